@@ -1,5 +1,5 @@
 """Blizzard adapters"""
 
-from .client import BlizzardClient
+from .client import BlizzardClient, blizzard_request_deadline, blizzard_request_priority
 
-__all__ = ["BlizzardClient"]
+__all__ = ["BlizzardClient", "blizzard_request_deadline", "blizzard_request_priority"]
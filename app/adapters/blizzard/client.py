@@ -1,24 +1,78 @@
 """Blizzard HTTP client adapter implementing BlizzardClientPort"""
 
+import json
 import time
+from contextlib import contextmanager
+from contextvars import ContextVar
 from typing import TYPE_CHECKING
 
 import httpx2
 from fastapi import HTTPException, status
 
 from app.adapters.blizzard.throttle import BlizzardThrottle
+from app.adapters.blizzard.timeouts import AdaptiveTimeouts
+from app.adapters.cache.valkey_cache import ValkeyCache
 from app.config import settings
+from app.domain.enums import BlizzardRequestPriority
 from app.domain.exceptions import RateLimitedError
 from app.infrastructure.logger import logger
 from app.infrastructure.metaclasses import Singleton
 from app.monitoring.helpers import normalize_blizzard_url
 from app.monitoring.metrics import (
+    blizzard_conditional_requests_total,
+    blizzard_connection_errors_total,
+    blizzard_deadline_exceeded_total,
+    blizzard_pool_connections,
     blizzard_request_duration_seconds,
+    blizzard_request_timeout_seconds,
     blizzard_requests_total,
+    blizzard_streams_per_connection,
 )
 
 if TYPE_CHECKING:
-    from app.domain.ports import ThrottlePort
+    from collections.abc import Iterator
+
+    from app.domain.models import PageValidators
+    from app.domain.ports import CachePort, ThrottlePort
+
+# Priority of Blizzard requests made in the current context, so that code
+# paths shared by the API and the worker don't have to pass it around
+_request_priority: ContextVar[BlizzardRequestPriority] = ContextVar(
+    "blizzard_request_priority", default=BlizzardRequestPriority.INTERACTIVE
+)
+
+
+@contextmanager
+def blizzard_request_priority(priority: BlizzardRequestPriority) -> Iterator[None]:
+    """Make Blizzard requests with the given priority within the context"""
+    token = _request_priority.set(priority)
+    try:
+        yield
+    finally:
+        _request_priority.reset(token)
+
+
+# Monotonic time after which Blizzard requests made in the current context are
+# abandoned, as the API request they're made for ran out of time
+_request_deadline: ContextVar[float | None] = ContextVar(
+    "blizzard_request_deadline", default=None
+)
+
+
+@contextmanager
+def blizzard_request_deadline(budget: float) -> Iterator[None]:
+    """Abandon Blizzard requests made within the context once ``budget``
+    seconds elapsed. Nested deadlines can only shorten the current one."""
+    deadline = time.monotonic() + budget
+    current_deadline = _request_deadline.get()
+    if current_deadline is not None:
+        deadline = min(deadline, current_deadline)
+
+    token = _request_deadline.set(deadline)
+    try:
+        yield
+    finally:
+        _request_deadline.reset(token)
 
 
 class BlizzardClient(metaclass=Singleton):
@@ -33,7 +87,14 @@ class BlizzardClient(metaclass=Singleton):
         self.throttle: ThrottlePort | None = (
             BlizzardThrottle() if settings.throttle_enabled else None
         )
+        # Holds the validators of responses to revalidating requests
+        self.cache: CachePort = ValkeyCache()
+        self.timeouts = AdaptiveTimeouts()
+        self._inflight_requests = 0
+        # Kept to inspect its connection pool
+        self.transport = self._build_transport()
         self.client = httpx2.AsyncClient(
+            transport=self.transport,
             headers={
                 "User-Agent": (
                     f"OverFastAPI v{settings.app_version} - "
@@ -41,34 +102,64 @@ class BlizzardClient(metaclass=Singleton):
                 ),
                 "From": "valentin.porchet@proton.me",
             },
-            http2=True,
-            timeout=10,
+            timeout=settings.blizzard_timeout,
             follow_redirects=True,
         )
 
+    @staticmethod
+    def _build_transport() -> httpx2.AsyncBaseTransport:
+        """Build the transport sending requests to Blizzard"""
+        return httpx2.AsyncHTTPTransport(
+            http2=True,
+            limits=httpx2.Limits(
+                max_connections=settings.blizzard_max_connections,
+                max_keepalive_connections=settings.blizzard_max_keepalive_connections,
+                keepalive_expiry=settings.blizzard_keepalive_expiry,
+            ),
+        )
+
     async def get(
         self,
         url: str,
         *,
         headers: dict[str, str] | None = None,
         params: dict[str, str] | None = None,
+        priority: BlizzardRequestPriority | None = None,
+        revalidate: bool = False,
     ) -> httpx2.Response:
-        """Make an HTTP GET request, respecting the adaptive throttle."""
+        """Make an HTTP GET request, respecting the adaptive throttle.
+
+        With ``revalidate``, the request is conditional on the validators saved
+        for the same URL (see ``save_validators``). Query params aren't part of
+        the validators key, revalidating requests shouldn't use any.
+
+        The timeout depends on the latency observed on the endpoint, and is
+        shortened to the remaining time before the deadline of the context (see
+        ``blizzard_request_deadline``), if any.
+        """
+        normalized_endpoint = normalize_blizzard_url(url)
+        remaining = self._check_deadline(normalized_endpoint)
+
         if self.throttle:
-            await self._throttle_wait()
+            await self._throttle_wait(priority or _request_priority.get(), remaining)
 
         kwargs: dict = {}
+        if revalidate:
+            headers = {**(headers or {}), **await self._get_conditional_headers(url)}
         if headers:
             kwargs["headers"] = headers
         if params:
             kwargs["params"] = params
+        kwargs["timeout"] = self._get_timeout(normalized_endpoint)
 
-        normalized_endpoint = normalize_blizzard_url(url)
         response = await self._execute_request(url, normalized_endpoint, kwargs)
 
         if self.throttle:
             await self.throttle.adjust_delay(response.status_code)
 
+        if revalidate:
+            self._record_revalidation(kwargs, response)
+
         logger.debug("OverFast request done!")
 
         if response.status_code == status.HTTP_403_FORBIDDEN:
@@ -76,13 +167,99 @@ class BlizzardClient(metaclass=Singleton):
 
         return response
 
-    async def _throttle_wait(self) -> None:
-        """Check throttle before request; raise 503 if in penalty period."""
+    def _get_timeout(self, normalized_endpoint: str) -> float:
+        """Return the timeout of a request to the endpoint, within the deadline"""
+        timeout = self.timeouts.get(normalized_endpoint)
+        if settings.prometheus_enabled:
+            blizzard_request_timeout_seconds.labels(endpoint=normalized_endpoint).set(
+                timeout
+            )
+
+        # The throttle wait may have consumed the remaining budget
+        return min(timeout, self._check_deadline(normalized_endpoint))
+
+    @staticmethod
+    def _check_deadline(normalized_endpoint: str) -> float:
+        """Return the remaining time before the deadline of the context, or
+        raise a 504 if it's already over. Returns infinity without deadline."""
+        deadline = _request_deadline.get()
+        if deadline is None:
+            return float("inf")
+
+        remaining = deadline - time.monotonic()
+        if remaining > 0:
+            return remaining
+
+        logger.warning(
+            "Request deadline exceeded, Blizzard request to {} abandoned",
+            normalized_endpoint,
+        )
+        if settings.prometheus_enabled:
+            blizzard_deadline_exceeded_total.labels(endpoint=normalized_endpoint).inc()
+        raise HTTPException(
+            status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+            detail="Couldn't get Blizzard page in time, please retry later",
+        )
+
+    @staticmethod
+    def _validators_key(url: str) -> str:
+        return f"{settings.blizzard_validators_key_prefix}:{url}"
+
+    async def _get_conditional_headers(self, url: str) -> dict[str, str]:
+        """Build If-None-Match / If-Modified-Since headers from stored validators"""
+        raw_validators = await self.cache.get(self._validators_key(url))
+        if not raw_validators:
+            return {}
+
+        validators = json.loads(raw_validators)
+        conditional_headers: dict[str, str] = {}
+        if validators.get("etag"):
+            conditional_headers["If-None-Match"] = validators["etag"]
+        if validators.get("last_modified"):
+            conditional_headers["If-Modified-Since"] = validators["last_modified"]
+        return conditional_headers
+
+    @staticmethod
+    def _record_revalidation(kwargs: dict, response: httpx2.Response) -> None:
+        """Record the outcome of a conditional request"""
+        headers = kwargs.get("headers") or {}
+        if settings.prometheus_enabled and (
+            "If-None-Match" in headers or "If-Modified-Since" in headers
+        ):
+            blizzard_conditional_requests_total.labels(
+                result=(
+                    "not_modified"
+                    if response.status_code == status.HTTP_304_NOT_MODIFIED
+                    else "modified"
+                )
+            ).inc()
+
+    async def save_validators(self, validators: PageValidators) -> None:
+        """Store the validators of a full response for the next revalidation of
+        the same URL. Callers only save them once the page content is stored,
+        otherwise a 304 would vouch for content we don't have."""
+        if not validators.etag and not validators.last_modified:
+            return
+
+        await self.cache.set(
+            self._validators_key(validators.url),
+            json.dumps(
+                {"etag": validators.etag, "last_modified": validators.last_modified}
+            ).encode(),
+            expire=settings.blizzard_validators_ttl,
+        )
+
+    async def _throttle_wait(
+        self, priority: BlizzardRequestPriority, max_wait: float
+    ) -> None:
+        """Check throttle before request; raise 503 if in penalty period, or if
+        no request slot is free within ``max_wait`` seconds (the time left
+        before the deadline)."""
         if not self.throttle:
             return
 
         try:
-            await self.throttle.wait_before_request()
+            await self.throttle.wait_before_request(priority, max_wait=max_wait)
         except RateLimitedError as exc:
             raise HTTPException(
                 status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
@@ -101,25 +278,45 @@ class BlizzardClient(metaclass=Singleton):
     ) -> httpx2.Response:
         """Execute the HTTP GET and record metrics."""
         start_time = time.perf_counter()
+        self._inflight_requests += 1
         try:
             response = await self.client.get(url, **kwargs)
         except httpx2.TimeoutException as error:
             duration = time.perf_counter() - start_time
             self._record_metrics(normalized_endpoint, "timeout", duration)
+            # Timeouts shortened by a deadline say nothing about the endpoint
+            if kwargs["timeout"] >= self.timeouts.get(normalized_endpoint):
+                self.timeouts.observe(normalized_endpoint, duration)
             raise self._blizzard_response_error(
                 status_code=0,
-                error="Blizzard took more than 10 seconds to respond, resulting in a timeout",
+                error=(
+                    f"Blizzard took more than {kwargs['timeout']:g} seconds to "
+                    "respond, resulting in a timeout"
+                ),
             ) from error
         except httpx2.RemoteProtocolError as error:
             duration = time.perf_counter() - start_time
             self._record_metrics(normalized_endpoint, "error", duration)
+            self._record_connection_error(self._protocol_error_reason(error), error)
             raise self._blizzard_response_error(
                 status_code=0,
                 error="Blizzard closed the connection, no data could be retrieved",
             ) from error
+        except httpx2.NetworkError as error:
+            duration = time.perf_counter() - start_time
+            self._record_metrics(normalized_endpoint, "error", duration)
+            self._record_connection_error("network", error)
+            raise self._blizzard_response_error(
+                status_code=0,
+                error="Connection to Blizzard failed, no data could be retrieved",
+            ) from error
+        finally:
+            self._inflight_requests -= 1
+            self._record_pool_metrics()
 
         duration = time.perf_counter() - start_time
         self._record_metrics(normalized_endpoint, str(response.status_code), duration)
+        self.timeouts.observe(normalized_endpoint, duration)
         return response
 
     @staticmethod
@@ -130,6 +327,58 @@ class BlizzardClient(metaclass=Singleton):
                 duration
             )
 
+    @staticmethod
+    def _protocol_error_reason(error: httpx2.RemoteProtocolError) -> str:
+        """Tell HTTP/2 connection shutdowns (GOAWAY) and stream resets apart
+        from other protocol errors, using the h2 event in the message."""
+        message = str(error)
+        if "ConnectionTerminated" in message:
+            return "goaway"
+        if "StreamReset" in message:
+            return "stream_reset"
+        return "protocol"
+
+    @staticmethod
+    def _record_connection_error(reason: str, error: Exception) -> None:
+        logger.warning("Blizzard connection error ({}) : {!r}", reason, error)
+        if settings.prometheus_enabled:
+            blizzard_connection_errors_total.labels(reason=reason).inc()
+
+    def _record_pool_metrics(self) -> None:
+        """Update connection pool gauges, from the connections of the pool.
+
+        With HTTP/2, several requests share a connection as concurrent streams.
+        """
+        if not settings.prometheus_enabled:
+            return
+
+        pool = getattr(self.transport, "_pool", None)
+        connections = [
+            connection
+            for connection in getattr(pool, "connections", ())
+            if not connection.is_closed()
+        ]
+        idle = sum(1 for connection in connections if connection.is_idle())
+        active = len(connections) - idle
+
+        blizzard_pool_connections.labels(state="active").set(active)
+        blizzard_pool_connections.labels(state="idle").set(idle)
+        blizzard_streams_per_connection.set(
+            self._inflight_requests / active if active else 0
+        )
+
+    async def warm_up(self) -> None:
+        """Open a connection to Blizzard ahead of the first request, so that
+        it doesn't pay for the TLS handshake. Failures are only logged."""
+        try:
+            await self.client.head(settings.blizzard_host)
+        except httpx2.HTTPError as error:
+            logger.warning("Couldn't warm up connection to Blizzard : {!r}", error)
+            return
+        finally:
+            self._record_pool_metrics()
+        logger.info("Connection to Blizzard warmed up")
+
     async def close(self) -> None:
         """Properly close HTTPX Async Client"""
         await self.client.aclose()
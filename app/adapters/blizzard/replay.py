@@ -0,0 +1,174 @@
+"""Blizzard clients replaying or recording a local corpus of Blizzard responses.
+
+Used to load test the whole stack (nginx, API, worker, storage) without
+sending any request to Blizzard. The corpus follows the layout of test
+fixtures, relative to ``settings.blizzard_replay_corpus_path``:
+
+* ``html/home.html`` : home page (roles, gamemodes)
+* ``html/heroes.html`` and ``html/heroes/<hero_key>.html`` : heroes pages
+* ``html/players/<player_id>.html`` : career pages
+* ``json/search/<name>.json`` : account search results, defaulting to
+  ``json/search_players_blizzard_result.json``
+* ``json/blizzard_hero_stats.json`` : heroes usage statistics
+
+Only one locale is stored, the locale of requested pages is ignored, as well
+as query params.
+"""
+
+import asyncio
+import math
+import random
+import re
+from http import HTTPStatus
+from pathlib import Path
+from urllib.parse import unquote, urlparse
+
+import httpx2
+
+from app.adapters.blizzard.client import BlizzardClient
+from app.config import settings
+from app.infrastructure.logger import logger
+from app.monitoring.helpers import normalize_blizzard_url
+
+_LOCALE_PATTERN = re.compile(r"[a-z]{2}-[a-z]{2}")
+
+_SEARCH_FALLBACK_FILE = "json/search_players_blizzard_result.json"
+
+
+def corpus_file(url: str) -> str | None:
+    """Return the corpus file of a Blizzard URL, relative to the corpus root,
+    or None if the URL isn't part of the corpus layout."""
+    segments = [
+        segment for segment in unquote(urlparse(url).path).split("/") if segment
+    ]
+    if segments and _LOCALE_PATTERN.fullmatch(segments[0]):
+        segments = segments[1:]
+
+    match segments:
+        case []:
+            relative_path = "html/home.html"
+        case ["heroes"]:
+            relative_path = "html/heroes.html"
+        case ["heroes", hero_key]:
+            relative_path = f"html/heroes/{hero_key}.html"
+        case ["career", player_id]:
+            relative_path = f"html/players/{player_id}.html"
+        case ["search", "account-by-name", name]:
+            relative_path = f"json/search/{name}.json"
+        case ["rates", "data"]:
+            relative_path = "json/blizzard_hero_stats.json"
+        case _:
+            relative_path = None
+    return relative_path
+
+
+class ReplayTransport(httpx2.AsyncBaseTransport):
+    """
+    Transport answering requests from the corpus, instead of Blizzard.
+
+    Latencies follow a log-normal distribution, whose median depends on the
+    endpoint (see ``settings.blizzard_replay_latency_medians``). A share of
+    requests is answered with a 403, to exercise the throttle. Files have an
+    ETag, so that conditional requests get 304 responses.
+    """
+
+    def __init__(self, corpus_path: Path):
+        self.corpus_path = corpus_path
+
+    async def handle_async_request(self, request: httpx2.Request) -> httpx2.Response:
+        url = str(request.url)
+        await asyncio.sleep(self._latency(normalize_blizzard_url(url)))
+
+        if random.random() < settings.blizzard_replay_forbidden_rate:
+            return httpx2.Response(HTTPStatus.FORBIDDEN, request=request)
+
+        file = self._find_file(url)
+        if file is None:
+            return httpx2.Response(HTTPStatus.NOT_FOUND, request=request)
+
+        stat = file.stat()
+        etag = f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+        if request.headers.get("If-None-Match") == etag:
+            return httpx2.Response(
+                HTTPStatus.NOT_MODIFIED, headers={"ETag": etag}, request=request
+            )
+
+        headers = {
+            "ETag": etag,
+            "Content-Type": (
+                "application/json" if file.suffix == ".json" else "text/html"
+            ),
+        }
+        if request.method == "HEAD":
+            return httpx2.Response(HTTPStatus.OK, headers=headers, request=request)
+
+        content = await asyncio.to_thread(file.read_bytes)
+        return httpx2.Response(
+            HTTPStatus.OK, headers=headers, content=content, request=request
+        )
+
+    def _find_file(self, url: str) -> Path | None:
+        relative_path = corpus_file(url)
+        if relative_path is None:
+            return None
+
+        file = self.corpus_path / relative_path
+        if file.is_file():
+            return file
+
+        if relative_path.startswith("json/search/"):
+            fallback_file = self.corpus_path / _SEARCH_FALLBACK_FILE
+            if fallback_file.is_file():
+                return fallback_file
+
+        return None
+
+    @staticmethod
+    def _latency(endpoint: str) -> float:
+        median = settings.blizzard_replay_latency_medians.get(
+            endpoint, settings.blizzard_replay_latency_median
+        )
+        if median <= 0:
+            return 0.0
+        return random.lognormvariate(
+            math.log(median), settings.blizzard_replay_latency_sigma
+        )
+
+
+class ReplayBlizzardClient(BlizzardClient):
+    """Blizzard client answering from the local corpus. Throttling, timeouts
+    and metrics behave as with Blizzard."""
+
+    @staticmethod
+    def _build_transport() -> httpx2.AsyncBaseTransport:
+        logger.warning(
+            "Blizzard responses are replayed from {}",
+            settings.blizzard_replay_corpus_path,
+        )
+        return ReplayTransport(Path(settings.blizzard_replay_corpus_path))
+
+
+class RecordingBlizzardClient(BlizzardClient):
+    """Blizzard client saving successful responses of Blizzard into the local
+    corpus, for later replays."""
+
+    async def _execute_request(
+        self,
+        url: str,
+        normalized_endpoint: str,
+        kwargs: dict,
+    ) -> httpx2.Response:
+        response = await super()._execute_request(url, normalized_endpoint, kwargs)
+
+        relative_path = corpus_file(url)
+        if response.status_code == HTTPStatus.OK and relative_path is not None:
+            file = Path(settings.blizzard_replay_corpus_path) / relative_path
+            await asyncio.to_thread(self._save_file, file, response.content)
+            logger.info("Recorded {} into {}", url, file)
+
+        return response
+
+    @staticmethod
+    def _save_file(file: Path, content: bytes) -> None:
+        file.parent.mkdir(parents=True, exist_ok=True)
+        file.write_bytes(content)
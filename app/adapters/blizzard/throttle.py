@@ -14,7 +14,8 @@ Implements a TCP Slow Start + AIMD strategy:
   ``throttle_penalty_duration`` seconds.
 
 State is stored in Valkey so the API process and the worker process share
-the same throttle state.
+the same throttle state. Each state transition is a Lua script, so that it's
+atomic across processes and costs a single round-trip.
 """
 
 import asyncio
@@ -24,6 +25,7 @@ from typing import TYPE_CHECKING
 
 from app.adapters.cache.valkey_cache import ValkeyCache
 from app.config import settings
+from app.domain.enums import BlizzardRequestPriority
 from app.domain.exceptions import RateLimitedError
 from app.infrastructure.helpers import send_discord_webhook_message
 from app.infrastructure.logger import logger
@@ -31,7 +33,9 @@ from app.infrastructure.metaclasses import Singleton
 from app.monitoring.metrics import (
     blizzard_rate_limited_total,
     throttle_403_total,
+    throttle_background_deferrals_total,
     throttle_current_delay_seconds,
+    throttle_queue_depth,
     throttle_wait_seconds,
 )
 
@@ -42,7 +46,115 @@ _DELAY_KEY = "throttle:delay"
 _SSTHRESH_KEY = "throttle:ssthresh"
 _STREAK_KEY = "throttle:streak"
 _LAST_403_KEY = "throttle:last_403"
-_LAST_REQUEST_KEY = "throttle:last_request"
+_LAST_SLOT_KEY = "throttle:last_slot"
+
+# Checks the penalty, then reserves the next free send slot : the last
+# reserved slot plus the current delay, or now if that's already past. Each
+# caller gets its own slot, so concurrent callers are spread out by the delay
+# instead of all waking up together. Background requests only take a slot
+# which is free right away, so that they never delay interactive ones.
+# KEYS: last_403, last_slot, delay
+# ARGV: now, penalty_duration, start_delay, max_queue_wait, priority
+# Returns {"penalty", remaining seconds}, {"full", seconds until the next free
+# slot} when it's further than max_queue_wait, {"busy", milliseconds until the
+# next free slot} for background requests (nothing is reserved in these cases),
+# or {"wait", milliseconds until the reserved slot, reserved slots ahead}
+_WAIT_SCRIPT = """
+local now = tonumber(ARGV[1])
+local last_403 = tonumber(redis.call("GET", KEYS[1]))
+if last_403 then
+    local remaining = tonumber(ARGV[2]) - (now - last_403)
+    if remaining > 0 then
+        return {"penalty", math.ceil(remaining)}
+    end
+end
+
+local delay = tonumber(redis.call("GET", KEYS[3])) or tonumber(ARGV[3])
+local slot = now
+local last_slot = tonumber(redis.call("GET", KEYS[2]))
+if last_slot then
+    slot = math.max(now, last_slot + delay)
+end
+
+local wait = slot - now
+if ARGV[5] == "background" and wait > 0 then
+    return {"busy", math.ceil(wait * 1000)}
+end
+if wait > tonumber(ARGV[4]) then
+    return {"full", math.ceil(wait)}
+end
+
+redis.call("SET", KEYS[2], tostring(slot))
+local queue_depth = 0
+if delay > 0 then
+    queue_depth = math.ceil(wait / delay)
+end
+return {"wait", math.ceil(wait * 1000), queue_depth}
+"""
+
+# Slow Start / AIMD state machine, applied to the outcome of a request.
+# KEYS: delay, ssthresh, streak, last_403
+# ARGV: outcome ("forbidden", "ok" or "other"), now, start_delay, min_delay,
+#       max_delay, penalty_delay, penalty_duration, slow_start_n_successes,
+#       aimd_n_successes, aimd_delta
+# Returns {event, previous delay, new delay}, delays as strings as Lua numbers
+# would be truncated to integers. Events : "penalty" (403), "slow_start" and
+# "aimd" (delay decreased), "penalized" (success ignored during a penalty),
+# "unchanged" (streak updated only).
+_ADJUST_SCRIPT = """
+local outcome = ARGV[1]
+local now = tonumber(ARGV[2])
+local min_delay = tonumber(ARGV[4])
+local max_delay = tonumber(ARGV[5])
+local delay = tonumber(redis.call("GET", KEYS[1])) or tonumber(ARGV[3])
+
+if outcome == "forbidden" then
+    local new_delay = math.min(math.max(delay * 2, tonumber(ARGV[6])), max_delay)
+    redis.call("SET", KEYS[1], tostring(new_delay))
+    redis.call("SET", KEYS[2], tostring(math.min(delay * 2, max_delay)))
+    redis.call("SET", KEYS[3], "0")
+    redis.call("SET", KEYS[4], tostring(now))
+    return {"penalty", tostring(delay), tostring(new_delay)}
+end
+
+if outcome ~= "ok" then
+    redis.call("SET", KEYS[3], "0")
+    return {"unchanged", tostring(delay), tostring(delay)}
+end
+
+local last_403 = tonumber(redis.call("GET", KEYS[4]))
+if last_403 and now - last_403 < tonumber(ARGV[7]) then
+    return {"penalized", tostring(delay), tostring(delay)}
+end
+
+local streak = (tonumber(redis.call("GET", KEYS[3])) or 0) + 1
+local ssthresh = tonumber(redis.call("GET", KEYS[2])) or min_delay
+local event = "unchanged"
+local new_delay = delay
+if delay > ssthresh then
+    if streak >= tonumber(ARGV[8]) then
+        event = "slow_start"
+        new_delay = delay / 2
+    end
+elseif streak >= tonumber(ARGV[9]) then
+    event = "aimd"
+    new_delay = delay - tonumber(ARGV[10])
+end
+
+if event == "unchanged" then
+    redis.call("SET", KEYS[3], tostring(streak))
+    return {event, tostring(delay), tostring(delay)}
+end
+
+new_delay = math.max(min_delay, math.min(new_delay, max_delay))
+redis.call("SET", KEYS[1], tostring(new_delay))
+redis.call("SET", KEYS[3], "0")
+return {event, tostring(delay), tostring(new_delay)}
+"""
+
+
+def _decode(value: bytes | str) -> str:
+    return value.decode("utf-8") if isinstance(value, bytes) else value
 
 
 class BlizzardThrottle(metaclass=Singleton):
@@ -69,12 +181,9 @@ class BlizzardThrottle(metaclass=Singleton):
         back to Valkey for cross-process awareness (e.g., from the worker).
         """
         # Fast in-process check (avoids Valkey round-trip in the common case)
-        if self._penalty_start is not None:
-            elapsed = time.monotonic() - self._penalty_start
-            remaining = settings.throttle_penalty_duration - elapsed
-            if remaining > 0:
-                return int(remaining)
-            self._penalty_start = None  # penalty expired
+        remaining = self._remaining_local_penalty()
+        if remaining > 0:
+            return remaining
 
         # Cross-process check via Valkey (e.g. worker set the penalty)
         raw = await self._cache.get(_LAST_403_KEY)
@@ -83,76 +192,201 @@ class BlizzardThrottle(metaclass=Singleton):
         elapsed = time.time() - float(raw)
         remaining = settings.throttle_penalty_duration - elapsed
         if remaining > 0:
-            # Sync the in-process monotonic clock so subsequent calls bypass Valkey.
-            self._penalty_start = time.monotonic() - elapsed
+            self._sync_penalty_start(remaining)
             return int(remaining)
         return 0
 
-    async def wait_before_request(self) -> None:
-        """Sleep for the current throttle delay, or raise RateLimitedError if in penalty.
+    async def wait_before_request(
+        self,
+        priority: BlizzardRequestPriority | None = None,
+        max_wait: float | None = None,
+    ) -> None:
+        """Reserve the next Blizzard request slot and sleep until it, or raise
+        RateLimitedError if in penalty or if the next free slot is too far.
+
+        The penalty check and the slot reservation happen atomically in
+        Valkey, so that concurrent callers from any process each get their
+        own slot. Without Valkey, requests are sent without waiting.
+
+        The next free slot is too far when it's more than ``max_wait`` seconds
+        away (e.g. after the deadline of the request), capped to
+        ``throttle_max_queue_wait`` : no slot is reserved in this case.
+
+        Background requests are handled by ``_wait_for_spare_slot`` instead,
+        ``max_wait`` doesn't apply to them.
 
         Raises:
-            RateLimitedError: if the penalty period is still active.
+            RateLimitedError: if the penalty period is still active, started
+                while waiting, or if the wait would exceed the maximum.
         """
-        remaining = await self.is_rate_limited()
+        if priority == BlizzardRequestPriority.BACKGROUND:
+            await self._wait_for_spare_slot()
+            return
+
+        remaining = self._remaining_local_penalty()
         if remaining > 0:
             raise RateLimitedError(retry_after=remaining)
 
-        delay = await self.get_current_delay()
-        raw_last = await self._cache.get(_LAST_REQUEST_KEY)
-        if raw_last:
-            wait = max(0.0, delay - (time.time() - float(raw_last)))
-            if wait > 0:
-                if settings.prometheus_enabled:
-                    throttle_wait_seconds.observe(wait)
-                logger.debug(
-                    "[Throttle] Waiting {:.2f}s before next Blizzard request", wait
-                )
-                await asyncio.sleep(wait)
+        result = await self._reserve_slot(BlizzardRequestPriority.INTERACTIVE, max_wait)
+        if not result:
+            return
 
-        await self._cache.set(_LAST_REQUEST_KEY, str(time.time()).encode())
+        decision, value = _decode(result[0]), int(result[1])
+        if decision == "penalty":
+            self._sync_penalty_start(value)
+            raise RateLimitedError(retry_after=value)
+        if decision == "full":
+            logger.warning(
+                "[Throttle] Next Blizzard request slot is in {}s, rejecting request",
+                value,
+            )
+            raise RateLimitedError(retry_after=value)
+
+        queue_depth = int(result[2])
+        if settings.prometheus_enabled:
+            throttle_queue_depth.set(queue_depth)
+
+        wait = value / 1000
+        if wait > 0:
+            if settings.prometheus_enabled:
+                throttle_wait_seconds.observe(wait)
+            logger.debug(
+                "[Throttle] Waiting {:.2f}s for Blizzard request slot ({} reserved)",
+                wait,
+                queue_depth,
+            )
+            await asyncio.sleep(wait)
+
+            # Don't use the slot if a 403 was received meanwhile
+            remaining = self._remaining_local_penalty()
+            if remaining > 0:
+                raise RateLimitedError(retry_after=remaining)
 
     async def adjust_delay(self, status_code: int) -> None:
         """Update the throttle delay based on the observed response.
 
-        * **200**: TCP Slow Start / AIMD — gradually reduce delay on success.
+        * **200** (or **304** to a conditional request): TCP Slow Start / AIMD —
+          gradually reduce delay on success.
         * **403**: Multiplicative increase — double delay, set ssthresh.
         * **other non-200**: reset streak only (not a rate-limit signal).
 
         Args:
-            latency: Kept for interface compatibility; not used in this implementation.
             status_code: HTTP status code of the Blizzard response.
         """
         if status_code == HTTPStatus.FORBIDDEN:
-            await self._apply_403_penalty()
-            return
-        if status_code == HTTPStatus.OK:
-            in_penalty = (await self.is_rate_limited()) > 0
-            if not in_penalty:
-                await self._on_success()
+            outcome = "forbidden"
+        elif status_code in {HTTPStatus.OK, HTTPStatus.NOT_MODIFIED}:
+            # Successes don't count during a penalty, skip the round-trip
+            if self._remaining_local_penalty() > 0:
+                return
+            outcome = "ok"
+        else:
+            outcome = "other"
+
+        result = await self._cache.run_script(
+            _ADJUST_SCRIPT,
+            [_DELAY_KEY, _SSTHRESH_KEY, _STREAK_KEY, _LAST_403_KEY],
+            [
+                outcome,
+                time.time(),
+                settings.throttle_start_delay,
+                settings.throttle_min_delay,
+                settings.throttle_max_delay,
+                settings.throttle_penalty_delay,
+                settings.throttle_penalty_duration,
+                settings.throttle_slow_start_n_successes,
+                settings.throttle_aimd_n_successes,
+                settings.throttle_aimd_delta,
+            ],
+        )
+        if not result:
             return
-        # non-200, non-403: reset streak only
-        await self._cache.set(_STREAK_KEY, b"0")
+
+        event = _decode(result[0])
+        current_delay, new_delay = float(result[1]), float(result[2])
+        if event == "penalty":
+            self._on_penalty(current_delay, new_delay)
+        elif event in {"slow_start", "aimd"}:
+            self._on_delay_decrease(event, current_delay, new_delay)
 
     # ------------------------------------------------------------------
     # Private helpers
     # ------------------------------------------------------------------
 
-    async def _get_ssthresh(self) -> float:
-        raw = await self._cache.get(_SSTHRESH_KEY)
-        return float(raw) if raw else settings.throttle_min_delay
+    async def _reserve_slot(
+        self, priority: BlizzardRequestPriority, max_wait: float | None = None
+    ) -> list | None:
+        if max_wait is None or max_wait > settings.throttle_max_queue_wait:
+            max_wait = settings.throttle_max_queue_wait
+        return await self._cache.run_script(
+            _WAIT_SCRIPT,
+            [_LAST_403_KEY, _LAST_SLOT_KEY, _DELAY_KEY],
+            [
+                time.time(),
+                settings.throttle_penalty_duration,
+                settings.throttle_start_delay,
+                max_wait,
+                priority,
+            ],
+        )
+
+    async def _wait_for_spare_slot(self) -> None:
+        """Wait until a request slot is free right away, and take it.
 
-    async def _apply_403_penalty(self) -> None:
-        current_delay = await self.get_current_delay()
-        new_ssthresh = min(current_delay * 2, settings.throttle_max_delay)
-        new_delay = min(
-            max(current_delay * 2, settings.throttle_penalty_delay),
-            settings.throttle_max_delay,
+        Background requests are deferred while interactive requests have
+        reserved slots ahead, and while a penalty is active, instead of being
+        rejected. Under sustained interactive load, they wait for it to drop.
+        """
+        while True:
+            remaining = self._remaining_local_penalty()
+            if remaining > 0:
+                await self._defer_background_request("penalty", remaining)
+                continue
+
+            result = await self._reserve_slot(BlizzardRequestPriority.BACKGROUND)
+            if not result:
+                return
+
+            decision, value = _decode(result[0]), int(result[1])
+            if decision == "penalty":
+                self._sync_penalty_start(value)
+                await self._defer_background_request("penalty", value)
+            elif decision == "busy":
+                await self._defer_background_request("busy", value / 1000)
+            else:
+                if settings.prometheus_enabled:
+                    throttle_queue_depth.set(int(result[2]))
+                return
+
+    @staticmethod
+    async def _defer_background_request(reason: str, wait: float) -> None:
+        if settings.prometheus_enabled:
+            throttle_background_deferrals_total.labels(reason=reason).inc()
+        logger.debug(
+            "[Throttle] Deferring background Blizzard request for {:.2f}s ({})",
+            wait,
+            reason,
         )
-        await self._cache.set(_DELAY_KEY, str(new_delay).encode())
-        await self._cache.set(_SSTHRESH_KEY, str(new_ssthresh).encode())
-        await self._cache.set(_LAST_403_KEY, str(time.time()).encode())
-        await self._cache.set(_STREAK_KEY, b"0")
+        await asyncio.sleep(wait)
+
+    def _remaining_local_penalty(self) -> int:
+        """Remaining penalty seconds known by this process, without I/O."""
+        if self._penalty_start is None:
+            return 0
+        elapsed = time.monotonic() - self._penalty_start
+        remaining = settings.throttle_penalty_duration - elapsed
+        if remaining > 0:
+            return int(remaining)
+        self._penalty_start = None  # penalty expired
+        return 0
+
+    def _sync_penalty_start(self, remaining: float) -> None:
+        """Sync the in-process monotonic clock with a penalty seen in Valkey,
+        so that subsequent calls bypass Valkey."""
+        elapsed = settings.throttle_penalty_duration - remaining
+        self._penalty_start = time.monotonic() - elapsed
+
+    def _on_penalty(self, current_delay: float, new_delay: float) -> None:
         self._penalty_start = time.monotonic()
 
         if settings.prometheus_enabled:
@@ -182,41 +416,14 @@ class BlizzardThrottle(metaclass=Singleton):
                 color=0xF39C12,
             )
 
-    async def _on_success(self) -> None:
-        raw_streak = await self._cache.get(_STREAK_KEY)
-        streak = int(raw_streak) if raw_streak else 0
-        streak += 1
-
-        current_delay = await self.get_current_delay()
-        ssthresh = await self._get_ssthresh()
-
-        new_delay: float | None = None
-
-        if current_delay > ssthresh:
-            # Slow Start phase: halve delay every N successes
-            if streak >= settings.throttle_slow_start_n_successes:
-                new_delay = current_delay / 2
-                streak = 0
-        # AIMD phase: decrease delay by delta every M successes
-        elif streak >= settings.throttle_aimd_n_successes:
-            new_delay = current_delay - settings.throttle_aimd_delta
-            streak = 0
-
-        await self._cache.set(_STREAK_KEY, str(streak).encode())
-
-        if new_delay is not None:
-            new_delay = max(
-                settings.throttle_min_delay,
-                min(new_delay, settings.throttle_max_delay),
-            )
-            await self._cache.set(_DELAY_KEY, str(new_delay).encode())
-
-            if settings.prometheus_enabled:
-                throttle_current_delay_seconds.set(new_delay)
+    @staticmethod
+    def _on_delay_decrease(event: str, current_delay: float, new_delay: float) -> None:
+        if settings.prometheus_enabled:
+            throttle_current_delay_seconds.set(new_delay)
 
-            logger.debug(
-                "[Throttle] {}: {:.3f}s → {:.3f}s (streak reset)",
-                "Slow Start" if current_delay > ssthresh else "AIMD",
-                current_delay,
-                new_delay,
-            )
+        logger.debug(
+            "[Throttle] {}: {:.3f}s → {:.3f}s (streak reset)",
+            "Slow Start" if event == "slow_start" else "AIMD",
+            current_delay,
+            new_delay,
+        )
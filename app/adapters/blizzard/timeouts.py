@@ -0,0 +1,57 @@
+"""Per-endpoint adaptive timeouts for Blizzard requests"""
+
+import math
+from collections import deque
+
+from app.config import settings
+
+
+class AdaptiveTimeouts:
+    """
+    Derive the timeout of each Blizzard endpoint from its observed latencies.
+
+    The timeout of an endpoint is the p99 of its last response durations,
+    multiplied by ``settings.blizzard_timeout_p99_factor``, and bounded by
+    ``settings.blizzard_min_timeout`` and ``settings.blizzard_timeout``. Until
+    enough durations were observed, the maximum timeout is used.
+
+    Timeouts are observed as well, with the timeout value as duration, so that
+    the timeout of an endpoint which became slower grows back.
+    """
+
+    def __init__(self):
+        self._durations: dict[str, deque[float]] = {}
+        # Timeouts computed since the last observation of each endpoint
+        self._timeouts: dict[str, float] = {}
+
+    def observe(self, endpoint: str, duration: float) -> None:
+        """Record the duration of a request to a normalized Blizzard endpoint"""
+        durations = self._durations.get(endpoint)
+        if durations is None:
+            durations = self._durations[endpoint] = deque(
+                maxlen=settings.blizzard_timeout_window
+            )
+        durations.append(duration)
+        self._timeouts.pop(endpoint, None)
+
+    def get(self, endpoint: str) -> float:
+        """Return the timeout to use for a request to a normalized endpoint"""
+        timeout = self._timeouts.get(endpoint)
+        if timeout is None:
+            timeout = self._timeouts[endpoint] = self._compute(endpoint)
+        return timeout
+
+    def _compute(self, endpoint: str) -> float:
+        durations = self._durations.get(endpoint)
+        if not durations or len(durations) < settings.blizzard_timeout_min_samples:
+            return settings.blizzard_timeout
+
+        ordered = sorted(durations)
+        p99 = ordered[math.ceil(0.99 * len(ordered)) - 1]
+        return min(
+            max(
+                p99 * settings.blizzard_timeout_p99_factor,
+                settings.blizzard_min_timeout,
+            ),
+            settings.blizzard_timeout,
+        )
@@ -1,13 +1,19 @@
 """
 Valkey cache adapter implementing CachePort.
 
-API Cache will expire depending on the given route. It simply contains
-a string representing the processed JSON to return. It's used by nginx
-reverse-proxy before calling the application server.
+API Cache will expire depending on the given route. It's used by nginx
+reverse-proxy before calling the application server. Each value is a short
+ASCII header line holding the SWR metadata and the ETag of the body, followed
+by the zstd-compressed JSON body, so that nginx can serve it without parsing
+any JSON :
+"<stored_at> <staleness_threshold> <stale_while_revalidate> <etag>\n<zstd body>"
 
 Examples :
-api-cache:/heroes => "[{...}]"
-api-cache:/heroes?role=damage => "[{...}]"
+api-cache:/heroes => "1700000000 86400 0 9f86d081884c7d65\n<zstd [{...}]>"
+api-cache:/heroes?role=damage => "1700000000 86400 0 2c26b46b68ffc68f\n<zstd [{...}]>"
+
+Large bodies also have a gzip variant, served to clients not accepting zstd :
+api-cache:/heroes#gzip => "<gzip [{...}]>"
 
 ----
 
@@ -17,22 +23,98 @@ Unknown Player Cache uses a two-key pattern per player:
 
 The cooldown key drives rejection; the status key preserves check_count across
 cooldown expirations so exponential backoff keeps growing.
+
+----
+
+Player Cache Index is a set per player, listing the API Cache keys written for
+this player, so that they can be evicted on refresh without a keyspace scan :
+- player-cache-index:{id}  TTL=longest API Cache TTL, members=API Cache keys
+
+----
+
+Player Popularity is a sorted set of player IDs, incremented by nginx on each
+player request, and decayed over time by the pre-refresh scheduler :
+- player-popularity  no TTL, members=player IDs, scores=decayed request counts
 """
 
 import json
 import time
-from compression import zstd
+from compression import gzip, zstd
+from contextlib import asynccontextmanager
 from functools import wraps
 from typing import TYPE_CHECKING, Any
 
 import valkey.asyncio as valkey
 
 from app.config import settings
+from app.infrastructure.helpers import compute_etag
 from app.infrastructure.logger import logger
 from app.infrastructure.metaclasses import Singleton
 
 if TYPE_CHECKING:
-    from collections.abc import Callable
+    from collections.abc import AsyncIterator, Callable
+
+    from valkey.asyncio.client import Pipeline
+    from valkey.commands.core import AsyncScript
+
+# Separates the SWR metadata header from the compressed body in API Cache values
+API_CACHE_HEADER_SEPARATOR = b"\n"
+
+# Suffix of the API Cache keys holding the gzip variant of a body. Kept as a
+# suffix so that key scans on a URI prefix also match the variants.
+API_CACHE_GZIP_KEY_SUFFIX = "#gzip"
+
+# Atomically store an API Cache value and its gzip variant, and add both keys
+# to the player cache index, unless the current value was built from more
+# recent data (its header starts with a later stored_at)
+# KEYS: API Cache key, gzip variant key, player cache index key (optional)
+# ARGV: value, stored_at, TTL, gzip body ("" to delete the variant)
+# Returns 1 if the value was stored, 0 if a more recent one was kept
+_UPDATE_API_CACHE_SCRIPT = """
+local header = redis.call('GETRANGE', KEYS[1], 0, 19)
+local current_stored_at = tonumber(string.match(header, '^(%d+) '))
+if current_stored_at and current_stored_at > tonumber(ARGV[2]) then
+    return 0
+end
+redis.call('SET', KEYS[1], ARGV[1], 'EX', ARGV[3])
+if ARGV[4] ~= '' then
+    redis.call('SET', KEYS[2], ARGV[4], 'EX', ARGV[3])
+else
+    redis.call('DEL', KEYS[2])
+end
+if KEYS[3] then
+    redis.call('SADD', KEYS[3], KEYS[1], KEYS[2])
+    redis.call('EXPIRE', KEYS[3], ARGV[3], 'NX')
+    redis.call('EXPIRE', KEYS[3], ARGV[3], 'GT')
+end
+return 1
+"""
+
+# Atomically delete the status of an unknown player, its cooldown key, and the
+# cooldown key of the battletag recorded in the status, if any
+# KEYS: status key, cooldown key / ARGV: cooldown key prefix
+# Returns the number of deleted keys
+_DELETE_PLAYER_STATUS_SCRIPT = """
+local status = redis.call('GET', KEYS[1])
+local keys = {KEYS[1], KEYS[2]}
+if status then
+    local battletag = cjson.decode(status)['battletag']
+    if type(battletag) == 'string' and battletag ~= '' then
+        keys[#keys + 1] = ARGV[1] .. ':' .. battletag
+    end
+end
+return redis.call('DEL', unpack(keys))
+"""
+
+# Delete a lock only if it's still held with the given token, so that a lock
+# which expired and was taken by another holder meanwhile is kept
+# KEYS: lock key / ARGV: lock token
+_RELEASE_LOCK_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
 
 
 def handle_valkey_error(
@@ -63,6 +145,40 @@ def handle_valkey_error(
     return decorator
 
 
+class ValkeyCachePipeline:
+    """
+    Valkey pipeline implementing CachePipeline protocol.
+
+    Commands are buffered client-side and sent without MULTI/EXEC on
+    ``execute()``. On Valkey error, ``execute()`` returns a None result for
+    each queued command, like single-key methods do.
+    """
+
+    def __init__(self, pipe: Pipeline) -> None:
+        self._pipe = pipe
+        self._queued = 0
+
+    def get(self, key: str) -> None:
+        self._pipe.get(key)
+        self._queued += 1
+
+    def set(self, key: str, value: bytes, expire: int | None = None) -> None:
+        self._pipe.set(key, value, ex=expire)
+        self._queued += 1
+
+    def delete(self, *keys: str) -> None:
+        self._pipe.delete(*keys)
+        self._queued += 1
+
+    async def execute(self) -> list[Any]:
+        queued, self._queued = self._queued, 0
+        try:
+            return await self._pipe.execute()
+        except valkey.ValkeyError as err:
+            logger.warning("Valkey server error in pipeline execute: {}", err)
+            return [None] * queued
+
+
 class ValkeyCache(metaclass=Singleton):
     """
     Async Valkey cache adapter implementing CachePort protocol.
@@ -76,19 +192,28 @@ class ValkeyCache(metaclass=Singleton):
         self.valkey_server = valkey.Valkey(
             host=settings.valkey_host, port=settings.valkey_port, protocol=3
         )
+        # Registered Lua scripts, by source
+        self._scripts: dict[str, AsyncScript] = {}
 
     @staticmethod
-    def _compress_json_value(value: dict | list) -> bytes:
-        """Helper method to transform a value into compressed JSON data using zstd"""
-        json_str = json.dumps(value, separators=(",", ":"))
+    def _build_api_cache_value(
+        body: bytes,
+        stored_at: int,
+        staleness_threshold: int,
+        stale_while_revalidate: int,
+        etag: str,
+    ) -> bytes:
+        """Build the API Cache value : metadata header line, then zstd JSON body"""
+        header = f"{stored_at} {staleness_threshold} {stale_while_revalidate} {etag}\n"
         # Use module-level function for better performance
-        return zstd.compress(json_str.encode("utf-8"))
+        return header.encode("ascii") + zstd.compress(body)
 
     @staticmethod
-    def _decompress_json_value(value: bytes) -> dict | list:
-        """Helper method to retrieve a value from a compressed JSON data using zstd"""
+    def _parse_api_cache_value(value: bytes) -> dict | list:
+        """Retrieve the JSON body of an API Cache value, ignoring its header"""
+        _, _, compressed_body = value.partition(API_CACHE_HEADER_SEPARATOR)
         # Use module-level function for better performance
-        return json.loads(zstd.decompress(value).decode("utf-8"))
+        return json.loads(zstd.decompress(compressed_body).decode("utf-8"))
 
     # CachePort protocol methods
     @handle_valkey_error(default_return=None)
@@ -118,6 +243,45 @@ class ValkeyCache(metaclass=Singleton):
         result = await self.valkey_server.exists(key)
         return bool(result)
 
+    @handle_valkey_error(default_return=None)
+    async def mget(self, keys: list[str]) -> list[bytes | None]:
+        """Get raw values of several keys with a single MGET"""
+        if not keys:
+            return []
+        return await self.valkey_server.mget(keys)
+
+    @handle_valkey_error(default_return=None)
+    async def mset_with_ttl(
+        self,
+        mapping: dict[str, bytes],
+        expire: int | None = None,
+    ) -> None:
+        """Set several raw values in one round-trip : a single MSET without
+        expiration, a pipeline of SET EX otherwise (MSET can't set TTLs)."""
+        if not mapping:
+            return
+        if expire is None:
+            await self.valkey_server.mset(mapping)
+            return
+
+        async with self.pipeline() as pipe:
+            for key, value in mapping.items():
+                pipe.set(key, value, expire=expire)
+            await pipe.execute()
+
+    @handle_valkey_error(default_return=0)
+    async def delete_many(self, keys: list[str]) -> int:
+        """Delete several keys with a single DEL"""
+        if not keys:
+            return 0
+        return await self.valkey_server.delete(*keys)
+
+    @asynccontextmanager
+    async def pipeline(self) -> AsyncIterator[ValkeyCachePipeline]:
+        """Open a non-transactional Valkey pipeline"""
+        async with self.valkey_server.pipeline(transaction=False) as pipe:
+            yield ValkeyCachePipeline(pipe)
+
     # Application-specific cache methods
     @handle_valkey_error(default_return=None)
     async def get_api_cache(self, cache_key: str) -> dict | list | None:
@@ -126,10 +290,7 @@ class ValkeyCache(metaclass=Singleton):
         api_cache = await self.valkey_server.get(api_cache_key)
         if not api_cache or not isinstance(api_cache, bytes):
             return None
-        envelope = self._decompress_json_value(api_cache)
-        if isinstance(envelope, dict) and "data_json" in envelope:
-            return json.loads(envelope["data_json"])
-        return envelope
+        return self._parse_api_cache_value(api_cache)
 
     @handle_valkey_error(default_return=None)
     async def update_api_cache(
@@ -141,27 +302,95 @@ class ValkeyCache(metaclass=Singleton):
         stored_at: int | None = None,
         staleness_threshold: int | None = None,
         stale_while_revalidate: int = 0,
-    ) -> None:
-        """Wrap value in a metadata envelope, compress, and store with TTL.
+        player_id: str | None = None,
+    ) -> str | None:
+        """Prefix the compressed value with its SWR metadata, and store with TTL.
+
+        The body is serialized once here (key order preserved by Python's
+        ``json.dumps``), so nginx/Lua only has to decompress and print it, or
+        pass it through as-is to clients accepting zstd. Large enough bodies
+        also get a gzip variant, stored under the same key with a suffix.
+
+        When ``player_id`` is given, both keys are added to the player cache
+        index in the same round-trip.
 
-        ``data_json`` is the pre-serialized JSON string (key order preserved by
-        Python's ``json.dumps``), so nginx/Lua can print it verbatim without
-        re-encoding through cjson (which does not guarantee key ordering).
+        The value is only replaced if it wasn't built from more recent data
+        (a later ``stored_at``), so that a process serving an older profile
+        never overwrites what another one just published.
+
+        Returns the entity tag of the body, for the headers of the response
+        served by FastAPI, or None if the value wasn't stored (a more recent
+        one was kept, or the write failed).
         """
-        envelope: dict = {
-            "data_json": json.dumps(value, separators=(",", ":")),
-            "stored_at": stored_at if stored_at is not None else int(time.time()),
-            "staleness_threshold": (
-                staleness_threshold if staleness_threshold is not None else expire
-            ),
-            "stale_while_revalidate": stale_while_revalidate,
-        }
-        bytes_value = self._compress_json_value(envelope)
-        await self.valkey_server.set(
-            f"{settings.api_cache_key_prefix}:{cache_key}",
-            bytes_value,
-            ex=expire,
+        api_cache_key = f"{settings.api_cache_key_prefix}:{cache_key}"
+        body = json.dumps(value, separators=(",", ":")).encode("utf-8")
+        etag = compute_etag(body)
+        if stored_at is None:
+            stored_at = int(time.time())
+        bytes_value = self._build_api_cache_value(
+            body,
+            stored_at,
+            staleness_threshold if staleness_threshold is not None else expire,
+            stale_while_revalidate,
+            etag,
+        )
+
+        # gzip variant of the body, served by nginx as-is to clients which
+        # accept gzip but not zstd (the main value body is already zstd)
+        gzip_key = f"{api_cache_key}{API_CACHE_GZIP_KEY_SUFFIX}"
+        gzip_body = (
+            gzip.compress(body, compresslevel=6)
+            if settings.api_cache_gzip_enabled
+            and len(body) >= settings.api_cache_gzip_min_length
+            else b""
+        )
+
+        keys = [api_cache_key, gzip_key]
+        if player_id is not None:
+            # Index lives as long as the longest-lived key it references
+            keys.append(f"{settings.player_cache_index_key_prefix}:{player_id}")
+
+        stored = await self.run_script(
+            _UPDATE_API_CACHE_SCRIPT, keys, [bytes_value, stored_at, expire, gzip_body]
         )
+        return etag if stored else None
+
+    @handle_valkey_error(default_return={})
+    async def evict_players_api_cache(self, player_ids: list[str]) -> dict[str, int]:
+        """Unlink all API Cache keys listed in the cache indexes of players,
+        with a pipeline reading the indexes then one unlinking the keys.
+
+        Keys are removed from the index rather than deleting it, so that keys
+        written meanwhile remain indexed.
+        """
+        index_keys = [
+            f"{settings.player_cache_index_key_prefix}:{player_id}"
+            for player_id in player_ids
+        ]
+        async with self.valkey_server.pipeline(transaction=False) as pipe:
+            for index_key in index_keys:
+                pipe.smembers(index_key)
+            indexed_keys = await pipe.execute()
+
+        evicted = dict.fromkeys(player_ids, 0)
+        to_evict = [
+            (player_id, index_key, keys)
+            for player_id, index_key, keys in zip(
+                player_ids, index_keys, indexed_keys, strict=True
+            )
+            if keys
+        ]
+        if not to_evict:
+            return evicted
+
+        async with self.valkey_server.pipeline(transaction=False) as pipe:
+            for _, index_key, keys in to_evict:
+                pipe.unlink(*keys)
+                pipe.srem(index_key, *keys)
+            results = await pipe.execute()
+        for (player_id, _, _), unlinked in zip(to_evict, results[::2], strict=True):
+            evicted[player_id] = unlinked
+        return evicted
 
     @handle_valkey_error(default_return=None)
     async def get_player_status(self, player_id: str) -> dict | None:
@@ -221,24 +450,32 @@ class ValkeyCache(metaclass=Singleton):
                 )
             await pipe.execute()
 
-    @handle_valkey_error(default_return=None)
     async def delete_player_status(self, player_id: str) -> None:
-        """Delete status and all associated cooldown keys for a player (by Blizzard ID)."""
-        status_key = f"{settings.unknown_player_status_key_prefix}:{player_id}"
+        """Delete status and all associated cooldown keys for a player (by
+        Blizzard ID), the battletag-based cooldown key being read from the
+        status in the same script call."""
+        await self.run_script(
+            _DELETE_PLAYER_STATUS_SCRIPT,
+            [
+                f"{settings.unknown_player_status_key_prefix}:{player_id}",
+                f"{settings.unknown_player_cooldown_key_prefix}:{player_id}",
+            ],
+            [settings.unknown_player_cooldown_key_prefix],
+        )
 
-        # Read battletag from status to also delete the battletag-based cooldown key
-        status_bytes = await self.valkey_server.get(status_key)
+    @staticmethod
+    def _player_status_keys(player_id: str, status_bytes: bytes | None) -> list[str]:
+        """Return the status key of a player and its associated cooldown keys,
+        using the battletag recorded in the status value if any."""
         battletag = json.loads(status_bytes).get("battletag") if status_bytes else None
 
-        keys_to_delete = [
-            status_key,
+        keys = [
+            f"{settings.unknown_player_status_key_prefix}:{player_id}",
             f"{settings.unknown_player_cooldown_key_prefix}:{player_id}",
         ]
         if battletag:
-            keys_to_delete.append(
-                f"{settings.unknown_player_cooldown_key_prefix}:{battletag}"
-            )
-        await self.valkey_server.delete(*keys_to_delete)
+            keys.append(f"{settings.unknown_player_cooldown_key_prefix}:{battletag}")
+        return keys
 
     @handle_valkey_error(default_return=None)
     async def get_gamemode_filter(self, gamemode: str) -> str | None:
@@ -253,6 +490,51 @@ class ValkeyCache(metaclass=Singleton):
         key = f"{settings.gamemode_filter_key_prefix}:{gamemode}"
         await self.valkey_server.set(key, filter_value.encode("utf-8"))
 
+    @handle_valkey_error(default_return=None)
+    async def decay_player_popularity(self, factor: float, max_players: int) -> None:
+        """Scale popularity scores in place with ZUNIONSTORE weights, then trim
+        the least popular players."""
+        key = settings.player_popularity_key
+        async with self.valkey_server.pipeline(transaction=False) as pipe:
+            pipe.zunionstore(key, {key: factor})
+            pipe.zremrangebyrank(key, 0, -max_players - 1)
+            await pipe.execute()
+
+    @handle_valkey_error(default_return=[])
+    async def get_popular_players(self, count: int) -> list[str]:
+        player_ids = await self.valkey_server.zrevrange(
+            settings.player_popularity_key, 0, count - 1
+        )
+        return [
+            player_id.decode("utf-8") if isinstance(player_id, bytes) else player_id
+            for player_id in player_ids
+        ]
+
+    @handle_valkey_error(default_return=True)
+    async def acquire_lock(self, key: str, token: str, ttl: int) -> bool:
+        """Take the lock with SET NX, its TTL bounding how long it can be held."""
+        return bool(await self.valkey_server.set(key, token, nx=True, ex=ttl))
+
+    @handle_valkey_error(default_return=None)
+    async def release_lock(self, key: str, token: str) -> None:
+        """Delete the lock if it's still ours, atomically."""
+        await self.run_script(_RELEASE_LOCK_SCRIPT, [key], [token])
+
+    @handle_valkey_error(default_return=None)
+    async def run_script(
+        self,
+        script: str,
+        keys: list[str],
+        args: list[str | bytes | int | float],
+    ) -> Any:
+        """Run a Lua script with EVALSHA, the script being loaded on first use
+        (or after a server restart) by the registered script object."""
+        registered_script = self._scripts.get(script)
+        if registered_script is None:
+            registered_script = self.valkey_server.register_script(script)
+            self._scripts[script] = registered_script
+        return await registered_script(keys=keys, args=args)
+
     @handle_valkey_error(default_return=[])
     async def scan_keys(self, pattern: str) -> list[str]:
         """Return all Valkey keys matching *pattern* using SCAN iteration."""
@@ -263,11 +545,16 @@ class ValkeyCache(metaclass=Singleton):
 
     @handle_valkey_error(default_return=None)
     async def evict_volatile_data(self) -> None:
-        """Delete all Valkey keys except unknown-player status and cooldown keys."""
+        """Delete all Valkey keys except unknown-player status and cooldown keys,
+        validators of Blizzard pages (which match pages in persistent storage)
+        and players popularity scores.
+        """
         _evict_batch_size = 1000
         prefixes_to_keep = (
             settings.unknown_player_cooldown_key_prefix,
             settings.unknown_player_status_key_prefix,
+            settings.blizzard_validators_key_prefix,
+            settings.player_popularity_key,
         )
         keys_to_delete = []
         async for key in self.valkey_server.scan_iter(
@@ -288,9 +575,10 @@ class ValkeyCache(metaclass=Singleton):
         """Delete unknown-player status entries (and their cooldown keys) whose
         check_count is strictly below the configured minimum retention count.
 
-        Uses batched MGET to minimise round-trips: keys are collected via SCAN
-        in batches of 1000, then fetched in a single MGET per batch before
-        deciding which ones to evict.
+        Uses batched MGET and DEL to minimise round-trips: keys are collected
+        via SCAN in batches of 1000, then fetched in a single MGET per batch
+        before deleting the evicted ones (and their cooldown keys, found from
+        the fetched battletags) in a single DEL.
         """
         min_count = settings.unknown_player_min_retention_count
         if min_count <= 0:
@@ -307,15 +595,18 @@ class ValkeyCache(metaclass=Singleton):
             if not keys:
                 return 0
             count = 0
-            values = await self.valkey_server.mget(*keys)
+            keys_to_delete: list[str] = []
+            values = await self.valkey_server.mget(keys)
             for key, value in zip(keys, values, strict=True):
                 if value is None:
                     continue
                 status = json.loads(value)
                 if status.get("check_count", 0) < min_count:
                     player_id = key.removeprefix(f"{status_prefix}:")
-                    await self.delete_player_status(player_id)
+                    keys_to_delete.extend(self._player_status_keys(player_id, value))
                     count += 1
+            if keys_to_delete:
+                await self.valkey_server.delete(*keys_to_delete)
             return count
 
         async for raw_key in self.valkey_server.scan_iter(
@@ -24,6 +24,22 @@ if TYPE_CHECKING:
 
 _SCHEMA_SQL = (Path(__file__).parent / "schema.sql").read_text()
 
+_UPSERT_PLAYER_PROFILE_SQL = """INSERT INTO player_profiles
+       (player_id, battletag, name, html_compressed, summary,
+        last_updated_blizzard, data_version,
+        parsed_compressed, parser_version, updated_at)
+   VALUES ($1, $2, $3, $4, $5::jsonb, $6, $7, $8, $9, NOW())
+   ON CONFLICT (player_id) DO UPDATE
+   SET battletag = COALESCE(EXCLUDED.battletag, player_profiles.battletag),
+       name = COALESCE(EXCLUDED.name, player_profiles.name),
+       html_compressed = EXCLUDED.html_compressed,
+       summary = EXCLUDED.summary,
+       last_updated_blizzard = EXCLUDED.last_updated_blizzard,
+       data_version = EXCLUDED.data_version,
+       parsed_compressed = EXCLUDED.parsed_compressed,
+       parser_version = EXCLUDED.parser_version,
+       updated_at = NOW()"""
+
 
 class PostgresStorage(metaclass=Singleton):
     """
@@ -31,7 +47,7 @@ class PostgresStorage(metaclass=Singleton):
 
     Provides persistent storage for:
     - Static data (heroes, maps, gamemodes, roles) as JSONB
-    - Player profiles with zstd-compressed HTML
+    - Player profiles with zstd-compressed HTML and pre-parsed profile document
 
     Uses Singleton pattern to ensure a single connection pool across the application.
     """
@@ -114,6 +130,14 @@ class PostgresStorage(metaclass=Singleton):
     def _decompress(data: bytes) -> str:
         return zstd.decompress(data).decode("utf-8")
 
+    @classmethod
+    def _compress_json(cls, data: dict) -> bytes:
+        return cls._compress(json.dumps(data, separators=(",", ":")))
+
+    @classmethod
+    def _decompress_json(cls, data: bytes | None) -> dict | None:
+        return json.loads(cls._decompress(data)) if data is not None else None
+
     # ------------------------------------------------------------------ #
     # Static data
     # ------------------------------------------------------------------ #
@@ -164,6 +188,15 @@ class PostgresStorage(metaclass=Singleton):
                 data_version,
             )
 
+    @track_storage_operation("static_data", "set")
+    async def touch_static_data(self, key: str) -> bool:
+        """Reset ``updated_at`` of static data, without rewriting its content."""
+        async with self._pool.acquire() as conn:  # type: ignore[union-attr]
+            result = await conn.execute(
+                "UPDATE static_data SET updated_at = NOW() WHERE key = $1", key
+            )
+        return int(result.split()[-1]) > 0
+
     # ------------------------------------------------------------------ #
     # Player profiles
     # ------------------------------------------------------------------ #
@@ -173,13 +206,15 @@ class PostgresStorage(metaclass=Singleton):
         """Get player profile by player_id.
 
         Returns dict with 'html', 'summary' (dict), 'battletag', 'name',
-        'last_updated_blizzard', 'updated_at' (Unix int), 'data_version'
-        or None if not found.
+        'last_updated_blizzard', 'updated_at' (Unix int), 'data_version',
+        'parsed_profile' (dict or None), 'parsed_profile_size' (length of its
+        JSON, or None), 'parser_version' or None if not found.
         """
         async with self._pool.acquire() as conn:  # type: ignore[union-attr]
             row = await conn.fetchrow(
                 """SELECT battletag, name, html_compressed, summary,
-                          last_updated_blizzard, updated_at, data_version
+                          last_updated_blizzard, updated_at, data_version,
+                          parsed_compressed, parser_version
                    FROM player_profiles WHERE player_id = $1""",
                 player_id,
             )
@@ -190,6 +225,12 @@ class PostgresStorage(metaclass=Singleton):
         if not summary:
             summary = {"url": player_id, "lastUpdated": row["last_updated_blizzard"]}
 
+        parsed_json = (
+            self._decompress(row["parsed_compressed"])
+            if row["parsed_compressed"] is not None
+            else None
+        )
+
         return {
             "html": self._decompress(row["html_compressed"]),
             "battletag": row["battletag"],
@@ -198,6 +239,9 @@ class PostgresStorage(metaclass=Singleton):
             "last_updated_blizzard": row["last_updated_blizzard"],
             "updated_at": int(row["updated_at"].timestamp()),
             "data_version": row["data_version"],
+            "parsed_profile": json.loads(parsed_json) if parsed_json else None,
+            "parsed_profile_size": len(parsed_json) if parsed_json else None,
+            "parser_version": row["parser_version"],
         }
 
     @track_storage_operation("player_profiles", "get")
@@ -210,6 +254,60 @@ class PostgresStorage(metaclass=Singleton):
             )
         return row["player_id"] if row else None
 
+    @track_storage_operation("player_profiles", "get_many")
+    async def get_player_profiles_updated_at(
+        self, player_ids: list[str]
+    ) -> dict[str, int]:
+        """Get ``updated_at`` of several player profiles in a single query,
+        matched either by player_id or by battletag."""
+        if not player_ids:
+            return {}
+
+        async with self._pool.acquire() as conn:  # type: ignore[union-attr]
+            rows = await conn.fetch(
+                """SELECT player_id, battletag, updated_at FROM player_profiles
+                   WHERE player_id = ANY($1::text[]) OR battletag = ANY($1::text[])""",
+                player_ids,
+            )
+
+        requested = set(player_ids)
+        updated_at = {}
+        for row in rows:
+            timestamp = int(row["updated_at"].timestamp())
+            for key in (row["player_id"], row["battletag"]):
+                if key in requested:
+                    updated_at[key] = timestamp
+        return updated_at
+
+    @classmethod
+    def _player_profile_row(
+        cls,
+        player_id: str,
+        html: str,
+        summary: dict | None = None,
+        battletag: str | None = None,
+        name: str | None = None,
+        last_updated_blizzard: int | None = None,
+        data_version: int = 1,
+        parsed_profile: dict | None = None,
+        parser_version: int | None = None,
+    ) -> tuple:
+        """Build the arguments of the player profile upsert query"""
+        if summary and last_updated_blizzard is None:
+            last_updated_blizzard = summary.get("lastUpdated")
+
+        return (
+            player_id,
+            battletag,
+            name,
+            cls._compress(html),
+            summary,
+            last_updated_blizzard,
+            data_version,
+            cls._compress_json(parsed_profile) if parsed_profile is not None else None,
+            parser_version if parsed_profile is not None else None,
+        )
+
     @track_storage_operation("player_profiles", "set")
     async def set_player_profile(
         self,
@@ -220,35 +318,62 @@ class PostgresStorage(metaclass=Singleton):
         name: str | None = None,
         last_updated_blizzard: int | None = None,
         data_version: int = 1,
+        parsed_profile: dict | None = None,
+        parser_version: int | None = None,
     ) -> None:
-        """Upsert player profile. HTML is zstd-compressed before storage."""
-        if summary and last_updated_blizzard is None:
-            last_updated_blizzard = summary.get("lastUpdated")
+        """Upsert player profile. HTML and parsed profile are zstd-compressed
+        before storage. A stale parsed profile is cleared when none is given."""
+        row = self._player_profile_row(
+            player_id,
+            html,
+            summary,
+            battletag,
+            name,
+            last_updated_blizzard,
+            data_version,
+            parsed_profile,
+            parser_version,
+        )
+        async with self._pool.acquire() as conn:  # type: ignore[union-attr]
+            await conn.execute(_UPSERT_PLAYER_PROFILE_SQL, *row)
 
-        compressed = self._compress(html)
+    @track_storage_operation("player_profiles", "set_many")
+    async def set_player_profiles(self, profiles: list[dict]) -> None:
+        """Upsert several player profiles with a single ``executemany``"""
+        if not profiles:
+            return
 
+        rows = [self._player_profile_row(**profile) for profile in profiles]
+        async with self._pool.acquire() as conn:  # type: ignore[union-attr]
+            await conn.executemany(_UPSERT_PLAYER_PROFILE_SQL, rows)
+
+    @track_storage_operation("player_profiles", "set")
+    async def set_player_profile_parsed(
+        self,
+        player_id: str,
+        parsed_profile: dict,
+        parser_version: int,
+    ) -> None:
+        """Replace the parsed profile document only, leaving ``updated_at`` untouched."""
         async with self._pool.acquire() as conn:  # type: ignore[union-attr]
             await conn.execute(
-                """INSERT INTO player_profiles
-                       (player_id, battletag, name, html_compressed, summary,
-                        last_updated_blizzard, data_version, updated_at)
-                   VALUES ($1, $2, $3, $4, $5::jsonb, $6, $7, NOW())
-                   ON CONFLICT (player_id) DO UPDATE
-                   SET battletag = COALESCE(EXCLUDED.battletag, player_profiles.battletag),
-                       name = COALESCE(EXCLUDED.name, player_profiles.name),
-                       html_compressed = EXCLUDED.html_compressed,
-                       summary = EXCLUDED.summary,
-                       last_updated_blizzard = EXCLUDED.last_updated_blizzard,
-                       data_version = EXCLUDED.data_version,
-                       updated_at = NOW()""",
+                """UPDATE player_profiles
+                   SET parsed_compressed = $2, parser_version = $3
+                   WHERE player_id = $1""",
+                player_id,
+                self._compress_json(parsed_profile),
+                parser_version,
+            )
+
+    @track_storage_operation("player_profiles", "set")
+    async def touch_player_profile(self, player_id: str) -> bool:
+        """Reset ``updated_at`` of a player profile, without rewriting its content."""
+        async with self._pool.acquire() as conn:  # type: ignore[union-attr]
+            result = await conn.execute(
+                "UPDATE player_profiles SET updated_at = NOW() WHERE player_id = $1",
                 player_id,
-                battletag,
-                name,
-                compressed,
-                summary,
-                last_updated_blizzard,
-                data_version,
             )
+        return int(result.split()[-1]) > 0
 
     # ------------------------------------------------------------------ #
     # Maintenance
@@ -28,6 +28,11 @@ CREATE TABLE IF NOT EXISTS player_profiles (
     updated_at              TIMESTAMPTZ NOT NULL DEFAULT NOW()
 );
 
+-- Pre-parsed profile document (zstd-compressed JSON), tagged with the parser
+-- version that produced it. Added after the initial schema, hence ALTER TABLE.
+ALTER TABLE player_profiles ADD COLUMN IF NOT EXISTS parsed_compressed BYTEA;
+ALTER TABLE player_profiles ADD COLUMN IF NOT EXISTS parser_version SMALLINT;
+
 CREATE INDEX IF NOT EXISTS idx_player_profiles_updated_at
     ON player_profiles (updated_at);
 
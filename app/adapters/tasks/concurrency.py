@@ -0,0 +1,127 @@
+"""Concurrency autotuning of the taskiq worker.
+
+Nearly all the time of a refresh job is spent waiting for a Blizzard request
+slot, so the right number of jobs processed at once depends on the current
+throttle delay : Blizzard allows a request every ``delay`` seconds across all
+worker replicas, and a job holds its slot for its service time (Blizzard
+response, parsing, storage). By Little's law, keeping every request slot busy
+takes ``service time / delay`` jobs in flight, shared among the replicas.
+
+Jobs beyond that only wait on the throttle, while another replica could have
+processed them, so the limit of each worker is periodically sized from the
+live throttle delay, the queue depth and the number of alive workers.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import math
+import statistics
+from typing import TYPE_CHECKING
+
+from app.adapters.blizzard.throttle import BlizzardThrottle
+from app.config import settings
+from app.infrastructure.logger import logger
+from app.monitoring.metrics import worker_concurrency_limit
+
+if TYPE_CHECKING:
+    from app.adapters.tasks.valkey_broker import ValkeyListBroker
+
+_TUNING_INTERVAL = 5.0  # seconds between two adjustments of the limit
+
+# Low percentile of recent job durations used as the job service time : the
+# fastest jobs are the ones which didn't wait for a throttle slot
+_SERVICE_TIME_PERCENTILE = 10
+_MIN_SAMPLES = 5
+
+# Job service time assumed until enough jobs have been processed
+_DEFAULT_SERVICE_TIME = 2.0
+
+
+def estimate_service_time(job_durations: list[float]) -> float:
+    """Estimate the service time of a job, without throttle wait, from the
+    durations of recently processed jobs."""
+    if len(job_durations) < _MIN_SAMPLES:
+        return _DEFAULT_SERVICE_TIME
+    return statistics.quantiles(job_durations, n=100, method="inclusive")[
+        _SERVICE_TIME_PERCENTILE - 1
+    ]
+
+
+def compute_concurrency_limit(
+    *,
+    delay: float,
+    service_time: float,
+    queue_size: int,
+    in_flight: int,
+    workers: int,
+) -> int:
+    """Number of jobs this worker should process at once.
+
+    Enough jobs to use every request slot the throttle allows, shared among
+    the alive workers, plus one ready for the next slot. Never more than the
+    jobs this worker could actually get from the queue, and always within
+    ``worker_min_concurrent_jobs`` and ``worker_max_concurrent_jobs``.
+    """
+    workers = max(workers, 1)
+    limit = math.ceil(service_time / max(delay, 0.001) / workers) + 1
+    limit = min(limit, in_flight + math.ceil(queue_size / workers))
+    return max(
+        settings.worker_min_concurrent_jobs,
+        min(limit, settings.worker_max_concurrent_jobs),
+    )
+
+
+class ConcurrencyController:
+    """Periodically adjusts the maximum number of jobs processed at once by
+    the worker, from the shared throttle state and queue depth in Valkey."""
+
+    def __init__(self, broker: ValkeyListBroker) -> None:
+        self._broker = broker
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+
+    def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def adjust(self) -> int:
+        """Size the limit of the worker from the current state, and return it.
+        During a throttle penalty, the minimum is used, and without throttle
+        the maximum."""
+        throttle = BlizzardThrottle()
+        if not settings.throttle_enabled:
+            limit = settings.worker_max_concurrent_jobs
+        elif await throttle.is_rate_limited():
+            limit = settings.worker_min_concurrent_jobs
+        else:
+            queue_size, workers = await self._broker.get_queue_stats()
+            limit = compute_concurrency_limit(
+                delay=await throttle.get_current_delay(),
+                service_time=estimate_service_time(self._broker.job_durations),
+                queue_size=queue_size,
+                in_flight=self._broker.in_flight,
+                workers=workers,
+            )
+
+        if limit != self._broker.max_in_flight:
+            logger.info(
+                "[Worker] Concurrency limit : {} -> {}",
+                self._broker.max_in_flight,
+                limit,
+            )
+            await self._broker.set_max_in_flight(limit)
+        if settings.prometheus_enabled:
+            worker_concurrency_limit.set(limit)
+        return limit
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.adjust()
+            except Exception:  # noqa: BLE001
+                logger.warning("[Worker] Failed to adjust concurrency limit")
+            await asyncio.sleep(_TUNING_INTERVAL)
@@ -1,42 +1,134 @@
 """Custom Valkey List broker for taskiq.
 
-Uses LPUSH for enqueuing (``kick``) and BRPOP for consuming (``listen``).
+Uses LPUSH for enqueuing (``kick``) and BLMOVE for consuming (``listen``).
 A :class:`~valkey.asyncio.BlockingConnectionPool` is shared across all
 operations to avoid connection exhaustion.
+
+Delivery is at-least-once : consumed messages are moved to a processing list
+of the worker, and only removed from it once acknowledged. Workers send
+heartbeats, and the in-flight messages of a worker whose heartbeat expired
+(crashed, OOM-killed...) are queued again by the other workers.
+
+Messages labelled with a future ``run_at`` Unix timestamp are delayed : they
+are kept in a sorted set scored by due time, and promoted to the queue list
+once due by worker processes.
+
+Messages labelled with a ``dedup_key`` are only queued if this key doesn't
+exist yet, the key being set at the same time, in a single atomic round-trip.
+
+The number of messages processed at once by a worker is capped, and can be
+adjusted while running (see :mod:`app.adapters.tasks.concurrency`).
 """
 
 from __future__ import annotations
 
 import asyncio
+import os
+import socket
+import time
+from collections import deque
+from functools import partial
 from typing import TYPE_CHECKING, Any
+from uuid import uuid4
 
 import valkey.asyncio as aiovalkey
+from taskiq import AckableMessage
 from taskiq.abc.broker import AsyncBroker
 
+from app.config import settings
 from app.infrastructure.logger import logger
+from app.monitoring.metrics import background_tasks_deduplicated_total
 
 if TYPE_CHECKING:
     from collections.abc import AsyncGenerator
 
     from taskiq.message import BrokerMessage
+    from valkey.commands.core import AsyncScript
 
 _QUEUE_DEFAULT = "taskiq:queue"
-_BRPOP_TIMEOUT = 2  # seconds; controls shutdown responsiveness
+_BLMOVE_TIMEOUT = 2  # seconds; controls shutdown responsiveness
 _RECONNECT_INITIAL_DELAY = 1.0  # seconds before first retry
 _RECONNECT_MAX_DELAY = 30.0  # cap for exponential back-off
 
+# Label of messages holding the Unix timestamp they're due at
+RUN_AT_LABEL = "run_at"
+# Labels of messages holding the key claimed to deduplicate them, and its TTL
+DEDUP_KEY_LABEL = "dedup_key"
+DEDUP_TTL_LABEL = "dedup_ttl"
+_DELAYED_SUFFIX = ":delayed"
+_PROMOTE_INTERVAL = 1.0  # seconds between two checks of due delayed messages
+_PROMOTE_BATCH_SIZE = 100  # maximum messages promoted at once
+
+# Atomically move due messages (oldest first) from the delayed sorted set to
+# the queue list, so that several workers never promote the same message
+_PROMOTE_DUE_SCRIPT = """
+local due = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', ARGV[1], 'LIMIT', 0, ARGV[2])
+if #due > 0 then
+    redis.call('ZREM', KEYS[1], unpack(due))
+    redis.call('LPUSH', KEYS[2], unpack(due))
+end
+return #due
+"""
+
+# Atomically claim the dedup key of a message and queue it (or delay it when
+# a due time is given), unless the key already exists
+# KEYS: dedup key, queue list, delayed sorted set
+# ARGV: message, dedup key TTL, due time ("" to queue right away)
+# Returns 1 if the message was queued, 0 if it's a duplicate
+_KICK_IF_ABSENT_SCRIPT = """
+if not redis.call('SET', KEYS[1], 'pending', 'NX', 'EX', ARGV[2]) then
+    return 0
+end
+if ARGV[3] ~= '' then
+    redis.call('ZADD', KEYS[3], ARGV[3], ARGV[1])
+else
+    redis.call('LPUSH', KEYS[2], ARGV[1])
+end
+return 1
+"""
+
+_PROCESSING_SUFFIX = ":processing:"
+_HEARTBEAT_SUFFIX = ":heartbeat:"
+_WORKERS_SUFFIX = ":workers"
+_JOB_DURATIONS_WINDOW = 100  # recent job durations kept for concurrency tuning
+
+# Atomically queue again the in-flight messages of a worker, unless it's still
+# alive, oldest first, so that several reapers never queue them twice
+_REQUEUE_PROCESSING_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 1 then
+    return -1
+end
+local count = 0
+while redis.call('LMOVE', KEYS[2], KEYS[3], 'LEFT', 'RIGHT') do
+    count = count + 1
+end
+redis.call('SREM', KEYS[4], ARGV[1])
+return count
+"""
+
 
 class ValkeyListBroker(AsyncBroker):
-    """Taskiq broker backed by a Valkey List (LPUSH / BRPOP).
+    """Taskiq broker backed by a Valkey List (LPUSH / BLMOVE).
 
     The broker is intentionally simple:
 
     * ``kick`` pushes the serialised task bytes to the **left** of the list.
-    * ``listen`` pops from the **right**, maintaining FIFO order.
+    * ``listen`` moves them from the **right**, maintaining FIFO order, to
+      the processing list of the worker, from which they're removed once
+      acknowledged.
+    * Every worker refreshes a heartbeat key expiring after
+      ``visibility_timeout`` seconds, and queues again the in-flight messages
+      of workers whose heartbeat expired.
+    * At most ``max_in_flight`` messages are processed at once : ``listen``
+      only takes a new message once a slot is freed by an acknowledgement.
     * A :class:`~valkey.asyncio.BlockingConnectionPool` is created once on
       ``startup`` and disconnected on ``shutdown``.
+    * ``kick`` adds messages with a future ``run_at`` label to a sorted set
+      instead, from which worker processes promote them once due.
+    * ``kick`` drops messages whose ``dedup_key`` label is an existing key,
+      and sets it otherwise, atomically with queuing them.
 
-    Deduplication is the responsibility of the caller (e.g.
+    Deduplication keys are chosen by the caller (e.g.
     :class:`~app.adapters.tasks.valkey_task_queue.ValkeyTaskQueue`).
     """
 
@@ -45,14 +137,79 @@ class ValkeyListBroker(AsyncBroker):
         url: str,
         queue_name: str = _QUEUE_DEFAULT,
         max_pool_size: int = 10,
+        visibility_timeout: int = 60,
+        max_in_flight: int = 10,
         **connection_kwargs: Any,
     ) -> None:
         super().__init__()
         self._url = url
         self.queue_name = queue_name
         self._max_pool_size = max_pool_size
+        self._visibility_timeout = visibility_timeout
         self._connection_kwargs = connection_kwargs
+        self.delayed_queue_name = f"{queue_name}{_DELAYED_SUFFIX}"
+        self.workers_set_name = f"{queue_name}{_WORKERS_SUFFIX}"
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid4().hex[:8]}"
         self._pool: aiovalkey.BlockingConnectionPool | None = None
+        self._promote_task: asyncio.Task | None = None
+        self._heartbeat_task: asyncio.Task | None = None
+        self._max_in_flight = max_in_flight
+        self._in_flight = 0
+        self._slots = asyncio.Condition()
+        self._job_durations: deque[float] = deque(maxlen=_JOB_DURATIONS_WINDOW)
+        # Registered Lua scripts, by source
+        self._scripts: dict[str, AsyncScript] = {}
+
+    @property
+    def in_flight(self) -> int:
+        """Number of messages currently processed by this worker."""
+        return self._in_flight
+
+    @property
+    def max_in_flight(self) -> int:
+        """Maximum number of messages processed at once by this worker."""
+        return self._max_in_flight
+
+    @property
+    def job_durations(self) -> list[float]:
+        """Durations (seconds) of the last messages processed by this worker."""
+        return list(self._job_durations)
+
+    async def set_max_in_flight(self, max_in_flight: int) -> None:
+        """Change the maximum number of messages processed at once (at least
+        one). Messages already in flight above a lowered limit are not
+        interrupted."""
+        async with self._slots:
+            self._max_in_flight = max(1, max_in_flight)
+            self._slots.notify_all()
+
+    async def get_queue_stats(self) -> tuple[int, int]:
+        """Return the number of queued messages, and of alive workers."""
+        async with self._get_client() as conn:
+            queue_size = await conn.llen(self.queue_name)  # ty: ignore[invalid-await]
+            workers = await conn.scard(self.workers_set_name)  # ty: ignore[invalid-await]
+        return queue_size, workers
+
+    def _processing_list_name(self, worker_id: str) -> str:
+        return f"{self.queue_name}{_PROCESSING_SUFFIX}{worker_id}"
+
+    def _heartbeat_key(self, worker_id: str) -> str:
+        return f"{self.queue_name}{_HEARTBEAT_SUFFIX}{worker_id}"
+
+    async def _run_script(
+        self,
+        conn: aiovalkey.Valkey,
+        script: str,
+        keys: list[str],
+        args: list[Any],
+    ) -> Any:
+        """Run a Lua script with EVALSHA, the script being loaded on first use
+        (or after a server restart) by the registered script object."""
+        registered_script = self._scripts.get(script)
+        if registered_script is None:
+            registered_script = conn.register_script(script)
+            self._scripts[script] = registered_script
+        return await registered_script(keys=keys, args=args, client=conn)
 
     def _get_client(self) -> aiovalkey.Valkey:
         """Return a client backed by the shared pool."""
@@ -77,25 +234,193 @@ class ValkeyListBroker(AsyncBroker):
             self.queue_name,
             queue_size,
         )
+        if self.is_worker_process:
+            await self._send_heartbeat()
+            self._promote_task = asyncio.create_task(self._promote_due_messages())
+            self._heartbeat_task = asyncio.create_task(self._reap_dead_workers())
 
     async def shutdown(self) -> None:
         """Disconnect the pool and run taskiq shutdown hooks."""
         await super().shutdown()
+        for task in (self._promote_task, self._heartbeat_task):
+            if task is not None:
+                task.cancel()
+        self._promote_task = self._heartbeat_task = None
         if self._pool is not None:
+            if self.is_worker_process:
+                await self._release_processing_list()
             await self._pool.disconnect()
             self._pool = None
         logger.info("ValkeyListBroker stopped.")
 
     async def kick(self, message: BrokerMessage) -> None:
-        """Push a serialised task message to the left of the queue list."""
+        """Push a serialised task message to the left of the queue list, or
+        to the delayed sorted set if its ``run_at`` label is in the future.
+
+        With a ``dedup_key`` label, the message is dropped if this key exists,
+        the check, the key claim and the push being a single script call.
+        """
+        run_at = message.labels.get(RUN_AT_LABEL)
+        if run_at is not None and float(run_at) <= time.time():
+            run_at = None
+        dedup_key = message.labels.get(DEDUP_KEY_LABEL)
+
         async with self._get_client() as conn:
-            await conn.lpush(self.queue_name, message.message)  # ty: ignore[invalid-await]
+            if dedup_key is not None:
+                await self._kick_if_absent(conn, message, str(dedup_key), run_at)
+            elif run_at is not None:
+                await conn.zadd(
+                    self.delayed_queue_name, {message.message: float(run_at)}
+                )  # ty: ignore[invalid-await]
+            else:
+                await conn.lpush(self.queue_name, message.message)  # ty: ignore[invalid-await]
+
+    async def _kick_if_absent(
+        self,
+        conn: aiovalkey.Valkey,
+        message: BrokerMessage,
+        dedup_key: str,
+        run_at: Any,
+    ) -> None:
+        queued = await self._run_script(
+            conn,
+            _KICK_IF_ABSENT_SCRIPT,
+            [dedup_key, self.queue_name, self.delayed_queue_name],
+            [
+                message.message,
+                int(float(message.labels[DEDUP_TTL_LABEL])),
+                float(run_at) if run_at is not None else "",
+            ],
+        )
+        if not queued:
+            logger.debug("[ValkeyListBroker] Already queued: {}", dedup_key)
+            if settings.prometheus_enabled:
+                background_tasks_deduplicated_total.labels(
+                    task_name=message.task_name
+                ).inc()
+
+    async def _promote_due_messages(self) -> None:
+        """Move due delayed messages to the queue list, for the worker lifetime.
+
+        Checks every ``_PROMOTE_INTERVAL`` seconds, or right away while full
+        batches are promoted. Errors are logged, and checks go on.
+        """
+        while True:
+            promoted = 0
+            try:
+                async with self._get_client() as conn:
+                    promoted = await self._run_script(
+                        conn,
+                        _PROMOTE_DUE_SCRIPT,
+                        [self.delayed_queue_name, self.queue_name],
+                        [time.time(), _PROMOTE_BATCH_SIZE],
+                    )
+                if promoted:
+                    logger.debug(
+                        "[ValkeyListBroker] Promoted {} delayed message(s)", promoted
+                    )
+            except Exception:  # noqa: BLE001
+                logger.warning("[ValkeyListBroker] Failed to promote delayed messages")
+
+            if promoted < _PROMOTE_BATCH_SIZE:
+                await asyncio.sleep(_PROMOTE_INTERVAL)
+
+    async def _send_heartbeat(self) -> None:
+        """Register the worker, and mark it alive for ``visibility_timeout``."""
+        async with self._get_client() as conn:
+            await conn.set(  # ty: ignore[invalid-await]
+                self._heartbeat_key(self.worker_id),
+                1,
+                ex=self._visibility_timeout,
+            )
+            await conn.sadd(self.workers_set_name, self.worker_id)  # ty: ignore[invalid-await]
+
+    async def _requeue_processing_list(
+        self, conn: aiovalkey.Valkey, worker_id: str
+    ) -> int:
+        """Queue again the in-flight messages of a worker, if it's not alive.
+        Returns the number of messages queued again, or -1 if it's alive."""
+        return await self._run_script(
+            conn,
+            _REQUEUE_PROCESSING_SCRIPT,
+            [
+                self._heartbeat_key(worker_id),
+                self._processing_list_name(worker_id),
+                self.queue_name,
+                self.workers_set_name,
+            ],
+            [worker_id],
+        )
+
+    async def _reap_dead_workers(self) -> None:
+        """Send heartbeats, and queue again the in-flight messages of workers
+        whose heartbeat expired, for the worker lifetime.
+
+        Runs three times per ``visibility_timeout``. Errors are logged, and
+        heartbeats go on.
+        """
+        while True:
+            await asyncio.sleep(self._visibility_timeout / 3)
+            try:
+                await self._send_heartbeat()
+                async with self._get_client() as conn:
+                    worker_ids = await conn.smembers(self.workers_set_name)  # ty: ignore[invalid-await]
+                    for raw_worker_id in worker_ids:
+                        worker_id = (
+                            raw_worker_id.decode("utf-8")
+                            if isinstance(raw_worker_id, bytes)
+                            else raw_worker_id
+                        )
+                        if worker_id == self.worker_id:
+                            continue
+                        requeued = await self._requeue_processing_list(conn, worker_id)
+                        if requeued > 0:
+                            logger.warning(
+                                "[ValkeyListBroker] Queued again {} message(s) of dead "
+                                "worker {}",
+                                requeued,
+                                worker_id,
+                            )
+            except Exception:  # noqa: BLE001
+                logger.warning("[ValkeyListBroker] Failed to check workers heartbeats")
+
+    async def _release_processing_list(self) -> None:
+        """Queue again the messages this worker received without processing
+        them, and unregister it."""
+        try:
+            async with self._get_client() as conn:
+                await conn.delete(self._heartbeat_key(self.worker_id))  # ty: ignore[invalid-await]
+                requeued = await self._requeue_processing_list(conn, self.worker_id)
+            if requeued > 0:
+                logger.info(
+                    "[ValkeyListBroker] Queued again {} unprocessed message(s)",
+                    requeued,
+                )
+        except Exception:  # noqa: BLE001
+            logger.warning("[ValkeyListBroker] Failed to release in-flight messages")
+
+    async def _ack(self, data: bytes, received_at: float) -> None:
+        """Remove a processed message from the processing list of the worker,
+        and free its slot."""
+        try:
+            async with self._get_client() as conn:
+                await conn.lrem(self._processing_list_name(self.worker_id), 1, data)  # ty: ignore[invalid-await]
+        finally:
+            self._job_durations.append(time.monotonic() - received_at)
+            async with self._slots:
+                self._in_flight -= 1
+                self._slots.notify_all()
+
+    async def _wait_for_slot(self) -> None:
+        async with self._slots:
+            await self._slots.wait_for(lambda: self._in_flight < self._max_in_flight)
 
-    async def listen(self) -> AsyncGenerator[bytes]:
-        """Block-pop messages from the right of the queue and yield raw bytes.
+    async def listen(self) -> AsyncGenerator[AckableMessage]:
+        """Block-move messages from the right of the queue to the processing
+        list of the worker, and yield them to be acknowledged once processed.
 
         Keeps a single long-lived connection open for the worker lifetime.
-        The short ``BRPOP`` timeout ensures shutdown is responsive.
+        The short ``BLMOVE`` timeout ensures shutdown is responsive.
 
         On a transient Valkey disconnection the generator reconnects with
         exponential back-off (capped at ``_RECONNECT_MAX_DELAY`` seconds)
@@ -107,12 +432,20 @@ class ValkeyListBroker(AsyncBroker):
                 async with self._get_client() as conn:
                     delay = _RECONNECT_INITIAL_DELAY  # reset on successful connect
                     while True:
-                        result = await conn.brpop(
-                            [self.queue_name], timeout=_BRPOP_TIMEOUT
+                        await self._wait_for_slot()
+                        data = await conn.blmove(
+                            self.queue_name,
+                            self._processing_list_name(self.worker_id),
+                            _BLMOVE_TIMEOUT,
+                            "RIGHT",
+                            "LEFT",
                         )  # ty: ignore[invalid-await]
-                        if result is not None:
-                            _, data = result
-                            yield data
+                        if data is not None:
+                            self._in_flight += 1
+                            yield AckableMessage(
+                                data=data,
+                                ack=partial(self._ack, data, time.monotonic()),
+                            )
             except Exception:  # noqa: BLE001
                 logger.warning(
                     "[ValkeyListBroker] Valkey connection lost — reconnecting in {:.1f}s",
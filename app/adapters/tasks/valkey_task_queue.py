@@ -1,19 +1,100 @@
 """Valkey-backed task queue — enqueues background jobs via taskiq.
 
-Deduplication is handled here with ``SET NX`` before dispatching to the
-:class:`~app.adapters.tasks.valkey_broker.ValkeyListBroker`.  The taskiq
-worker executes the tasks using FastAPI's DI container.
+Jobs are dispatched to the
+:class:`~app.adapters.tasks.valkey_broker.ValkeyListBroker` with a
+deduplication key label : the broker claims the key with ``SET NX`` and
+queues the job in a single atomic round-trip, skipping it if the key already
+exists.  The taskiq worker executes the tasks using FastAPI's DI container.
+
+When batched player refresh is enabled, player refresh jobs are pushed to a
+dedicated Valkey list instead, the claim, the push and the decision to kick a
+batch task being a single script call. Batch tasks move the jobs they drain to
+a processing list of their own, only cleared once the batch is done : a batch
+task interrupted by a worker crash is queued again by the broker, and resumes
+its batch.
+
+Jobs enqueued with a future ``run_at`` are delayed by the broker until due.
+
+The admission rate of refreshes is computed from the queue depth and the
+Blizzard throttle penalty, and shared by the instances of the process for a
+short interval, so that stale hits don't all read it from Valkey.
 """
 
 from __future__ import annotations
 
-from typing import Any
+import math
+import time
+from typing import Any, ClassVar
 
+from app.adapters.blizzard.throttle import BlizzardThrottle
 from app.adapters.tasks.task_registry import TASK_MAP
+from app.adapters.tasks.valkey_broker import (
+    _QUEUE_DEFAULT,
+    DEDUP_KEY_LABEL,
+    DEDUP_TTL_LABEL,
+    RUN_AT_LABEL,
+)
 from app.config import settings
 from app.infrastructure.logger import logger
+from app.monitoring.metrics import background_tasks_deduplicated_total
 
 JOB_KEY_PREFIX = "worker:job:"
+BATCH_QUEUE_KEY_PREFIX = "worker:batch:"
+_BATCH_PROCESSING_SUFFIX = ":processing:"
+_BATCH_DRAINERS_SUFFIX = ":drainers"
+
+# Tasks which can be processed by batches, with the task draining their batches
+BATCHED_TASKS: dict[str, str] = {"refresh_player_profile": "refresh_player_profiles"}
+
+# Seconds during which a computed admission rate is reused by the process
+_ADMISSION_RATE_TTL = 1.0
+
+# Atomically claim the dedup key of a job and push it to the batch queue,
+# unless the key already exists. A batch task must be kicked when the queue
+# holds more than a batch per batch task kicked and not done yet, which are
+# counted until they find the queue empty (or the count expires, should a
+# batch task never be kicked).
+# KEYS: dedup key, batch queue list, batch tasks count
+# ARGV: job ID, dedup key TTL, batch size, batch tasks count TTL
+# Returns -1 if the job is a duplicate, 1 if a batch task must be kicked, 0 otherwise
+_ENQUEUE_BATCHED_SCRIPT = """
+if not redis.call('SET', KEYS[1], 'pending', 'NX', 'EX', ARGV[2]) then
+    return -1
+end
+local queue_size = redis.call('LPUSH', KEYS[2], ARGV[1])
+local drainers = tonumber(redis.call('GET', KEYS[3]) or '0')
+if queue_size <= drainers * tonumber(ARGV[3]) then
+    return 0
+end
+redis.call('INCR', KEYS[3])
+redis.call('EXPIRE', KEYS[3], ARGV[4])
+return 1
+"""
+
+# Atomically return the jobs left in the processing list of a batch task by an
+# interrupted run, or move up to a batch of jobs (oldest first) to it. When
+# there is none left, the batch task is not counted anymore.
+# KEYS: batch queue list, processing list, batch tasks count
+# ARGV: batch size, batch tasks count TTL
+# Returns the job IDs of the batch, oldest first
+_DEQUEUE_BATCH_SCRIPT = """
+local job_ids = redis.call('LRANGE', KEYS[2], 0, -1)
+if #job_ids == 0 then
+    for _ = 1, tonumber(ARGV[1]) do
+        local job_id = redis.call('LMOVE', KEYS[1], KEYS[2], 'RIGHT', 'RIGHT')
+        if not job_id then
+            break
+        end
+        job_ids[#job_ids + 1] = job_id
+    end
+end
+if #job_ids > 0 then
+    redis.call('EXPIRE', KEYS[3], ARGV[2])
+elseif tonumber(redis.call('GET', KEYS[3]) or '0') > 0 then
+    redis.call('DECR', KEYS[3])
+end
+return job_ids
+"""
 
 
 class ValkeyTaskQueue:
@@ -23,6 +104,9 @@ class ValkeyTaskQueue:
     exists the job is silently skipped.
     """
 
+    # Last computed admission rate, and its monotonic computation time
+    _admission_rate: ClassVar[tuple[float, float] | None] = None
+
     def __init__(self, valkey_server: Any) -> None:
         self._valkey = valkey_server
 
@@ -31,12 +115,18 @@ class ValkeyTaskQueue:
         task_name: str,
         *,
         job_id: str | None = None,
+        run_at: float | None = None,
     ) -> str:
         """Dispatch a job to the taskiq worker, skipping duplicates.
 
-        Uses ``SET NX`` to atomically claim the dedup slot before calling
-        ``task_fn.kiq()``.  If the slot is already taken the call is a no-op.
+        The dedup slot is given to the broker as a message label, which claims
+        it with ``SET NX`` and queues the job atomically, in a single Valkey
+        round-trip.  If the slot is already taken the job is dropped.
         The ``job_id`` is passed to the task as its first positional argument.
+
+        A future ``run_at`` is given to the broker as a message label too, and
+        the dedup slot is kept until the job is due on top of the job timeout.
+        Delayed jobs are never batched.
         """
         effective_id = job_id or task_name
 
@@ -45,32 +135,139 @@ class ValkeyTaskQueue:
             logger.warning("[ValkeyTaskQueue] Unknown task: {!r}", task_name)
             return effective_id
 
+        delay = max(0.0, run_at - time.time()) if run_at is not None else 0.0
+        dedup_ttl = settings.worker_job_timeout + math.ceil(delay)
+
         try:
-            claimed = await self._valkey.set(
-                f"{JOB_KEY_PREFIX}{effective_id}",
-                "pending",
-                nx=True,
-                ex=settings.worker_job_timeout,
-            )
-            if not claimed:
-                logger.debug("[ValkeyTaskQueue] Already queued: {}", effective_id)
+            if delay <= 0 and self._is_batched(task_name):
+                await self._enqueue_batched(task_name, effective_id, dedup_ttl)
                 return effective_id
 
-            await task_fn.kiq(effective_id)
+            labels: dict[str, Any] = {
+                DEDUP_KEY_LABEL: f"{JOB_KEY_PREFIX}{effective_id}",
+                DEDUP_TTL_LABEL: dedup_ttl,
+            }
+            if delay > 0:
+                labels[RUN_AT_LABEL] = run_at
+            await task_fn.kicker().with_labels(**labels).kiq(effective_id)
             logger.debug(
-                "[ValkeyTaskQueue] Enqueued {} (job_id={})", task_name, effective_id
+                "[ValkeyTaskQueue] Dispatched {} (job_id={})", task_name, effective_id
             )
         except Exception as exc:  # noqa: BLE001
             logger.warning("[ValkeyTaskQueue] Failed to enqueue {}: {}", task_name, exc)
 
         return effective_id
 
-    async def is_job_pending_or_running(self, job_id: str) -> bool:
-        """Return True if a job with this ID is already pending or running."""
+    @staticmethod
+    def _is_batched(task_name: str) -> bool:
+        return (
+            task_name in BATCHED_TASKS and settings.worker_player_refresh_batch_size > 1
+        )
+
+    async def _enqueue_batched(
+        self, task_name: str, job_id: str, dedup_ttl: int
+    ) -> None:
+        """Claim the dedup slot of the job, and push it to the batch queue of
+        the task, in a single script call. A batch task is kicked whenever the
+        queue holds more than a batch per running batch task, so that several
+        workers can drain a long queue at the same time, and a job is never
+        left without a batch task to drain it."""
+        batch_queue = f"{BATCH_QUEUE_KEY_PREFIX}{task_name}"
+        kick = await self._run_script(
+            _ENQUEUE_BATCHED_SCRIPT,
+            [
+                f"{JOB_KEY_PREFIX}{job_id}",
+                batch_queue,
+                f"{batch_queue}{_BATCH_DRAINERS_SUFFIX}",
+            ],
+            [
+                job_id,
+                dedup_ttl,
+                settings.worker_player_refresh_batch_size,
+                settings.worker_job_timeout,
+            ],
+        )
+        if kick < 0:
+            logger.debug("[ValkeyTaskQueue] Already queued: {}", job_id)
+            if settings.prometheus_enabled:
+                background_tasks_deduplicated_total.labels(task_name=task_name).inc()
+        elif kick:
+            await TASK_MAP[BATCHED_TASKS[task_name]].kiq()
+
+    async def _run_script(self, script: str, keys: list[str], args: list[Any]) -> Any:
+        """Run a Lua script with EVALSHA, loading it on first use."""
+        return await self._valkey.register_script(script)(keys=keys, args=args)
+
+    async def get_admission_rate(self) -> float:
+        """Return the share of refreshes to enqueue, recomputed at most every
+        ``_ADMISSION_RATE_TTL`` seconds. 1 if the state can't be read."""
+        now = time.monotonic()
+        cached = ValkeyTaskQueue._admission_rate
+        if cached is not None and now - cached[1] < _ADMISSION_RATE_TTL:
+            return cached[0]
+
+        try:
+            rate = await self._compute_admission_rate()
+        except Exception:  # noqa: BLE001
+            logger.warning("[ValkeyTaskQueue] Failed to compute admission rate")
+            rate = 1.0
+        ValkeyTaskQueue._admission_rate = (rate, now)
+        return rate
+
+    async def _compute_admission_rate(self) -> float:
+        if settings.throttle_enabled and await BlizzardThrottle().is_rate_limited():
+            return settings.refresh_admission_penalty_rate
+
+        async with self._valkey.pipeline(transaction=False) as pipe:
+            pipe.llen(_QUEUE_DEFAULT)
+            for task_name in BATCHED_TASKS:
+                pipe.llen(f"{BATCH_QUEUE_KEY_PREFIX}{task_name}")
+            queue_depth = sum(await pipe.execute())
+
+        soft_limit = settings.refresh_admission_queue_soft_limit
+        hard_limit = settings.refresh_admission_queue_hard_limit
+        if queue_depth <= soft_limit:
+            return 1.0
+        if queue_depth >= hard_limit:
+            return 0.0
+        return (hard_limit - queue_depth) / (hard_limit - soft_limit)
+
+    async def dequeue_batch(
+        self, task_name: str, count: int, consumer_id: str
+    ) -> list[str]:
+        """Move up to ``count`` job IDs from the batch queue of the task to the
+        processing list of ``consumer_id``, and return them. The jobs still in
+        this list are returned instead, if a previous run was interrupted."""
+        batch_queue = f"{BATCH_QUEUE_KEY_PREFIX}{task_name}"
         try:
-            return (await self._valkey.exists(f"{JOB_KEY_PREFIX}{job_id}")) > 0
+            job_ids = await self._run_script(
+                _DEQUEUE_BATCH_SCRIPT,
+                [
+                    batch_queue,
+                    f"{batch_queue}{_BATCH_PROCESSING_SUFFIX}{consumer_id}",
+                    f"{batch_queue}{_BATCH_DRAINERS_SUFFIX}",
+                ],
+                [count, settings.worker_job_timeout],
+            )
         except Exception:  # noqa: BLE001
-            return False
+            logger.warning("[ValkeyTaskQueue] Failed to dequeue {} jobs", task_name)
+            return []
+        return [
+            job_id.decode() if isinstance(job_id, bytes) else job_id
+            for job_id in job_ids or []
+        ]
+
+    async def ack_batch(self, task_name: str, consumer_id: str) -> None:
+        """Clear the processing list of ``consumer_id``, once its batch is done."""
+        try:
+            await self._valkey.delete(
+                f"{BATCH_QUEUE_KEY_PREFIX}{task_name}"
+                f"{_BATCH_PROCESSING_SUFFIX}{consumer_id}"
+            )
+        except Exception:  # noqa: BLE001
+            logger.warning(
+                "[ValkeyTaskQueue] Failed to acknowledge {} batch", task_name
+            )
 
     async def release_job(self, job_id: str) -> None:
         """Delete the dedup key for ``job_id``, allowing it to be re-enqueued.
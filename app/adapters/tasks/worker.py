@@ -4,7 +4,7 @@ Tasks are executed by the taskiq worker process::
 
     taskiq worker app.adapters.tasks.worker:broker
 
-The cron task ``check_new_hero`` is scheduled by the taskiq scheduler::
+Cron tasks (e.g. ``check_new_hero``) are scheduled by the taskiq scheduler::
 
     taskiq scheduler app.adapters.tasks.worker:scheduler
 
@@ -15,6 +15,7 @@ the API server (including any overrides set in ``app.main``).
 
 from __future__ import annotations
 
+import asyncio
 import time
 from contextlib import asynccontextmanager
 from typing import TYPE_CHECKING, Annotated
@@ -24,11 +25,14 @@ from prometheus_client import start_http_server
 if TYPE_CHECKING:
     from collections.abc import AsyncIterator
 
-from taskiq import TaskiqDepends, TaskiqEvents
+from taskiq import Context, TaskiqDepends, TaskiqEvents
 from taskiq.schedule_sources import LabelScheduleSource
 from taskiq.scheduler.scheduler import TaskiqScheduler
 from taskiq_fastapi import init as taskiq_init
 
+from app.adapters.blizzard import blizzard_request_priority
+from app.adapters.blizzard.throttle import BlizzardThrottle
+from app.adapters.tasks.concurrency import ConcurrencyController
 from app.adapters.tasks.task_registry import TASK_MAP
 from app.adapters.tasks.valkey_broker import ValkeyListBroker
 from app.api.dependencies import (
@@ -42,7 +46,7 @@ from app.api.dependencies import (
     get_task_queue,
 )
 from app.config import settings
-from app.domain.enums import HeroKey, Locale
+from app.domain.enums import BlizzardRequestPriority, HeroKey, Locale
 from app.domain.parsers.heroes import fetch_heroes_html, parse_heroes_html
 from app.domain.ports import BlizzardClientPort, StoragePort, TaskQueuePort
 from app.domain.services import (
@@ -66,7 +70,10 @@ broker = ValkeyListBroker(
     url=f"valkey://{settings.valkey_host}:{settings.valkey_port}",
     queue_name="taskiq:queue",
     max_pool_size=settings.worker_max_concurrent_jobs,
+    visibility_timeout=settings.worker_visibility_timeout,
+    max_in_flight=settings.worker_max_concurrent_jobs,
 )
+concurrency_controller = ConcurrencyController(broker)
 
 # Wire FastAPI DI into taskiq tasks.
 # In worker mode this also triggers the FastAPI lifespan (DB init, cache eviction…).
@@ -84,6 +91,18 @@ async def start_metrics_server(state: object) -> None:  # noqa: ARG001
         )
 
 
+@broker.on_event(TaskiqEvents.WORKER_STARTUP)
+async def start_concurrency_controller(state: object) -> None:  # noqa: ARG001
+    """Autotune the number of jobs processed at once by the worker process."""
+    if settings.worker_concurrency_autotuning:
+        concurrency_controller.start()
+
+
+@broker.on_event(TaskiqEvents.WORKER_SHUTDOWN)
+async def stop_concurrency_controller(state: object) -> None:  # noqa: ARG001
+    concurrency_controller.stop()
+
+
 # ─── Scheduler (cron) ────────────────────────────────────────────────────────
 
 scheduler = TaskiqScheduler(
@@ -106,6 +125,21 @@ TaskQueueDep = Annotated[TaskQueuePort, TaskiqDepends(get_task_queue)]
 # ─── Metrics helper ──────────────────────────────────────────────────────────
 
 
+def _record_refresh(
+    entity_type: str, entity_id: str, duration: float, error: Exception | None
+) -> None:
+    """Record the duration and success/failure metrics of a refresh task."""
+    if error is None:
+        background_refresh_completed_total.labels(entity_type=entity_type).inc()
+        logger.info("[Worker] Refresh completed: {} in {:.3f}s", entity_id, duration)
+    else:
+        background_refresh_failed_total.labels(entity_type=entity_type).inc()
+        logger.warning(
+            "[Worker] Refresh failed: {} — {} ({:.3f}s)", entity_id, error, duration
+        )
+    background_tasks_duration_seconds.labels(entity_type=entity_type).observe(duration)
+
+
 @asynccontextmanager
 async def _run_refresh_task(
     entity_type: str,
@@ -115,28 +149,63 @@ async def _run_refresh_task(
     """Context manager that executes a refresh task end-to-end: records
     duration and success/failure metrics, then releases the dedup key so
     the job can be re-enqueued immediately after completion.
+
+    Blizzard requests of the task are made with background priority, so that
+    they only use capacity left by API requests.
     """
     start = time.monotonic()
-    duration = 0.0
     try:
-        yield
-        duration = time.monotonic() - start
-        background_refresh_completed_total.labels(entity_type=entity_type).inc()
-        logger.info("[Worker] Refresh completed: {} in {:.3f}s", entity_id, duration)
+        with blizzard_request_priority(BlizzardRequestPriority.BACKGROUND):
+            yield
     except Exception as exc:
-        duration = time.monotonic() - start
-        background_refresh_failed_total.labels(entity_type=entity_type).inc()
-        logger.warning(
-            "[Worker] Refresh failed: {} — {} ({:.3f}s)", entity_id, exc, duration
-        )
+        _record_refresh(entity_type, entity_id, time.monotonic() - start, exc)
         raise
+    else:
+        _record_refresh(entity_type, entity_id, time.monotonic() - start, None)
     finally:
-        background_tasks_duration_seconds.labels(entity_type=entity_type).observe(
-            duration
-        )
         await task_queue.release_job(entity_id)
 
 
+async def _refresh_player_batch(
+    player_ids: list[str], service: PlayerService, task_queue: TaskQueuePort
+) -> None:
+    """Refresh a batch of player profiles, stored in a single storage write.
+
+    Jobs are only released, and their outcome recorded, once the write is
+    done : if it fails, they're all counted as failed, and its error is raised.
+    """
+    semaphore = asyncio.Semaphore(settings.worker_player_refresh_concurrency)
+    outcomes: dict[str, tuple[float, Exception | None]] = {}
+
+    async def refresh(player_id: str) -> None:
+        start = time.monotonic()
+        error: Exception | None = None
+        try:
+            async with semaphore:
+                with blizzard_request_priority(BlizzardRequestPriority.BACKGROUND):
+                    await service.refresh_player_profile(player_id)
+        except Exception as exc:  # noqa: BLE001
+            error = exc
+        outcomes[player_id] = (time.monotonic() - start, error)
+
+    def record_outcomes(write_error: Exception | None) -> None:
+        for player_id, (duration, error) in outcomes.items():
+            _record_refresh("player", player_id, duration, error or write_error)
+
+    try:
+        async with service.buffered_profile_writes():
+            await asyncio.gather(*(refresh(player_id) for player_id in player_ids))
+    except Exception as exc:
+        record_outcomes(exc)
+        raise
+    else:
+        record_outcomes(None)
+    finally:
+        await asyncio.gather(
+            *(task_queue.release_job(player_id) for player_id in player_ids)
+        )
+
+
 # ─── Refresh tasks ────────────────────────────────────────────────────────────
 
 
@@ -216,6 +285,43 @@ async def refresh_player_profile(
         await service.refresh_player_profile(entity_id)
 
 
+@broker.task
+async def refresh_player_profiles(
+    service: PlayerServiceDep,
+    task_queue: TaskQueueDep,
+    context: Annotated[Context, TaskiqDepends()],
+) -> None:
+    """Refresh player career profiles queued for batched refresh.
+
+    Enqueued instead of ``refresh_player_profile`` when
+    ``worker_player_refresh_batch_size`` is above 1. Drains batches of player
+    IDs until the queue is empty : profiles of a batch are refreshed
+    concurrently (up to ``worker_player_refresh_concurrency``), and stored in
+    a single storage write once all of them are done.
+
+    Batches are taken on behalf of the task message, and acknowledged once
+    done : if the worker crashes meanwhile, the broker queues the message
+    again, and the batch is resumed. If the storage write of a batch fails,
+    the task fails once the queue is drained.
+    """
+    consumer_id = context.message.task_id
+    write_error: Exception | None = None
+    while player_ids := await task_queue.dequeue_batch(
+        "refresh_player_profile", settings.worker_player_refresh_batch_size, consumer_id
+    ):
+        logger.info("[Worker] Refreshing batch of {} players", len(player_ids))
+        try:
+            await _refresh_player_batch(player_ids, service, task_queue)
+        except Exception as exc:  # noqa: BLE001
+            # Other batches are still drained, the task failing afterwards
+            write_error = exc
+        finally:
+            await task_queue.ack_batch("refresh_player_profile", consumer_id)
+
+    if write_error is not None:
+        raise write_error
+
+
 # ─── Cron tasks ───────────────────────────────────────────────────────────────
 
 
@@ -238,6 +344,47 @@ async def cleanup_stale_players(storage: StorageDep) -> None:
     logger.info("[Worker] cleanup_stale_players: Done.")
 
 
+# Interval (seconds) between two pre-refreshes of popular players, matching
+# the cron schedule of the task
+_PREREFRESH_INTERVAL = 60
+
+# Blizzard requests made by a player refresh (search, then career page)
+_BLIZZARD_REQUESTS_PER_PLAYER_REFRESH = 2
+
+
+async def _prerefresh_budget() -> int:
+    """Number of player refreshes fitting in the share of the throttle capacity
+    dedicated to pre-refreshes, until the next run. 0 during a penalty."""
+    if not settings.throttle_enabled:
+        delay = settings.throttle_start_delay
+    else:
+        throttle = BlizzardThrottle()
+        if await throttle.is_rate_limited():
+            return 0
+        delay = await throttle.get_current_delay()
+
+    capacity = _PREREFRESH_INTERVAL / max(delay, 0.001)
+    return int(
+        capacity
+        * settings.player_prerefresh_budget_share
+        / _BLIZZARD_REQUESTS_PER_PLAYER_REFRESH
+    )
+
+
+@broker.task(schedule=[{"cron": "* * * * *"}])
+async def prerefresh_popular_players(service: PlayerServiceDep) -> None:
+    """Refresh popular player profiles ahead of expiry (runs every minute)."""
+    if not settings.player_prerefresh_enabled:
+        return
+
+    try:
+        await service.prerefresh_popular_players(
+            _PREREFRESH_INTERVAL, await _prerefresh_budget()
+        )
+    except Exception:  # noqa: BLE001
+        logger.exception("[Worker] prerefresh_popular_players: Failed.")
+
+
 @broker.task(schedule=[{"cron": "0 2 * * *"}])
 async def check_new_hero(client: BlizzardClientDep) -> None:
     """Detect new Blizzard heroes and notify via Discord (runs daily at 02:00 UTC)."""
@@ -247,7 +394,8 @@ async def check_new_hero(client: BlizzardClientDep) -> None:
 
     logger.info("[Worker] check_new_hero: Checking for new heroes...")
     try:
-        html = await fetch_heroes_html(client)
+        with blizzard_request_priority(BlizzardRequestPriority.BACKGROUND):
+            html = await fetch_heroes_html(client)
         heroes = parse_heroes_html(html)
     except Exception as exc:  # noqa: BLE001
         logger.warning("[Worker] check_new_hero: Failed to fetch heroes: {}", exc)
@@ -288,5 +436,6 @@ TASK_MAP.update(
         "refresh_maps": refresh_maps,
         "refresh_gamemodes": refresh_gamemodes,
         "refresh_player_profile": refresh_player_profile,
+        "refresh_player_profiles": refresh_player_profiles,
     }
 )
@@ -5,9 +5,11 @@ from typing import Annotated
 from fastapi import Depends
 
 from app.adapters.blizzard.client import BlizzardClient
+from app.adapters.blizzard.replay import RecordingBlizzardClient, ReplayBlizzardClient
 from app.adapters.cache.valkey_cache import ValkeyCache
 from app.adapters.storage.postgres_storage import PostgresStorage
 from app.adapters.tasks.valkey_task_queue import ValkeyTaskQueue
+from app.config import settings
 from app.domain.ports import BlizzardClientPort, CachePort, StoragePort, TaskQueuePort
 from app.domain.services import (
     GamemodeService,
@@ -22,9 +24,17 @@ from app.domain.services import (
 # ---------------------------------------------------------------------------
 
 
+_BLIZZARD_CLIENTS: dict[str, type[BlizzardClient]] = {
+    "live": BlizzardClient,
+    "replay": ReplayBlizzardClient,
+    "record": RecordingBlizzardClient,
+}
+
+
 def get_blizzard_client() -> BlizzardClientPort:
-    """Dependency for Blizzard HTTP client (Singleton)."""
-    return BlizzardClient()
+    """Dependency for Blizzard HTTP client (Singleton), replaying or recording
+    a local corpus of responses depending on settings."""
+    return _BLIZZARD_CLIENTS[settings.blizzard_client_mode]()
 
 
 def get_cache() -> CachePort:
@@ -147,12 +147,18 @@ def apply_swr_headers(
     age_seconds: int = 0,
     *,
     staleness_threshold: int | None = None,
+    etag: str | None = None,
 ) -> None:
     """Add standard SWR and cache metadata headers to the response.
 
     Sets ``Cache-Control`` (RFC 5861), ``Age`` (RFC 7234), ``X-Cache-Status``,
     and the non-standard ``X-Cache-TTL`` on every FastAPI-served response.
 
+    When ``etag`` is given, it's set as a weak ``ETag`` (RFC 9110) as well. It's
+    the entity tag returned by ``update_api_cache``, which nginx emits when
+    serving this data from the API Cache, so that clients can revalidate with
+    ``If-None-Match`` on later cache hits.
+
     ``staleness_threshold`` is used for ``Cache-Control: max-age``; it defaults
     to ``cache_ttl`` for endpoints that have no SWR (e.g. player, search).
     ``stale-while-revalidate`` is included only on stale responses, using the
@@ -171,3 +177,5 @@ def apply_swr_headers(
     else:
         response.headers["Cache-Control"] = f"public, max-age={max_age}"
         response.headers["X-Cache-Status"] = "hit"
+    if etag is not None:
+        response.headers["ETag"] = f'W/"{etag}"'
@@ -5,10 +5,10 @@ from __future__ import annotations
 from contextlib import asynccontextmanager
 from typing import TYPE_CHECKING
 
-from app.adapters.blizzard import BlizzardClient
 from app.adapters.cache import ValkeyCache
 from app.adapters.storage import PostgresStorage
 from app.adapters.tasks.worker import broker
+from app.api.dependencies import get_blizzard_client
 from app.infrastructure.logger import logger
 
 if TYPE_CHECKING:
@@ -24,7 +24,8 @@ async def lifespan(_: FastAPI):  # pragma: no cover
     await storage.initialize()
 
     logger.info("Instanciating HTTPX AsyncClient...")
-    overfast_client: BlizzardClientPort = BlizzardClient()
+    overfast_client: BlizzardClientPort = get_blizzard_client()
+    await overfast_client.warm_up()
 
     # Evict stale api-cache data on startup (handles crash/deploy scenarios)
     cache: CachePort = ValkeyCache()
@@ -11,10 +11,14 @@ from anyio import to_thread
 from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.responses import HTMLResponse, JSONResponse
 
+from app.adapters.blizzard.client import blizzard_request_deadline
+from app.config import settings
+
 if TYPE_CHECKING:
     from collections.abc import Callable
 
     from fastapi import FastAPI, Request
+    from starlette.types import ASGIApp, Receive, Scope, Send
 
 # Profiling packages aren't installed on production environment
 with suppress(ModuleNotFoundError):
@@ -156,3 +160,19 @@ class ObjGraphMiddleware(OverFastMiddleware):  # pragma: no cover
         }
 
         return JSONResponse(content=memory_report)
+
+
+class RequestDeadlineMiddleware:
+    """Give each API request a time budget for its Blizzard requests, see
+    ``settings.api_request_deadline``. Background refreshes have none."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with blizzard_request_deadline(settings.api_request_deadline):
+            await self.app(scope, receive, send)
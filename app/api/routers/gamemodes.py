@@ -35,7 +35,7 @@ async def list_map_gamemodes(
     response: Response,
     service: GamemodeServiceDep,
 ) -> Any:
-    data, is_stale, age = await service.list_gamemodes(
+    data, is_stale, age, etag = await service.list_gamemodes(
         cache_key=build_cache_key(request)
     )
     apply_swr_headers(
@@ -44,5 +44,6 @@ async def list_map_gamemodes(
         is_stale,
         age,
         staleness_threshold=settings.gamemodes_staleness_threshold,
+        etag=etag,
     )
     return data
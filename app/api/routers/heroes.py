@@ -58,7 +58,7 @@ async def list_heroes(
     ] = Locale.ENGLISH_US,
     gamemode: Annotated[HeroGamemode | None, Query(title="Gamemode filter")] = None,
 ) -> Any:
-    data, is_stale, age = await service.list_heroes(
+    data, is_stale, age, etag = await service.list_heroes(
         locale=locale, role=role, gamemode=gamemode, cache_key=build_cache_key(request)
     )
     apply_swr_headers(
@@ -67,6 +67,7 @@ async def list_heroes(
         is_stale,
         age,
         staleness_threshold=settings.heroes_staleness_threshold,
+        etag=etag,
     )
     return data
 
@@ -134,7 +135,7 @@ async def get_hero_stats(
         ),
     ] = "hero:asc",
 ) -> Any:
-    data, is_stale, age = await service.get_hero_stats(
+    data, is_stale, age, etag = await service.get_hero_stats(
         platform=platform,
         gamemode=gamemode,
         region=region,
@@ -149,6 +150,7 @@ async def get_hero_stats(
         settings.hero_stats_cache_timeout,
         is_stale,
         age,
+        etag=etag,
     )
     return data
 
@@ -180,7 +182,7 @@ async def get_hero(
         Locale, Query(title="Locale to be displayed")
     ] = Locale.ENGLISH_US,
 ) -> Any:
-    data, is_stale, age = await service.get_hero(
+    data, is_stale, age, etag = await service.get_hero(
         hero_key=str(hero_key), locale=locale, cache_key=build_cache_key(request)
     )
     apply_swr_headers(
@@ -189,5 +191,6 @@ async def get_hero(
         is_stale,
         age,
         staleness_threshold=settings.heroes_staleness_threshold,
+        etag=etag,
     )
     return data
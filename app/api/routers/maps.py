@@ -43,7 +43,7 @@ async def list_maps(
         ),
     ] = None,
 ) -> Any:
-    data, is_stale, age = await service.list_maps(
+    data, is_stale, age, etag = await service.list_maps(
         gamemode=gamemode, cache_key=build_cache_key(request)
     )
     apply_swr_headers(
@@ -52,5 +52,6 @@ async def list_maps(
         is_stale,
         age,
         staleness_threshold=settings.maps_staleness_threshold,
+        etag=etag,
     )
     return data
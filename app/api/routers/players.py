@@ -130,14 +130,16 @@ async def search_players(
     limit: Annotated[int, Query(title="Limit of results per page", gt=0)] = 20,
 ) -> Any:
     cache_key = build_cache_key(request)
-    data = await service.search_players(
+    data, etag = await service.search_players(
         name=name,
         order_by=order_by,
         offset=offset,
         limit=limit,
         cache_key=cache_key,
     )
-    apply_swr_headers(response, settings.search_account_path_cache_timeout, False, 0)
+    apply_swr_headers(
+        response, settings.search_account_path_cache_timeout, False, 0, etag=etag
+    )
     return data
 
 
@@ -160,11 +162,13 @@ async def get_player_summary(
     commons: CommonsPlayerDep,
 ) -> Any:
     cache_key = build_cache_key(request)
-    data, is_stale, age = await service.get_player_summary(
+    data, is_stale, age, etag = await service.get_player_summary(
         player_id=commons["player_id"],
         cache_key=cache_key,
     )
-    apply_swr_headers(response, settings.career_path_cache_timeout, is_stale, age)
+    apply_swr_headers(
+        response, settings.career_path_cache_timeout, is_stale, age, etag=etag
+    )
     return data
 
 
@@ -216,13 +220,15 @@ async def get_player_stats_summary(
     ] = None,
 ) -> Any:
     cache_key = build_cache_key(request)
-    data, is_stale, age = await service.get_player_stats_summary(
+    data, is_stale, age, etag = await service.get_player_stats_summary(
         player_id=commons["player_id"],
         gamemode=gamemode,
         platform=platform,
         cache_key=cache_key,
     )
-    apply_swr_headers(response, settings.career_path_cache_timeout, is_stale, age)
+    apply_swr_headers(
+        response, settings.career_path_cache_timeout, is_stale, age, etag=etag
+    )
     return data
 
 
@@ -249,14 +255,16 @@ async def get_player_career_stats(
     commons: CommonsPlayerCareerDep,
 ) -> Any:
     cache_key = build_cache_key(request)
-    data, is_stale, age = await service.get_player_career_stats(
+    data, is_stale, age, etag = await service.get_player_career_stats(
         player_id=commons["player_id"],
         gamemode=commons["gamemode"],
         platform=commons.get("platform"),
         hero=commons.get("hero"),
         cache_key=cache_key,
     )
-    apply_swr_headers(response, settings.career_path_cache_timeout, is_stale, age)
+    apply_swr_headers(
+        response, settings.career_path_cache_timeout, is_stale, age, etag=etag
+    )
     return data
 
 
@@ -281,14 +289,16 @@ async def get_player_stats(
     commons: CommonsPlayerCareerDep,
 ) -> Any:
     cache_key = build_cache_key(request)
-    data, is_stale, age = await service.get_player_stats(
+    data, is_stale, age, etag = await service.get_player_stats(
         player_id=commons["player_id"],
         gamemode=commons["gamemode"],
         platform=commons.get("platform"),
         hero=commons.get("hero"),
         cache_key=cache_key,
     )
-    apply_swr_headers(response, settings.career_path_cache_timeout, is_stale, age)
+    apply_swr_headers(
+        response, settings.career_path_cache_timeout, is_stale, age, etag=etag
+    )
     return data
 
 
@@ -327,11 +337,13 @@ async def get_player_career(
     ] = None,
 ) -> Any:
     cache_key = build_cache_key(request)
-    data, is_stale, age = await service.get_player_career(
+    data, is_stale, age, etag = await service.get_player_career(
         player_id=commons["player_id"],
         gamemode=gamemode,
         platform=platform,
         cache_key=cache_key,
     )
-    apply_swr_headers(response, settings.career_path_cache_timeout, is_stale, age)
+    apply_swr_headers(
+        response, settings.career_path_cache_timeout, is_stale, age, etag=etag
+    )
     return data
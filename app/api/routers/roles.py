@@ -39,7 +39,7 @@ async def list_roles(
         Locale, Query(title="Locale to be displayed")
     ] = Locale.ENGLISH_US,
 ) -> Any:
-    data, is_stale, age = await service.list_roles(
+    data, is_stale, age, etag = await service.list_roles(
         locale=locale, cache_key=build_cache_key(request)
     )
     apply_swr_headers(
@@ -48,5 +48,6 @@ async def list_roles(
         is_stale,
         age,
         staleness_threshold=settings.roles_staleness_threshold,
+        etag=etag,
     )
     return data
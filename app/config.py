@@ -3,6 +3,7 @@
 import tomllib
 from functools import cache
 from pathlib import Path
+from typing import Literal
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -131,6 +132,10 @@ class Settings(BaseSettings):
     # Seconds after a 403 during which delay cannot decrease (recovery blocked)
     throttle_penalty_duration: int = 60
 
+    # Maximum time a request can wait for its reserved slot (seconds). Requests
+    # whose next free slot is further away are rejected as rate limited.
+    throttle_max_queue_wait: float = 30.0
+
     ############
     # VALKEY CONFIGURATION
     ############
@@ -153,6 +158,17 @@ class Settings(BaseSettings):
     # Used by nginx as main API cache.
     api_cache_key_prefix: str = "api-cache"
 
+    # Prefix for Valkey sets indexing the API Cache keys written for a player,
+    # so that they can all be evicted on refresh without scanning the keyspace
+    player_cache_index_key_prefix: str = "player-cache-index"
+
+    # Store a gzip variant of API Cache bodies, served by nginx as-is to clients
+    # accepting gzip but not zstd (zstd bodies are always passed through as-is)
+    api_cache_gzip_enabled: bool = True
+
+    # Minimum body size (bytes) for storing a gzip variant in API Cache
+    api_cache_gzip_min_length: int = 1024
+
     # Cache TTL for heroes list data (seconds)
     heroes_path_cache_timeout: int = 86400
 
@@ -171,6 +187,17 @@ class Settings(BaseSettings):
     # Cache TTL for hero stats data (seconds)
     hero_stats_cache_timeout: int = 3600
 
+    # TTL (seconds) of parsed player profiles kept in memory by each API process,
+    # so that bursts of requests on several endpoints for the same player don't
+    # hit persistent storage and the parser each time. A profile refreshed by
+    # another process may be served from memory until then. Set to 0 to disable.
+    parsed_profile_cache_ttl: int = 60
+
+    # Memory budget (bytes, estimated as 4 times the JSON size of profiles) of
+    # the parsed player profiles cache. Least recently used profiles are
+    # evicted above it.
+    parsed_profile_cache_max_bytes: int = 64 * 1024 * 1024  # 64 MiB
+
     ############
     # SWR STALENESS THRESHOLDS
     ############
@@ -191,6 +218,18 @@ class Settings(BaseSettings):
     # while the refresh is in-flight.
     stale_cache_timeout: int = 60
 
+    # Admission control of background refreshes triggered by stale data. Above
+    # the soft limit of queued jobs, only a share of refreshes are enqueued,
+    # decreasing linearly down to none at the hard limit. During a Blizzard
+    # throttle penalty, only the given share of refreshes are enqueued.
+    refresh_admission_queue_soft_limit: int = 1000
+    refresh_admission_queue_hard_limit: int = 5000
+    refresh_admission_penalty_rate: float = 0.0
+
+    # TTL (seconds) for stale responses whose refresh wasn't enqueued by
+    # admission control, as it will take longer to get fresh data
+    stale_cache_backlog_timeout: int = 300
+
     ############
     # UNKNOWN PLAYERS SYSTEM
     ############
@@ -207,16 +246,79 @@ class Settings(BaseSettings):
     # Prefix for Valkey keys caching the working Blizzard gamemode filter value per gamemode
     gamemode_filter_key_prefix: str = "gamemode-filter"
 
+    ############
+    # PLAYER PROFILE LOADING
+    ############
+
+    # Prefix for Valkey keys locking the load of a player profile from Blizzard,
+    # so that concurrent requests on several processes only trigger one load
+    player_fetch_lock_key_prefix: str = "player-fetch-lock"
+
+    # Maximum time (seconds) a player profile load lock can be held, which is
+    # also how long other processes wait for it before loading the profile anyway
+    player_fetch_lock_timeout: int = 30
+
+    ############
+    # PLAYER PRE-REFRESH
+    ############
+
+    # Indicate if popular player profiles are refreshed ahead of expiry. Player
+    # requests are then counted by nginx in a Valkey sorted set, whose scores
+    # decay over time, and the most requested players are pre-refreshed.
+    player_prerefresh_enabled: bool = False
+
+    # Valkey key of the sorted set holding players popularity scores
+    player_popularity_key: str = "player-popularity"
+
+    # Time (seconds) after which a request only counts half in popularity scores
+    player_popularity_half_life: int = 86400
+
+    # Maximum number of players kept in the popularity sorted set
+    player_popularity_max_players: int = 10000
+
+    # Number of most popular players considered for pre-refresh
+    player_prerefresh_top_k: int = 500
+
+    # Share of player_staleness_threshold after which a popular profile is
+    # pre-refreshed (the same share as SWR refreshes of requested profiles)
+    player_prerefresh_min_age_ratio: float = 0.5
+
+    # Maximum share of the Blizzard throttle capacity (requests allowed by its
+    # current delay) used by pre-refreshes
+    player_prerefresh_budget_share: float = 0.2
+
     ############
     # BACKGROUND WORKER
     ############
 
-    # Maximum number of concurrent worker jobs
+    # Maximum number of concurrent jobs of each worker process
     worker_max_concurrent_jobs: int = 10
 
+    # Minimum number of concurrent jobs of each worker process, when the
+    # concurrency is autotuned
+    worker_min_concurrent_jobs: int = 2
+
+    # Periodically size the number of concurrent jobs of each worker process
+    # from the Blizzard throttle delay, the queue depth and the number of
+    # workers, between the minimum and the maximum above. Disabled by default,
+    # each worker process then running up to the maximum number of jobs.
+    worker_concurrency_autotuning: bool = False
+
     # Job timeout in seconds
     worker_job_timeout: int = 300
 
+    # Maximum number of player profiles refreshed by a single worker task.
+    # Above 1, player refreshes are queued apart and drained by batches, whose
+    # profiles are stored in a single database round-trip. 1 disables batching.
+    worker_player_refresh_batch_size: int = 1
+
+    # Maximum number of player profiles of a batch refreshed concurrently
+    worker_player_refresh_concurrency: int = 5
+
+    # Seconds without heartbeat after which a worker is considered dead, and
+    # the jobs it was processing are queued again for other workers
+    worker_visibility_timeout: int = 60
+
     ############
     # BLIZZARD
     ############
@@ -239,6 +341,69 @@ class Settings(BaseSettings):
     # Route for retrieving usage statistics about Overwatch heroes
     hero_stats_path: str = "/en-us/rates/data/"
 
+    # Prefix of the Valkey keys holding the validators (ETag, Last-Modified) of
+    # Blizzard pages, sent back on refreshes to only download changed pages
+    blizzard_validators_key_prefix: str = "blizzard-validators"
+
+    # How long validators of a Blizzard page are kept (seconds)
+    blizzard_validators_ttl: int = 604800
+
+    # Maximum time to wait for a Blizzard response (seconds). Used for every
+    # endpoint until enough of its responses were observed.
+    blizzard_timeout: float = 10.0
+
+    # Minimum timeout of a Blizzard endpoint (seconds)
+    blizzard_min_timeout: float = 2.0
+
+    # Timeout of a Blizzard endpoint, as a multiple of the p99 of its latency
+    blizzard_timeout_p99_factor: float = 3.0
+
+    # Number of last response durations of each Blizzard endpoint kept to
+    # compute its timeout, and how many are needed before computing it
+    blizzard_timeout_window: int = 500
+    blizzard_timeout_min_samples: int = 50
+
+    # Connection pool of the Blizzard HTTP client. With HTTP/2, concurrent
+    # requests are multiplexed on the same connection.
+    blizzard_max_connections: int = 10
+    blizzard_max_keepalive_connections: int = 5
+
+    # How long an idle connection to Blizzard is kept open (seconds), to avoid
+    # new TLS handshakes after quiet periods
+    blizzard_keepalive_expiry: float = 120.0
+
+    # Time budget of an API request (seconds). Blizzard requests made for it are
+    # abandoned with a 504 once the budget is spent. 0 to disable.
+    api_request_deadline: float = 0.0
+
+    ############
+    # BLIZZARD REPLAY (load testing)
+    ############
+
+    # Blizzard client to use : "live" sends requests to Blizzard, "replay"
+    # answers them from a local corpus of responses, without any request to
+    # Blizzard, and "record" saves responses of Blizzard into the corpus
+    blizzard_client_mode: Literal["live", "replay", "record"] = "live"
+
+    # Root path of the corpus of Blizzard responses, with the same layout as
+    # test fixtures (see app/adapters/blizzard/replay.py). Kept apart from test
+    # fixtures so that recording never overwrites them, set it to the test
+    # fixtures path to replay them.
+    blizzard_replay_corpus_path: str = f"{Path.cwd()}/blizzard_corpus"
+
+    # Median latency of replayed responses (seconds), log-normally distributed
+    # with the given sigma. 0 to answer right away.
+    blizzard_replay_latency_median: float = 0.3
+    blizzard_replay_latency_sigma: float = 0.5
+
+    # Median latency of replayed responses for specific Blizzard endpoints
+    blizzard_replay_latency_medians: dict[str, float] = {
+        "/career/{player_id}": 1.0,
+    }
+
+    # Share of replayed requests answered with a 403, between 0 and 1
+    blizzard_replay_forbidden_rate: float = 0.0
+
     ############
     # CRITICAL ERROR DISCORD WEBHOOK
     ############
@@ -211,3 +211,10 @@ CompetitiveDivisionFilter = StrEnum(
 CompetitiveDivisionFilter.__doc__ = (
     "Competitive divisions ('grandmaster' includes 'champion')"
 )
+
+
+class BlizzardRequestPriority(StrEnum):
+    """Priority of requests to Blizzard in the throttle"""
+
+    INTERACTIVE = "interactive"  # served to an API client waiting for it
+    BACKGROUND = "background"  # refresh jobs, only using spare capacity
@@ -19,6 +19,12 @@ class RateLimitedError(Exception):
         return self.message
 
 
+class BlizzardNotModifiedError(Exception):
+    """Raised when Blizzard answers a conditional request with 304 Not Modified,
+    meaning the stored copy of the requested page is still current.
+    """
+
+
 class OverfastError(Exception):
     """Generic OverFast API Exception"""
 
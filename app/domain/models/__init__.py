@@ -1,5 +1,6 @@
 """Domain models package."""
 
+from app.domain.models.blizzard import PageValidators
 from app.domain.models.player import PlayerIdentity
 
-__all__ = ["PlayerIdentity"]
+__all__ = ["PageValidators", "PlayerIdentity"]
@@ -0,0 +1,18 @@
+"""Blizzard pages domain model dataclasses."""
+
+from dataclasses import dataclass, field
+
+
+@dataclass
+class PageValidators:
+    """Validators (ETag, Last-Modified) of a full response to a revalidating
+    request, which make the next revalidating request on the same URL
+    conditional once saved.
+
+    They must only be saved once the page content is stored, as a 304 Not
+    Modified on the next request vouches for the stored content.
+    """
+
+    url: str
+    etag: str | None = field(default=None)
+    last_modified: str | None = field(default=None)
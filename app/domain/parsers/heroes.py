@@ -6,6 +6,7 @@ from app.config import settings
 from app.domain.enums import HeroGamemode, Locale
 from app.domain.exceptions import ParserParsingError
 from app.domain.parsers.utils import (
+    get_page_validators,
     parse_html_root,
     safe_get_attribute,
     safe_get_text,
@@ -13,6 +14,7 @@ from app.domain.parsers.utils import (
 )
 
 if TYPE_CHECKING:
+    from app.domain.models import PageValidators
     from app.domain.ports import BlizzardClientPort
 
 
@@ -33,6 +35,26 @@ async def fetch_heroes_html(
     return response.text
 
 
+async def fetch_heroes_html_if_modified(
+    client: BlizzardClientPort,
+    locale: Locale = Locale.ENGLISH_US,
+) -> tuple[str, PageValidators]:
+    """
+    Fetch heroes list HTML from Blizzard, conditionally on the page having
+    changed since the last saved validators. Returns the HTML and the new
+    validators, to be saved once the HTML is stored.
+
+    Raises:
+        HTTPException: If Blizzard returns non-200 status
+        BlizzardNotModifiedError: If the page didn't change
+    """
+
+    url = f"{settings.blizzard_host}/{locale}{settings.heroes_path}"
+    response = await client.get(url, headers={"Accept": "text/html"}, revalidate=True)
+    validate_response_status(response)
+    return response.text, get_page_validators(url, response)
+
+
 def parse_heroes_html(html: str) -> list[dict]:
     """
     Parse heroes list HTML into structured data
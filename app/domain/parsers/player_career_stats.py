@@ -88,6 +88,27 @@ def _process_career_stats(
     return filter_stats_by_query(stats, gamemode, platform, hero)
 
 
+def parse_player_career_stats_from_profile(
+    profile_data: dict,
+    gamemode: PlayerGamemode | str,
+    platform: PlayerPlatform | str | None = None,
+    hero: str | None = None,
+) -> dict:
+    """
+    Compute player career stats from an already parsed profile (stored document)
+
+    Args:
+        profile_data: Full profile dict with "summary" and "stats"
+        gamemode: Mandatory gamemode filter
+        platform: Optional platform filter
+        hero: Optional hero filter
+
+    Returns:
+        Career stats dict, filtered by query parameters
+    """
+    return _process_career_stats(profile_data, gamemode, platform, hero)
+
+
 def parse_player_career_stats_from_html(
     html: str,
     gamemode: PlayerGamemode | str,
@@ -109,4 +130,6 @@ def parse_player_career_stats_from_html(
         Career stats dict, filtered by query parameters
     """
     profile_data = parse_player_profile_html(html, player_summary)
-    return _process_career_stats(profile_data, gamemode, platform, hero)
+    return parse_player_career_stats_from_profile(
+        profile_data, gamemode, platform, hero
+    )
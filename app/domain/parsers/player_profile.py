@@ -15,6 +15,7 @@ from app.domain.exceptions import ParserBlizzardError, ParserParsingError
 from app.domain.parsers.utils import (
     build_blizzard_url,
     extract_blizzard_id_from_url,
+    get_page_validators,
     parse_html_root,
     validate_response_status,
 )
@@ -22,6 +23,7 @@ from app.domain.parsers.utils import (
 if TYPE_CHECKING:
     from selectolax.lexbor import LexborNode
 
+    from app.domain.models import PageValidators
     from app.domain.ports import BlizzardClientPort
 
 from app.domain.enums import (
@@ -46,6 +48,11 @@ from app.domain.parsers.player_helpers import (
 )
 from app.infrastructure.logger import logger
 
+# Version of the parsed profile document produced by ``parse_player_profile_html``.
+# It's stored alongside the raw HTML in persistent storage : bump it whenever the
+# parser output changes, so that stored documents are re-parsed from the HTML.
+PLAYER_PROFILE_PARSER_VERSION = 1
+
 # Platform/gamemode CSS class mappings
 PLATFORMS_DIV_MAPPING = {
     PlayerPlatform.PC: "mouseKeyboard-view",
@@ -90,6 +97,29 @@ async def fetch_player_html(
     return response.text, blizzard_id
 
 
+async def fetch_player_html_if_modified(
+    client: BlizzardClientPort, player_id: str
+) -> tuple[str, PageValidators]:
+    """
+    Fetch player profile HTML from Blizzard, conditionally on the page having
+    changed since the last saved validators.
+
+    Returns:
+        Tuple of (HTML content, validators to save once the HTML is stored)
+
+    Raises:
+        ParserBlizzardError: If player not found (404)
+        BlizzardNotModifiedError: If the page didn't change
+    """
+
+    url = build_blizzard_url(settings.career_path, player_id)
+
+    response = await client.get(url, revalidate=True)
+    validate_response_status(response, valid_codes=[200, 404])
+
+    return response.text, get_page_validators(url, response)
+
+
 def extract_name_from_profile_html(html: str) -> str | None:
     """
     Extract player display name from profile HTML.
@@ -371,6 +371,25 @@ def _process_player_stats_summary(
     }
 
 
+def parse_player_stats_summary_from_profile(
+    profile_data: dict,
+    gamemode: PlayerGamemode | None = None,
+    platform: PlayerPlatform | None = None,
+) -> dict:
+    """
+    Compute player stats summary from an already parsed profile (stored document)
+
+    Args:
+        profile_data: Full profile dict with "summary" and "stats"
+        gamemode: Optional gamemode filter
+        platform: Optional platform filter
+
+    Returns:
+        Dict with "general", "roles", and "heroes" stats
+    """
+    return _process_player_stats_summary(profile_data, gamemode, platform)
+
+
 def parse_player_stats_summary_from_html(
     html: str,
     player_summary: dict | None = None,
@@ -390,4 +409,4 @@ def parse_player_stats_summary_from_html(
         Dict with "general", "roles", and "heroes" stats
     """
     profile_data = parse_player_profile_html(html, player_summary)
-    return _process_player_stats_summary(profile_data, gamemode, platform)
+    return parse_player_stats_summary_from_profile(profile_data, gamemode, platform)
@@ -6,6 +6,7 @@ from app.config import settings
 from app.domain.enums import Locale
 from app.domain.exceptions import ParserParsingError
 from app.domain.parsers.utils import (
+    get_page_validators,
     parse_html_root,
     safe_get_attribute,
     safe_get_text,
@@ -13,6 +14,7 @@ from app.domain.parsers.utils import (
 )
 
 if TYPE_CHECKING:
+    from app.domain.models import PageValidators
     from app.domain.ports import BlizzardClientPort
 
 
@@ -32,6 +34,18 @@ async def fetch_roles_html(
     return response.text
 
 
+async def fetch_roles_html_if_modified(
+    client: BlizzardClientPort,
+    locale: Locale = Locale.ENGLISH_US,
+) -> tuple[str, PageValidators]:
+    """Fetch roles HTML from Blizzard homepage if it changed, along with its
+    validators (see ``fetch_heroes_html_if_modified``)"""
+    url = f"{settings.blizzard_host}/{locale}{settings.home_path}"
+    response = await client.get(url, headers={"Accept": "text/html"}, revalidate=True)
+    validate_response_status(response)
+    return response.text, get_page_validators(url, response)
+
+
 def parse_roles_html(html: str) -> list[dict]:
     """
     Parse roles from Blizzard homepage HTML
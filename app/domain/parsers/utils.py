@@ -6,12 +6,19 @@ from urllib.parse import quote
 from selectolax.lexbor import LexborHTMLParser, LexborNode
 
 from app.config import settings
-from app.domain.exceptions import ParserBlizzardError, ParserParsingError
+from app.domain.exceptions import (
+    BlizzardNotModifiedError,
+    ParserBlizzardError,
+    ParserParsingError,
+)
+from app.domain.models import PageValidators
 from app.infrastructure.logger import logger
 
 if TYPE_CHECKING:
     import httpx2
 
+_HTTP_200 = 200
+_HTTP_304 = 304
 _HTTP_504 = 504
 
 
@@ -26,6 +33,19 @@ def build_blizzard_url(path: str, segment: str) -> str:
     return f"{settings.blizzard_host}{path}/{quoted_segment}/"
 
 
+def get_page_validators(url: str, response: httpx2.Response) -> PageValidators:
+    """Return the validators of a full response to a revalidating request on
+    ``url``, to be saved once the page content is stored. Other responses
+    (e.g. 404) have none."""
+    if response.status_code != _HTTP_200:
+        return PageValidators(url=url)
+    return PageValidators(
+        url=url,
+        etag=response.headers.get("ETag"),
+        last_modified=response.headers.get("Last-Modified"),
+    )
+
+
 def validate_response_status(
     response: httpx2.Response,
     valid_codes: list[int] | None = None,
@@ -33,8 +53,13 @@ def validate_response_status(
     """Validate HTTP response status code.
 
     Raises:
+        BlizzardNotModifiedError: If Blizzard answered a conditional request
+            with 304 Not Modified
         ParserBlizzardError: If status code is not in ``valid_codes`` (default: [200])
     """
+    if response.status_code == _HTTP_304:
+        raise BlizzardNotModifiedError
+
     if valid_codes is None:
         valid_codes = [200]
 
@@ -1,13 +1,14 @@
 """Domain ports (protocols) for dependency injection"""
 
 from .blizzard_client import BlizzardClientPort
-from .cache import CachePort
+from .cache import CachePipeline, CachePort
 from .storage import StoragePort
 from .task_queue import TaskQueuePort
 from .throttle import ThrottlePort
 
 __all__ = [
     "BlizzardClientPort",
+    "CachePipeline",
     "CachePort",
     "StoragePort",
     "TaskQueuePort",
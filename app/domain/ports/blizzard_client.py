@@ -5,6 +5,9 @@ from typing import TYPE_CHECKING, Protocol
 if TYPE_CHECKING:
     import httpx2
 
+    from app.domain.enums import BlizzardRequestPriority
+    from app.domain.models import PageValidators
+
 
 class BlizzardClientPort(Protocol):
     """Protocol for Blizzard API/web client operations"""
@@ -15,8 +18,28 @@ class BlizzardClientPort(Protocol):
         *,
         headers: dict[str, str] | None = None,
         params: dict[str, str] | None = None,
+        priority: BlizzardRequestPriority | None = None,
+        revalidate: bool = False,
     ) -> httpx2.Response:
-        """GET request to the given URL, respecting configured throttling."""
+        """GET request to the given URL, respecting configured throttling.
+
+        Without explicit priority, the one of the current context is used
+        (interactive unless set otherwise, e.g. by background workers).
+
+        With ``revalidate``, the validators (ETag, Last-Modified) saved for
+        the same URL are sent, and the response may be a 304 Not Modified.
+        Validators of the response aren't saved, see ``save_validators``.
+        """
+        ...
+
+    async def save_validators(self, validators: PageValidators) -> None:
+        """Save the validators of a full response, for the next revalidating
+        request on the same URL. Only call it once the page content is stored.
+        """
+        ...
+
+    async def warm_up(self) -> None:
+        """Open a connection ahead of the first request (best-effort)"""
         ...
 
     async def close(self) -> None:
@@ -1,6 +1,34 @@
 """Cache port protocol for dependency injection"""
 
-from typing import Protocol
+from typing import TYPE_CHECKING, Any, Protocol
+
+if TYPE_CHECKING:
+    from contextlib import AbstractAsyncContextManager
+
+
+class CachePipeline(Protocol):
+    """
+    Protocol for a batch of cache commands sent in a single round-trip.
+
+    Commands are only queued when called, and sent on ``execute()``, which
+    returns their results in order.
+    """
+
+    def get(self, key: str) -> None:
+        """Queue a read of the raw value of key"""
+        ...
+
+    def set(self, key: str, value: bytes, expire: int | None = None) -> None:
+        """Queue a write of a raw value with optional expiration (seconds)"""
+        ...
+
+    def delete(self, *keys: str) -> None:
+        """Queue a deletion of the given keys"""
+        ...
+
+    async def execute(self) -> list[Any]:
+        """Send the queued commands, and return their results in order"""
+        ...
 
 
 class CachePort(Protocol):
@@ -37,6 +65,36 @@ class CachePort(Protocol):
         """Check if key exists in cache"""
         ...
 
+    # Batch cache operations, each using a single round-trip
+    async def mget(self, keys: list[str]) -> list[bytes | None]:
+        """Get raw values of several keys, in order, None for missing ones"""
+        ...
+
+    async def mset_with_ttl(
+        self,
+        mapping: dict[str, bytes],
+        expire: int | None = None,
+    ) -> None:
+        """Set several raw values with the same optional expiration (seconds)"""
+        ...
+
+    async def delete_many(self, keys: list[str]) -> int:
+        """Delete several keys from cache, returning the number of deleted ones"""
+        ...
+
+    def pipeline(self) -> AbstractAsyncContextManager[CachePipeline]:
+        """
+        Open a pipeline to batch heterogeneous commands in a single round-trip.
+
+        Usage::
+
+            async with cache.pipeline() as pipe:
+                pipe.get("a")
+                pipe.set("b", b"1", expire=60)
+                value_a, _ = await pipe.execute()
+        """
+        ...
+
     # Application-specific cache methods
     async def get_api_cache(self, cache_key: str) -> dict | list | None:
         """
@@ -55,15 +113,16 @@ class CachePort(Protocol):
         stored_at: int | None = None,
         staleness_threshold: int | None = None,
         stale_while_revalidate: int = 0,
-    ) -> None:
+        player_id: str | None = None,
+    ) -> str | None:
         """Update or set an API cache value with an expiration (in seconds).
 
-        Value is wrapped in a metadata envelope before storage::
+        Value is stored as a SWR envelope : a metadata header line followed by
+        the compressed JSON body, readable by nginx without any JSON parsing::
 
-            {"data_json": "<pre-serialized JSON string>",
-             "stored_at": <unix epoch>,
-             "staleness_threshold": <seconds>,
-             "stale_while_revalidate": <seconds>}
+            <stored_at> <staleness_threshold> <stale_while_revalidate> <etag>\n<body>
+
+        A value built from more recent data (later ``stored_at``) is kept.
 
         Args:
             cache_key: Cache key suffix.
@@ -74,6 +133,20 @@ class CachePort(Protocol):
                 Defaults to ``expire``.
             stale_while_revalidate: Seconds the caller may serve stale data while
                 revalidating. 0 means no SWR window.
+            player_id: When given, the key is recorded in the cache index of
+                this player, for ``evict_players_api_cache``.
+
+        Returns:
+            The entity tag of the body, or None if the value wasn't stored (a
+            more recent one was kept, or the write failed).
+        """
+        ...
+
+    async def evict_players_api_cache(self, player_ids: list[str]) -> dict[str, int]:
+        """Delete all API cache values recorded in the cache indexes of players,
+        in a constant number of round-trips.
+
+        Returns the number of deleted keys by player ID.
         """
         ...
 
@@ -116,6 +189,42 @@ class CachePort(Protocol):
         """Persist the working Blizzard filter value for gamemode with no TTL."""
         ...
 
+    async def decay_player_popularity(self, factor: float, max_players: int) -> None:
+        """Multiply popularity scores of all players by ``factor``, and only keep
+        the ``max_players`` most popular ones."""
+        ...
+
+    async def get_popular_players(self, count: int) -> list[str]:
+        """Return the IDs of the ``count`` most popular players, most popular
+        first. Returns an empty list on error."""
+        ...
+
+    async def acquire_lock(self, key: str, token: str, ttl: int) -> bool:
+        """Try to take a short-lived lock, identified by a caller-generated token.
+
+        Returns True if the lock was acquired, False if it's already held.
+        Returns True as well when the cache is unavailable, so that callers
+        proceed without coordination rather than waiting forever.
+        """
+        ...
+
+    async def release_lock(self, key: str, token: str) -> None:
+        """Release a lock, only if it's still held with the given token."""
+        ...
+
+    async def run_script(
+        self,
+        script: str,
+        keys: list[str],
+        args: list[str | bytes | int | float],
+    ) -> Any:
+        """Run a server-side Lua script atomically, and return its result.
+
+        Scripts receive ``keys`` as KEYS and ``args`` as ARGV. Returns None
+        when the cache is unavailable.
+        """
+        ...
+
     async def scan_keys(self, pattern: str) -> list[str]:
         """Return all cache keys matching the given glob pattern.
 
@@ -43,12 +43,22 @@ class StoragePort(Protocol):
         """Store static data. ``data`` is a raw string (HTML or JSON)."""
         ...
 
+    async def touch_static_data(self, key: str) -> bool:
+        """Reset the ``updated_at`` timestamp of static data to now, when its
+        source is known to be unchanged (e.g. Blizzard answered 304).
+
+        Returns False if there is no static data for this key.
+        """
+        ...
+
     async def get_player_profile(self, player_id: str) -> dict | None:
         """
         Get player profile HTML and parsed summary.
 
         Returns dict with 'html', 'summary' (dict), 'battletag', 'name',
-        'last_updated_blizzard', 'updated_at' (int Unix ts), 'data_version'
+        'last_updated_blizzard', 'updated_at' (int Unix ts), 'data_version',
+        'parsed_profile' (dict or None), 'parsed_profile_size' (length of the
+        serialized parsed profile, or None), 'parser_version' (int or None)
         or None if not found.
         """
         ...
@@ -65,6 +75,14 @@ class StoragePort(Protocol):
         """
         ...
 
+    async def get_player_profiles_updated_at(
+        self, player_ids: list[str]
+    ) -> dict[str, int]:
+        """Return the ``updated_at`` timestamp (Unix int) of stored profiles, by
+        player ID or battletag as given. Players without profile are omitted.
+        """
+        ...
+
     async def set_player_profile(
         self,
         player_id: str,
@@ -74,8 +92,39 @@ class StoragePort(Protocol):
         name: str | None = None,
         last_updated_blizzard: int | None = None,
         data_version: int = 1,
+        parsed_profile: dict | None = None,
+        parser_version: int | None = None,
+    ) -> None:
+        """Store player profile HTML and parsed summary with optional metadata.
+
+        ``parsed_profile`` is the output of the profile parser for ``html``,
+        tagged with ``parser_version`` so readers can skip re-parsing the HTML
+        as long as the parser didn't change.
+        """
+        ...
+
+    async def set_player_profiles(self, profiles: list[dict]) -> None:
+        """Store several player profiles at once, each dict holding the
+        keyword arguments of ``set_player_profile``. Used by batched background
+        refreshes, to save storage round-trips."""
+        ...
+
+    async def set_player_profile_parsed(
+        self,
+        player_id: str,
+        parsed_profile: dict,
+        parser_version: int,
     ) -> None:
-        """Store player profile HTML and parsed summary with optional metadata"""
+        """Replace the parsed profile document of an existing player profile,
+        without touching its ``updated_at`` timestamp."""
+        ...
+
+    async def touch_player_profile(self, player_id: str) -> bool:
+        """Reset the ``updated_at`` timestamp of a player profile to now, when
+        its HTML is known to be unchanged (e.g. Blizzard answered 304).
+
+        Returns False if there is no profile for this player.
+        """
         ...
 
     async def delete_old_player_profiles(self, max_age_seconds: int) -> int:
@@ -11,17 +11,42 @@ class TaskQueuePort(Protocol):
         task_name: str,
         *,
         job_id: str | None = None,
+        run_at: float | None = None,
     ) -> str:
         """Enqueue a background task by name, returning the effective job ID.
 
         Implementations must silently skip the enqueue when the job is already
         pending or running (deduplication by ``job_id``).
         The ``job_id`` is also passed to the task as its first positional argument.
+        When ``run_at`` (Unix timestamp) is in the future, the task is only
+        executed once it's due.
         """
         ...
 
-    async def is_job_pending_or_running(self, job_id: str) -> bool:
-        """Return True if a job with this ID is already pending or running."""
+    async def get_admission_rate(self) -> float:
+        """Return the share (0 to 1) of background refreshes to enqueue, given
+        the current queue backlog and Blizzard rate limiting.
+
+        Called on every stale hit, so implementations should avoid a network
+        round-trip per call. Returns 1 when the state can't be read.
+        """
+        ...
+
+    async def dequeue_batch(
+        self, task_name: str, count: int, consumer_id: str
+    ) -> list[str]:
+        """Take up to ``count`` job IDs of a task enqueued for batched
+        processing, oldest first, on behalf of ``consumer_id``. Returns an
+        empty list when there is none left.
+
+        Taken jobs are kept until ``ack_batch`` is called : while they are,
+        the same jobs are returned again to ``consumer_id``, so that a batch
+        interrupted by a crash is resumed by the consumer queued again.
+        """
+        ...
+
+    async def ack_batch(self, task_name: str, consumer_id: str) -> None:
+        """Forget the jobs last taken by ``consumer_id``, once processed."""
         ...
 
     async def release_job(self, job_id: str) -> None:
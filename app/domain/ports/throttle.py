@@ -1,13 +1,27 @@
 """Throttle port protocol for dependency injection"""
 
-from typing import Protocol
+from typing import TYPE_CHECKING, Protocol
+
+if TYPE_CHECKING:
+    from app.domain.enums import BlizzardRequestPriority
 
 
 class ThrottlePort(Protocol):
     """Protocol for adaptive request throttling."""
 
-    async def wait_before_request(self) -> None:
-        """Sleep for the current throttle delay, or raise RateLimitedError if in penalty."""
+    async def wait_before_request(
+        self,
+        priority: BlizzardRequestPriority | None = None,
+        max_wait: float | None = None,
+    ) -> None:
+        """Sleep for the current throttle delay, or raise RateLimitedError if in penalty.
+
+        Interactive requests are also rejected, without taking any request slot,
+        when they would have to wait more than ``max_wait`` seconds.
+
+        Background requests only use spare capacity, and are deferred instead of
+        rejected during a penalty. Requests are interactive by default.
+        """
         ...
 
     async def adjust_delay(self, status_code: int) -> None:
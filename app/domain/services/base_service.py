@@ -13,9 +13,15 @@ staleness strategy (Blizzard ``lastUpdated`` comparison) and storage logic
 (``player_profiles`` table).
 """
 
+import random
 from typing import TYPE_CHECKING, Any
 
+from app.config import settings
 from app.infrastructure.logger import logger
+from app.monitoring.metrics import (
+    background_refresh_admission_rate,
+    background_refresh_shed_total,
+)
 
 if TYPE_CHECKING:
     from app.domain.ports import (
@@ -32,7 +38,8 @@ class BaseService:
     Provides:
     - Adapter references (cache, storage, blizzard_client, task_queue)
     - ``_update_api_cache``: write to Valkey after serving data
-    - ``_enqueue_refresh``: deduplicated background refresh scheduling
+    - ``_enqueue_refresh``: deduplicated background refresh scheduling, with
+      admission control under queue backlog or Blizzard rate limiting
     """
 
     def __init__(
@@ -56,37 +63,55 @@ class BaseService:
         stored_at: int | None = None,
         staleness_threshold: int | None = None,
         stale_while_revalidate: int = 0,
-    ) -> None:
-        """Write data to Valkey API cache, swallowing errors."""
+        player_id: str | None = None,
+    ) -> str | None:
+        """Write data to Valkey API cache, swallowing errors.
+
+        Returns the entity tag of the cached body (None if the write failed).
+        """
         try:
-            await self.cache.update_api_cache(
+            return await self.cache.update_api_cache(
                 cache_key,
                 data,
                 cache_ttl,
                 stored_at=stored_at,
                 staleness_threshold=staleness_threshold,
                 stale_while_revalidate=stale_while_revalidate,
+                player_id=player_id,
             )
         except Exception as exc:  # noqa: BLE001
             logger.warning("[SWR] Valkey write failed for {}: {}", cache_key, exc)
+            return None
 
     async def _enqueue_refresh(
         self,
         entity_type: str,
         entity_id: str,
-    ) -> None:
+        *,
+        run_at: float | None = None,
+    ) -> bool:
         """Enqueue a background refresh, deduplicating via job_id.
 
         ``job_id`` is set to ``entity_id`` so the task receives it directly
         as its first positional argument — no separate args needed.
+        ``run_at`` optionally delays the refresh until this Unix timestamp.
+
+        Only a share of refreshes are enqueued while the queue is backlogged
+        or Blizzard is rate limiting us, the others being skipped before any
+        Valkey round-trip. Returns False if the refresh was skipped this way,
+        so that callers can serve stale data for longer.
         """
-        job_id = entity_id
+        if not await self._admit_refresh(entity_type):
+            return False
+
+        # The task queue skips the job if it's already pending or running, in
+        # the same round-trip as the enqueue
         try:
-            if not await self.task_queue.is_job_pending_or_running(job_id):
-                await self.task_queue.enqueue(
-                    f"refresh_{entity_type}",
-                    job_id=job_id,
-                )
+            await self.task_queue.enqueue(
+                f"refresh_{entity_type}",
+                job_id=entity_id,
+                run_at=run_at,
+            )
         except Exception as exc:  # noqa: BLE001
             logger.warning(
                 "[SWR] Failed to enqueue refresh for {}/{}: {}",
@@ -94,3 +119,22 @@ class BaseService:
                 entity_id,
                 exc,
             )
+        return True
+
+    async def _admit_refresh(self, entity_type: str) -> bool:
+        try:
+            rate = await self.task_queue.get_admission_rate()
+        except Exception:  # noqa: BLE001
+            return True
+
+        if settings.prometheus_enabled:
+            background_refresh_admission_rate.set(rate)
+        if rate >= 1.0 or random.random() < rate:
+            return True
+
+        if settings.prometheus_enabled:
+            background_refresh_shed_total.labels(entity_type=entity_type).inc()
+        logger.debug(
+            "[SWR] Skipped {} refresh (admission rate {:.2f})", entity_type, rate
+        )
+        return False
@@ -26,7 +26,7 @@ class GamemodeService(StaticDataService):
     async def list_gamemodes(
         self,
         cache_key: str,
-    ) -> tuple[list[dict], bool, int]:
+    ) -> tuple[list[dict], bool, int, str | None]:
         """Return the gamemodes list."""
         return await self.get_or_fetch(self._gamemodes_config(cache_key))
 
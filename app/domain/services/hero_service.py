@@ -14,6 +14,7 @@ from app.domain.parsers.hero import fetch_hero_html, parse_hero_html
 from app.domain.parsers.hero_stats_summary import parse_hero_stats_summary
 from app.domain.parsers.heroes import (
     fetch_heroes_html,
+    fetch_heroes_html_if_modified,
     filter_heroes,
     parse_heroes_html,
 )
@@ -29,6 +30,7 @@ if TYPE_CHECKING:
         PlayerRegion,
         Role,
     )
+    from app.domain.models import PageValidators
 
 
 class HeroService(StaticDataService):
@@ -50,6 +52,9 @@ class HeroService(StaticDataService):
         async def _fetch() -> str:
             return await fetch_heroes_html(self.blizzard_client, locale)
 
+        async def _fetch_if_modified() -> tuple[str, PageValidators]:
+            return await fetch_heroes_html_if_modified(self.blizzard_client, locale)
+
         def _parse(html: str) -> list[dict]:
             try:
                 return parse_heroes_html(html)
@@ -62,6 +67,7 @@ class HeroService(StaticDataService):
         return StaticFetchConfig(
             storage_key=f"heroes:{locale}",
             fetcher=_fetch,
+            conditional_fetcher=_fetch_if_modified,
             parser=_parse,
             result_filter=(
                 (lambda data: filter_heroes(data, role, gamemode))
@@ -80,7 +86,7 @@ class HeroService(StaticDataService):
         role: Role | SubRole | None,
         gamemode: HeroGamemode | None,
         cache_key: str,
-    ) -> tuple[list[dict], bool, int]:
+    ) -> tuple[list[dict], bool, int, str | None]:
         """Return the heroes list (with optional role/gamemode filters).
 
         Stores raw Blizzard HTML per locale in persistent storage so that
@@ -100,7 +106,9 @@ class HeroService(StaticDataService):
         cache_key = (
             f"/heroes?locale={locale_str}" if locale != Locale.ENGLISH_US else "/heroes"
         )
-        await self._fetch_and_store(self._heroes_list_config(locale, cache_key))
+        await self._fetch_and_store(
+            self._heroes_list_config(locale, cache_key), revalidate=True
+        )
 
     # ------------------------------------------------------------------
     # Single hero  (GET /heroes/{hero_key})
@@ -151,7 +159,7 @@ class HeroService(StaticDataService):
         hero_key: str,
         locale: Locale,
         cache_key: str,
-    ) -> tuple[dict, bool, int]:
+    ) -> tuple[dict, bool, int, str | None]:
         """Return full hero details merged with portrait and hitpoints.
 
         Stores a JSON-encoded dict of raw HTML sources per ``hero_key:locale``
@@ -191,7 +199,7 @@ class HeroService(StaticDataService):
         competitive_division: CompetitiveDivisionFilter | None,
         order_by: str,
         cache_key: str,
-    ) -> tuple[list[dict], bool, int]:
+    ) -> tuple[list[dict], bool, int, str | None]:
         """Return hero usage statistics — Valkey-only cache, no persistent storage.
 
         Stats change frequently and have too many parameter combinations to
@@ -224,12 +232,12 @@ class HeroService(StaticDataService):
             ) from gamemode_filter_exception
 
         await self.cache.set_gamemode_filter(gamemode, working_filter)
-        await self._update_api_cache(
+        etag = await self._update_api_cache(
             cache_key,
             data,
             settings.hero_stats_cache_timeout,
         )
-        return data, False, 0
+        return data, False, 0, etag
 
     async def _get_hero_stats_gamemode_filters(
         self, gamemode: PlayerGamemode
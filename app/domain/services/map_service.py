@@ -36,7 +36,7 @@ class MapService(StaticDataService):
         self,
         gamemode: str | None,
         cache_key: str,
-    ) -> tuple[list[dict], bool, int]:
+    ) -> tuple[list[dict], bool, int, str | None]:
         """Return the maps list (with optional gamemode filter).
 
         Stores the full (unfiltered) maps list in persistent storage.
@@ -1,33 +1,41 @@
 """Player domain service — career, stats, summary, and search"""
 
+import asyncio
 import time
+from contextlib import asynccontextmanager
 from http import HTTPStatus
-from typing import TYPE_CHECKING, Never, cast
+from typing import TYPE_CHECKING, ClassVar, Never, cast
+from uuid import uuid4
 
 if TYPE_CHECKING:
-    from collections.abc import Callable
+    from collections.abc import AsyncIterator, Callable
+
+    from app.domain.models import PageValidators
 
 from app.config import settings
 from app.domain.enums import HeroKeyCareerFilter, PlayerGamemode, PlayerPlatform
 from app.domain.exceptions import (
+    BlizzardNotModifiedError,
     ParserBlizzardError,
     ParserInternalError,
     ParserParsingError,
 )
 from app.domain.models.player import PlayerIdentity
 from app.domain.parsers.player_career_stats import (
-    parse_player_career_stats_from_html,
+    parse_player_career_stats_from_profile,
 )
 from app.domain.parsers.player_profile import (
+    PLAYER_PROFILE_PARSER_VERSION,
     extract_name_from_profile_html,
     fetch_player_html,
+    fetch_player_html_if_modified,
     filter_all_stats_data,
     filter_stats_by_query,
     parse_player_profile_html,
 )
 from app.domain.parsers.player_search import parse_player_search
 from app.domain.parsers.player_stats import (
-    parse_player_stats_summary_from_html,
+    parse_player_stats_summary_from_profile,
 )
 from app.domain.parsers.player_summary import (
     fetch_player_summary_json,
@@ -35,8 +43,12 @@ from app.domain.parsers.player_summary import (
 )
 from app.domain.parsers.utils import is_blizzard_id
 from app.domain.services.base_service import BaseService
+from app.domain.utils.parsed_profile_cache import ParsedProfileCache
 from app.infrastructure.logger import logger
 from app.monitoring.metrics import (
+    player_cache_keys_evicted,
+    player_prerefresh_enqueued_total,
+    player_requests_coalesced_total,
     storage_battletag_lookup_total,
     storage_cache_hit_total,
     storage_hits_total,
@@ -50,6 +62,21 @@ class PlayerService(BaseService):
     that was previously scattered across multiple controllers.
     """
 
+    # Profile loads in progress in this process, by requested player ID
+    _inflight_profile_loads: ClassVar[
+        dict[str, asyncio.Future[tuple[dict, PlayerIdentity]]]
+    ] = {}
+
+    # Seconds between two checks of a profile load lock held by another process
+    _lock_poll_interval: ClassVar[float] = 0.1
+
+    # Player profiles writes (and validators of their pages), and cache
+    # evictions buffered during a batched background refresh (see
+    # ``buffered_profile_writes``), None otherwise
+    _pending_profile_writes: list[dict] | None = None
+    _pending_validators: list[PageValidators] | None = None
+    _pending_cache_evictions: list[str] | None = None
+
     # ------------------------------------------------------------------
     # Search  (Valkey-only, no persistent storage, no SWR)
     # ------------------------------------------------------------------
@@ -61,8 +88,11 @@ class PlayerService(BaseService):
         offset: int,
         limit: int,
         cache_key: str,
-    ) -> dict:
-        """Search for players by name — Valkey-only cache, no persistent storage."""
+    ) -> tuple[dict, str | None]:
+        """Search for players by name — Valkey-only cache, no persistent storage.
+
+        Returns the results, and the entity tag written to the API cache.
+        """
         try:
             data = await parse_player_search(
                 self.blizzard_client,
@@ -78,10 +108,10 @@ class PlayerService(BaseService):
             )
             raise ParserInternalError(blizzard_url, exc) from exc
 
-        await self._update_api_cache(
+        etag = await self._update_api_cache(
             cache_key, data, settings.search_account_path_cache_timeout
         )
-        return data
+        return data, etag
 
     # ------------------------------------------------------------------
     # Player summary  (GET /players/{player_id}/summary)
@@ -91,11 +121,11 @@ class PlayerService(BaseService):
         self,
         player_id: str,
         cache_key: str,
-    ) -> tuple[dict, bool, int]:
+    ) -> tuple[dict, bool, int, str | None]:
         """Return player summary (name, avatar, competitive ranks, …)."""
 
-        def extract(html: str, player_summary: dict) -> dict:
-            return parse_player_profile_html(html, player_summary).get("summary") or {}
+        def extract(profile: dict) -> dict:
+            return profile.get("summary") or {}
 
         return await self._execute_player_request(player_id, cache_key, extract)
 
@@ -109,11 +139,10 @@ class PlayerService(BaseService):
         gamemode: PlayerGamemode | None,
         platform: PlayerPlatform | None,
         cache_key: str,
-    ) -> tuple[dict, bool, int]:
+    ) -> tuple[dict, bool, int, str | None]:
         """Return full player data: summary + stats."""
 
-        def extract(html: str, player_summary: dict) -> dict:
-            profile = parse_player_profile_html(html, player_summary)
+        def extract(profile: dict) -> dict:
             return {
                 "summary": profile.get("summary") or {},
                 "stats": filter_all_stats_data(
@@ -146,27 +175,138 @@ class PlayerService(BaseService):
         try:
             identity = await self._resolve_player_identity(player_id)
             effective_id = identity.blizzard_id or player_id
-            await self._get_player_html(effective_id, identity, force_update=True)
-            await self._evict_player_cache_keys(player_id)
+            await self._get_player_profile(effective_id, identity, force_update=True)
+            if self._pending_cache_evictions is not None:
+                self._pending_cache_evictions.append(player_id)
+            else:
+                await self._evict_player_cache_keys(player_id)
         except Exception as exc:  # noqa: BLE001
             await self._handle_player_exceptions(exc, player_id, identity)
 
-    async def _evict_player_cache_keys(self, player_id: str) -> None:
-        """Delete all API cache keys for *player_id* from Valkey.
+    @asynccontextmanager
+    async def buffered_profile_writes(self) -> AsyncIterator[None]:
+        """Buffer player profiles stored by ``refresh_player_profile`` calls
+        made within the context, in order to store them all at once on exit.
+
+        API cache keys of refreshed players are only evicted after the write,
+        otherwise the next requests could repopulate the cache with the
+        previous profile. If the write fails, its error is raised on exit.
+        """
+        self._pending_profile_writes = []
+        self._pending_validators = []
+        self._pending_cache_evictions = []
+        try:
+            yield
+        finally:
+            profiles, self._pending_profile_writes = self._pending_profile_writes, None
+            validators, self._pending_validators = self._pending_validators, None
+            player_ids, self._pending_cache_evictions = (
+                self._pending_cache_evictions,
+                None,
+            )
+            await self._flush_profile_writes(profiles, validators, player_ids)
+
+    async def _flush_profile_writes(
+        self,
+        profiles: list[dict],
+        validators: list[PageValidators],
+        player_ids: list[str],
+    ) -> None:
+        """Store buffered player profiles, then save the validators of their
+        pages and evict API cache keys of players. A failed storage write is
+        raised, nothing else being done."""
+        if profiles:
+            try:
+                await self.storage.set_player_profiles(profiles)
+            except Exception as exc:
+                logger.warning(
+                    "[refresh] Storage write of {} player profile(s) failed: {}",
+                    len(profiles),
+                    exc,
+                )
+                raise
+            logger.info("[refresh] Stored {} player profile(s)", len(profiles))
+
+        for page_validators in validators:
+            await self.blizzard_client.save_validators(page_validators)
+
+        if player_ids:
+            await self._evict_player_cache_keys(*player_ids)
+
+    async def prerefresh_popular_players(self, interval: int, budget: int) -> int:
+        """Enqueue refreshes of the most popular players whose profile is about
+        to expire, so that their requests never wait for Blizzard.
+
+        Called by the scheduler every ``interval`` seconds : popularity scores
+        are decayed, then among the ``player_prerefresh_top_k`` most popular
+        players, up to ``budget`` profiles old enough are enqueued, the oldest
+        first. Players without stored profile are skipped. Refreshes are
+        delayed evenly over the interval, to spread the load on Blizzard.
 
-        Uses a glob scan so every endpoint/parameter combination is cleared
-        without needing to enumerate them explicitly.  The next request for
-        each key will hit the storage fast-path and repopulate the cache.
+        Returns the number of enqueued refreshes.
         """
-        pattern = f"{settings.api_cache_key_prefix}:/players/{player_id}*"
-        keys = await self.cache.scan_keys(pattern)
-        for key in keys:
-            await self.cache.delete(key)
-        if keys:
-            logger.debug(
-                "[refresh] Evicted {} cache key(s) for {}", len(keys), player_id
+        await self.cache.decay_player_popularity(
+            0.5 ** (interval / settings.player_popularity_half_life),
+            settings.player_popularity_max_players,
+        )
+        if budget <= 0:
+            return 0
+
+        player_ids = await self.cache.get_popular_players(
+            settings.player_prerefresh_top_k
+        )
+        updated_at = await self.storage.get_player_profiles_updated_at(player_ids)
+        max_updated_at = int(time.time()) - int(
+            settings.player_staleness_threshold
+            * settings.player_prerefresh_min_age_ratio
+        )
+        expiring_ids = sorted(
+            (
+                player_id
+                for player_id in player_ids
+                if updated_at.get(player_id, max_updated_at + 1) <= max_updated_at
+            ),
+            key=updated_at.__getitem__,
+        )[:budget]
+
+        now = time.time()
+        for index, player_id in enumerate(expiring_ids):
+            await self._enqueue_refresh(
+                "player_profile",
+                player_id,
+                run_at=now + interval * index / len(expiring_ids),
             )
 
+        if settings.prometheus_enabled:
+            player_prerefresh_enqueued_total.inc(len(expiring_ids))
+        logger.info(
+            "[prerefresh] {} popular player(s) enqueued (budget {})",
+            len(expiring_ids),
+            budget,
+        )
+        return len(expiring_ids)
+
+    async def _evict_player_cache_keys(self, *player_ids: str) -> None:
+        """Delete all API cache keys of *player_ids* from Valkey.
+
+        Every endpoint/parameter combination written for a player is recorded
+        in its cache index, so they are all cleared without scanning the
+        keyspace, for all players at once.  The next request for each key will
+        hit the storage fast-path and repopulate the cache.
+        """
+        self._invalidate_parsed_profile(*player_ids)
+        evicted = await self.cache.evict_players_api_cache(list(player_ids))
+        for player_id in player_ids:
+            player_evicted = evicted.get(player_id, 0)
+            if settings.prometheus_enabled:
+                player_cache_keys_evicted.observe(player_evicted)
+            if player_evicted:
+                logger.debug(
+                    "[refresh] Evicted {} cache key(s) for {}",
+                    player_evicted,
+                    player_id,
+                )
+
     # ------------------------------------------------------------------
     # Player stats  (GET /players/{player_id}/stats)
     # ------------------------------------------------------------------
@@ -178,11 +318,10 @@ class PlayerService(BaseService):
         platform: PlayerPlatform | None,
         hero: HeroKeyCareerFilter | None,
         cache_key: str,
-    ) -> tuple[dict, bool, int]:
+    ) -> tuple[dict, bool, int, str | None]:
         """Return player stats with category labels."""
 
-        def extract(html: str, player_summary: dict) -> dict:
-            profile = parse_player_profile_html(html, player_summary)
+        def extract(profile: dict) -> dict:
             return filter_stats_by_query(
                 profile.get("stats") or {}, gamemode, platform, hero
             )
@@ -199,13 +338,11 @@ class PlayerService(BaseService):
         gamemode: PlayerGamemode | None,
         platform: PlayerPlatform | None,
         cache_key: str,
-    ) -> tuple[dict, bool, int]:
+    ) -> tuple[dict, bool, int, str | None]:
         """Return player statistics summary (winrate, kda, …)."""
 
-        def extract(html: str, player_summary: dict) -> dict:
-            return parse_player_stats_summary_from_html(
-                html, player_summary, gamemode, platform
-            )
+        def extract(profile: dict) -> dict:
+            return parse_player_stats_summary_from_profile(profile, gamemode, platform)
 
         return await self._execute_player_request(player_id, cache_key, extract)
 
@@ -220,12 +357,12 @@ class PlayerService(BaseService):
         platform: PlayerPlatform | None,
         hero: HeroKeyCareerFilter | None,
         cache_key: str,
-    ) -> tuple[dict, bool, int]:
+    ) -> tuple[dict, bool, int, str | None]:
         """Return player career stats (no labels)."""
 
-        def extract(html: str, player_summary: dict) -> dict:
-            return parse_player_career_stats_from_html(
-                html, gamemode, player_summary, platform, hero
+        def extract(profile: dict) -> dict:
+            return parse_player_career_stats_from_profile(
+                profile, gamemode, platform, hero
             )
 
         return await self._execute_player_request(player_id, cache_key, extract)
@@ -238,19 +375,24 @@ class PlayerService(BaseService):
         self,
         player_id: str,
         cache_key: str,
-        data_factory: Callable[[str, dict], dict],
-    ) -> tuple[dict, bool, int]:
-        """Resolve identity → get HTML → compute data → update cache → return.
+        data_factory: Callable[[dict], dict],
+    ) -> tuple[dict, bool, int, str | None]:
+        """Resolve identity → get parsed profile → compute data → update cache → return.
 
         Fast path: if persistent storage has a profile fresher than
         ``player_staleness_threshold``, all Blizzard calls are skipped and
-        the cached HTML + summary are used directly.
+        the stored parsed profile is used directly (the stored HTML is only
+        re-parsed when it was produced by another parser version). Parsed
+        profiles are also kept in the in-process ``ParsedProfileCache``, which
+        lets subsequent requests for the same player skip persistent storage.
+        As the parsed profile may be shared this way, ``data_factory`` must not
+        mutate it.
         """
         identity = PlayerIdentity()
-        effective_id = player_id
         data: dict = {}
         age: int = 0
         stored_at: int | None = None
+        parsed_profile: dict | None = None
 
         try:
             profile, age = await self._get_fresh_stored_profile(player_id)
@@ -260,28 +402,153 @@ class PlayerService(BaseService):
                 logger.info(
                     "Serving player data from persistent storage (within staleness threshold)"
                 )
-                data = data_factory(profile["profile"], profile["summary"])
-            else:
-                identity = await self._resolve_player_identity(player_id)
-                effective_id = identity.blizzard_id or player_id
-                html = await self._get_player_html(effective_id, identity)
-                data = data_factory(html, identity.player_summary)
+                parsed_profile = await self._get_stored_parsed_profile(profile)
+                # Profiles parsed again have no serialized size, they're cached
+                # by next requests once written back
+                if serialized_size := profile.get("parsed_profile_size"):
+                    ParsedProfileCache().set(
+                        player_id, stored_at, parsed_profile, serialized_size
+                    )
+        except Exception as exc:  # noqa: BLE001
+            await self._handle_player_exceptions(exc, player_id, identity)
 
+        if parsed_profile is None:
+            # Errors are already translated by the request which loaded the profile
+            parsed_profile, identity = await self._load_player_profile_once(player_id)
+
+        try:
+            data = data_factory(parsed_profile)
         except Exception as exc:  # noqa: BLE001
             await self._handle_player_exceptions(exc, player_id, identity)
 
         is_stale = self._check_player_staleness(age)
-        await self._update_api_cache(
+        stale_while_revalidate = 0
+        if is_stale:
+            stale_while_revalidate = (
+                settings.stale_cache_timeout
+                if await self._enqueue_refresh("player_profile", player_id)
+                else settings.stale_cache_backlog_timeout
+            )
+        etag = await self._update_api_cache(
             cache_key,
             data,
             settings.career_path_cache_timeout,
             stored_at=stored_at,
             staleness_threshold=settings.player_staleness_threshold,
-            stale_while_revalidate=settings.stale_cache_timeout if is_stale else 0,
+            stale_while_revalidate=stale_while_revalidate,
+            player_id=player_id,
         )
-        if is_stale:
-            await self._enqueue_refresh("player_profile", player_id)
-        return data, is_stale, age
+        return data, is_stale, age, etag
+
+    # ------------------------------------------------------------------
+    # Single-flight profile loading
+    # ------------------------------------------------------------------
+
+    async def _load_player_profile_once(
+        self, player_id: str
+    ) -> tuple[dict, PlayerIdentity]:
+        """Load a player profile from Blizzard, coalescing concurrent requests.
+
+        Within the process, concurrent requests for the same player share the
+        future of the first one, and get its result or its exception. Across
+        processes, see ``_load_player_profile_with_lock``.
+        """
+        while (inflight := self._inflight_profile_loads.get(player_id)) is not None:
+            logger.info("Waiting for in-flight profile load of {}", player_id)
+            if settings.prometheus_enabled:
+                player_requests_coalesced_total.labels(scope="process").inc()
+            try:
+                return await asyncio.shield(inflight)
+            except asyncio.CancelledError:
+                # Only retry when the loading request itself was cancelled
+                current_task = asyncio.current_task()
+                if not inflight.cancelled() or (
+                    current_task is not None and current_task.cancelling()
+                ):
+                    raise
+
+        future: asyncio.Future[tuple[dict, PlayerIdentity]] = (
+            asyncio.get_running_loop().create_future()
+        )
+        self._inflight_profile_loads[player_id] = future
+        try:
+            result = await self._load_player_profile_with_lock(player_id)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as exc:
+            future.set_exception(exc)
+            # Mark the exception as retrieved, in case nobody was waiting
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            del self._inflight_profile_loads[player_id]
+
+    async def _load_player_profile_with_lock(
+        self, player_id: str
+    ) -> tuple[dict, PlayerIdentity]:
+        """Load a player profile from Blizzard, holding a short-lived Valkey lock.
+
+        When another process already holds the lock, wait for it to be released
+        and use the profile it stored (the holder bumps ``updated_at`` even when
+        the profile didn't change). If the profile is still missing or stale in
+        persistent storage after that (the other process failed, or the lock
+        expired), load it anyway.
+        """
+        lock_key = f"{settings.player_fetch_lock_key_prefix}:{player_id}"
+        lock_token = uuid4().hex
+
+        if not await self.cache.acquire_lock(
+            lock_key, lock_token, settings.player_fetch_lock_timeout
+        ):
+            logger.info("Profile of {} is being loaded by another process", player_id)
+            if settings.prometheus_enabled:
+                player_requests_coalesced_total.labels(scope="cluster").inc()
+
+            if await self._wait_for_lock_release(lock_key):
+                profile, _ = await self._get_fresh_stored_profile(player_id)
+                if profile is not None:
+                    parsed_profile = await self._get_stored_parsed_profile(profile)
+                    return parsed_profile, PlayerIdentity(
+                        blizzard_id=profile["player_id"]
+                    )
+
+            return await self._load_player_profile(player_id)
+
+        try:
+            return await self._load_player_profile(player_id)
+        finally:
+            await self.cache.release_lock(lock_key, lock_token)
+
+    async def _wait_for_lock_release(self, lock_key: str) -> bool:
+        """Poll a lock until it's released. Returns False on timeout."""
+        deadline = time.monotonic() + settings.player_fetch_lock_timeout
+        while time.monotonic() < deadline:
+            await asyncio.sleep(self._lock_poll_interval)
+            if not await self.cache.exists(lock_key):
+                return True
+        return False
+
+    async def _load_player_profile(self, player_id: str) -> tuple[dict, PlayerIdentity]:
+        """Resolve identity, then fetch, parse and store the player profile.
+
+        Errors are translated by ``_handle_player_exceptions`` here, so that
+        requests sharing the result don't mark the player as unknown again.
+        """
+        identity = PlayerIdentity()
+        try:
+            identity = await self._resolve_player_identity(player_id)
+            effective_id = identity.blizzard_id or player_id
+            parsed_profile = await self._get_player_profile(effective_id, identity)
+        except Exception as exc:  # noqa: BLE001
+            await self._handle_player_exceptions(exc, player_id, identity)
+
+        # The stored profile changed, next requests read it from storage again
+        self._invalidate_parsed_profile(player_id, effective_id)
+        return parsed_profile, identity
 
     # ------------------------------------------------------------------
     # Profile caching helpers
@@ -302,8 +569,18 @@ class PlayerService(BaseService):
             storage_cache_hit_total.labels(table="player_profiles", result="hit").inc()
             storage_hits_total.labels(result="hit").inc()
 
+        is_current_parser = (
+            profile.get("parser_version") == PLAYER_PROFILE_PARSER_VERSION
+        )
         return {
+            "player_id": player_id,
             "profile": profile["html"],
+            "parsed_profile": (
+                profile.get("parsed_profile") if is_current_parser else None
+            ),
+            "parsed_profile_size": (
+                profile.get("parsed_profile_size") if is_current_parser else None
+            ),
             "summary": profile["summary"],
             "battletag": profile.get("battletag"),
             "name": profile.get("name"),
@@ -317,15 +594,69 @@ class PlayerService(BaseService):
         html: str,
         battletag: str | None = None,
         name: str | None = None,
-    ) -> None:
-        """Store player profile in persistent storage."""
-        await self.storage.set_player_profile(
-            player_id=player_id,
-            html=html,
-            summary=player_summary or None,
-            battletag=battletag,
-            name=name,
+        parsed_profile: dict | None = None,
+        validators: PageValidators | None = None,
+    ) -> dict:
+        """Parse player profile HTML (unless already parsed) and store both the
+        HTML and the parsed profile in persistent storage. Returns the parsed profile.
+
+        ``validators`` of the fetched page are saved once the profile is
+        stored. Within ``buffered_profile_writes``, both are deferred to the
+        end of the context.
+        """
+        if parsed_profile is None:
+            parsed_profile = parse_player_profile_html(html, player_summary)
+        profile = {
+            "player_id": player_id,
+            "html": html,
+            "summary": player_summary or None,
+            "battletag": battletag,
+            "name": name,
+            "parsed_profile": parsed_profile,
+            "parser_version": PLAYER_PROFILE_PARSER_VERSION,
+        }
+        if self._pending_profile_writes is not None:
+            self._pending_profile_writes.append(profile)
+            if validators is not None and self._pending_validators is not None:
+                self._pending_validators.append(validators)
+        else:
+            await self.storage.set_player_profile(**profile)
+            if validators is not None:
+                await self.blizzard_client.save_validators(validators)
+        return parsed_profile
+
+    @staticmethod
+    def _invalidate_parsed_profile(*player_ids: str) -> None:
+        """Remove parsed profiles of a player from the in-process cache, under
+        all the given IDs (requested player ID, resolved Blizzard ID)."""
+        profile_cache = ParsedProfileCache()
+        for player_id in player_ids:
+            profile_cache.delete(player_id)
+
+    async def _get_stored_parsed_profile(self, profile: dict) -> dict:
+        """Return the parsed profile of a stored player profile.
+
+        The stored document is used as-is when it was produced by the current
+        parser version. Otherwise the stored HTML is parsed again, and the new
+        document is written back so that next requests don't have to.
+        """
+        if profile["parsed_profile"] is not None:
+            return profile["parsed_profile"]
+
+        parsed_profile = parse_player_profile_html(
+            profile["profile"], profile["summary"]
         )
+        try:
+            await self.storage.set_player_profile_parsed(
+                profile["player_id"], parsed_profile, PLAYER_PROFILE_PARSER_VERSION
+            )
+        except Exception as exc:  # noqa: BLE001
+            logger.warning(
+                "Storage write of parsed profile failed for {}: {}",
+                profile["player_id"],
+                exc,
+            )
+        return parsed_profile
 
     def _check_player_staleness(self, age: int) -> bool:
         """Return True when the stored profile is old enough to warrant a background pre-refresh.
@@ -361,8 +692,29 @@ class PlayerService(BaseService):
         profile is absent. Returns tuple with ``(None, age)`` if the profile exists
         but is older than the threshold.
 
+        The in-process ``ParsedProfileCache`` is checked first, without any
+        storage round-trip: its entries are trusted until they expire, a
+        profile refreshed by another process (the worker) being served for at
+        most ``parsed_profile_cache_ttl`` seconds. The returned profile only
+        holds ``player_id``, ``parsed_profile`` and ``updated_at``, which is
+        all the fast path needs.
+
         See ``_check_player_staleness`` for the full SWR lifecycle description.
         """
+        profile_cache = ParsedProfileCache()
+        cached = profile_cache.get(player_id)
+        if cached is not None:
+            parsed_profile, updated_at = cached
+            age = int(time.time()) - updated_at
+            if age < settings.player_staleness_threshold:
+                logger.info("Parsed profile for {} found in memory cache", player_id)
+                return {
+                    "player_id": player_id,
+                    "parsed_profile": parsed_profile,
+                    "updated_at": updated_at,
+                }, age
+            profile_cache.delete(player_id)
+
         if is_blizzard_id(player_id):
             blizzard_id = player_id
         else:
@@ -386,36 +738,32 @@ class PlayerService(BaseService):
 
         return None, age
 
-    async def _get_player_html(
+    async def _get_player_profile(
         self,
         effective_id: str,
         identity: PlayerIdentity,
         *,
         force_update: bool = False,
-    ) -> str:
-        """Return player HTML, always storing fresh HTML in persistent storage.
+    ) -> dict:
+        """Return the parsed player profile, always storing fresh HTML in persistent storage.
 
         Priority order:
-        1. ``identity.cached_html`` — fetched during identity resolution; store and return.
+        1. ``identity.cached_html`` — fetched during identity resolution; parse, store and return.
         2. persistent storage hit with matching ``lastUpdated`` — the profile hasn't changed
            on Blizzard's side, so there is no need to re-fetch the HTML page.  When
            ``force_update=True`` (background worker), ``update_player_profile_cache`` is
-           called with the existing HTML to bump ``updated_at`` and reset the staleness clock.
+           called with the existing HTML (and parsed profile, unless the summary
+           changed) to bump ``updated_at`` and reset the staleness clock.
+           Otherwise, the stored profile is only touched to bump ``updated_at``.
            Battletag is backfilled in either case when it was previously missing.
-        3. Fetch from Blizzard, store, return.
+        3. Fetch from Blizzard, parse, store, return. When ``force_update=True``
+           and a profile is stored, the request is conditional : if the page
+           didn't change, see ``_reuse_stored_player_html``.
         """
         if identity.cached_html:
-            name = extract_name_from_profile_html(
-                identity.cached_html
-            ) or identity.player_summary.get("name")
-            await self.update_player_profile_cache(
-                effective_id,
-                identity.player_summary,
-                identity.cached_html,
-                identity.battletag_input,
-                name,
+            return await self._store_player_html(
+                effective_id, identity, identity.cached_html
             )
-            return identity.cached_html
 
         player_cache = await self.get_player_profile_cache(effective_id)
         if (
@@ -424,31 +772,93 @@ class PlayerService(BaseService):
             and player_cache["summary"].get("lastUpdated")
             == identity.player_summary.get("lastUpdated")
         ):
-            html = cast("str", player_cache["profile"])
             if force_update or (
                 identity.battletag_input and not player_cache.get("battletag")
             ):
-                await self.update_player_profile_cache(
+                # The stored parsed profile is still valid for the same summary
+                return await self.update_player_profile_cache(
                     effective_id,
                     identity.player_summary,
-                    html,
+                    cast("str", player_cache["profile"]),
                     identity.battletag_input,
                     player_cache.get("name"),
+                    parsed_profile=(
+                        player_cache["parsed_profile"]
+                        if identity.player_summary == player_cache["summary"]
+                        else None
+                    ),
+                )
+            # Reset the staleness clock, so that requests waiting for this load
+            # use the stored profile instead of loading it again
+            await self.storage.touch_player_profile(effective_id)
+            return await self._get_stored_parsed_profile(player_cache)
+
+        validators: PageValidators | None = None
+        if force_update and player_cache is not None:
+            try:
+                html, validators = await fetch_player_html_if_modified(
+                    self.blizzard_client, effective_id
                 )
-            return html
+            except BlizzardNotModifiedError:
+                return await self._reuse_stored_player_html(
+                    effective_id, identity, player_cache
+                )
+        else:
+            html, _ = await fetch_player_html(self.blizzard_client, effective_id)
+        return await self._store_player_html(effective_id, identity, html, validators)
 
-        html, _ = await fetch_player_html(self.blizzard_client, effective_id)
-        name = extract_name_from_profile_html(html) or identity.player_summary.get(
-            "name"
+    async def _reuse_stored_player_html(
+        self, effective_id: str, identity: PlayerIdentity, player_cache: dict
+    ) -> dict:
+        """Keep the stored profile when Blizzard answered 304 Not Modified.
+
+        Only ``updated_at`` is bumped, without parsing nor rewriting the HTML,
+        unless the player summary changed since it was stored (it's part of the
+        parsed profile).
+        """
+        summary_changed = bool(identity.player_summary) and (
+            identity.player_summary != player_cache["summary"]
+        )
+        if not summary_changed and await self.storage.touch_player_profile(
+            effective_id
+        ):
+            logger.info("Player profile of {} not modified", effective_id)
+            return await self._get_stored_parsed_profile(player_cache)
+
+        return await self.update_player_profile_cache(
+            effective_id,
+            identity.player_summary or player_cache["summary"],
+            cast("str", player_cache["profile"]),
+            identity.battletag_input or player_cache.get("battletag"),
+            player_cache.get("name"),
+        )
+
+    async def _store_player_html(
+        self,
+        effective_id: str,
+        identity: PlayerIdentity,
+        html: str,
+        validators: PageValidators | None = None,
+    ) -> dict:
+        """Parse freshly fetched HTML once, then store it along with its parsed
+        profile, and save the validators of its page if any.
+
+        HTML failing to parse is not stored : the parsing error is raised, and
+        the previously stored profile (if any) is kept as-is.
+        """
+        parsed_profile = parse_player_profile_html(html, identity.player_summary)
+        name = (parsed_profile["summary"].get("username") or "").strip() or (
+            identity.player_summary.get("name")
         )
-        await self.update_player_profile_cache(
+        return await self.update_player_profile_cache(
             effective_id,
             identity.player_summary,
             html,
             identity.battletag_input,
             name,
+            parsed_profile=parsed_profile,
+            validators=validators,
         )
-        return html
 
     # ------------------------------------------------------------------
     # Identity resolution
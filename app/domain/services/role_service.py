@@ -1,11 +1,20 @@
 """Role domain service — roles list"""
 
+from typing import TYPE_CHECKING
+
 from app.config import settings
 from app.domain.enums import Locale
 from app.domain.exceptions import ParserInternalError, ParserParsingError
-from app.domain.parsers.roles import fetch_roles_html, parse_roles_html
+from app.domain.parsers.roles import (
+    fetch_roles_html,
+    fetch_roles_html_if_modified,
+    parse_roles_html,
+)
 from app.domain.services.static_data_service import StaticDataService, StaticFetchConfig
 
+if TYPE_CHECKING:
+    from app.domain.models import PageValidators
+
 
 class RoleService(StaticDataService):
     """Domain service for role data."""
@@ -16,6 +25,9 @@ class RoleService(StaticDataService):
         async def _fetch() -> str:
             return await fetch_roles_html(self.blizzard_client, locale)
 
+        async def _fetch_if_modified() -> tuple[str, PageValidators]:
+            return await fetch_roles_html_if_modified(self.blizzard_client, locale)
+
         def _parse(html: str) -> list[dict]:
             try:
                 return parse_roles_html(html)
@@ -26,6 +38,7 @@ class RoleService(StaticDataService):
         return StaticFetchConfig(
             storage_key=f"roles:{locale}",
             fetcher=_fetch,
+            conditional_fetcher=_fetch_if_modified,
             parser=_parse,
             cache_key=cache_key,
             cache_ttl=settings.heroes_path_cache_timeout,
@@ -37,7 +50,7 @@ class RoleService(StaticDataService):
         self,
         locale: Locale,
         cache_key: str,
-    ) -> tuple[list[dict], bool, int]:
+    ) -> tuple[list[dict], bool, int, str | None]:
         """Return the roles list.
 
         Stores raw Blizzard HTML per locale so that parser changes take effect
@@ -54,4 +67,6 @@ class RoleService(StaticDataService):
         cache_key = (
             f"/roles?locale={locale_str}" if locale != Locale.ENGLISH_US else "/roles"
         )
-        await self._fetch_and_store(self._roles_config(locale, cache_key))
+        await self._fetch_and_store(
+            self._roles_config(locale, cache_key), revalidate=True
+        )
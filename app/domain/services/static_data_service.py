@@ -5,6 +5,7 @@ from dataclasses import dataclass, field
 from typing import TYPE_CHECKING, Any
 
 from app.config import settings
+from app.domain.exceptions import BlizzardNotModifiedError
 from app.domain.ports.storage import StaticDataCategory
 from app.domain.services import BaseService
 from app.infrastructure.logger import logger
@@ -15,7 +16,9 @@ from app.monitoring.metrics import (
 )
 
 if TYPE_CHECKING:
-    from collections.abc import Callable
+    from collections.abc import Awaitable, Callable
+
+    from app.domain.models import PageValidators
 
 
 @dataclass
@@ -24,6 +27,11 @@ class StaticFetchConfig:
 
     Pass a single ``StaticFetchConfig`` to ``StaticDataService.get_or_fetch``
     instead of passing each field as a separate keyword argument.
+
+    ``conditional_fetcher``, when set, fetches the same source as ``fetcher``
+    with a conditional request, raising ``BlizzardNotModifiedError`` when it
+    didn't change. It returns the source along with its validators, saved once
+    the source is stored. It's used by background refreshes.
     """
 
     storage_key: str
@@ -34,6 +42,9 @@ class StaticFetchConfig:
     entity_type: str
     parser: Callable[[Any], Any] | None = field(default=None)
     result_filter: Callable[[Any], Any] | None = field(default=None)
+    conditional_fetcher: Callable[[], Awaitable[tuple[Any, PageValidators]]] | None = (
+        field(default=None)
+    )
 
 
 class StaticDataService(BaseService):
@@ -48,13 +59,16 @@ class StaticDataService(BaseService):
     is reached; this service only ever *writes* to the API cache.
     """
 
-    async def get_or_fetch(self, config: StaticFetchConfig) -> tuple[Any, bool, int]:
+    async def get_or_fetch(
+        self, config: StaticFetchConfig
+    ) -> tuple[Any, bool, int, str | None]:
         """SWR orchestration for static data.
 
         Returns:
-            ``(data, is_stale, age_seconds)`` tuple.  ``age_seconds`` is the
+            ``(data, is_stale, age_seconds, etag)`` tuple.  ``age_seconds`` is the
             number of seconds since the data was last stored in persistent storage (0 on
-            a cold-start fetch).
+            a cold-start fetch). ``etag`` is the entity tag of the data written to
+            the API cache (None if the write failed).
         """
         stored = await self._load_from_storage(config.storage_key)
         if stored is not None:
@@ -78,7 +92,7 @@ class StaticDataService(BaseService):
 
     async def _serve_from_storage(
         self, stored: dict[str, Any], config: StaticFetchConfig
-    ) -> tuple[Any, bool, int]:
+    ) -> tuple[Any, bool, int, str | None]:
         """Serve data from a persistent storage hit, triggering a background refresh if stale.
 
         The stored ``raw`` value is always re-parsed with the current parser (for
@@ -98,7 +112,7 @@ class StaticDataService(BaseService):
                 age,
                 config.staleness_threshold,
             )
-            await self._enqueue_refresh(
+            admitted = await self._enqueue_refresh(
                 config.entity_type,
                 config.storage_key,
             )
@@ -109,13 +123,17 @@ class StaticDataService(BaseService):
             # Preserve the original stored_at so Age is computed correctly by nginx/Lua.
             # Use the full cache_ttl (not stale_cache_timeout) so X-Cache-TTL reflects the
             # real remaining lifetime of the entry, not just the short SWR window.
-            await self._update_api_cache(
+            etag = await self._update_api_cache(
                 config.cache_key,
                 filtered,
                 config.cache_ttl,
                 stored_at=stored["updated_at"],
                 staleness_threshold=config.staleness_threshold,
-                stale_while_revalidate=settings.stale_cache_timeout,
+                stale_while_revalidate=(
+                    settings.stale_cache_timeout
+                    if admitted
+                    else settings.stale_cache_backlog_timeout
+                ),
             )
         else:
             logger.info(
@@ -125,7 +143,7 @@ class StaticDataService(BaseService):
             )
             # Preserve the original stored_at so Age is computed correctly by nginx/Lua.
             # Without this, every Valkey re-write resets stored_at to now, making Age ≈ 0.
-            await self._update_api_cache(
+            etag = await self._update_api_cache(
                 config.cache_key,
                 filtered,
                 config.cache_ttl,
@@ -133,7 +151,7 @@ class StaticDataService(BaseService):
                 staleness_threshold=config.staleness_threshold,
             )
 
-        return filtered, is_stale, age
+        return filtered, is_stale, age, etag
 
     async def _parse_stored(self, raw: str, config: StaticFetchConfig) -> Any:
         """Produce structured data from ``raw`` stored source.
@@ -156,12 +174,36 @@ class StaticDataService(BaseService):
         """Apply ``result_filter`` to ``data`` if provided, otherwise return as-is."""
         return result_filter(data) if result_filter is not None else data
 
-    async def _fetch_and_store(self, config: StaticFetchConfig) -> Any:
-        """Fetch from source, persist raw source to persistent storage, update Valkey, return filtered data."""
-        if inspect.iscoroutinefunction(config.fetcher):
-            raw = await config.fetcher()
+    async def _fetch_and_store(
+        self, config: StaticFetchConfig, *, revalidate: bool = False
+    ) -> tuple[Any, str | None]:
+        """Fetch from source, persist raw source to persistent storage, update Valkey.
+
+        Returns the filtered data, and the entity tag written to the API cache.
+
+        With ``revalidate`` (background refreshes), the source is fetched with
+        ``config.conditional_fetcher`` if any. When the source didn't change,
+        only the ``updated_at`` of the stored source is bumped, and the API
+        cache is written again from the stored source with this new
+        ``stored_at``. Otherwise the validators of the new source are only
+        saved once it's stored.
+        """
+        validators: PageValidators | None = None
+        if revalidate and config.conditional_fetcher is not None:
+            try:
+                raw, validators = await config.conditional_fetcher()
+            except BlizzardNotModifiedError:
+                if await self.storage.touch_static_data(config.storage_key):
+                    logger.info(
+                        "[SWR] {} not modified — bumped stored {}",
+                        config.entity_type,
+                        config.storage_key,
+                    )
+                    return await self._update_api_cache_from_storage(config)
+                # Validators outlived the stored source, fetch it again
+                raw = await self._fetch(config)
         else:
-            raw = config.fetcher()
+            raw = await self._fetch(config)
 
         data = config.parser(raw) if config.parser is not None else raw
 
@@ -171,32 +213,67 @@ class StaticDataService(BaseService):
         raw_to_store = (
             raw if config.parser is not None else json.dumps(raw, separators=(",", ":"))
         )
-        await self._store_in_storage(
+        stored = await self._store_in_storage(
             config.storage_key, raw_to_store, config.entity_type
         )
+        if stored and validators is not None:
+            await self.blizzard_client.save_validators(validators)
 
         filtered = self._apply_filter(data, config.result_filter)
-        await self._update_api_cache(
+        etag = await self._update_api_cache(
             config.cache_key,
             filtered,
             config.cache_ttl,
             staleness_threshold=config.staleness_threshold,
         )
 
-        return filtered
+        return filtered, etag
 
-    async def _cold_fetch(self, config: StaticFetchConfig) -> tuple[Any, bool, int]:
+    async def _update_api_cache_from_storage(
+        self, config: StaticFetchConfig
+    ) -> tuple[Any, str | None]:
+        """Write the API cache from the stored source, with its ``updated_at``
+        as ``stored_at``, and return the filtered data and its entity tag
+        (both None if not stored)."""
+        stored = await self._load_from_storage(config.storage_key)
+        if stored is None:
+            return None, None
+
+        data = await self._parse_stored(stored["raw"], config)
+        filtered = self._apply_filter(data, config.result_filter)
+        etag = await self._update_api_cache(
+            config.cache_key,
+            filtered,
+            config.cache_ttl,
+            stored_at=stored["updated_at"],
+            staleness_threshold=config.staleness_threshold,
+        )
+        return filtered, etag
+
+    @staticmethod
+    async def _fetch(config: StaticFetchConfig) -> Any:
+        """Fetch raw source with ``config.fetcher``, sync or async."""
+        if inspect.iscoroutinefunction(config.fetcher):
+            return await config.fetcher()
+        return config.fetcher()
+
+    async def _cold_fetch(
+        self, config: StaticFetchConfig
+    ) -> tuple[Any, bool, int, str | None]:
         """Fetch from source on cold start, persist to storage and Valkey."""
         logger.info(
             "[SWR] {} not in storage — fetching from source", config.entity_type
         )
-        filtered = await self._fetch_and_store(config)
-        return filtered, False, 0
+        filtered, etag = await self._fetch_and_store(config)
+        return filtered, False, 0, etag
 
     async def _store_in_storage(
         self, storage_key: str, raw: str, entity_type: str
-    ) -> None:
-        """Persist raw source string to the ``static_data`` table (zstd-compressed BYTEA)."""
+    ) -> bool:
+        """Persist raw source string to the ``static_data`` table (zstd-compressed BYTEA).
+
+        Returns False if the write failed.
+        """
         try:
             await self.storage.set_static_data(
                 key=storage_key,
@@ -205,3 +282,5 @@ class StaticDataService(BaseService):
             )
         except Exception as exc:  # noqa: BLE001
             logger.warning("[SWR] Storage write failed for {}: {}", storage_key, exc)
+            return False
+        return True
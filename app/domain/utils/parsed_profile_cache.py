@@ -0,0 +1,130 @@
+"""In-process LRU cache of parsed player profiles"""
+
+import time
+from collections import OrderedDict
+from typing import NamedTuple
+
+from app.config import settings
+from app.infrastructure.metaclasses import Singleton
+from app.monitoring.metrics import (
+    parsed_profile_cache_evictions_total,
+    parsed_profile_cache_requests_total,
+    parsed_profile_cache_size_bytes,
+)
+
+# Estimated memory used by the Python objects of a parsed profile, per byte of
+# its serialized JSON (measured around 4 on the player test fixtures)
+PARSED_PROFILE_MEMORY_FACTOR = 4
+
+
+class _CacheEntry(NamedTuple):
+    parsed_profile: dict
+    updated_at: int
+    expires_at: float
+    size: int
+
+
+class ParsedProfileCache(metaclass=Singleton):
+    """Bounded cache of parsed ``{"summary", "stats"}`` profiles, local to the
+    current process.
+
+    Requests for the summary, stats and career endpoints of a given player
+    usually arrive in bursts. Keeping the parsed profile in memory lets all
+    but the first of them skip both persistent storage and the parser.
+
+    Entries are versioned by the ``updated_at`` of the stored profile they come
+    from, and an entry is never replaced by an older version. They're trusted
+    until they expire after ``parsed_profile_cache_ttl`` seconds, callers
+    deleting them when the current process stores or evicts the profile :
+    a profile refreshed by another process (the worker) may be served from
+    this cache for up to the TTL. Least recently used entries are evicted once
+    the estimated size of all entries exceeds ``parsed_profile_cache_max_bytes``,
+    each entry being estimated from the size of its serialized JSON (known by
+    the caller) times ``PARSED_PROFILE_MEMORY_FACTOR``.
+
+    Cached profiles are shared by all requests, and must not be mutated.
+    """
+
+    def __init__(self) -> None:
+        self.ttl = settings.parsed_profile_cache_ttl
+        self.max_bytes = settings.parsed_profile_cache_max_bytes
+        self._entries: OrderedDict[str, _CacheEntry] = OrderedDict()
+        self._size = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0 and self.max_bytes > 0
+
+    def get(self, player_id: str) -> tuple[dict, int] | None:
+        """Return ``(parsed_profile, updated_at)`` for the player, or None if
+        there is no valid entry for it. The returned profile is read-only."""
+        if not self.enabled:
+            return None
+
+        entry = self._entries.get(player_id)
+        if entry is not None and entry.expires_at <= time.monotonic():
+            self._remove(player_id, reason="expired")
+            entry = None
+
+        if settings.prometheus_enabled:
+            parsed_profile_cache_requests_total.labels(
+                result="miss" if entry is None else "hit"
+            ).inc()
+
+        if entry is None:
+            return None
+
+        self._entries.move_to_end(player_id)
+        return entry.parsed_profile, entry.updated_at
+
+    def set(
+        self,
+        player_id: str,
+        updated_at: int,
+        parsed_profile: dict,
+        serialized_size: int,
+    ) -> None:
+        """Store a parsed profile, given the size of its serialized JSON, unless
+        a version at least as recent is already cached."""
+        if not self.enabled:
+            return
+
+        existing = self._entries.get(player_id)
+        if existing is not None and existing.updated_at >= updated_at:
+            return
+
+        size = serialized_size * PARSED_PROFILE_MEMORY_FACTOR
+        if size > self.max_bytes:
+            return
+
+        if existing is not None:
+            self._remove(player_id)
+
+        self._entries[player_id] = _CacheEntry(
+            parsed_profile=parsed_profile,
+            updated_at=updated_at,
+            expires_at=time.monotonic() + self.ttl,
+            size=size,
+        )
+        self._size += size
+
+        while self._size > self.max_bytes:
+            oldest_player_id = next(iter(self._entries))
+            self._remove(oldest_player_id, reason="size")
+
+        if settings.prometheus_enabled:
+            parsed_profile_cache_size_bytes.set(self._size)
+
+    def delete(self, player_id: str) -> None:
+        """Remove the entry of a player, if any."""
+        if player_id in self._entries:
+            self._remove(player_id)
+
+    def _remove(self, player_id: str, reason: str | None = None) -> None:
+        entry = self._entries.pop(player_id)
+        self._size -= entry.size
+
+        if settings.prometheus_enabled:
+            if reason is not None:
+                parsed_profile_cache_evictions_total.labels(reason=reason).inc()
+            parsed_profile_cache_size_bytes.set(self._size)
@@ -1,5 +1,6 @@
-"""Infrastructure helpers — error reporting and Discord notifications."""
+"""Infrastructure helpers — error reporting, Discord notifications and ETags."""
 
+import hashlib
 import traceback
 from datetime import UTC, datetime
 from typing import Any
@@ -159,3 +160,12 @@ def send_discord_webhook_message(
     return httpx2.post(  # pragma: no cover
         settings.discord_webhook_url, json=payload, timeout=10
     )
+
+
+def compute_etag(body: bytes) -> str:
+    """Return the entity tag of a serialized response body (without quotes).
+
+    Computed once when the body is written to the API Cache, and emitted as a
+    weak ``ETag`` by both nginx (cache hits) and FastAPI (cache misses).
+    """
+    return hashlib.blake2b(body, digest_size=8).hexdigest()
@@ -7,6 +7,7 @@ from app.api.docs import setup_custom_openapi
 from app.api.enums import RouteTag
 from app.api.exception_handlers import register_exception_handlers
 from app.api.lifespan import lifespan
+from app.api.middlewares import RequestDeadlineMiddleware
 from app.api.profiler import register_profiler
 from app.api.responses import ASCIIJSONResponse
 from app.api.routers.docs import router as docs
@@ -117,6 +118,10 @@ if settings.profiler:  # pragma: no cover
     register_profiler(app, settings.profiler)
 
 
+# Abandon Blizzard requests of API requests running out of time
+if settings.api_request_deadline > 0:
+    app.add_middleware(RequestDeadlineMiddleware)
+
 # Add Prometheus middleware and /metrics endpoint if enabled
 if settings.prometheus_enabled:
     register_prometheus_middleware(app)
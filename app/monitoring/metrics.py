@@ -66,6 +66,32 @@ stale_responses_total = Counter(
     "Stale responses served from persistent storage (SWR)",
 )
 
+# In-process cache of parsed player profiles (per API worker process)
+parsed_profile_cache_requests_total = Counter(
+    "parsed_profile_cache_requests_total",
+    "In-process parsed player profile cache lookups by result",
+    ["result"],  # "hit", "miss"
+)
+
+parsed_profile_cache_evictions_total = Counter(
+    "parsed_profile_cache_evictions_total",
+    "Entries evicted from the in-process parsed player profile cache",
+    ["reason"],  # "expired", "size"
+)
+
+parsed_profile_cache_size_bytes = Gauge(
+    "parsed_profile_cache_size_bytes",
+    "Estimated size of the in-process parsed player profile cache in bytes",
+)
+
+# Player requests which waited for a profile load already in progress,
+# instead of calling Blizzard themselves
+player_requests_coalesced_total = Counter(
+    "player_requests_coalesced_total",
+    "Player requests coalesced with a concurrent profile load",
+    ["scope"],  # "process", "cluster"
+)
+
 # Background refresh tasks triggered
 background_refresh_triggered_total = Counter(
     "background_refresh_triggered_total",
@@ -94,11 +120,49 @@ background_tasks_duration_seconds = Histogram(
     buckets=(0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0),
 )
 
+# Popular player profiles enqueued for refresh ahead of expiry
+player_prerefresh_enqueued_total = Counter(
+    "player_prerefresh_enqueued_total",
+    "Popular player profiles enqueued for pre-refresh by the scheduler",
+)
+
+player_cache_keys_evicted = Histogram(
+    "player_cache_keys_evicted",
+    "API cache keys evicted per player profile refresh",
+    buckets=(0, 1, 2, 5, 10, 20, 50, 100),
+)
+
 background_tasks_queue_size = Gauge(
     "background_tasks_queue_size",
     "Number of background refresh tasks currently queued or in-flight",
 )
 
+# Background refreshes not enqueued by admission control (queue backlog or
+# Blizzard throttle penalty), and share of refreshes currently enqueued
+background_refresh_shed_total = Counter(
+    "background_refresh_shed_total",
+    "Background refreshes of stale data skipped by admission control",
+    ["entity_type"],
+)
+
+background_refresh_admission_rate = Gauge(
+    "background_refresh_admission_rate",
+    "Share of background refreshes of stale data currently enqueued",
+)
+
+# Enqueues skipped as the same job was already pending or running
+background_tasks_deduplicated_total = Counter(
+    "background_tasks_deduplicated_total",
+    "Background task enqueues skipped as the job was already queued or running",
+    ["task_name"],
+)
+
+# Maximum number of jobs processed at once by the worker process (autotuned)
+worker_concurrency_limit = Gauge(
+    "worker_concurrency_limit",
+    "Maximum number of jobs processed at once by the worker process",
+)
+
 ########################
 # Throttle / Blizzard Metrics
 ########################
@@ -115,10 +179,21 @@ throttle_403_total = Counter(
 
 throttle_wait_seconds = Histogram(
     "throttle_wait_seconds",
-    "Time spent waiting before Blizzard requests due to throttle delay",
+    "Time spent waiting for a reserved throttle slot before Blizzard requests",
     buckets=(0.5, 1.0, 2.0, 5.0, 10.0, 20.0, 30.0),
 )
 
+throttle_background_deferrals_total = Counter(
+    "throttle_background_deferrals_total",
+    "Background Blizzard requests deferred to leave capacity to interactive ones",
+    ["reason"],  # "busy" (interactive slots reserved ahead), "penalty"
+)
+
+throttle_queue_depth = Gauge(
+    "throttle_queue_depth",
+    "Reserved Blizzard request slots ahead, across processes, at last reservation",
+)
+
 blizzard_requests_total = Counter(
     "blizzard_requests_total",
     "Total HTTP requests to Blizzard",
@@ -132,6 +207,41 @@ blizzard_request_duration_seconds = Histogram(
     buckets=(0.05, 0.1, 0.25, 0.5, 0.75, 1.0, 2.5, 5.0, 7.5, 10.0),
 )
 
+blizzard_request_timeout_seconds = Gauge(
+    "blizzard_request_timeout_seconds",
+    "Adaptive timeout of Blizzard requests, derived from the observed latency",
+    ["endpoint"],
+)
+
+blizzard_deadline_exceeded_total = Counter(
+    "blizzard_deadline_exceeded_total",
+    "Blizzard requests abandoned as the API request ran out of time",
+    ["endpoint"],
+)
+
+blizzard_conditional_requests_total = Counter(
+    "blizzard_conditional_requests_total",
+    "Conditional requests to Blizzard, by whether the page changed",
+    ["result"],  # "not_modified" (304), "modified"
+)
+
+blizzard_pool_connections = Gauge(
+    "blizzard_pool_connections",
+    "Connections to Blizzard in the HTTP client pool",
+    ["state"],  # "active", "idle"
+)
+
+blizzard_streams_per_connection = Gauge(
+    "blizzard_streams_per_connection",
+    "In-flight Blizzard requests per active connection (HTTP/2 streams)",
+)
+
+blizzard_connection_errors_total = Counter(
+    "blizzard_connection_errors_total",
+    "Connection-level errors on Blizzard requests",
+    ["reason"],  # "goaway", "stream_reset", "protocol", "network"
+)
+
 blizzard_rate_limited_total = Counter(
     "blizzard_rate_limited_total",
     "Times rate-limited by Blizzard (HTTP 403)",
@@ -14,6 +14,15 @@ set -o pipefail 2>/dev/null || true
 : "${UNKNOWN_PLAYER_COOLDOWN_KEY_PREFIX:=unknown-player:cooldown}"
 : "${UNKNOWN_PLAYERS_CACHE_ENABLED:=true}"
 
+# Set defaults for player pre-refresh variables if not provided
+: "${PLAYER_PREREFRESH_ENABLED:=false}"
+: "${PLAYER_POPULARITY_KEY:=player-popularity}"
+export PLAYER_PREREFRESH_ENABLED PLAYER_POPULARITY_KEY
+
+# Set default for cache miss lock timeout (seconds, 0 to disable) if not provided
+: "${NGINX_MISS_LOCK_TIMEOUT:=5}"
+export NGINX_MISS_LOCK_TIMEOUT
+
 # Convert NGINX_WORKER_PROCESSES: 0 → "auto" (nginx auto-detect syntax)
 if [ "$NGINX_WORKER_PROCESSES" = "0" ]; then
   NGINX_WORKER_PROCESSES_VALUE="auto"
@@ -55,7 +64,7 @@ envsubst '${NGINX_WORKER_PROCESSES_VALUE} ${NGINX_WORKER_CONNECTIONS} ${NGINX_MU
 
 # Replace placeholders and generate config and lua script from templates
 envsubst '${RATE_LIMIT_PER_SECOND_PER_IP} ${RATE_LIMIT_PER_IP_BURST} ${MAX_CONNECTIONS_PER_IP} ${RETRY_AFTER_HEADER} ${PROMETHEUS_LUA_SHARED_DICT} ${PROMETHEUS_INIT_WORKER} ${PROMETHEUS_LOG_BY_LUA} ${PROMETHEUS_METRICS_SERVER}' < /etc/nginx/conf.d/default.conf.template > /etc/nginx/conf.d/default.conf
-envsubst '${VALKEY_HOST} ${VALKEY_PORT} ${CACHE_TTL_HEADER} ${RETRY_AFTER_HEADER} ${UNKNOWN_PLAYER_COOLDOWN_KEY_PREFIX} ${UNKNOWN_PLAYERS_CACHE_ENABLED}' < /usr/local/openresty/lualib/valkey_handler.lua.template > /usr/local/openresty/lualib/valkey_handler.lua
+envsubst '${VALKEY_HOST} ${VALKEY_PORT} ${CACHE_TTL_HEADER} ${RETRY_AFTER_HEADER} ${UNKNOWN_PLAYER_COOLDOWN_KEY_PREFIX} ${UNKNOWN_PLAYERS_CACHE_ENABLED} ${NGINX_MISS_LOCK_TIMEOUT} ${PLAYER_PREREFRESH_ENABLED} ${PLAYER_POPULARITY_KEY}' < /usr/local/openresty/lualib/valkey_handler.lua.template > /usr/local/openresty/lualib/valkey_handler.lua
 
 # Check OpenResty config before starting
 openresty -t
@@ -0,0 +1,137 @@
+"""Unit tests for BlizzardClient connection handling."""
+
+from unittest.mock import AsyncMock, Mock, patch
+
+import httpx2
+import pytest
+from fastapi import HTTPException, status
+
+from app.adapters.blizzard.client import BlizzardClient
+from app.config import settings
+from app.domain.parsers.utils import get_page_validators
+
+
+def _connection(*, idle: bool, closed: bool = False) -> Mock:
+    connection = Mock()
+    connection.is_idle.return_value = idle
+    connection.is_closed.return_value = closed
+    return connection
+
+
+class TestConnectionErrors:
+    @pytest.mark.parametrize(
+        ("message", "reason"),
+        [
+            ("<ConnectionTerminated error_code:0, last_stream_id:5>", "goaway"),
+            ("<StreamReset stream_id:3, error_code:8>", "stream_reset"),
+            ("Server disconnected without sending a response.", "protocol"),
+        ],
+    )
+    def test_protocol_error_reason(self, message: str, reason: str) -> None:
+        error = httpx2.RemoteProtocolError(message)
+
+        assert BlizzardClient._protocol_error_reason(error) == reason
+
+    @pytest.mark.asyncio
+    async def test_network_error_returns_504(self) -> None:
+        client = BlizzardClient()
+
+        with (
+            patch.object(
+                client.client,
+                "get",
+                new=AsyncMock(side_effect=httpx2.ReadError("Connection reset")),
+            ),
+            patch.object(settings, "prometheus_enabled", True),
+            patch(
+                "app.adapters.blizzard.client.blizzard_connection_errors_total"
+            ) as counter,
+            pytest.raises(HTTPException) as exc_info,
+        ):
+            await client._execute_request(
+                "https://overwatch.blizzard.com/en-us/heroes/",
+                "/heroes",
+                {"timeout": 10.0},
+            )
+
+        assert exc_info.value.status_code == status.HTTP_504_GATEWAY_TIMEOUT
+        counter.labels.assert_called_once_with(reason="network")
+        assert client._inflight_requests == 0
+
+
+class TestPoolMetrics:
+    def test_counts_active_and_idle_connections(self) -> None:
+        client = BlizzardClient()
+        client.transport = Mock()
+        client.transport._pool.connections = [
+            _connection(idle=False),
+            _connection(idle=True),
+            _connection(idle=True, closed=True),
+        ]
+        client._inflight_requests = 3
+
+        with (
+            patch.object(settings, "prometheus_enabled", True),
+            patch(
+                "app.adapters.blizzard.client.blizzard_pool_connections"
+            ) as pool_gauge,
+            patch(
+                "app.adapters.blizzard.client.blizzard_streams_per_connection"
+            ) as streams_gauge,
+        ):
+            client._record_pool_metrics()
+
+        pool_gauge.labels.assert_any_call(state="active")
+        pool_gauge.labels.assert_any_call(state="idle")
+        assert pool_gauge.labels.return_value.set.call_count == 2  # noqa: PLR2004
+        streams_gauge.set.assert_called_once_with(3)
+
+
+class TestWarmUp:
+    @pytest.mark.asyncio
+    async def test_opens_connection_to_blizzard(self) -> None:
+        client = BlizzardClient()
+
+        with patch.object(client.client, "head", new=AsyncMock()) as head:
+            await client.warm_up()
+
+        head.assert_awaited_once_with(settings.blizzard_host)
+
+    @pytest.mark.asyncio
+    async def test_failure_is_swallowed(self) -> None:
+        client = BlizzardClient()
+
+        with patch.object(
+            client.client,
+            "head",
+            new=AsyncMock(side_effect=httpx2.ConnectError("unreachable")),
+        ):
+            await client.warm_up()
+
+
+class TestValidators:
+    @pytest.mark.asyncio
+    async def test_validators_are_sent_once_saved(self) -> None:
+        client = BlizzardClient()
+        url = "https://overwatch.blizzard.com/en-us/heroes/"
+        response = Mock(
+            status_code=status.HTTP_200_OK,
+            headers={"ETag": '"v1"', "Last-Modified": "Mon, 01 Jan 2024"},
+        )
+
+        with (
+            patch.object(client, "throttle", None),
+            patch.object(client, "_execute_request", AsyncMock(return_value=response)),
+        ):
+            await client.get(url, revalidate=True)
+            # Validators of the response aren't saved by the request itself
+            assert await client._get_conditional_headers(url) == {}
+
+            await client.save_validators(
+                get_page_validators(url, response)  # type: ignore[arg-type]
+            )
+
+        assert await client._get_conditional_headers(url) == {
+            "If-None-Match": '"v1"',
+            "If-Modified-Since": "Mon, 01 Jan 2024",
+        }
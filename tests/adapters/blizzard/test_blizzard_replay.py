@@ -0,0 +1,169 @@
+"""Unit tests for Blizzard responses replay and recording."""
+
+from http import HTTPStatus
+from typing import TYPE_CHECKING
+from unittest.mock import AsyncMock, Mock, patch
+
+import httpx2
+import pytest
+
+from app.adapters.blizzard.client import BlizzardClient
+from app.adapters.blizzard.replay import (
+    RecordingBlizzardClient,
+    ReplayTransport,
+    corpus_file,
+)
+from app.config import settings
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+_HOST = "https://overwatch.blizzard.com"
+
+
+@pytest.fixture
+def corpus(tmp_path: Path) -> Path:
+    (tmp_path / "html" / "players").mkdir(parents=True)
+    (tmp_path / "html" / "players" / "TeKrop-2217.html").write_text("<html />")
+    (tmp_path / "json").mkdir()
+    (tmp_path / "json" / "search_players_blizzard_result.json").write_text("[]")
+    return tmp_path
+
+
+def _replay_client(corpus: Path) -> httpx2.AsyncClient:
+    return httpx2.AsyncClient(transport=ReplayTransport(corpus))
+
+
+class TestCorpusFile:
+    @pytest.mark.parametrize(
+        ("url", "expected"),
+        [
+            (f"{_HOST}/en-us/", "html/home.html"),
+            (f"{_HOST}/fr-fr/heroes/", "html/heroes.html"),
+            (f"{_HOST}/en-us/heroes/ana/", "html/heroes/ana.html"),
+            (f"{_HOST}/en-us/career/TeKrop-2217/", "html/players/TeKrop-2217.html"),
+            (f"{_HOST}/en-us/career/abc%7Cdef/", "html/players/abc|def.html"),
+            (
+                f"{_HOST}/en-us/search/account-by-name/TeKrop/",
+                "json/search/TeKrop.json",
+            ),
+            (f"{_HOST}/en-us/rates/data/?input=PC", "json/blizzard_hero_stats.json"),
+            (f"{_HOST}/en-us/career/TeKrop-2217/extra/", None),
+        ],
+    )
+    def test_maps_url_to_corpus_layout(self, url: str, expected: str | None) -> None:
+        assert corpus_file(url) == expected
+
+
+class TestReplayTransport:
+    @pytest.fixture(autouse=True)
+    def _no_latency(self):
+        with (
+            patch.object(settings, "blizzard_replay_latency_median", 0.0),
+            patch.object(settings, "blizzard_replay_latency_medians", {}),
+            patch.object(settings, "blizzard_replay_forbidden_rate", 0.0),
+        ):
+            yield
+
+    @pytest.mark.asyncio
+    async def test_serves_corpus_file(self, corpus: Path) -> None:
+        async with _replay_client(corpus) as client:
+            response = await client.get(f"{_HOST}/en-us/career/TeKrop-2217/")
+
+        assert response.status_code == HTTPStatus.OK
+        assert response.text == "<html />"
+        assert response.headers["ETag"]
+
+    @pytest.mark.asyncio
+    async def test_missing_file_is_404(self, corpus: Path) -> None:
+        async with _replay_client(corpus) as client:
+            response = await client.get(f"{_HOST}/en-us/career/Unknown-1234/")
+
+        assert response.status_code == HTTPStatus.NOT_FOUND
+
+    @pytest.mark.asyncio
+    async def test_search_falls_back_to_default_results(self, corpus: Path) -> None:
+        async with _replay_client(corpus) as client:
+            response = await client.get(f"{_HOST}/en-us/search/account-by-name/Any/")
+
+        assert response.status_code == HTTPStatus.OK
+        assert response.json() == []
+
+    @pytest.mark.asyncio
+    async def test_matching_etag_is_304(self, corpus: Path) -> None:
+        url = f"{_HOST}/en-us/career/TeKrop-2217/"
+        async with _replay_client(corpus) as client:
+            etag = (await client.get(url)).headers["ETag"]
+            response = await client.get(url, headers={"If-None-Match": etag})
+
+        assert response.status_code == HTTPStatus.NOT_MODIFIED
+
+    @pytest.mark.asyncio
+    async def test_injects_403(self, corpus: Path) -> None:
+        with patch.object(settings, "blizzard_replay_forbidden_rate", 1.0):
+            async with _replay_client(corpus) as client:
+                response = await client.get(f"{_HOST}/en-us/career/TeKrop-2217/")
+
+        assert response.status_code == HTTPStatus.FORBIDDEN
+
+    @pytest.mark.asyncio
+    async def test_applies_endpoint_latency(self, corpus: Path) -> None:
+        with (
+            patch.object(
+                settings,
+                "blizzard_replay_latency_medians",
+                {"/career/{player_id}": 1.5},
+            ),
+            patch("app.adapters.blizzard.replay.asyncio.sleep") as sleep,
+        ):
+            async with _replay_client(corpus) as client:
+                await client.get(f"{_HOST}/en-us/career/TeKrop-2217/")
+
+        sleep.assert_awaited_once()
+        assert sleep.call_args[0][0] > 0
+
+
+class TestRecordingBlizzardClient:
+    @pytest.mark.asyncio
+    async def test_saves_successful_responses(self, tmp_path: Path) -> None:
+        client = RecordingBlizzardClient()
+        response = Mock(status_code=HTTPStatus.OK, content=b"<html />")
+
+        with (
+            patch.object(settings, "blizzard_replay_corpus_path", str(tmp_path)),
+            patch.object(
+                BlizzardClient,
+                "_execute_request",
+                new=AsyncMock(return_value=response),
+            ),
+        ):
+            await client._execute_request(
+                f"{_HOST}/en-us/career/TeKrop-2217/", "/career/{player_id}", {}
+            )
+
+        assert (tmp_path / "html/players/TeKrop-2217.html").read_bytes() == b"<html />"
+
+    @pytest.mark.asyncio
+    async def test_ignores_failed_responses(self, tmp_path: Path) -> None:
+        client = RecordingBlizzardClient()
+        response = Mock(status_code=HTTPStatus.NOT_FOUND, content=b"")
+
+        with (
+            patch.object(settings, "blizzard_replay_corpus_path", str(tmp_path)),
+            patch.object(
+                BlizzardClient,
+                "_execute_request",
+                new=AsyncMock(return_value=response),
+            ),
+        ):
+            await client._execute_request(
+                f"{_HOST}/en-us/career/TeKrop-2217/", "/career/{player_id}", {}
+            )
+
+        assert not (tmp_path / "html").exists()
+
+    def test_default_corpus_is_apart_from_test_fixtures(self) -> None:
+        """Recording with the default settings never overwrites test fixtures"""
+        assert settings.blizzard_replay_corpus_path != (
+            settings.test_fixtures_root_path
+        )
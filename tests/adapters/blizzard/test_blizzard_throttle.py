@@ -8,16 +8,22 @@ from unittest.mock import AsyncMock, patch
 if TYPE_CHECKING:
     from collections.abc import Generator
 
+    import fakeredis
+
 import pytest
 
 from app.adapters.blizzard.throttle import (
+    _ADJUST_SCRIPT,
     _DELAY_KEY,
     _LAST_403_KEY,
+    _LAST_SLOT_KEY,
     _SSTHRESH_KEY,
     _STREAK_KEY,
+    _WAIT_SCRIPT,
     BlizzardThrottle,
 )
 from app.config import settings
+from app.domain.enums import BlizzardRequestPriority
 from app.domain.exceptions import RateLimitedError
 from app.infrastructure.metaclasses import Singleton
 
@@ -34,7 +40,7 @@ def reset_singleton() -> Generator[None]:
 def mock_cache() -> AsyncMock:
     cache = AsyncMock()
     cache.get = AsyncMock(return_value=None)
-    cache.set = AsyncMock()
+    cache.run_script = AsyncMock(return_value=None)
     return cache
 
 
@@ -47,6 +53,16 @@ def throttle(mock_cache: AsyncMock) -> BlizzardThrottle:
         return BlizzardThrottle()
 
 
+@pytest.fixture
+def valkey_throttle() -> BlizzardThrottle:
+    """Throttle running its Lua scripts against the fake Valkey server"""
+    return BlizzardThrottle()
+
+
+async def _get_float(valkey_server: fakeredis.FakeAsyncRedis, key: str) -> float:
+    return float(await valkey_server.get(key))
+
+
 class TestGetCurrentDelay:
     @pytest.mark.asyncio
     async def test_returns_start_delay_when_no_stored_value(
@@ -97,262 +113,538 @@ class TestIsRateLimited:
 
 
 class TestWaitBeforeRequest:
+    @pytest.mark.asyncio
+    async def test_runs_wait_script_in_one_round_trip(
+        self, throttle: BlizzardThrottle, mock_cache: AsyncMock
+    ) -> None:
+        mock_cache.run_script.return_value = [b"wait", 0, 0]
+
+        with patch("asyncio.sleep") as mock_sleep:
+            await throttle.wait_before_request()
+            mock_sleep.assert_not_called()
+
+        mock_cache.run_script.assert_awaited_once()
+        script, keys, args = mock_cache.run_script.call_args[0]
+        assert script == _WAIT_SCRIPT
+        assert keys == [_LAST_403_KEY, _LAST_SLOT_KEY, _DELAY_KEY]
+        assert args[1:] == [
+            settings.throttle_penalty_duration,
+            settings.throttle_start_delay,
+            settings.throttle_max_queue_wait,
+            BlizzardRequestPriority.INTERACTIVE,
+        ]
+        mock_cache.get.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_sleeps_for_returned_wait(
+        self, throttle: BlizzardThrottle, mock_cache: AsyncMock
+    ) -> None:
+        mock_cache.run_script.return_value = [b"wait", 4000, 2]
+
+        with patch("asyncio.sleep") as mock_sleep:
+            await throttle.wait_before_request()
+            mock_sleep.assert_called_once_with(pytest.approx(4.0))
+
+    @pytest.mark.asyncio
+    async def test_sets_queue_depth_gauge(
+        self, throttle: BlizzardThrottle, mock_cache: AsyncMock
+    ) -> None:
+        mock_cache.run_script.return_value = [b"wait", 4000, 2]
+
+        with (
+            patch.object(settings, "prometheus_enabled", True),
+            patch("app.adapters.blizzard.throttle.throttle_queue_depth") as gauge,
+            patch("app.adapters.blizzard.throttle.throttle_wait_seconds") as histogram,
+            patch("asyncio.sleep"),
+        ):
+            await throttle.wait_before_request()
+
+        gauge.set.assert_called_once_with(2)
+        histogram.observe.assert_called_once_with(pytest.approx(4.0))
+
+    @pytest.mark.asyncio
+    async def test_raises_rate_limited_error_when_queue_is_full(
+        self, throttle: BlizzardThrottle, mock_cache: AsyncMock
+    ) -> None:
+        mock_cache.run_script.return_value = [b"full", 42]
+
+        with pytest.raises(RateLimitedError) as exc_info:
+            await throttle.wait_before_request()
+
+        assert exc_info.value.retry_after == 42  # noqa: PLR2004
+
+    @pytest.mark.asyncio
+    async def test_slot_is_dropped_if_penalized_while_waiting(
+        self, throttle: BlizzardThrottle, mock_cache: AsyncMock
+    ) -> None:
+        mock_cache.run_script.return_value = [b"wait", 4000, 2]
+
+        async def receive_403_meanwhile(_wait: float) -> None:
+            throttle._penalty_start = time.monotonic()
+
+        with (
+            patch("asyncio.sleep", side_effect=receive_403_meanwhile),
+            pytest.raises(RateLimitedError),
+        ):
+            await throttle.wait_before_request()
+
     @pytest.mark.asyncio
     async def test_raises_rate_limited_error_during_penalty(
         self, throttle: BlizzardThrottle, mock_cache: AsyncMock
     ) -> None:
-        recent_ts = time.time() - 5
-        mock_cache.get.return_value = str(recent_ts).encode()
+        mock_cache.run_script.return_value = [b"penalty", 55]
+
         with pytest.raises(RateLimitedError) as exc_info:
             await throttle.wait_before_request()
-        assert exc_info.value.retry_after > 0
+
+        assert exc_info.value.retry_after == 55  # noqa: PLR2004
 
     @pytest.mark.asyncio
-    async def test_no_sleep_when_enough_time_elapsed(
+    async def test_penalty_is_then_checked_in_process(
         self, throttle: BlizzardThrottle, mock_cache: AsyncMock
     ) -> None:
-        # No penalty, last request was long ago
-        def get_side_effect(key):
-            if "last_403" in key:
-                return None
-            if "delay" in key:
-                return b"2.0"
-            if "last_request" in key:
-                return str(time.time() - 10).encode()
-            return None
+        mock_cache.run_script.return_value = [b"penalty", 55]
+        with pytest.raises(RateLimitedError):
+            await throttle.wait_before_request()
+
+        with pytest.raises(RateLimitedError):
+            await throttle.wait_before_request()
+
+        mock_cache.run_script.assert_awaited_once()
 
-        mock_cache.get.side_effect = get_side_effect
+    @pytest.mark.asyncio
+    async def test_no_wait_when_valkey_unavailable(
+        self, throttle: BlizzardThrottle, mock_cache: AsyncMock
+    ) -> None:
+        mock_cache.run_script.return_value = None
 
         with patch("asyncio.sleep") as mock_sleep:
             await throttle.wait_before_request()
             mock_sleep.assert_not_called()
 
+
+class TestBackgroundPriority:
     @pytest.mark.asyncio
-    async def test_sleeps_when_request_too_soon(
+    async def test_takes_free_slot_without_waiting(
         self, throttle: BlizzardThrottle, mock_cache: AsyncMock
     ) -> None:
-        def get_side_effect(key):
-            if "last_403" in key:
-                return None
-            if "delay" in key:
-                return b"5.0"
-            if "last_request" in key:
-                return str(time.time() - 1).encode()  # only 1s ago, delay is 5s
-            return None
+        mock_cache.run_script.return_value = [b"wait", 0, 0]
+
+        with patch("asyncio.sleep") as mock_sleep:
+            await throttle.wait_before_request(BlizzardRequestPriority.BACKGROUND)
+            mock_sleep.assert_not_called()
 
-        mock_cache.get.side_effect = get_side_effect
+        _, _, args = mock_cache.run_script.call_args[0]
+        assert args[-1] == BlizzardRequestPriority.BACKGROUND
+
+    @pytest.mark.asyncio
+    async def test_deferred_while_interactive_slots_are_reserved(
+        self, throttle: BlizzardThrottle, mock_cache: AsyncMock
+    ) -> None:
+        mock_cache.run_script.side_effect = [
+            [b"busy", 1500],
+            [b"busy", 500],
+            [b"wait", 0, 0],
+        ]
 
         with patch("asyncio.sleep") as mock_sleep:
-            await throttle.wait_before_request()
-            mock_sleep.assert_called_once()
-            wait_time = mock_sleep.call_args[0][0]
-            assert 3.5 < wait_time < 4.5  # noqa: PLR2004  # ~4 seconds remaining
+            await throttle.wait_before_request(BlizzardRequestPriority.BACKGROUND)
+
+        assert [c[0][0] for c in mock_sleep.call_args_list] == [
+            pytest.approx(1.5),
+            pytest.approx(0.5),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_deferred_instead_of_rejected_during_penalty(
+        self, throttle: BlizzardThrottle, mock_cache: AsyncMock
+    ) -> None:
+        mock_cache.run_script.side_effect = [[b"penalty", 30], [b"wait", 0, 0]]
+
+        async def end_penalty(_wait: float) -> None:
+            throttle._penalty_start = None
+
+        with patch("asyncio.sleep", side_effect=end_penalty) as mock_sleep:
+            await throttle.wait_before_request(BlizzardRequestPriority.BACKGROUND)
+
+        mock_sleep.assert_called_once_with(30)
+        assert mock_cache.run_script.await_count == 2  # noqa: PLR2004
+
+    @pytest.mark.asyncio
+    async def test_counts_deferrals(
+        self, throttle: BlizzardThrottle, mock_cache: AsyncMock
+    ) -> None:
+        mock_cache.run_script.side_effect = [[b"busy", 500], [b"wait", 0, 0]]
+
+        with (
+            patch.object(settings, "prometheus_enabled", True),
+            patch(
+                "app.adapters.blizzard.throttle.throttle_background_deferrals_total"
+            ) as counter,
+            patch("asyncio.sleep"),
+        ):
+            await throttle.wait_before_request(BlizzardRequestPriority.BACKGROUND)
+
+        counter.labels.assert_called_once_with(reason="busy")
 
 
 class TestAdjustDelay:
     @pytest.mark.asyncio
-    async def test_403_sets_penalty_and_ssthresh(
+    @pytest.mark.parametrize(
+        ("status_code", "outcome"),
+        [
+            (HTTPStatus.OK, "ok"),
+            (HTTPStatus.NOT_MODIFIED, "ok"),
+            (HTTPStatus.FORBIDDEN, "forbidden"),
+            (HTTPStatus.SERVICE_UNAVAILABLE, "other"),
+        ],
+    )
+    async def test_runs_adjust_script_with_outcome(
+        self,
+        throttle: BlizzardThrottle,
+        mock_cache: AsyncMock,
+        status_code: HTTPStatus,
+        outcome: str,
+    ) -> None:
+        mock_cache.run_script.return_value = [b"unchanged", b"2", b"2"]
+
+        await throttle.adjust_delay(status_code)
+
+        mock_cache.run_script.assert_awaited_once()
+        script, keys, args = mock_cache.run_script.call_args[0]
+        assert script == _ADJUST_SCRIPT
+        assert keys == [_DELAY_KEY, _SSTHRESH_KEY, _STREAK_KEY, _LAST_403_KEY]
+        assert args[0] == outcome
+
+    @pytest.mark.asyncio
+    async def test_403_starts_in_process_penalty(
         self, throttle: BlizzardThrottle, mock_cache: AsyncMock
     ) -> None:
-        """403 should double delay, set ssthresh, reset streak, record last_403."""
-        mock_cache.get.return_value = b"2.0"
+        mock_cache.run_script.return_value = [b"penalty", b"2", b"10"]
+
         await throttle.adjust_delay(HTTPStatus.FORBIDDEN)
-        # delay set + last_403 set (at minimum 2 set calls)
-        keys_set = [call[0][0] for call in mock_cache.set.call_args_list]
-        assert _DELAY_KEY in keys_set
-        assert _LAST_403_KEY in keys_set
-        assert _SSTHRESH_KEY in keys_set
-        assert _STREAK_KEY in keys_set
+
+        assert await throttle.is_rate_limited() > 0
+        mock_cache.get.assert_not_called()
 
     @pytest.mark.asyncio
-    async def test_403_doubles_delay_with_minimum(
+    async def test_403_updates_metrics(
         self, throttle: BlizzardThrottle, mock_cache: AsyncMock
     ) -> None:
-        mock_cache.get.return_value = b"2.0"
-        await throttle.adjust_delay(HTTPStatus.FORBIDDEN)
-        delay_set = next(
-            float(c[0][1])
-            for c in mock_cache.set.call_args_list
-            if c[0][0] == _DELAY_KEY
-        )
-        assert delay_set == max(4.0, settings.throttle_penalty_delay)
+        mock_cache.run_script.return_value = [b"penalty", b"2", b"10"]
+
+        with (
+            patch.object(settings, "prometheus_enabled", True),
+            patch(
+                "app.adapters.blizzard.throttle.throttle_current_delay_seconds"
+            ) as delay_gauge,
+            patch("app.adapters.blizzard.throttle.throttle_403_total") as counter,
+        ):
+            await throttle.adjust_delay(HTTPStatus.FORBIDDEN)
+
+        delay_gauge.set.assert_called_once_with(pytest.approx(10.0))
+        counter.inc.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_delay_decrease_updates_gauge(
+        self, throttle: BlizzardThrottle, mock_cache: AsyncMock
+    ) -> None:
+        mock_cache.run_script.return_value = [b"slow_start", b"4", b"2"]
+
+        with (
+            patch.object(settings, "prometheus_enabled", True),
+            patch(
+                "app.adapters.blizzard.throttle.throttle_current_delay_seconds"
+            ) as delay_gauge,
+        ):
+            await throttle.adjust_delay(HTTPStatus.OK)
+
+        delay_gauge.set.assert_called_once_with(pytest.approx(2.0))
 
     @pytest.mark.asyncio
-    async def test_403_sets_ssthresh_to_double_current(
+    async def test_200_during_in_process_penalty_skips_script(
         self, throttle: BlizzardThrottle, mock_cache: AsyncMock
     ) -> None:
-        mock_cache.get.return_value = b"2.0"
+        throttle._penalty_start = time.monotonic() - 5
+
+        await throttle.adjust_delay(HTTPStatus.OK)
+
+        mock_cache.run_script.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_ignores_unavailable_valkey(
+        self, throttle: BlizzardThrottle, mock_cache: AsyncMock
+    ) -> None:
+        mock_cache.run_script.return_value = None
+
         await throttle.adjust_delay(HTTPStatus.FORBIDDEN)
-        ssthresh_set = next(
-            float(c[0][1])
-            for c in mock_cache.set.call_args_list
-            if c[0][0] == _SSTHRESH_KEY
+
+        assert throttle._penalty_start is None
+
+
+class TestWaitScript:
+    """State transitions of ``_WAIT_SCRIPT``, run by the fake Valkey server"""
+
+    @pytest.mark.asyncio
+    async def test_consecutive_requests_reserve_spaced_slots(
+        self,
+        valkey_throttle: BlizzardThrottle,
+        valkey_server: fakeredis.FakeAsyncRedis,
+    ) -> None:
+        await valkey_server.set(_DELAY_KEY, "2.0")
+
+        with patch("asyncio.sleep") as mock_sleep:
+            await valkey_throttle.wait_before_request()
+            await valkey_throttle.wait_before_request()
+            await valkey_throttle.wait_before_request()
+
+        waits = [c[0][0] for c in mock_sleep.call_args_list]
+        assert waits == [pytest.approx(2.0, abs=0.1), pytest.approx(4.0, abs=0.1)]
+
+    @pytest.mark.asyncio
+    async def test_rejects_request_during_penalty(
+        self,
+        valkey_throttle: BlizzardThrottle,
+        valkey_server: fakeredis.FakeAsyncRedis,
+    ) -> None:
+        await valkey_server.set(_LAST_403_KEY, str(time.time() - 10))
+
+        with pytest.raises(RateLimitedError) as exc_info:
+            await valkey_throttle.wait_before_request()
+
+        expected = settings.throttle_penalty_duration - 10
+        assert expected - 2 <= exc_info.value.retry_after <= expected
+        assert await valkey_server.get(_LAST_SLOT_KEY) is None
+
+    @pytest.mark.asyncio
+    async def test_rejects_request_when_next_slot_is_too_far(
+        self,
+        valkey_throttle: BlizzardThrottle,
+        valkey_server: fakeredis.FakeAsyncRedis,
+    ) -> None:
+        last_slot = time.time() + settings.throttle_max_queue_wait
+        await valkey_server.set(_DELAY_KEY, "2.0")
+        await valkey_server.set(_LAST_SLOT_KEY, str(last_slot))
+
+        with pytest.raises(RateLimitedError):
+            await valkey_throttle.wait_before_request()
+
+        assert await _get_float(valkey_server, _LAST_SLOT_KEY) == pytest.approx(
+            last_slot
+        )
+
+    @pytest.mark.asyncio
+    async def test_rejects_request_when_next_slot_is_after_max_wait(
+        self,
+        valkey_throttle: BlizzardThrottle,
+        valkey_server: fakeredis.FakeAsyncRedis,
+    ) -> None:
+        """A slot the request couldn't use before its deadline isn't reserved"""
+        last_slot = time.time()
+        await valkey_server.set(_DELAY_KEY, "2.0")
+        await valkey_server.set(_LAST_SLOT_KEY, str(last_slot))
+
+        with pytest.raises(RateLimitedError):
+            await valkey_throttle.wait_before_request(max_wait=1.0)
+
+        assert await _get_float(valkey_server, _LAST_SLOT_KEY) == pytest.approx(
+            last_slot
+        )
+
+    @pytest.mark.asyncio
+    async def test_background_request_only_takes_free_slot(
+        self,
+        valkey_throttle: BlizzardThrottle,
+        valkey_server: fakeredis.FakeAsyncRedis,
+    ) -> None:
+        await valkey_server.set(_DELAY_KEY, "2.0")
+        await valkey_server.set(_LAST_SLOT_KEY, str(time.time()))
+
+        async def free_slots(_wait: float) -> None:
+            await valkey_server.delete(_LAST_SLOT_KEY)
+
+        with patch("asyncio.sleep", side_effect=free_slots) as mock_sleep:
+            await valkey_throttle.wait_before_request(
+                BlizzardRequestPriority.BACKGROUND
+            )
+
+        mock_sleep.assert_called_once_with(pytest.approx(2.0, abs=0.1))
+        assert await _get_float(valkey_server, _LAST_SLOT_KEY) == pytest.approx(
+            time.time(), abs=1
+        )
+
+
+class TestAdjustScript:
+    """State transitions of ``_ADJUST_SCRIPT``, run by the fake Valkey server"""
+
+    @pytest.mark.asyncio
+    async def test_403_sets_penalty_and_ssthresh(
+        self,
+        valkey_throttle: BlizzardThrottle,
+        valkey_server: fakeredis.FakeAsyncRedis,
+    ) -> None:
+        """403 should double delay, set ssthresh, reset streak, record last_403."""
+        await valkey_server.set(_DELAY_KEY, "2.0")
+        await valkey_server.set(_STREAK_KEY, "5")
+
+        await valkey_throttle.adjust_delay(HTTPStatus.FORBIDDEN)
+
+        assert await _get_float(valkey_server, _SSTHRESH_KEY) == pytest.approx(4.0)
+        assert await _get_float(valkey_server, _STREAK_KEY) == 0
+        assert await _get_float(valkey_server, _LAST_403_KEY) == pytest.approx(
+            time.time(), abs=1
+        )
+        assert await valkey_throttle.is_rate_limited() > 0
+
+    @pytest.mark.asyncio
+    async def test_403_doubles_delay_with_minimum(
+        self,
+        valkey_throttle: BlizzardThrottle,
+        valkey_server: fakeredis.FakeAsyncRedis,
+    ) -> None:
+        await valkey_server.set(_DELAY_KEY, "2.0")
+
+        await valkey_throttle.adjust_delay(HTTPStatus.FORBIDDEN)
+
+        assert await _get_float(valkey_server, _DELAY_KEY) == max(
+            4.0, settings.throttle_penalty_delay
         )
-        assert ssthresh_set == pytest.approx(4.0)
 
     @pytest.mark.asyncio
     async def test_200_slow_start_halves_delay_after_n_successes(
-        self, throttle: BlizzardThrottle, mock_cache: AsyncMock
+        self,
+        valkey_throttle: BlizzardThrottle,
+        valkey_server: fakeredis.FakeAsyncRedis,
     ) -> None:
         """In slow start (delay > ssthresh), delay halves every N successes."""
+        await valkey_server.set(_DELAY_KEY, "4.0")
+        await valkey_server.set(_SSTHRESH_KEY, "1.0")
+        await valkey_server.set(
+            _STREAK_KEY, str(settings.throttle_slow_start_n_successes - 1)
+        )
 
-        # delay=4.0, ssthresh=1.0 (default min), streak reaching threshold
-        def get_side_effect(key):
-            if key == _LAST_403_KEY:
-                return None
-            if key == _DELAY_KEY:
-                return b"4.0"
-            if key == _SSTHRESH_KEY:
-                return b"1.0"
-            if key == _STREAK_KEY:
-                return str(settings.throttle_slow_start_n_successes - 1).encode()
-            return None
-
-        mock_cache.get.side_effect = get_side_effect
-        await throttle.adjust_delay(HTTPStatus.OK)
+        await valkey_throttle.adjust_delay(HTTPStatus.OK)
 
-        delay_set = next(
-            float(c[0][1])
-            for c in mock_cache.set.call_args_list
-            if c[0][0] == _DELAY_KEY
-        )
-        assert delay_set == pytest.approx(2.0)
+        assert await _get_float(valkey_server, _DELAY_KEY) == pytest.approx(2.0)
+        assert await _get_float(valkey_server, _STREAK_KEY) == 0
 
     @pytest.mark.asyncio
     async def test_200_slow_start_no_change_below_n_successes(
-        self, throttle: BlizzardThrottle, mock_cache: AsyncMock
+        self,
+        valkey_throttle: BlizzardThrottle,
+        valkey_server: fakeredis.FakeAsyncRedis,
     ) -> None:
         """In slow start, delay does not change if streak < N."""
+        await valkey_server.set(_DELAY_KEY, "4.0")
+        await valkey_server.set(_SSTHRESH_KEY, "1.0")
+        await valkey_server.set(_STREAK_KEY, "3")
 
-        def get_side_effect(key):
-            if key == _LAST_403_KEY:
-                return None
-            if key == _DELAY_KEY:
-                return b"4.0"
-            if key == _SSTHRESH_KEY:
-                return b"1.0"
-            if key == _STREAK_KEY:
-                return b"3"
-            return None
-
-        mock_cache.get.side_effect = get_side_effect
-        await throttle.adjust_delay(HTTPStatus.OK)
+        await valkey_throttle.adjust_delay(HTTPStatus.OK)
 
-        keys_set = [c[0][0] for c in mock_cache.set.call_args_list]
-        assert _DELAY_KEY not in keys_set
+        assert await _get_float(valkey_server, _DELAY_KEY) == pytest.approx(4.0)
+        assert await _get_float(valkey_server, _STREAK_KEY) == 4  # noqa: PLR2004
 
     @pytest.mark.asyncio
     async def test_200_aimd_decreases_delay_after_m_successes(
-        self, throttle: BlizzardThrottle, mock_cache: AsyncMock
+        self,
+        valkey_throttle: BlizzardThrottle,
+        valkey_server: fakeredis.FakeAsyncRedis,
     ) -> None:
         """In AIMD phase (delay <= ssthresh), delay decreases by delta every M successes."""
+        await valkey_server.set(_DELAY_KEY, "0.5")
+        await valkey_server.set(_SSTHRESH_KEY, "1.0")
+        await valkey_server.set(
+            _STREAK_KEY, str(settings.throttle_aimd_n_successes - 1)
+        )
 
-        def get_side_effect(key):
-            if key == _LAST_403_KEY:
-                return None
-            if key == _DELAY_KEY:
-                return b"0.5"
-            if key == _SSTHRESH_KEY:
-                return b"1.0"
-            if key == _STREAK_KEY:
-                return str(settings.throttle_aimd_n_successes - 1).encode()
-            return None
-
-        mock_cache.get.side_effect = get_side_effect
-        await throttle.adjust_delay(HTTPStatus.OK)
+        await valkey_throttle.adjust_delay(HTTPStatus.OK)
 
-        delay_set = next(
-            float(c[0][1])
-            for c in mock_cache.set.call_args_list
-            if c[0][0] == _DELAY_KEY
+        assert await _get_float(valkey_server, _DELAY_KEY) == pytest.approx(
+            0.5 - settings.throttle_aimd_delta
         )
-        assert delay_set == pytest.approx(0.5 - settings.throttle_aimd_delta)
 
     @pytest.mark.asyncio
     async def test_200_aimd_no_change_below_m_successes(
-        self, throttle: BlizzardThrottle, mock_cache: AsyncMock
+        self,
+        valkey_throttle: BlizzardThrottle,
+        valkey_server: fakeredis.FakeAsyncRedis,
     ) -> None:
         """In AIMD phase, delay does not change if streak < M."""
+        await valkey_server.set(_DELAY_KEY, "0.5")
+        await valkey_server.set(_SSTHRESH_KEY, "1.0")
+        await valkey_server.set(_STREAK_KEY, "3")
 
-        def get_side_effect(key):
-            if key == _LAST_403_KEY:
-                return None
-            if key == _DELAY_KEY:
-                return b"0.5"
-            if key == _SSTHRESH_KEY:
-                return b"1.0"
-            if key == _STREAK_KEY:
-                return b"3"
-            return None
-
-        mock_cache.get.side_effect = get_side_effect
-        await throttle.adjust_delay(HTTPStatus.OK)
+        await valkey_throttle.adjust_delay(HTTPStatus.OK)
 
-        keys_set = [c[0][0] for c in mock_cache.set.call_args_list]
-        assert _DELAY_KEY not in keys_set
+        assert await _get_float(valkey_server, _DELAY_KEY) == pytest.approx(0.5)
+        assert await _get_float(valkey_server, _STREAK_KEY) == 4  # noqa: PLR2004
 
     @pytest.mark.asyncio
     async def test_200_during_penalty_does_nothing(
-        self, throttle: BlizzardThrottle, mock_cache: AsyncMock
+        self,
+        valkey_throttle: BlizzardThrottle,
+        valkey_server: fakeredis.FakeAsyncRedis,
     ) -> None:
         """During penalty, 200 responses do not change delay or streak."""
+        await valkey_server.set(_LAST_403_KEY, str(time.time() - 5))
+        await valkey_server.set(_DELAY_KEY, "10.0")
+        await valkey_server.set(_STREAK_KEY, "3")
 
-        def get_side_effect(key):
-            if key == _LAST_403_KEY:
-                return str(time.time() - 5).encode()  # active penalty
-            return b"10.0"
+        await valkey_throttle.adjust_delay(HTTPStatus.OK)
 
-        mock_cache.get.side_effect = get_side_effect
-        await throttle.adjust_delay(HTTPStatus.OK)
-        mock_cache.set.assert_not_called()
+        assert await _get_float(valkey_server, _DELAY_KEY) == pytest.approx(10.0)
+        assert await _get_float(valkey_server, _STREAK_KEY) == 3  # noqa: PLR2004
 
     @pytest.mark.asyncio
     async def test_non_200_resets_streak_only(
-        self, throttle: BlizzardThrottle, mock_cache: AsyncMock
+        self,
+        valkey_throttle: BlizzardThrottle,
+        valkey_server: fakeredis.FakeAsyncRedis,
     ) -> None:
         """Non-200, non-403 responses only reset the streak."""
-        mock_cache.get.return_value = b"2.0"
-        await throttle.adjust_delay(HTTPStatus.SERVICE_UNAVAILABLE)
-        keys_set = [c[0][0] for c in mock_cache.set.call_args_list]
-        assert keys_set == [_STREAK_KEY]
+        await valkey_server.set(_DELAY_KEY, "2.0")
+        await valkey_server.set(_STREAK_KEY, "3")
+
+        await valkey_throttle.adjust_delay(HTTPStatus.SERVICE_UNAVAILABLE)
+
+        assert await _get_float(valkey_server, _DELAY_KEY) == pytest.approx(2.0)
+        assert await _get_float(valkey_server, _STREAK_KEY) == 0
+        assert await valkey_server.get(_SSTHRESH_KEY) is None
+        assert await valkey_server.get(_LAST_403_KEY) is None
 
     @pytest.mark.asyncio
     async def test_delay_respects_min_bound(
-        self, throttle: BlizzardThrottle, mock_cache: AsyncMock
+        self,
+        valkey_throttle: BlizzardThrottle,
+        valkey_server: fakeredis.FakeAsyncRedis,
     ) -> None:
         """AIMD phase: delay never goes below throttle_min_delay."""
+        await valkey_server.set(_DELAY_KEY, str(settings.throttle_min_delay))
+        await valkey_server.set(_SSTHRESH_KEY, str(settings.throttle_min_delay + 0.5))
+        await valkey_server.set(
+            _STREAK_KEY, str(settings.throttle_aimd_n_successes - 1)
+        )
 
-        def get_side_effect(key):
-            if key == _LAST_403_KEY:
-                return None
-            if key == _DELAY_KEY:
-                return str(settings.throttle_min_delay).encode()
-            if key == _SSTHRESH_KEY:
-                return str(settings.throttle_min_delay + 0.5).encode()
-            if key == _STREAK_KEY:
-                return str(settings.throttle_aimd_n_successes - 1).encode()
-            return None
-
-        mock_cache.get.side_effect = get_side_effect
-        await throttle.adjust_delay(HTTPStatus.OK)
+        await valkey_throttle.adjust_delay(HTTPStatus.OK)
 
-        delay_set_calls = [
-            c for c in mock_cache.set.call_args_list if c[0][0] == _DELAY_KEY
-        ]
-        if delay_set_calls:
-            new_delay = float(delay_set_calls[0][0][1])
-            assert new_delay >= settings.throttle_min_delay
+        assert await _get_float(valkey_server, _DELAY_KEY) == pytest.approx(
+            settings.throttle_min_delay
+        )
 
     @pytest.mark.asyncio
     async def test_delay_respects_max_bound(
-        self, throttle: BlizzardThrottle, mock_cache: AsyncMock
+        self,
+        valkey_throttle: BlizzardThrottle,
+        valkey_server: fakeredis.FakeAsyncRedis,
     ) -> None:
         """403 on max delay stays at max."""
-        mock_cache.get.return_value = str(settings.throttle_max_delay).encode()
-        await throttle.adjust_delay(HTTPStatus.FORBIDDEN)
-        delay_set = next(
-            float(c[0][1])
-            for c in mock_cache.set.call_args_list
-            if c[0][0] == _DELAY_KEY
+        await valkey_server.set(_DELAY_KEY, str(settings.throttle_max_delay))
+
+        await valkey_throttle.adjust_delay(HTTPStatus.FORBIDDEN)
+
+        assert await _get_float(valkey_server, _DELAY_KEY) == pytest.approx(
+            settings.throttle_max_delay
+        )
+        assert await _get_float(valkey_server, _SSTHRESH_KEY) == pytest.approx(
+            settings.throttle_max_delay
         )
-        assert delay_set == settings.throttle_max_delay
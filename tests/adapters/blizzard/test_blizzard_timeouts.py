@@ -0,0 +1,131 @@
+"""Unit tests for Blizzard request timeouts and deadlines."""
+
+import time
+from typing import TYPE_CHECKING
+from unittest.mock import AsyncMock, patch
+
+if TYPE_CHECKING:
+    from collections.abc import Generator
+
+import pytest
+from fastapi import HTTPException, status
+
+from app.adapters.blizzard.client import (
+    BlizzardClient,
+    _request_deadline,
+    blizzard_request_deadline,
+)
+from app.adapters.blizzard.timeouts import AdaptiveTimeouts
+from app.config import settings
+from app.domain.enums import BlizzardRequestPriority
+from app.domain.exceptions import RateLimitedError
+
+
+@pytest.fixture
+def timeouts() -> Generator[AdaptiveTimeouts]:
+    with (
+        patch.object(settings, "blizzard_timeout", 10.0),
+        patch.object(settings, "blizzard_min_timeout", 1.0),
+        patch.object(settings, "blizzard_timeout_p99_factor", 3.0),
+        patch.object(settings, "blizzard_timeout_window", 100),
+        patch.object(settings, "blizzard_timeout_min_samples", 10),
+    ):
+        yield AdaptiveTimeouts()
+
+
+class TestAdaptiveTimeouts:
+    def test_max_timeout_without_enough_samples(
+        self, timeouts: AdaptiveTimeouts
+    ) -> None:
+        for _ in range(9):
+            timeouts.observe("/career/{player_id}", 0.5)
+
+        assert timeouts.get("/career/{player_id}") == pytest.approx(10.0)
+
+    def test_timeout_is_p99_times_factor(self, timeouts: AdaptiveTimeouts) -> None:
+        for _ in range(99):
+            timeouts.observe("/career/{player_id}", 0.5)
+        timeouts.observe("/career/{player_id}", 2.0)
+
+        assert timeouts.get("/career/{player_id}") == pytest.approx(1.5)
+
+    def test_timeouts_are_per_endpoint(self, timeouts: AdaptiveTimeouts) -> None:
+        for _ in range(10):
+            timeouts.observe("/career/{player_id}", 2.0)
+            timeouts.observe("/search/account-by-name/{search_name}", 0.5)
+
+        assert timeouts.get("/career/{player_id}") == pytest.approx(6.0)
+        assert timeouts.get("/search/account-by-name/{search_name}") == pytest.approx(
+            1.5
+        )
+
+    @pytest.mark.parametrize(
+        ("duration", "expected"),
+        [(0.1, 1.0), (5.0, 10.0)],
+    )
+    def test_timeout_is_bounded(
+        self, timeouts: AdaptiveTimeouts, duration: float, expected: float
+    ) -> None:
+        for _ in range(10):
+            timeouts.observe("/heroes", duration)
+
+        assert timeouts.get("/heroes") == pytest.approx(expected)
+
+    def test_new_observations_update_timeout(self, timeouts: AdaptiveTimeouts) -> None:
+        for _ in range(10):
+            timeouts.observe("/heroes", 0.5)
+        assert timeouts.get("/heroes") == pytest.approx(1.5)
+
+        timeouts.observe("/heroes", 3.0)
+
+        assert timeouts.get("/heroes") == pytest.approx(9.0)
+
+
+class TestRequestDeadline:
+    def test_no_deadline_by_default(self) -> None:
+        assert BlizzardClient._check_deadline("/heroes") == float("inf")
+
+    def test_remaining_time_within_deadline(self) -> None:
+        with blizzard_request_deadline(5.0):
+            remaining = BlizzardClient._check_deadline("/heroes")
+
+        assert 0 < remaining <= 5.0  # noqa: PLR2004
+        assert _request_deadline.get() is None
+
+    def test_nested_deadline_cannot_extend_current_one(self) -> None:
+        with blizzard_request_deadline(1.0), blizzard_request_deadline(60.0):
+            deadline = _request_deadline.get()
+
+        assert deadline is not None
+        assert deadline <= time.monotonic() + 1.0
+
+    def test_raises_504_once_deadline_is_over(self) -> None:
+        with (
+            blizzard_request_deadline(0.0),
+            pytest.raises(HTTPException) as exc_info,
+        ):
+            BlizzardClient._check_deadline("/heroes")
+
+        assert exc_info.value.status_code == status.HTTP_504_GATEWAY_TIMEOUT
+
+    @pytest.mark.asyncio
+    async def test_throttle_wait_is_bounded_by_deadline(self) -> None:
+        """Requests needing a slot after their deadline are rejected by the
+        throttle, before anything is sent."""
+        client = BlizzardClient()
+        client.throttle = AsyncMock()
+        client.throttle.wait_before_request.side_effect = RateLimitedError(3)
+
+        with (
+            patch.object(client.client, "get", new=AsyncMock()) as mock_get,
+            blizzard_request_deadline(2.0),
+            pytest.raises(HTTPException) as exc_info,
+        ):
+            await client.get("https://overwatch.blizzard.com/en-us/heroes/")
+
+        assert exc_info.value.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+        (priority,) = client.throttle.wait_before_request.call_args.args
+        assert priority == BlizzardRequestPriority.INTERACTIVE
+        max_wait = client.throttle.wait_before_request.call_args.kwargs["max_wait"]
+        assert 0 < max_wait <= 2.0  # noqa: PLR2004
+        mock_get.assert_not_awaited()
@@ -1,4 +1,6 @@
 import asyncio
+import json
+from compression import gzip, zstd
 from unittest.mock import patch
 
 import pytest
@@ -7,6 +9,7 @@ from valkey.exceptions import ValkeyError
 from app.adapters.cache import ValkeyCache
 from app.config import settings
 from app.domain.enums import Locale
+from app.infrastructure.helpers import compute_etag
 
 
 @pytest.fixture
@@ -47,6 +50,86 @@ async def test_update_and_get_api_cache(
     assert await cache_manager.get_api_cache("another_cache_key") is None
 
 
+@pytest.mark.asyncio
+async def test_update_api_cache_prefixes_body_with_swr_header(
+    cache_manager: ValkeyCache,
+):
+    """API Cache values are a metadata header line (SWR values and ETag)
+    followed by the zstd body, the ETag being returned to the caller"""
+    etag = await cache_manager.update_api_cache(
+        "/heroes",
+        [{"name": "Sojourn"}],
+        600,
+        stored_at=1700000000,
+        staleness_threshold=300,
+        stale_while_revalidate=60,
+    )
+
+    raw_value = await cache_manager.valkey_server.get(
+        f"{settings.api_cache_key_prefix}:/heroes"
+    )
+    header, _, compressed_body = raw_value.partition(b"\n")
+
+    body = zstd.decompress(compressed_body)
+
+    assert header == f"1700000000 300 60 {compute_etag(body)}".encode()
+    assert body == b'[{"name":"Sojourn"}]'
+    assert etag == compute_etag(body)
+
+
+@pytest.mark.asyncio
+async def test_update_api_cache_keeps_more_recent_value(cache_manager: ValkeyCache):
+    """A value built from older data never replaces a more recent one"""
+    await cache_manager.update_api_cache("/heroes", ["new"], 600, stored_at=2000)
+    etag = await cache_manager.update_api_cache("/heroes", ["old"], 600, stored_at=1000)
+
+    assert await cache_manager.get_api_cache("/heroes") == ["new"]
+    assert etag is None
+
+    etag = await cache_manager.update_api_cache(
+        "/heroes", ["newer"], 600, stored_at=3000
+    )
+
+    assert await cache_manager.get_api_cache("/heroes") == ["newer"]
+    assert etag is not None
+
+
+@pytest.mark.asyncio
+async def test_update_api_cache_returns_no_etag_on_valkey_error(
+    cache_manager: ValkeyCache,
+):
+    with patch.object(
+        cache_manager.valkey_server,
+        "evalsha",
+        side_effect=ValkeyError("Connection refused"),
+    ):
+        etag = await cache_manager.update_api_cache("/heroes", ["new"], 600)
+
+    assert etag is None
+
+
+@pytest.mark.asyncio
+async def test_update_api_cache_stores_gzip_variant_of_large_bodies(
+    cache_manager: ValkeyCache,
+):
+    """A gzip variant is stored next to bodies larger than the minimum length"""
+    large_value = [{"name": f"Hero {i}"} for i in range(100)]
+
+    with patch.object(settings, "api_cache_gzip_min_length", 1024):
+        await cache_manager.update_api_cache("/heroes", large_value, 600)
+        await cache_manager.update_api_cache("/roles", [{"key": "tank"}], 600)
+
+    large_gzip = await cache_manager.valkey_server.get(
+        f"{settings.api_cache_key_prefix}:/heroes#gzip"
+    )
+    small_gzip = await cache_manager.valkey_server.get(
+        f"{settings.api_cache_key_prefix}:/roles#gzip"
+    )
+
+    assert json.loads(gzip.decompress(large_gzip)) == large_value
+    assert small_gzip is None
+
+
 @pytest.mark.asyncio
 async def test_valkey_connection_error(cache_manager: ValkeyCache, locale):
     """Test that cache operations handle Valkey connection errors gracefully"""
@@ -82,6 +165,163 @@ async def test_valkey_connection_error(cache_manager: ValkeyCache, locale):
         assert result is None
 
 
+class TestBatchOperations:
+    """Tests for multi-key operations sent in a single round-trip"""
+
+    @pytest.mark.asyncio
+    async def test_mset_with_ttl_and_mget(self, cache_manager: ValkeyCache):
+        await cache_manager.mset_with_ttl({"a": b"1", "b": b"2"}, expire=60)
+
+        assert await cache_manager.mget(["a", "missing", "b"]) == [b"1", None, b"2"]
+        assert 0 < await cache_manager.valkey_server.ttl("a") <= 60  # noqa: PLR2004
+
+    @pytest.mark.asyncio
+    async def test_mset_without_ttl(self, cache_manager: ValkeyCache):
+        await cache_manager.mset_with_ttl({"a": b"1", "b": b"2"})
+
+        assert await cache_manager.valkey_server.ttl("a") == -1
+
+    @pytest.mark.asyncio
+    async def test_delete_many(self, cache_manager: ValkeyCache):
+        await cache_manager.mset_with_ttl({"a": b"1", "b": b"2", "c": b"3"})
+
+        assert await cache_manager.delete_many(["a", "b", "missing"]) == 2  # noqa: PLR2004
+        assert await cache_manager.mget(["a", "b", "c"]) == [None, None, b"3"]
+        assert await cache_manager.delete_many([]) == 0
+
+    @pytest.mark.asyncio
+    async def test_pipeline_returns_results_in_order(self, cache_manager: ValkeyCache):
+        await cache_manager.set("a", b"1")
+
+        async with cache_manager.pipeline() as pipe:
+            pipe.get("a")
+            pipe.set("b", b"2", expire=60)
+            pipe.delete("a")
+            results = await pipe.execute()
+
+        assert results == [b"1", True, 1]
+        assert await cache_manager.mget(["a", "b"]) == [None, b"2"]
+
+    @pytest.mark.asyncio
+    async def test_pipeline_error_returns_none_results(
+        self, cache_manager: ValkeyCache
+    ):
+        async with cache_manager.pipeline() as pipe:
+            pipe.get("a")
+            pipe.get("b")
+            with patch.object(
+                pipe._pipe,
+                "execute",
+                side_effect=ValkeyError("Connection lost"),
+            ):
+                results = await pipe.execute()
+
+        assert results == [None, None]
+
+
+class TestPlayerApiCacheIndex:
+    """Tests for API cache eviction through the per-player key index"""
+
+    @pytest.mark.asyncio
+    async def test_evicts_indexed_keys_only(self, cache_manager: ValkeyCache):
+        await cache_manager.update_api_cache(
+            "/players/TeKrop-2217/summary", {"a": 1}, 600, player_id="TeKrop-2217"
+        )
+        await cache_manager.update_api_cache(
+            "/players/TeKrop-2217/stats/career", {"b": 2}, 600, player_id="TeKrop-2217"
+        )
+        await cache_manager.update_api_cache(
+            "/players/Other-1234/summary", {"c": 3}, 600, player_id="Other-1234"
+        )
+
+        evicted = await cache_manager.evict_players_api_cache(
+            ["TeKrop-2217", "Unknown-0000"]
+        )
+
+        assert evicted == {"TeKrop-2217": 2, "Unknown-0000": 0}
+        assert await cache_manager.get_api_cache("/players/TeKrop-2217/summary") is None
+        assert (
+            await cache_manager.get_api_cache("/players/TeKrop-2217/stats/career")
+            is None
+        )
+        assert await cache_manager.get_api_cache("/players/Other-1234/summary") == {
+            "c": 3
+        }
+
+    @pytest.mark.asyncio
+    async def test_index_expires_with_longest_lived_key(
+        self, cache_manager: ValkeyCache
+    ):
+        await cache_manager.update_api_cache(
+            "/players/TeKrop-2217/summary", {"a": 1}, 600, player_id="TeKrop-2217"
+        )
+        await cache_manager.update_api_cache(
+            "/players/TeKrop-2217/stats", {"b": 2}, 60, player_id="TeKrop-2217"
+        )
+
+        index_ttl = await cache_manager.valkey_server.ttl(
+            f"{settings.player_cache_index_key_prefix}:TeKrop-2217"
+        )
+
+        assert 60 < index_ttl <= 600  # noqa: PLR2004
+
+    @pytest.mark.asyncio
+    async def test_no_index_returns_zero(self, cache_manager: ValkeyCache):
+        assert await cache_manager.evict_players_api_cache(["Unknown-0000"]) == {
+            "Unknown-0000": 0
+        }
+
+
+class TestLock:
+    """Tests for short-lived Valkey locks"""
+
+    @pytest.mark.asyncio
+    async def test_lock_can_only_be_acquired_once(self, cache_manager: ValkeyCache):
+        assert await cache_manager.acquire_lock("lock:abc123", "first", 30)
+        assert not await cache_manager.acquire_lock("lock:abc123", "second", 30)
+
+    @pytest.mark.asyncio
+    async def test_release_with_wrong_token_keeps_lock(
+        self, cache_manager: ValkeyCache
+    ):
+        await cache_manager.acquire_lock("lock:abc123", "first", 30)
+        await cache_manager.release_lock("lock:abc123", "second")
+
+        assert await cache_manager.exists("lock:abc123")
+
+    @pytest.mark.asyncio
+    async def test_release_frees_lock(self, cache_manager: ValkeyCache):
+        await cache_manager.acquire_lock("lock:abc123", "first", 30)
+        await cache_manager.release_lock("lock:abc123", "first")
+
+        assert await cache_manager.acquire_lock("lock:abc123", "second", 30)
+
+
+class TestPlayerPopularity:
+    """Tests for the sorted set of players popularity scores"""
+
+    @pytest.mark.asyncio
+    async def test_most_popular_players_first(self, cache_manager: ValkeyCache):
+        await cache_manager.valkey_server.zadd(
+            settings.player_popularity_key, {"A-1": 1, "B-2": 5, "C-3": 3}
+        )
+
+        assert await cache_manager.get_popular_players(2) == ["B-2", "C-3"]
+
+    @pytest.mark.asyncio
+    async def test_decay_scales_scores_and_trims(self, cache_manager: ValkeyCache):
+        await cache_manager.valkey_server.zadd(
+            settings.player_popularity_key, {"A-1": 2, "B-2": 8, "C-3": 4}
+        )
+
+        await cache_manager.decay_player_popularity(0.5, max_players=2)
+
+        key = settings.player_popularity_key
+        assert await cache_manager.valkey_server.zscore(key, "A-1") is None
+        assert await cache_manager.valkey_server.zscore(key, "B-2") == 4.0  # noqa: PLR2004
+        assert await cache_manager.valkey_server.zscore(key, "C-3") == 2.0  # noqa: PLR2004
+
+
 class TestPlayerStatus:
     """Tests for Valkey-based unknown player two-key pattern"""
 
@@ -182,6 +422,21 @@ class TestPlayerStatus:
         assert result_by_id is None
         assert result_by_battletag is None
 
+    @pytest.mark.asyncio
+    async def test_delete_player_status_without_battletag(
+        self, cache_manager: ValkeyCache
+    ):
+        """A status recorded without battletag is deleted with its cooldown key"""
+        blizzard_id = "nobattletag123"
+        await cache_manager.set_player_status(blizzard_id, 1, 600)
+
+        await cache_manager.delete_player_status(blizzard_id)
+
+        assert await cache_manager.get_player_status(blizzard_id) is None
+        assert not await cache_manager.valkey_server.exists(
+            f"{settings.unknown_player_cooldown_key_prefix}:{blizzard_id}"
+        )
+
     @pytest.mark.asyncio
     async def test_delete_player_status_is_idempotent_when_not_tracked(
         self, cache_manager: ValkeyCache
@@ -237,6 +237,8 @@ class TestGetPlayerProfile:
             "last_updated_blizzard": 1700000000,
             "updated_at": updated_at,
             "data_version": 1,
+            "parsed_compressed": None,
+            "parser_version": None,
         }
         pool, conn = _make_pool()
         conn.fetchrow = AsyncMock(return_value=row)
@@ -262,6 +264,8 @@ class TestGetPlayerProfile:
             "last_updated_blizzard": 12345,
             "updated_at": updated_at,
             "data_version": 1,
+            "parsed_compressed": None,
+            "parser_version": None,
         }
         pool, conn = _make_pool()
         conn.fetchrow = AsyncMock(return_value=row)
@@ -272,6 +276,32 @@ class TestGetPlayerProfile:
         assert result["summary"]["url"] == "abc123"
         assert result["summary"]["lastUpdated"] == 12345  # noqa: PLR2004
 
+    @pytest.mark.asyncio
+    async def test_returns_decompressed_parsed_profile(self):
+        parsed_profile = {"summary": {"username": "TeKrop"}, "stats": None}
+        row = {
+            "html_compressed": PostgresStorage._compress("<html>player</html>"),
+            "battletag": None,
+            "name": None,
+            "summary": {"url": "abc123", "lastUpdated": 1700000000},
+            "last_updated_blizzard": 1700000000,
+            "updated_at": datetime.datetime(2025, 6, 1, tzinfo=datetime.UTC),
+            "data_version": 1,
+            "parsed_compressed": PostgresStorage._compress_json(parsed_profile),
+            "parser_version": 3,
+        }
+        pool, conn = _make_pool()
+        conn.fetchrow = AsyncMock(return_value=row)
+        storage = _make_storage(pool=pool)
+        result = await storage.get_player_profile("abc123")
+
+        assert result is not None
+        assert result["parsed_profile"] == parsed_profile
+        assert result["parsed_profile_size"] == len(
+            '{"summary":{"username":"TeKrop"},"stats":null}'
+        )
+        assert result["parser_version"] == 3  # noqa: PLR2004
+
 
 # ---------------------------------------------------------------------------
 # get_player_id_by_battletag
@@ -335,6 +365,120 @@ class TestSetPlayerProfile:
         # last_updated_blizzard is 6th positional arg
         assert args[6] == 9999  # noqa: PLR2004
 
+    @pytest.mark.asyncio
+    async def test_compresses_parsed_profile_with_version(self):
+        pool, conn = _make_pool()
+        storage = _make_storage(pool=pool)
+        parsed_profile = {"summary": {"username": "TeKrop"}, "stats": None}
+        await storage.set_player_profile(
+            player_id="abc123",
+            html="<html/>",
+            parsed_profile=parsed_profile,
+            parser_version=2,
+        )
+        args = conn.execute.call_args[0]
+
+        # parsed_compressed and parser_version are 8th and 9th positional args
+        assert PostgresStorage._decompress_json(args[8]) == parsed_profile
+        assert args[9] == 2  # noqa: PLR2004
+
+    @pytest.mark.asyncio
+    async def test_clears_parsed_profile_when_not_given(self):
+        pool, conn = _make_pool()
+        storage = _make_storage(pool=pool)
+        await storage.set_player_profile(
+            player_id="abc123", html="<html/>", parser_version=2
+        )
+        args = conn.execute.call_args[0]
+
+        assert args[8] is None
+        assert args[9] is None
+
+
+class TestSetPlayerProfiles:
+    @pytest.mark.asyncio
+    async def test_upserts_all_profiles_at_once(self):
+        pool, conn = _make_pool()
+        storage = _make_storage(pool=pool)
+        await storage.set_player_profiles(
+            [
+                {
+                    "player_id": "abc123",
+                    "html": "<html/>",
+                    "summary": {"lastUpdated": 1},
+                },
+                {"player_id": "def456", "html": "<html/>", "battletag": "TeKrop-2217"},
+            ]
+        )
+        conn.executemany.assert_awaited_once()
+        sql, rows = conn.executemany.call_args[0]
+
+        assert "INSERT INTO player_profiles" in sql
+        assert [row[0] for row in rows] == ["abc123", "def456"]
+        # last_updated_blizzard is extracted from summary, as for a single upsert
+        assert rows[0][5] == 1
+        assert rows[1][1] == "TeKrop-2217"
+        conn.execute.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_no_profile_is_noop(self):
+        pool, conn = _make_pool()
+        storage = _make_storage(pool=pool)
+        await storage.set_player_profiles([])
+
+        conn.executemany.assert_not_awaited()
+
+
+class TestGetPlayerProfilesUpdatedAt:
+    @pytest.mark.asyncio
+    async def test_maps_player_ids_and_battletags(self):
+        updated_at = datetime.datetime(2024, 1, 1, tzinfo=datetime.UTC)
+        rows = [
+            {"player_id": "abc123", "battletag": None, "updated_at": updated_at},
+            {
+                "player_id": "def456",
+                "battletag": "TeKrop-2217",
+                "updated_at": updated_at,
+            },
+        ]
+        pool, _ = _make_pool(_make_connection(fetch_result=rows))
+        storage = _make_storage(pool=pool)
+
+        result = await storage.get_player_profiles_updated_at(
+            ["abc123", "TeKrop-2217", "Unknown-1234"]
+        )
+
+        timestamp = int(updated_at.timestamp())
+        assert result == {"abc123": timestamp, "TeKrop-2217": timestamp}
+
+    @pytest.mark.asyncio
+    async def test_no_player_is_noop(self):
+        pool, conn = _make_pool()
+        storage = _make_storage(pool=pool)
+
+        assert await storage.get_player_profiles_updated_at([]) == {}
+        conn.fetch.assert_not_awaited()
+
+
+# ---------------------------------------------------------------------------
+# set_player_profile_parsed
+# ---------------------------------------------------------------------------
+
+
+class TestSetPlayerProfileParsed:
+    @pytest.mark.asyncio
+    async def test_updates_parsed_profile_only(self):
+        pool, conn = _make_pool()
+        storage = _make_storage(pool=pool)
+        parsed_profile = {"summary": {}, "stats": None}
+        await storage.set_player_profile_parsed("abc123", parsed_profile, 2)
+        sql, player_id, parsed_compressed, parser_version = conn.execute.call_args[0]
+
+        assert "updated_at" not in sql
+        assert player_id == "abc123"
+        assert PostgresStorage._decompress_json(parsed_compressed) == parsed_profile
+        assert parser_version == 2  # noqa: PLR2004
+
 
 # ---------------------------------------------------------------------------
 # delete_old_player_profiles
@@ -0,0 +1,123 @@
+"""Tests for the worker concurrency autotuning"""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.adapters.tasks.concurrency import (
+    ConcurrencyController,
+    compute_concurrency_limit,
+    estimate_service_time,
+)
+
+_MODULE = "app.adapters.tasks.concurrency"
+
+
+@pytest.fixture(autouse=True)
+def concurrency_settings():
+    with patch(f"{_MODULE}.settings") as mock_settings:
+        mock_settings.worker_min_concurrent_jobs = 2
+        mock_settings.worker_max_concurrent_jobs = 20
+        mock_settings.throttle_enabled = True
+        mock_settings.prometheus_enabled = False
+        yield mock_settings
+
+
+class TestEstimateServiceTime:
+    def test_default_without_enough_jobs(self):
+        assert estimate_service_time([10.0, 12.0]) == 2.0  # noqa: PLR2004
+
+    def test_ignores_jobs_which_waited_for_the_throttle(self):
+        durations = [1.0] * 20 + [30.0] * 80
+
+        assert estimate_service_time(durations) == pytest.approx(1.0)
+
+
+class TestComputeConcurrencyLimit:
+    def test_sized_from_throttle_delay(self):
+        # 3s per job, a request every 0.5s : 6 jobs in flight, plus one
+        limit = compute_concurrency_limit(
+            delay=0.5, service_time=3.0, queue_size=100, in_flight=0, workers=1
+        )
+
+        assert limit == 7  # noqa: PLR2004
+
+    def test_shared_among_workers(self):
+        limit = compute_concurrency_limit(
+            delay=0.25, service_time=3.0, queue_size=100, in_flight=0, workers=3
+        )
+
+        assert limit == 5  # noqa: PLR2004
+
+    def test_capped_by_queued_jobs(self):
+        limit = compute_concurrency_limit(
+            delay=0.1, service_time=3.0, queue_size=4, in_flight=1, workers=1
+        )
+
+        assert limit == 5  # noqa: PLR2004
+
+    def test_within_bounds(self):
+        assert (
+            compute_concurrency_limit(
+                delay=0.01, service_time=3.0, queue_size=1000, in_flight=0, workers=1
+            )
+            == 20  # noqa: PLR2004
+        )
+        assert (
+            compute_concurrency_limit(
+                delay=5.0, service_time=1.0, queue_size=0, in_flight=0, workers=1
+            )
+            == 2  # noqa: PLR2004
+        )
+
+
+class TestConcurrencyController:
+    @staticmethod
+    def _broker(max_in_flight: int = 10) -> MagicMock:
+        broker = MagicMock()
+        broker.max_in_flight = max_in_flight
+        broker.in_flight = 0
+        broker.job_durations = []
+        broker.get_queue_stats = AsyncMock(return_value=(100, 1))
+        broker.set_max_in_flight = AsyncMock()
+        return broker
+
+    @staticmethod
+    def _throttle(delay: float = 0.5, rate_limited: int = 0) -> AsyncMock:
+        throttle = AsyncMock()
+        throttle.is_rate_limited.return_value = rate_limited
+        throttle.get_current_delay.return_value = delay
+        return throttle
+
+    @pytest.mark.asyncio
+    async def test_adjusts_broker_limit(self):
+        broker = self._broker()
+
+        with patch(f"{_MODULE}.BlizzardThrottle", return_value=self._throttle()):
+            limit = await ConcurrencyController(broker).adjust()
+
+        # Default 2s service time, a request every 0.5s : 4 jobs, plus one
+        assert limit == 5  # noqa: PLR2004
+        broker.set_max_in_flight.assert_awaited_once_with(5)
+
+    @pytest.mark.asyncio
+    async def test_minimum_during_penalty(self):
+        broker = self._broker()
+
+        with patch(
+            f"{_MODULE}.BlizzardThrottle",
+            return_value=self._throttle(rate_limited=30),
+        ):
+            limit = await ConcurrencyController(broker).adjust()
+
+        assert limit == 2  # noqa: PLR2004
+        broker.get_queue_stats.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_unchanged_limit_is_not_set(self):
+        broker = self._broker(max_in_flight=5)
+
+        with patch(f"{_MODULE}.BlizzardThrottle", return_value=self._throttle()):
+            await ConcurrencyController(broker).adjust()
+
+        broker.set_max_in_flight.assert_not_awaited()
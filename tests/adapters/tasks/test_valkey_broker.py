@@ -1,10 +1,21 @@
 """Tests for ValkeyListBroker — startup, shutdown, _get_client, kick, listen"""
 
+import asyncio
+import time
+from typing import TYPE_CHECKING
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
-from app.adapters.tasks.valkey_broker import ValkeyListBroker
+from app.adapters.tasks.valkey_broker import (
+    _KICK_IF_ABSENT_SCRIPT,
+    _PROMOTE_DUE_SCRIPT,
+    _REQUEUE_PROCESSING_SCRIPT,
+    ValkeyListBroker,
+)
+
+if TYPE_CHECKING:
+    import fakeredis
 
 _MODULE = "app.adapters.tasks.valkey_broker"
 
@@ -110,6 +121,7 @@ class TestKick:
 
         mock_message = MagicMock()
         mock_message.message = b"serialised-task"
+        mock_message.labels = {}
 
         broker._pool = MagicMock()  # non-None so _get_client won't raise
 
@@ -118,25 +130,179 @@ class TestKick:
 
         mock_conn.lpush.assert_awaited_once_with("test:queue", b"serialised-task")
 
+    @pytest.mark.asyncio
+    async def test_kick_delays_future_messages(self, broker: ValkeyListBroker):
+        """kick() adds messages due later to the delayed sorted set."""
+        mock_conn = AsyncMock()
+        mock_conn.__aenter__ = AsyncMock(return_value=mock_conn)
+        mock_conn.__aexit__ = AsyncMock(return_value=False)
+
+        run_at = time.time() + 60
+        mock_message = MagicMock()
+        mock_message.message = b"serialised-task"
+        mock_message.labels = {"run_at": run_at}
+
+        broker._pool = MagicMock()
+
+        with patch.object(broker, "_get_client", return_value=mock_conn):
+            await broker.kick(mock_message)
+
+        mock_conn.zadd.assert_awaited_once_with(
+            "test:queue:delayed", {b"serialised-task": run_at}
+        )
+        mock_conn.lpush.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_kick_pushes_due_messages(self, broker: ValkeyListBroker):
+        """kick() LPUSH messages whose run_at is already past."""
+        mock_conn = AsyncMock()
+        mock_conn.__aenter__ = AsyncMock(return_value=mock_conn)
+        mock_conn.__aexit__ = AsyncMock(return_value=False)
+
+        mock_message = MagicMock()
+        mock_message.message = b"serialised-task"
+        mock_message.labels = {"run_at": time.time() - 1}
+
+        broker._pool = MagicMock()
+
+        with patch.object(broker, "_get_client", return_value=mock_conn):
+            await broker.kick(mock_message)
+
+        mock_conn.lpush.assert_awaited_once_with("test:queue", b"serialised-task")
+        mock_conn.zadd.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_kick_claims_dedup_key_atomically(self, broker: ValkeyListBroker):
+        """kick() claims the dedup key and pushes in a single script call."""
+        mock_conn = AsyncMock()
+        mock_conn.__aenter__ = AsyncMock(return_value=mock_conn)
+        mock_conn.__aexit__ = AsyncMock(return_value=False)
+
+        mock_message = MagicMock()
+        mock_message.message = b"serialised-task"
+        mock_message.labels = {"dedup_key": "worker:job:job-1", "dedup_ttl": "300"}
+
+        broker._pool = MagicMock()
+
+        with (
+            patch.object(broker, "_get_client", return_value=mock_conn),
+            patch.object(broker, "_run_script", return_value=1) as mock_run_script,
+        ):
+            await broker.kick(mock_message)
+
+        mock_run_script.assert_awaited_once()
+        assert mock_run_script.call_args.args[2:] == (
+            ["worker:job:job-1", "test:queue", "test:queue:delayed"],
+            [b"serialised-task", 300, ""],
+        )
+        mock_conn.lpush.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_kick_counts_duplicates(self, broker: ValkeyListBroker):
+        """A message whose dedup key exists is counted as deduplicated."""
+        mock_conn = AsyncMock()
+        mock_conn.__aenter__ = AsyncMock(return_value=mock_conn)
+        mock_conn.__aexit__ = AsyncMock(return_value=False)
+
+        run_at = time.time() + 60
+        mock_message = MagicMock()
+        mock_message.message = b"serialised-task"
+        mock_message.task_name = "refresh_player_profile"
+        mock_message.labels = {
+            "dedup_key": "worker:job:job-1",
+            "dedup_ttl": "360",
+            "run_at": str(run_at),
+        }
+
+        broker._pool = MagicMock()
+
+        with (
+            patch.object(broker, "_get_client", return_value=mock_conn),
+            patch.object(broker, "_run_script", return_value=0) as mock_run_script,
+            patch(f"{_MODULE}.settings") as mock_settings,
+            patch(f"{_MODULE}.background_tasks_deduplicated_total") as mock_metric,
+        ):
+            mock_settings.prometheus_enabled = True
+            await broker.kick(mock_message)
+
+        assert mock_run_script.call_args.args[3][-1] == pytest.approx(run_at)
+        mock_metric.labels.assert_called_once_with(task_name="refresh_player_profile")
+        mock_metric.labels.return_value.inc.assert_called_once()
+
+
+class TestRunScript:
+    @pytest.mark.asyncio
+    async def test_script_is_registered_once(self, broker: ValkeyListBroker):
+        """Scripts are run with EVALSHA, their source isn't sent on each call."""
+        mock_conn = AsyncMock()
+        registered_script = AsyncMock(return_value=1)
+        mock_conn.register_script = MagicMock(return_value=registered_script)
+
+        for _ in range(2):
+            result = await broker._run_script(mock_conn, "return 1", ["key"], [42])
+            assert result == 1
+
+        mock_conn.register_script.assert_called_once_with("return 1")
+        registered_script.assert_awaited_with(keys=["key"], args=[42], client=mock_conn)
+        mock_conn.eval.assert_not_called()
+
+
+class TestPromoteDueMessages:
+    @pytest.mark.asyncio
+    async def test_promotes_due_messages_atomically(self, broker: ValkeyListBroker):
+        """Due messages are moved by a single script, then the loop waits."""
+        mock_conn = AsyncMock()
+        mock_conn.__aenter__ = AsyncMock(return_value=mock_conn)
+        mock_conn.__aexit__ = AsyncMock(return_value=False)
+
+        broker._pool = MagicMock()
+
+        with (
+            patch.object(broker, "_get_client", return_value=mock_conn),
+            patch.object(broker, "_run_script", return_value=2) as mock_run_script,
+            patch(f"{_MODULE}.asyncio.sleep", side_effect=asyncio.CancelledError),
+            pytest.raises(asyncio.CancelledError),
+        ):
+            await broker._promote_due_messages()
+
+        mock_run_script.assert_awaited_once()
+        assert mock_run_script.call_args.args[2] == [
+            "test:queue:delayed",
+            "test:queue",
+        ]
+
+    @pytest.mark.asyncio
+    async def test_errors_do_not_stop_the_loop(self, broker: ValkeyListBroker):
+        """A failing promotion is logged, and the next check still happens."""
+        mock_conn = AsyncMock()
+        mock_conn.__aenter__ = AsyncMock(return_value=mock_conn)
+        mock_conn.__aexit__ = AsyncMock(return_value=False)
+
+        broker._pool = MagicMock()
+
+        with (
+            patch.object(broker, "_get_client", return_value=mock_conn),
+            patch.object(
+                broker, "_run_script", side_effect=ConnectionError("down")
+            ) as mock_run_script,
+            patch(f"{_MODULE}.asyncio.sleep", side_effect=asyncio.CancelledError),
+            pytest.raises(asyncio.CancelledError),
+        ):
+            await broker._promote_due_messages()
+
+        mock_run_script.assert_awaited_once()
+
 
 class TestListen:
     @pytest.mark.asyncio
-    async def test_listen_yields_data_from_brpop(self, broker: ValkeyListBroker):
-        """listen() yields the data part of BRPOP result."""
+    async def test_listen_yields_data_from_blmove(self, broker: ValkeyListBroker):
+        """listen() moves messages to the processing list and yields them."""
         mock_conn = AsyncMock()
         mock_conn.__aenter__ = AsyncMock(return_value=mock_conn)
         mock_conn.__aexit__ = AsyncMock(return_value=False)
 
-        # First call returns a result; second returns None (no more items);
-        # third returns None again — we'll stop iteration via StopAsyncIteration
-        mock_conn.brpop = AsyncMock(
-            side_effect=[
-                ("test:queue", b"task-data-1"),
-                ("test:queue", b"task-data-2"),
-                None,
-                None,
-                None,
-            ]
+        mock_conn.blmove = AsyncMock(
+            side_effect=[b"task-data-1", b"task-data-2", None, None, None]
         )
 
         broker._pool = MagicMock()
@@ -144,35 +310,275 @@ class TestListen:
         with patch.object(broker, "_get_client", return_value=mock_conn):
             results = []
             async for item in broker.listen():
-                results.append(item)
+                results.append(item.data)
                 if len(results) >= 2:  # noqa: PLR2004
                     break
 
         assert results == [b"task-data-1", b"task-data-2"]
+        assert mock_conn.blmove.call_args.args[:2] == (
+            "test:queue",
+            f"test:queue:processing:{broker.worker_id}",
+        )
 
     @pytest.mark.asyncio
-    async def test_listen_skips_none_brpop(self, broker: ValkeyListBroker):
-        """listen() skips None results from BRPOP (timeout with no message)."""
+    async def test_listen_skips_none_blmove(self, broker: ValkeyListBroker):
+        """listen() skips None results from BLMOVE (timeout with no message)."""
         mock_conn = AsyncMock()
         mock_conn.__aenter__ = AsyncMock(return_value=mock_conn)
         mock_conn.__aexit__ = AsyncMock(return_value=False)
 
-        call_count = 0
-
-        async def brpop_side_effect(*_args, **_kwargs):
-            nonlocal call_count
-            call_count += 1
-            if call_count == 1:
-                return None  # timeout, no message
-            return ("test:queue", b"real-task")
-
-        mock_conn.brpop = brpop_side_effect
+        mock_conn.blmove = AsyncMock(side_effect=[None, b"real-task"])
         broker._pool = MagicMock()
 
         with patch.object(broker, "_get_client", return_value=mock_conn):
             results = []
             async for item in broker.listen():
-                results.append(item)
+                results.append(item.data)
                 break  # take the first real item
 
         assert results == [b"real-task"]
+
+    @pytest.mark.asyncio
+    async def test_ack_removes_message_from_processing_list(
+        self, broker: ValkeyListBroker
+    ):
+        """Acknowledging a message removes it from the processing list."""
+        mock_conn = AsyncMock()
+        mock_conn.__aenter__ = AsyncMock(return_value=mock_conn)
+        mock_conn.__aexit__ = AsyncMock(return_value=False)
+        mock_conn.blmove = AsyncMock(return_value=b"task-data")
+
+        broker._pool = MagicMock()
+
+        with patch.object(broker, "_get_client", return_value=mock_conn):
+            async for item in broker.listen():
+                await item.ack()
+                break
+
+        mock_conn.lrem.assert_awaited_once_with(
+            f"test:queue:processing:{broker.worker_id}", 1, b"task-data"
+        )
+
+
+class TestConcurrencyLimit:
+    @pytest.mark.asyncio
+    async def test_waits_for_a_free_slot(self):
+        """No message is taken from the queue while the limit is reached."""
+        broker = ValkeyListBroker(
+            url="valkey://localhost:6379", queue_name="test:queue", max_in_flight=1
+        )
+        mock_conn = AsyncMock()
+        mock_conn.__aenter__ = AsyncMock(return_value=mock_conn)
+        mock_conn.__aexit__ = AsyncMock(return_value=False)
+        mock_conn.blmove = AsyncMock(side_effect=[b"task-1", b"task-2"])
+        broker._pool = MagicMock()
+
+        with patch.object(broker, "_get_client", return_value=mock_conn):
+            messages = broker.listen()
+            first = await anext(messages)
+            second = asyncio.ensure_future(anext(messages))
+            await asyncio.sleep(0)
+
+            assert mock_conn.blmove.await_count == 1
+            assert broker.in_flight == 1
+
+            await first.ack()
+            assert (await second).data == b"task-2"
+            await messages.aclose()
+
+        assert len(broker.job_durations) == 1
+
+    @pytest.mark.asyncio
+    async def test_limit_is_at_least_one(self, broker: ValkeyListBroker):
+        await broker.set_max_in_flight(0)
+        assert broker.max_in_flight == 1
+
+        await broker.set_max_in_flight(4)
+        assert broker.max_in_flight == 4  # noqa: PLR2004
+
+
+class TestReliableDelivery:
+    @staticmethod
+    def _mock_conn() -> AsyncMock:
+        mock_conn = AsyncMock()
+        mock_conn.__aenter__ = AsyncMock(return_value=mock_conn)
+        mock_conn.__aexit__ = AsyncMock(return_value=False)
+        return mock_conn
+
+    @pytest.mark.asyncio
+    async def test_dead_workers_messages_are_queued_again(
+        self, broker: ValkeyListBroker
+    ):
+        """Other workers are checked by the script, the current one skipped."""
+        mock_conn = self._mock_conn()
+        mock_conn.smembers = AsyncMock(
+            return_value={broker.worker_id.encode(), b"dead-worker"}
+        )
+        broker._pool = MagicMock()
+
+        with (
+            patch.object(broker, "_get_client", return_value=mock_conn),
+            patch.object(broker, "_run_script", return_value=3) as mock_run_script,
+            patch(
+                f"{_MODULE}.asyncio.sleep",
+                side_effect=[None, asyncio.CancelledError],
+            ),
+            pytest.raises(asyncio.CancelledError),
+        ):
+            await broker._reap_dead_workers()
+
+        mock_conn.set.assert_awaited_once_with(
+            f"test:queue:heartbeat:{broker.worker_id}", 1, ex=60
+        )
+        mock_run_script.assert_awaited_once()
+        assert mock_run_script.call_args.args[2:] == (
+            [
+                "test:queue:heartbeat:dead-worker",
+                "test:queue:processing:dead-worker",
+                "test:queue",
+                "test:queue:workers",
+            ],
+            ["dead-worker"],
+        )
+
+    @pytest.mark.asyncio
+    async def test_shutdown_releases_unprocessed_messages(
+        self, broker: ValkeyListBroker
+    ):
+        """A worker queues again its in-flight messages when stopping."""
+        mock_conn = self._mock_conn()
+        broker._pool = AsyncMock()
+        broker.is_worker_process = True
+
+        with (
+            patch.object(broker, "_get_client", return_value=mock_conn),
+            patch.object(broker, "_run_script", return_value=1) as mock_run_script,
+        ):
+            await broker.shutdown()
+
+        mock_conn.delete.assert_awaited_once_with(
+            f"test:queue:heartbeat:{broker.worker_id}"
+        )
+        assert mock_run_script.call_args.args[2][1] == (
+            f"test:queue:processing:{broker.worker_id}"
+        )
+
+
+class TestScripts:
+    """Lua scripts of the broker, run against the fake Valkey server"""
+
+    @pytest.mark.asyncio
+    async def test_dead_worker_messages_are_queued_again_oldest_first(
+        self, broker: ValkeyListBroker, valkey_server: fakeredis.FakeAsyncRedis
+    ):
+        # Messages are consumed from the right of the queue, and moved to the
+        # left of the processing list : "a" was consumed first
+        in_flight = ["a", "b"]
+        await valkey_server.lpush("test:queue:processing:dead-worker", *in_flight)
+        await valkey_server.lpush("test:queue", "c")
+        await valkey_server.sadd("test:queue:workers", "dead-worker")
+
+        result = await broker._run_script(
+            valkey_server,
+            _REQUEUE_PROCESSING_SCRIPT,
+            [
+                "test:queue:heartbeat:dead-worker",
+                "test:queue:processing:dead-worker",
+                "test:queue",
+                "test:queue:workers",
+            ],
+            ["dead-worker"],
+        )
+
+        assert result == len(in_flight)
+        # "a" is consumed first again, then "b", then "c"
+        assert await valkey_server.lrange("test:queue", 0, -1) == [b"c", b"b", b"a"]
+        assert not await valkey_server.exists("test:queue:processing:dead-worker")
+        assert not await valkey_server.sismember("test:queue:workers", "dead-worker")
+
+    @pytest.mark.asyncio
+    async def test_alive_worker_messages_are_kept(
+        self, broker: ValkeyListBroker, valkey_server: fakeredis.FakeAsyncRedis
+    ):
+        await valkey_server.set("test:queue:heartbeat:alive-worker", 1, ex=60)
+        await valkey_server.lpush("test:queue:processing:alive-worker", "a")
+        await valkey_server.sadd("test:queue:workers", "alive-worker")
+
+        result = await broker._run_script(
+            valkey_server,
+            _REQUEUE_PROCESSING_SCRIPT,
+            [
+                "test:queue:heartbeat:alive-worker",
+                "test:queue:processing:alive-worker",
+                "test:queue",
+                "test:queue:workers",
+            ],
+            ["alive-worker"],
+        )
+
+        assert result == -1
+        assert not await valkey_server.exists("test:queue")
+        assert await valkey_server.lrange(
+            "test:queue:processing:alive-worker", 0, -1
+        ) == [b"a"]
+        assert await valkey_server.sismember("test:queue:workers", "alive-worker")
+
+    @pytest.mark.asyncio
+    async def test_duplicate_kick_pushes_nothing(
+        self, broker: ValkeyListBroker, valkey_server: fakeredis.FakeAsyncRedis
+    ):
+        keys = ["worker:job:job-1", "test:queue", "test:queue:delayed"]
+        dedup_ttl = 300
+
+        first = await broker._run_script(
+            valkey_server, _KICK_IF_ABSENT_SCRIPT, keys, ["task", dedup_ttl, ""]
+        )
+        duplicate = await broker._run_script(
+            valkey_server, _KICK_IF_ABSENT_SCRIPT, keys, ["task", dedup_ttl, ""]
+        )
+
+        assert (first, duplicate) == (1, 0)
+        assert await valkey_server.lrange("test:queue", 0, -1) == [b"task"]
+        assert 0 < await valkey_server.ttl("worker:job:job-1") <= dedup_ttl
+
+    @pytest.mark.asyncio
+    async def test_delayed_kick_is_added_to_sorted_set(
+        self, broker: ValkeyListBroker, valkey_server: fakeredis.FakeAsyncRedis
+    ):
+        run_at = time.time() + 60
+
+        result = await broker._run_script(
+            valkey_server,
+            _KICK_IF_ABSENT_SCRIPT,
+            ["worker:job:job-1", "test:queue", "test:queue:delayed"],
+            ["task", 300, run_at],
+        )
+
+        assert result == 1
+        assert not await valkey_server.exists("test:queue")
+        assert await valkey_server.zscore(
+            "test:queue:delayed", "task"
+        ) == pytest.approx(run_at)
+
+    @pytest.mark.asyncio
+    async def test_due_messages_are_promoted_once(
+        self, broker: ValkeyListBroker, valkey_server: fakeredis.FakeAsyncRedis
+    ):
+        now = time.time()
+        await valkey_server.zadd(
+            "test:queue:delayed",
+            {"due-1": now - 20, "due-2": now - 10, "later": now + 60},
+        )
+        keys = ["test:queue:delayed", "test:queue"]
+
+        promoted = await broker._run_script(
+            valkey_server, _PROMOTE_DUE_SCRIPT, keys, [now, 100]
+        )
+        promoted_again = await broker._run_script(
+            valkey_server, _PROMOTE_DUE_SCRIPT, keys, [now, 100]
+        )
+
+        assert (promoted, promoted_again) == (2, 0)
+        # Oldest due message is consumed first
+        assert await valkey_server.lrange("test:queue", 0, -1) == [b"due-2", b"due-1"]
+        assert await valkey_server.zrange("test:queue:delayed", 0, -1) == [b"later"]
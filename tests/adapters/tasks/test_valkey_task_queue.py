@@ -1,5 +1,6 @@
 """Tests for ValkeyTaskQueue adapter"""
 
+import time
 from typing import Any, cast
 from unittest.mock import AsyncMock, MagicMock, patch
 
@@ -7,6 +8,7 @@ import fakeredis
 import pytest
 
 from app.adapters.tasks.valkey_task_queue import ValkeyTaskQueue
+from app.config import settings
 
 
 @pytest.fixture
@@ -19,36 +21,52 @@ def queue(fake_redis: fakeredis.FakeAsyncRedis) -> ValkeyTaskQueue:
     return ValkeyTaskQueue(fake_redis)
 
 
+def _mock_task() -> MagicMock:
+    """Task whose kicker records the labels given to the broker."""
+    mock_task = MagicMock()
+    mock_task.kiq = AsyncMock()
+    mock_task.kicker.return_value.with_labels.return_value.kiq = AsyncMock()
+    return mock_task
+
+
+def _kicked_labels(mock_task: MagicMock) -> dict[str, Any]:
+    return mock_task.kicker.return_value.with_labels.call_args.kwargs
+
+
+def _kiq(mock_task: MagicMock) -> AsyncMock:
+    return mock_task.kicker.return_value.with_labels.return_value.kiq
+
+
 class TestDeduplication:
     @pytest.mark.asyncio
-    async def test_duplicate_job_skipped(self, queue: ValkeyTaskQueue):
-        mock_task = MagicMock()
-        mock_task.kiq = AsyncMock()
+    async def test_dedup_key_given_to_the_broker(self, queue: ValkeyTaskQueue):
+        """The broker claims the dedup key and queues the job in one call."""
+        mock_task = _mock_task()
         with patch.dict(
             "app.adapters.tasks.valkey_task_queue.TASK_MAP",
             {"refresh": mock_task},
         ):
             await queue.enqueue("refresh", job_id="job-1")
-            await queue.enqueue("refresh", job_id="job-1")
 
-        mock_task.kiq.assert_awaited_once_with("job-1")
+        _kiq(mock_task).assert_awaited_once_with("job-1")
+        assert _kicked_labels(mock_task) == {
+            "dedup_key": "worker:job:job-1",
+            "dedup_ttl": settings.worker_job_timeout,
+        }
+        mock_task.kiq.assert_not_awaited()
 
     @pytest.mark.asyncio
-    async def test_different_job_ids_both_recorded(self, queue: ValkeyTaskQueue):
-        mock_task = MagicMock()
-        mock_task.kiq = AsyncMock()
+    async def test_no_separate_dedup_round_trip(
+        self, queue: ValkeyTaskQueue, fake_redis: fakeredis.FakeAsyncRedis
+    ):
+        """Enqueue doesn't claim the dedup key itself, the broker does."""
         with patch.dict(
             "app.adapters.tasks.valkey_task_queue.TASK_MAP",
-            {"refresh": mock_task},
+            {"refresh": _mock_task()},
         ):
-            await queue.enqueue("refresh", job_id="job-a")
-            await queue.enqueue("refresh", job_id="job-b")
-
-        result_a = await queue.is_job_pending_or_running("job-a")
-        result_b = await queue.is_job_pending_or_running("job-b")
+            await queue.enqueue("refresh", job_id="job-1")
 
-        assert result_a
-        assert result_b
+        assert not await fake_redis.exists("worker:job:job-1")
 
     @pytest.mark.asyncio
     async def test_returns_effective_id(self, queue: ValkeyTaskQueue):
@@ -58,161 +76,304 @@ class TestDeduplication:
 
     @pytest.mark.asyncio
     async def test_falls_back_to_task_name_when_no_job_id(self, queue: ValkeyTaskQueue):
-        mock_task = MagicMock()
-        mock_task.kiq = AsyncMock()
+        mock_task = _mock_task()
         with patch.dict(
             "app.adapters.tasks.valkey_task_queue.TASK_MAP",
             {"refresh_heroes": mock_task},
         ):
             result = await queue.enqueue("refresh_heroes")
 
-        pending = await queue.is_job_pending_or_running("refresh_heroes")
-
         assert result == "refresh_heroes"
-        assert pending
+        assert _kicked_labels(mock_task)["dedup_key"] == "worker:job:refresh_heroes"
 
 
-class TestIsJobPendingOrRunning:
+class TestEnqueueTaskDispatch:
     @pytest.mark.asyncio
-    async def test_pending_after_enqueue(self, queue: ValkeyTaskQueue):
-        mock_task = MagicMock()
-        mock_task.kiq = AsyncMock()
+    async def test_known_task_kiq_called(self, queue: ValkeyTaskQueue):
+        """A known task name is kicked with effective_id."""
+        mock_task = _mock_task()
         with patch.dict(
             "app.adapters.tasks.valkey_task_queue.TASK_MAP",
-            {"refresh": mock_task},
+            {"refresh_heroes": mock_task},
         ):
-            await queue.enqueue("refresh", job_id="job-1")
-
-        result = await queue.is_job_pending_or_running("job-1")
-
-        assert result
+            await queue.enqueue("refresh_heroes", job_id="heroes")
+        _kiq(mock_task).assert_awaited_once_with("heroes")
 
     @pytest.mark.asyncio
-    async def test_not_pending_for_unknown_job(self, queue: ValkeyTaskQueue):
-        result = await queue.is_job_pending_or_running("unknown-job")
+    async def test_unknown_task_skips_kiq(
+        self, queue: ValkeyTaskQueue, fake_redis: fakeredis.FakeAsyncRedis
+    ):
+        """An unknown task name is a no-op — returns effective_id without claiming a dedup slot."""
+        result = await queue.enqueue("nonexistent_task", job_id="xyz")
 
-        assert not result
+        assert result == "xyz"
+        assert not await fake_redis.exists("worker:job:xyz")
 
     @pytest.mark.asyncio
-    async def test_independent_instances_share_redis_state(
-        self, fake_redis: fakeredis.FakeAsyncRedis
-    ):
-        """Two queue instances using the same redis see each other's dedup keys."""
-        mock_task = MagicMock()
-        mock_task.kiq = AsyncMock()
-        q1 = ValkeyTaskQueue(fake_redis)
-        q2 = ValkeyTaskQueue(fake_redis)
+    async def test_broker_exception_is_swallowed(self, queue: ValkeyTaskQueue):
+        """If the broker raises, enqueue swallows the exception and returns effective_id."""
+        mock_task = _mock_task()
+        _kiq(mock_task).side_effect = RuntimeError("redis down")
         with patch.dict(
             "app.adapters.tasks.valkey_task_queue.TASK_MAP",
-            {"refresh": mock_task},
+            {"refresh_heroes": mock_task},
         ):
-            await q1.enqueue("refresh", job_id="job-shared")
-
-        result = await q2.is_job_pending_or_running("job-shared")
+            result = await queue.enqueue("refresh_heroes", job_id="boom")
 
-        assert result
+        assert result == "boom"
 
 
-class TestEnqueueTaskDispatch:
+class TestReleaseJob:
     @pytest.mark.asyncio
-    async def test_known_task_kiq_called(self, queue: ValkeyTaskQueue):
-        """A known task name triggers task_fn.kiq(effective_id)."""
-        mock_task = MagicMock()
-        mock_task.kiq = AsyncMock()
-        with patch.dict(
-            "app.adapters.tasks.valkey_task_queue.TASK_MAP",
-            {"refresh_heroes": mock_task},
-        ):
-            await queue.enqueue("refresh_heroes", job_id="heroes")
-        mock_task.kiq.assert_awaited_once_with("heroes")
+    async def test_release_removes_dedup_key(
+        self, queue: ValkeyTaskQueue, fake_redis: fakeredis.FakeAsyncRedis
+    ):
+        """After release_job, the dedup key of the job is gone."""
+        await fake_redis.set("worker:job:job-1", "pending")
 
-    @pytest.mark.asyncio
-    async def test_unknown_task_skips_kiq(self, queue: ValkeyTaskQueue):
-        """An unknown task name is a no-op — returns effective_id without claiming a dedup slot."""
-        result = await queue.enqueue("nonexistent_task", job_id="xyz")
+        await queue.release_job("job-1")
 
-        pending = await queue.is_job_pending_or_running("xyz")
+        assert not await fake_redis.exists("worker:job:job-1")
 
-        assert result == "xyz"
-        assert not pending
+    @pytest.mark.asyncio
+    async def test_release_nonexistent_job_is_noop(self, queue: ValkeyTaskQueue):
+        """Releasing an unknown job_id does not raise."""
+        await queue.release_job("nonexistent-job")
 
     @pytest.mark.asyncio
     async def test_redis_exception_is_swallowed(
         self, fake_redis: fakeredis.FakeAsyncRedis
     ):
-        """If redis raises, enqueue swallows the exception and returns effective_id."""
+        """If redis raises during release, the exception is swallowed."""
         queue = ValkeyTaskQueue(fake_redis)
-        mock_task = MagicMock()
-        mock_task.kiq = AsyncMock()
-        cast("Any", fake_redis).set = AsyncMock(side_effect=RuntimeError("redis down"))
+        cast("Any", fake_redis).delete = AsyncMock(
+            side_effect=RuntimeError("redis down")
+        )
+        await queue.release_job("any-job")
+
+
+class TestBatchedEnqueue:
+    @pytest.fixture
+    def tasks(self):
+        single_task, batch_task = _mock_task(), MagicMock()
+        batch_task.kiq = AsyncMock()
         with patch.dict(
             "app.adapters.tasks.valkey_task_queue.TASK_MAP",
-            {"refresh_heroes": mock_task},
+            {
+                "refresh_player_profile": single_task,
+                "refresh_player_profiles": batch_task,
+            },
         ):
-            result = await queue.enqueue("refresh_heroes", job_id="boom")
+            yield single_task, batch_task
 
-        assert result == "boom"
+    @pytest.mark.asyncio
+    async def test_batch_task_kicked_once_per_batch(
+        self, queue: ValkeyTaskQueue, fake_redis: fakeredis.FakeAsyncRedis, tasks
+    ):
+        """Jobs are queued for the batch task, kicked for each new batch."""
+        single_task, batch_task = tasks
+        with patch.object(settings, "worker_player_refresh_batch_size", 3):
+            for player_id in ("p1", "p2", "p3", "p4"):
+                await queue.enqueue("refresh_player_profile", job_id=player_id)
 
+        _kiq(single_task).assert_not_awaited()
+        assert batch_task.kiq.await_count == 2  # noqa: PLR2004
+        assert await fake_redis.exists("worker:job:p4")
 
-class TestIsJobPendingOrRunningExceptionHandling:
     @pytest.mark.asyncio
-    async def test_redis_exception_returns_false(
-        self, fake_redis: fakeredis.FakeAsyncRedis
-    ):
-        """If redis raises, is_job_pending_or_running returns False."""
-        queue = ValkeyTaskQueue(fake_redis)
-        cast("Any", fake_redis).exists = AsyncMock(
-            side_effect=RuntimeError("redis down")
+    @pytest.mark.usefixtures("tasks")
+    async def test_duplicate_batched_job_skipped(self, queue: ValkeyTaskQueue):
+        with patch.object(settings, "worker_player_refresh_batch_size", 3):
+            await queue.enqueue("refresh_player_profile", job_id="p1")
+            await queue.enqueue("refresh_player_profile", job_id="p1")
+
+        assert await queue.dequeue_batch("refresh_player_profile", 3, "task-1") == [
+            "p1"
+        ]
+
+    @pytest.mark.asyncio
+    @pytest.mark.usefixtures("tasks")
+    async def test_dequeue_batch_oldest_first(self, queue: ValkeyTaskQueue):
+        with patch.object(settings, "worker_player_refresh_batch_size", 3):
+            for player_id in ("p1", "p2", "p3", "p4"):
+                await queue.enqueue("refresh_player_profile", job_id=player_id)
+
+        assert await queue.dequeue_batch("refresh_player_profile", 3, "task-1") == [
+            "p1",
+            "p2",
+            "p3",
+        ]
+        await queue.ack_batch("refresh_player_profile", "task-1")
+        assert await queue.dequeue_batch("refresh_player_profile", 3, "task-1") == [
+            "p4"
+        ]
+        await queue.ack_batch("refresh_player_profile", "task-1")
+        assert await queue.dequeue_batch("refresh_player_profile", 3, "task-1") == []
+
+    @pytest.mark.asyncio
+    @pytest.mark.usefixtures("tasks")
+    async def test_unacknowledged_batch_is_resumed(self, queue: ValkeyTaskQueue):
+        """Jobs taken by an interrupted batch task are returned to it again
+        rather than lost, until acknowledged."""
+        with patch.object(settings, "worker_player_refresh_batch_size", 2):
+            for player_id in ("p1", "p2", "p3"):
+                await queue.enqueue("refresh_player_profile", job_id=player_id)
+
+        batch = await queue.dequeue_batch("refresh_player_profile", 2, "task-1")
+        assert await queue.dequeue_batch("refresh_player_profile", 2, "task-1") == (
+            batch
         )
-        result = await queue.is_job_pending_or_running("any-job")
+        assert await queue.dequeue_batch("refresh_player_profile", 2, "task-2") == [
+            "p3"
+        ]
 
-        assert result is False
+        await queue.ack_batch("refresh_player_profile", "task-1")
+        assert await queue.dequeue_batch("refresh_player_profile", 2, "task-1") == []
 
+    @pytest.mark.asyncio
+    async def test_batch_task_kicked_once_queue_was_drained(
+        self, queue: ValkeyTaskQueue, tasks
+    ):
+        """Jobs queued while a batch task runs are left to it, and a new batch
+        task is kicked once it found the queue empty."""
+        _, batch_task = tasks
+        with patch.object(settings, "worker_player_refresh_batch_size", 3):
+            await queue.enqueue("refresh_player_profile", job_id="p1")
+            assert await queue.dequeue_batch("refresh_player_profile", 3, "task-1") == [
+                "p1"
+            ]
+            await queue.ack_batch("refresh_player_profile", "task-1")
+
+            await queue.enqueue("refresh_player_profile", job_id="p2")
+            assert batch_task.kiq.await_count == 1
+            assert await queue.dequeue_batch("refresh_player_profile", 3, "task-1") == [
+                "p2"
+            ]
+            await queue.ack_batch("refresh_player_profile", "task-1")
+            assert (
+                await queue.dequeue_batch("refresh_player_profile", 3, "task-1") == []
+            )
+
+            await queue.enqueue("refresh_player_profile", job_id="p3")
+            assert batch_task.kiq.await_count == 2  # noqa: PLR2004
 
-class TestReleaseJob:
     @pytest.mark.asyncio
-    async def test_release_removes_dedup_key(self, queue: ValkeyTaskQueue):
-        """After release_job, is_job_pending_or_running returns False."""
-        mock_task = MagicMock()
-        mock_task.kiq = AsyncMock()
+    async def test_disabled_batching_kicks_single_task(
+        self, queue: ValkeyTaskQueue, tasks
+    ):
+        single_task, batch_task = tasks
+        with patch.object(settings, "worker_player_refresh_batch_size", 1):
+            await queue.enqueue("refresh_player_profile", job_id="p1")
+
+        _kiq(single_task).assert_awaited_once_with("p1")
+        batch_task.kiq.assert_not_awaited()
+        assert await queue.dequeue_batch("refresh_player_profile", 3, "task-1") == []
+
+
+class TestDelayedEnqueue:
+    @pytest.mark.asyncio
+    async def test_future_run_at_is_given_to_the_broker(self, queue: ValkeyTaskQueue):
+        """A job due later is kicked with a run_at label, and its dedup slot
+        lasts until it's due on top of the job timeout."""
+        mock_task = _mock_task()
+        run_at = time.time() + 600
+
+        with (
+            patch.dict(
+                "app.adapters.tasks.valkey_task_queue.TASK_MAP",
+                {"refresh_player_profile": mock_task},
+            ),
+            patch.object(settings, "worker_player_refresh_batch_size", 3),
+        ):
+            await queue.enqueue("refresh_player_profile", job_id="p1", run_at=run_at)
+
+        _kiq(mock_task).assert_awaited_once_with("p1")
+        labels = _kicked_labels(mock_task)
+        assert labels["run_at"] == run_at
+        assert labels["dedup_ttl"] > settings.worker_job_timeout
+
+    @pytest.mark.asyncio
+    async def test_past_run_at_is_kicked_right_away(self, queue: ValkeyTaskQueue):
+        mock_task = _mock_task()
+
         with patch.dict(
             "app.adapters.tasks.valkey_task_queue.TASK_MAP",
-            {"refresh": mock_task},
+            {"refresh_heroes": mock_task},
         ):
-            await queue.enqueue("refresh", job_id="job-1")
+            await queue.enqueue("refresh_heroes", job_id="heroes", run_at=time.time())
 
-        await queue.release_job("job-1")
+        _kiq(mock_task).assert_awaited_once_with("heroes")
+        assert "run_at" not in _kicked_labels(mock_task)
+        assert _kicked_labels(mock_task)["dedup_ttl"] == settings.worker_job_timeout
 
-        result = await queue.is_job_pending_or_running("job-1")
-        assert not result
+
+class TestAdmissionRate:
+    @pytest.fixture(autouse=True)
+    def _reset_admission_rate(self):
+        ValkeyTaskQueue._admission_rate = None
+        with patch.object(settings, "throttle_enabled", False):
+            yield
+        ValkeyTaskQueue._admission_rate = None
+
+    @staticmethod
+    async def _fill_queue(fake_redis: fakeredis.FakeAsyncRedis, size: int) -> None:
+        await fake_redis.lpush("taskiq:queue", *(f"job-{i}" for i in range(size)))
 
     @pytest.mark.asyncio
-    async def test_release_allows_reenqueue(self, queue: ValkeyTaskQueue):
-        """After release_job the same job_id can be dispatched again."""
-        mock_task = MagicMock()
-        mock_task.kiq = AsyncMock()
-        with patch.dict(
-            "app.adapters.tasks.valkey_task_queue.TASK_MAP",
-            {"refresh": mock_task},
+    async def test_all_admitted_below_soft_limit(
+        self, queue: ValkeyTaskQueue, fake_redis: fakeredis.FakeAsyncRedis
+    ):
+        await self._fill_queue(fake_redis, 5)
+        with patch.object(settings, "refresh_admission_queue_soft_limit", 10):
+            assert await queue.get_admission_rate() == 1.0
+
+    @pytest.mark.asyncio
+    async def test_sampled_between_limits(
+        self, queue: ValkeyTaskQueue, fake_redis: fakeredis.FakeAsyncRedis
+    ):
+        await self._fill_queue(fake_redis, 15)
+        await fake_redis.lpush("worker:batch:refresh_player_profile", "p1", "p2")
+        with (
+            patch.object(settings, "refresh_admission_queue_soft_limit", 10),
+            patch.object(settings, "refresh_admission_queue_hard_limit", 30),
         ):
-            await queue.enqueue("refresh", job_id="job-1")
-            await queue.release_job("job-1")
-            await queue.enqueue("refresh", job_id="job-1")
+            # 17 queued jobs, 7 above the soft limit out of 20
+            assert await queue.get_admission_rate() == pytest.approx(0.65)
 
-        assert mock_task.kiq.await_count == 2  # noqa: PLR2004
+    @pytest.mark.asyncio
+    async def test_none_admitted_above_hard_limit(
+        self, queue: ValkeyTaskQueue, fake_redis: fakeredis.FakeAsyncRedis
+    ):
+        await self._fill_queue(fake_redis, 40)
+        with (
+            patch.object(settings, "refresh_admission_queue_soft_limit", 10),
+            patch.object(settings, "refresh_admission_queue_hard_limit", 30),
+        ):
+            assert await queue.get_admission_rate() == 0.0
 
     @pytest.mark.asyncio
-    async def test_release_nonexistent_job_is_noop(self, queue: ValkeyTaskQueue):
-        """Releasing an unknown job_id does not raise."""
-        await queue.release_job("nonexistent-job")
+    async def test_penalty_rate_while_rate_limited(self, queue: ValkeyTaskQueue):
+        throttle = AsyncMock()
+        throttle.is_rate_limited.return_value = 30
+        with (
+            patch.object(settings, "throttle_enabled", True),
+            patch.object(settings, "refresh_admission_penalty_rate", 0.1),
+            patch(
+                "app.adapters.tasks.valkey_task_queue.BlizzardThrottle",
+                return_value=throttle,
+            ),
+        ):
+            assert await queue.get_admission_rate() == pytest.approx(0.1)
 
     @pytest.mark.asyncio
-    async def test_redis_exception_is_swallowed(
-        self, fake_redis: fakeredis.FakeAsyncRedis
+    async def test_rate_is_reused_for_a_short_while(
+        self, queue: ValkeyTaskQueue, fake_redis: fakeredis.FakeAsyncRedis
     ):
-        """If redis raises during release, the exception is swallowed."""
-        queue = ValkeyTaskQueue(fake_redis)
-        cast("Any", fake_redis).delete = AsyncMock(
-            side_effect=RuntimeError("redis down")
-        )
-        await queue.release_job("any-job")
+        with (
+            patch.object(settings, "refresh_admission_queue_soft_limit", 10),
+            patch.object(settings, "refresh_admission_queue_hard_limit", 30),
+        ):
+            assert await queue.get_admission_rate() == 1.0
+            await self._fill_queue(fake_redis, 40)
+
+            assert await ValkeyTaskQueue(fake_redis).get_admission_rate() == 1.0
@@ -6,18 +6,22 @@ from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
+from app.adapters.blizzard.client import _request_priority
 from app.adapters.tasks.worker import (
     _run_refresh_task,
     check_new_hero,
     cleanup_stale_players,
+    prerefresh_popular_players,
     refresh_gamemodes,
     refresh_hero,
     refresh_heroes,
     refresh_maps,
     refresh_player_profile,
+    refresh_player_profiles,
     refresh_roles,
 )
-from app.domain.enums import HeroKey, Locale
+from app.config import settings
+from app.domain.enums import BlizzardRequestPriority, HeroKey, Locale
 
 
 @pytest.fixture(autouse=True)
@@ -121,6 +125,16 @@ class TestRunRefreshTask:
 
         mock_queue.release_job.assert_awaited_once_with("hero:ana:en-us")
 
+    @pytest.mark.asyncio
+    async def test_blizzard_requests_have_background_priority(self):
+        """Blizzard requests made during the task are background ones."""
+        mock_queue = AsyncMock()
+
+        async with _run_refresh_task("player", "Player-1234", mock_queue):
+            assert _request_priority.get() == BlizzardRequestPriority.BACKGROUND
+
+        assert _request_priority.get() == BlizzardRequestPriority.INTERACTIVE
+
 
 # ── refresh tasks ─────────────────────────────────────────────────────────────
 
@@ -206,6 +220,112 @@ class TestRefreshPlayerProfile:
         mock_service.refresh_player_profile.assert_awaited_once_with("Player-1234")
 
 
+def _task_context(task_id: str) -> MagicMock:
+    context = MagicMock()
+    context.message.task_id = task_id
+    return context
+
+
+class TestRefreshPlayerProfiles:
+    @pytest.mark.asyncio
+    async def test_drains_batches_until_queue_is_empty(self):
+        mock_service = AsyncMock()
+        mock_service.buffered_profile_writes = MagicMock(
+            side_effect=contextlib.nullcontext
+        )
+        mock_queue = AsyncMock()
+        mock_queue.dequeue_batch = AsyncMock(
+            side_effect=[["Player-1", "Player-2"], ["Player-3"], []]
+        )
+
+        await cast("Any", refresh_player_profiles).__wrapped__(
+            mock_service, mock_queue, _task_context("task-1")
+        )
+
+        assert mock_service.refresh_player_profile.await_count == 3  # noqa: PLR2004
+        assert mock_service.buffered_profile_writes.call_count == 2  # noqa: PLR2004
+        assert mock_queue.release_job.await_count == 3  # noqa: PLR2004
+        mock_queue.dequeue_batch.assert_awaited_with(
+            "refresh_player_profile",
+            settings.worker_player_refresh_batch_size,
+            "task-1",
+        )
+        assert mock_queue.ack_batch.await_count == 2  # noqa: PLR2004
+
+    @pytest.mark.asyncio
+    async def test_failure_does_not_stop_the_batch(self, mock_worker_metrics):
+        _, mock_failed, _ = mock_worker_metrics
+        mock_service = AsyncMock()
+        mock_service.buffered_profile_writes = MagicMock(
+            side_effect=contextlib.nullcontext
+        )
+        mock_service.refresh_player_profile = AsyncMock(
+            side_effect=[RuntimeError("Blizzard down"), None]
+        )
+        mock_queue = AsyncMock()
+        mock_queue.dequeue_batch = AsyncMock(side_effect=[["Player-1", "Player-2"], []])
+
+        await cast("Any", refresh_player_profiles).__wrapped__(
+            mock_service, mock_queue, _task_context("task-1")
+        )
+
+        assert mock_service.refresh_player_profile.await_count == 2  # noqa: PLR2004
+        mock_failed.labels.return_value.inc.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_jobs_released_once_batch_is_stored(self):
+        """Jobs of a batch are neither released nor counted before the
+        profiles are stored."""
+        events: list[str] = []
+        mock_service = AsyncMock()
+
+        @contextlib.asynccontextmanager
+        async def buffered_profile_writes():
+            yield
+            events.append("stored")
+
+        mock_service.buffered_profile_writes = buffered_profile_writes
+        mock_queue = AsyncMock()
+        mock_queue.dequeue_batch = AsyncMock(side_effect=[["Player-1", "Player-2"], []])
+        mock_queue.release_job = AsyncMock(side_effect=events.append)
+
+        await cast("Any", refresh_player_profiles).__wrapped__(
+            mock_service, mock_queue, _task_context("task-1")
+        )
+
+        assert events == ["stored", "Player-1", "Player-2"]
+
+    @pytest.mark.asyncio
+    async def test_failed_write_fails_the_task_once_drained(self, mock_worker_metrics):
+        """If a batch can't be stored, its jobs are counted as failed, other
+        batches are still refreshed, and the task fails."""
+        mock_completed, mock_failed, _ = mock_worker_metrics
+        mock_service = AsyncMock()
+        write_error = RuntimeError("db")
+
+        @contextlib.asynccontextmanager
+        async def buffered_profile_writes():
+            yield
+            if mock_service.refresh_player_profile.await_count <= 2:  # noqa: PLR2004
+                raise write_error
+
+        mock_service.buffered_profile_writes = buffered_profile_writes
+        mock_queue = AsyncMock()
+        mock_queue.dequeue_batch = AsyncMock(
+            side_effect=[["Player-1", "Player-2"], ["Player-3"], []]
+        )
+
+        with pytest.raises(RuntimeError, match="db"):
+            await cast("Any", refresh_player_profiles).__wrapped__(
+                mock_service, mock_queue, _task_context("task-1")
+            )
+
+        assert mock_failed.labels.return_value.inc.call_count == 2  # noqa: PLR2004
+        mock_completed.labels.return_value.inc.assert_called_once()
+        assert mock_queue.release_job.await_count == 3  # noqa: PLR2004
+        assert mock_queue.ack_batch.await_count == 2  # noqa: PLR2004
+
+
 # ── cleanup_stale_players ─────────────────────────────────────────────────────
 
 
@@ -238,6 +358,70 @@ class TestCleanupStalePlayers:
             await cast("Any", cleanup_stale_players).__wrapped__(mock_storage)
 
 
+# ── prerefresh_popular_players ────────────────────────────────────────────────
+
+
+class TestPrerefreshPopularPlayers:
+    @pytest.mark.asyncio
+    async def test_skipped_when_disabled(self):
+        mock_service = AsyncMock()
+        with patch("app.adapters.tasks.worker.settings") as mock_settings:
+            mock_settings.player_prerefresh_enabled = False
+            await cast("Any", prerefresh_popular_players).__wrapped__(mock_service)
+
+        mock_service.prerefresh_popular_players.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_budget_is_share_of_throttle_capacity(self):
+        mock_service = AsyncMock()
+        mock_throttle = AsyncMock()
+        mock_throttle.is_rate_limited.return_value = 0
+        mock_throttle.get_current_delay.return_value = 0.5
+        with (
+            patch("app.adapters.tasks.worker.settings") as mock_settings,
+            patch(
+                "app.adapters.tasks.worker.BlizzardThrottle",
+                return_value=mock_throttle,
+            ),
+        ):
+            mock_settings.player_prerefresh_enabled = True
+            mock_settings.throttle_enabled = True
+            mock_settings.player_prerefresh_budget_share = 0.25
+            await cast("Any", prerefresh_popular_players).__wrapped__(mock_service)
+
+        # 60s / 0.5s = 120 requests, a quarter of it, 2 requests per refresh
+        mock_service.prerefresh_popular_players.assert_awaited_once_with(60, 15)
+
+    @pytest.mark.asyncio
+    async def test_no_budget_during_penalty(self):
+        mock_service = AsyncMock()
+        mock_throttle = AsyncMock()
+        mock_throttle.is_rate_limited.return_value = 30
+        with (
+            patch("app.adapters.tasks.worker.settings") as mock_settings,
+            patch(
+                "app.adapters.tasks.worker.BlizzardThrottle",
+                return_value=mock_throttle,
+            ),
+        ):
+            mock_settings.player_prerefresh_enabled = True
+            mock_settings.throttle_enabled = True
+            await cast("Any", prerefresh_popular_players).__wrapped__(mock_service)
+
+        mock_service.prerefresh_popular_players.assert_awaited_once_with(60, 0)
+
+    @pytest.mark.asyncio
+    async def test_service_exception_is_swallowed(self):
+        mock_service = AsyncMock()
+        mock_service.prerefresh_popular_players.side_effect = Exception("Valkey gone")
+        with patch("app.adapters.tasks.worker.settings") as mock_settings:
+            mock_settings.player_prerefresh_enabled = True
+            mock_settings.throttle_enabled = False
+            mock_settings.throttle_start_delay = 2.0
+            mock_settings.player_prerefresh_budget_share = 0.2
+            await cast("Any", prerefresh_popular_players).__wrapped__(mock_service)
+
+
 # ── check_new_hero ────────────────────────────────────────────────────────────
 
 
@@ -0,0 +1,332 @@
+"""Load Benchmark module
+Drive a running OverFast API stack with a realistic mix of endpoints, and
+report latency percentiles, throughput and Blizzard calls per endpoint.
+
+The stack is expected to run with local stand-ins, e.g. with `just start_testing`
+and BLIZZARD_CLIENT_MODE=replay in .env (and PROMETHEUS_ENABLED=true to count
+Blizzard calls). Results can be saved as JSON and compared with a baseline,
+exiting with an error if any endpoint regressed beyond a threshold.
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import re
+import statistics
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from http import HTTPStatus
+from itertools import accumulate
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import httpx2
+
+from app.config import settings
+from app.domain.enums import HeroKey, PlayerGamemode, PlayerPlatform, PlayerRegion
+from app.infrastructure.logger import logger
+from app.monitoring.helpers import normalize_endpoint
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+# Share of each endpoint in the synthetic mix, close to production traffic
+ENDPOINT_WEIGHTS: dict[str, int] = {
+    "/heroes": 10,
+    "/heroes/{hero_key}": 15,
+    "/heroes/stats": 5,
+    "/roles": 3,
+    "/maps": 2,
+    "/gamemodes": 2,
+    "/players": 8,
+    "/players/{player_id}/summary": 20,
+    "/players/{player_id}": 15,
+    "/players/{player_id}/stats/summary": 12,
+    "/players/{player_id}/stats/career": 8,
+}
+
+# Latency percentiles (ms) and throughput compared with the baseline
+_COMPARED_LATENCIES = ("p50", "p95", "p99")
+
+# Request path in nginx access logs (combined format)
+_ACCESS_LOG_PATTERN = re.compile(r'"GET (?P<path>/\S*) HTTP/[\d.]+"')
+
+_BLIZZARD_REQUESTS_PATTERN = re.compile(
+    r'^blizzard_requests_total\{(?=[^}]*endpoint="(?P<endpoint>[^"]+)")[^}]*\}'
+    r" (?P<value>[\d.e+]+)$",
+    re.MULTILINE,
+)
+
+
+@dataclass(slots=True)
+class RequestResult:
+    endpoint: str
+    status_code: int
+    duration: float
+
+
+def parse_parameters() -> argparse.Namespace:  # pragma: no cover
+    """Parse command line arguments and returns the corresponding Namespace object"""
+    parser = argparse.ArgumentParser(
+        description="Run a load benchmark against a running OverFast API stack.",
+    )
+    parser.add_argument(
+        "--base-url", default="http://localhost:8080", help="URL of the API"
+    )
+    parser.add_argument(
+        "--metrics-url",
+        default="http://localhost:8080/metrics",
+        help="Prometheus endpoint of the app, to count Blizzard calls",
+    )
+    parser.add_argument(
+        "-d", "--duration", type=float, default=60.0, help="duration (seconds)"
+    )
+    parser.add_argument(
+        "-c", "--concurrency", type=int, default=20, help="concurrent clients"
+    )
+    parser.add_argument(
+        "--access-log",
+        type=Path,
+        help="nginx access log to replay paths from, instead of the synthetic mix",
+    )
+    parser.add_argument(
+        "--zipf-exponent",
+        type=float,
+        default=1.1,
+        help="exponent of the Zipfian distribution of players",
+    )
+    parser.add_argument("--seed", type=int, default=0, help="random seed")
+    parser.add_argument("-o", "--output", type=Path, help="JSON results file")
+    parser.add_argument("--baseline", type=Path, help="JSON results to compare with")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="maximum relative regression against the baseline (0.1 = 10%%)",
+    )
+    return parser.parse_args()
+
+
+def list_corpus_players() -> list[str]:
+    """Players of the replay corpus, the first ones being the most requested"""
+    players_path = Path(settings.blizzard_replay_corpus_path) / "html" / "players"
+    return sorted(player_file.stem for player_file in players_path.glob("*.html"))
+
+
+def zipf_cum_weights(size: int, exponent: float) -> list[float]:
+    """Cumulative weights of ranks 1 to size in a Zipfian distribution"""
+    return list(accumulate(1 / rank**exponent for rank in range(1, size + 1)))
+
+
+def build_synthetic_mix(
+    players: list[str], exponent: float, rng: random.Random
+) -> Callable[[], str]:
+    """Return a generator of request paths, following ``ENDPOINT_WEIGHTS``,
+    with players picked in a Zipfian distribution."""
+    endpoints = list(ENDPOINT_WEIGHTS)
+    endpoints_cum_weights = list(accumulate(ENDPOINT_WEIGHTS.values()))
+    players_cum_weights = zipf_cum_weights(len(players), exponent)
+
+    def next_path() -> str:
+        endpoint = rng.choices(endpoints, cum_weights=endpoints_cum_weights)[0]
+        player_id = rng.choices(players, cum_weights=players_cum_weights)[0]
+        match endpoint:
+            case "/heroes/{hero_key}":
+                return f"/heroes/{rng.choice(list(HeroKey))}"
+            case "/heroes/stats":
+                return (
+                    f"/heroes/stats?platform={rng.choice(list(PlayerPlatform))}"
+                    f"&gamemode={rng.choice(list(PlayerGamemode))}"
+                    f"&region={rng.choice(list(PlayerRegion))}"
+                )
+            case "/players":
+                return f"/players?name={player_id.split('-')[0]}"
+            case "/players/{player_id}/stats/career":
+                return (
+                    f"/players/{player_id}/stats/career"
+                    f"?gamemode={rng.choice(list(PlayerGamemode))}"
+                )
+            case _:
+                return endpoint.replace("{player_id}", player_id)
+
+    return next_path
+
+
+def build_access_log_mix(
+    access_log: Path, rng: random.Random
+) -> Callable[[], str]:  # pragma: no cover
+    """Return a generator of request paths, sampled from an nginx access log"""
+    with access_log.open(encoding="utf-8") as log_file:
+        paths = [
+            match["path"]
+            for line in log_file
+            if (match := _ACCESS_LOG_PATTERN.search(line))
+        ]
+    if not paths:
+        msg = f"No GET request found in {access_log}"
+        raise ValueError(msg)
+    return lambda: rng.choice(paths)
+
+
+def summarize(results: list[RequestResult], elapsed: float) -> dict[str, dict]:
+    """Compute latency percentiles (ms), throughput and error rate per endpoint,
+    and for all endpoints under the "all" key."""
+    by_endpoint: dict[str, list[RequestResult]] = defaultdict(list)
+    for result in results:
+        by_endpoint[result.endpoint].append(result)
+    by_endpoint["all"] = results
+
+    summary = {}
+    for endpoint, endpoint_results in sorted(by_endpoint.items()):
+        durations = [result.duration * 1000 for result in endpoint_results]
+        percentiles = (
+            statistics.quantiles(durations, n=100, method="inclusive")
+            if len(durations) > 1
+            else durations * 99
+        )
+        errors = sum(
+            1
+            for result in endpoint_results
+            if result.status_code >= HTTPStatus.INTERNAL_SERVER_ERROR
+        )
+        summary[endpoint] = {
+            "requests": len(endpoint_results),
+            "rps": round(len(endpoint_results) / elapsed, 2),
+            "error_rate": round(errors / len(endpoint_results), 4),
+            "p50": round(percentiles[49], 2),
+            "p95": round(percentiles[94], 2),
+            "p99": round(percentiles[98], 2),
+        }
+    return summary
+
+
+def find_regressions(results: dict, baseline: dict, threshold: float) -> list[str]:
+    """List endpoints whose latency percentiles or throughput regressed by
+    more than ``threshold`` (relative) compared to the baseline."""
+    regressions = []
+    for endpoint, baseline_stats in baseline["endpoints"].items():
+        stats = results["endpoints"].get(endpoint)
+        if stats is None:
+            continue
+
+        regressions.extend(
+            f"{endpoint} {percentile} : {baseline_stats[percentile]}ms "
+            f"-> {stats[percentile]}ms"
+            for percentile in _COMPARED_LATENCIES
+            if stats[percentile] > baseline_stats[percentile] * (1 + threshold)
+        )
+        if stats["rps"] < baseline_stats["rps"] * (1 - threshold):
+            regressions.append(
+                f"{endpoint} rps : {baseline_stats['rps']} -> {stats['rps']}"
+            )
+    return regressions
+
+
+async def fetch_blizzard_calls(
+    client: httpx2.AsyncClient, metrics_url: str
+) -> dict[str, float]:  # pragma: no cover
+    """Read the Blizzard requests counters of the app, per Blizzard endpoint"""
+    try:
+        response = await client.get(metrics_url)
+        response.raise_for_status()
+    except httpx2.HTTPError as error:
+        logger.warning("Couldn't read Blizzard calls from {} : {}", metrics_url, error)
+        return {}
+
+    calls: dict[str, float] = defaultdict(float)
+    for match in _BLIZZARD_REQUESTS_PATTERN.finditer(response.text):
+        calls[match["endpoint"]] += float(match["value"])
+    return calls
+
+
+async def run_load(
+    client: httpx2.AsyncClient,
+    next_path: Callable[[], str],
+    concurrency: int,
+    duration: float,
+) -> tuple[list[RequestResult], float]:  # pragma: no cover
+    """Send requests from concurrent clients during the given duration"""
+    results: list[RequestResult] = []
+    start = time.perf_counter()
+    deadline = start + duration
+
+    async def run_client() -> None:
+        while time.perf_counter() < deadline:
+            path = next_path()
+            request_start = time.perf_counter()
+            try:
+                response = await client.get(path)
+                status_code = response.status_code
+            except httpx2.HTTPError:
+                status_code = 599
+            results.append(
+                RequestResult(
+                    endpoint=normalize_endpoint(path.split("?")[0]),
+                    status_code=status_code,
+                    duration=time.perf_counter() - request_start,
+                )
+            )
+
+    await asyncio.gather(*(run_client() for _ in range(concurrency)))
+    return results, time.perf_counter() - start
+
+
+async def main() -> int:  # pragma: no cover
+    """Main method of the script"""
+    args = parse_parameters()
+    rng = random.Random(args.seed)
+
+    if args.access_log:
+        next_path = build_access_log_mix(args.access_log, rng)
+    else:
+        players = list_corpus_players()
+        logger.info("Synthetic mix over {} corpus players", len(players))
+        next_path = build_synthetic_mix(players, args.zipf_exponent, rng)
+
+    async with httpx2.AsyncClient(
+        base_url=args.base_url,
+        timeout=30,
+        limits=httpx2.Limits(max_connections=args.concurrency),
+    ) as client:
+        calls_before = await fetch_blizzard_calls(client, args.metrics_url)
+        logger.info(
+            "Running {}s with {} clients on {}...",
+            args.duration,
+            args.concurrency,
+            args.base_url,
+        )
+        results, elapsed = await run_load(
+            client, next_path, args.concurrency, args.duration
+        )
+        calls_after = await fetch_blizzard_calls(client, args.metrics_url)
+
+    report = {
+        "duration": round(elapsed, 2),
+        "concurrency": args.concurrency,
+        "endpoints": summarize(results, elapsed),
+        "blizzard_calls": {
+            endpoint: int(count - calls_before.get(endpoint, 0))
+            for endpoint, count in sorted(calls_after.items())
+        },
+    }
+    logger.info("Results :\n{}", json.dumps(report, indent=2))
+
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+        logger.info("Results saved into {}", args.output)
+
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        if regressions := find_regressions(report, baseline, args.threshold):
+            logger.error("Regressions found :\n{}", "\n".join(regressions))
+            return 1
+        logger.info("No regression compared to {}", args.baseline)
+
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    logger = logger.patch(lambda record: record.update(name="load_benchmark"))
+    raise SystemExit(asyncio.run(main()))
@@ -0,0 +1,264 @@
+"""Parsers Benchmark module
+Measure throughput (ops/sec) and memory allocations of the Blizzard HTML
+parsers over every HTML test fixture, and over a synthetic large profile
+(a player with career stats for every hero, on both platforms).
+
+Results can be saved as JSON and compared with a baseline, exiting with an
+error if any parser regressed beyond a threshold.
+"""
+
+import argparse
+import json
+import re
+import time
+import tracemalloc
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from app.config import settings
+from app.domain.enums import PlayerGamemode
+from app.domain.exceptions import ParserBlizzardError
+from app.domain.parsers.hero import parse_hero_html
+from app.domain.parsers.heroes import parse_heroes_html
+from app.domain.parsers.player_career_stats import parse_player_career_stats_from_html
+from app.domain.parsers.player_profile import parse_player_profile_html
+from app.domain.parsers.player_stats import parse_player_stats_summary_from_html
+from app.infrastructure.logger import logger
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+# Player profile used as a base for the synthetic large profile, as it
+# already has stats on both platforms
+LARGE_PROFILE_BASE_FIXTURE = "players/KIRIKO-12460.html"
+LARGE_PROFILE_NAME = "players/<large-profile>"
+
+# Heroes dropdown of a career stats section, followed by the stats containers
+# of each of its options, until the end of the section
+_HEROES_SELECT_PATTERN = re.compile(
+    r'(<select class="blz-dropdown stats-dropdown"[^>]*>)(.*?)(</select>)(.*?)'
+    r"(</blz-section>)",
+    re.DOTALL,
+)
+_STATS_CONTAINER_PATTERN = re.compile(
+    r'<span class="stats-container option-(?P<option>\d+)[^"]*">.*?</span>',
+    re.DOTALL,
+)
+
+_PLAYER_PARSERS: dict[str, Callable[[str], Any]] = {
+    "parse_player_profile_html": parse_player_profile_html,
+    "parse_player_stats_summary_from_html": parse_player_stats_summary_from_html,
+    "parse_player_career_stats_from_html": lambda html: (
+        parse_player_career_stats_from_html(html, PlayerGamemode.COMPETITIVE)
+    ),
+}
+
+
+@dataclass(slots=True)
+class BenchmarkCase:
+    parser: str
+    fixture: str
+    func: Callable[[str], Any]
+    html: str
+
+    @property
+    def name(self) -> str:
+        return f"{self.parser}[{self.fixture}]"
+
+
+def parse_parameters() -> argparse.Namespace:  # pragma: no cover
+    """Parse command line arguments and returns the corresponding Namespace object"""
+    parser = argparse.ArgumentParser(
+        description="Run parsers microbenchmarks over the HTML test fixtures.",
+    )
+    parser.add_argument(
+        "-k", "--filter", default="", help="only run cases containing this string"
+    )
+    parser.add_argument(
+        "--min-time",
+        type=float,
+        default=0.5,
+        help="minimum duration of each measurement round (seconds)",
+    )
+    parser.add_argument(
+        "--rounds", type=int, default=5, help="measurement rounds, the best is kept"
+    )
+    parser.add_argument("-o", "--output", type=Path, help="JSON results file")
+    parser.add_argument("--baseline", type=Path, help="JSON results to compare with")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="maximum relative regression against the baseline (0.1 = 10%%)",
+    )
+    return parser.parse_args()
+
+
+def build_large_profile_html(html: str, hero_names: list[str]) -> str:
+    """Return a copy of a player profile page with career stats for every given
+    hero, in every platform and gamemode it has stats for, by cloning the stats
+    of the first hero of each section."""
+    hero_options = "".join(
+        f'<option value="{option}" option-id="{hero_name}">{hero_name}</option>'
+        for option, hero_name in enumerate(["ALL HEROES", *hero_names])
+    )
+
+    def expand_section(section: re.Match) -> str:
+        matches = list(_STATS_CONTAINER_PATTERN.finditer(section[4]))
+        containers = {container["option"]: container[0] for container in matches}
+        if "0" not in containers or "1" not in containers:
+            return section[0]
+
+        hero_container = containers["1"]
+        hero_containers = "".join(
+            hero_container.replace("option-1", f"option-{option}", 1)
+            for option in range(1, len(hero_names) + 1)
+        )
+        # Markup around the containers (closing tags of the dropdown) is kept
+        before = section[4][: matches[0].start()]
+        after = section[4][matches[-1].end() :]
+        return (
+            f"{section[1]}{hero_options}{section[3]}"
+            f"{before}{containers['0']}{hero_containers}{after}{section[5]}"
+        )
+
+    return _HEROES_SELECT_PATTERN.sub(expand_section, html)
+
+
+def list_cases() -> list[BenchmarkCase]:
+    """List the benchmark cases, one per parser and per relevant fixture"""
+    html_path = Path(settings.test_fixtures_root_path) / "html"
+
+    def read(relative_path: str) -> str:
+        return (html_path / relative_path).read_text(encoding="utf-8")
+
+    heroes_html = read("heroes.html")
+    cases = [
+        BenchmarkCase(
+            "parse_heroes_html", "heroes.html", parse_heroes_html, heroes_html
+        )
+    ]
+
+    cases.extend(
+        BenchmarkCase(
+            "parse_hero_html",
+            f"heroes/{hero_file.name}",
+            parse_hero_html,
+            hero_file.read_text(encoding="utf-8"),
+        )
+        for hero_file in sorted((html_path / "heroes").glob("*.html"))
+    )
+
+    players = {
+        f"players/{player_file.name}": player_file.read_text(encoding="utf-8")
+        for player_file in sorted((html_path / "players").glob("*.html"))
+    }
+    hero_names = [hero["name"] for hero in parse_heroes_html(heroes_html)]
+    players[LARGE_PROFILE_NAME] = build_large_profile_html(
+        players[LARGE_PROFILE_BASE_FIXTURE], hero_names
+    )
+
+    for fixture, html in players.items():
+        try:
+            parse_player_profile_html(html)
+        except ParserBlizzardError:
+            # Unknown players pages have nothing to parse
+            continue
+        cases.extend(
+            BenchmarkCase(parser, fixture, func, html)
+            for parser, func in _PLAYER_PARSERS.items()
+        )
+
+    return cases
+
+
+def measure(case: BenchmarkCase, min_time: float, rounds: int) -> dict:
+    """Measure ops/sec (best round) and bytes allocated by a single call"""
+    # Calibrate the number of calls per round to last at least min_time
+    calls = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(calls):
+            case.func(case.html)
+        if (elapsed := time.perf_counter() - start) >= min_time:
+            break
+        calls = max(calls * 2, int(calls * min_time / max(elapsed, 1e-9)))
+
+    best = elapsed
+    for _ in range(rounds - 1):
+        start = time.perf_counter()
+        for _ in range(calls):
+            case.func(case.html)
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        case.func(case.html)
+        _, peak_bytes = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "ops_per_sec": round(calls / best, 2),
+        "mean_ms": round(best / calls * 1000, 3),
+        "peak_bytes": peak_bytes,
+    }
+
+
+def find_regressions(results: dict, baseline: dict, threshold: float) -> list[str]:
+    """List cases whose throughput decreased, or whose allocations increased,
+    by more than ``threshold`` (relative) compared to the baseline."""
+    regressions = []
+    for name, baseline_stats in baseline["cases"].items():
+        stats = results["cases"].get(name)
+        if stats is None:
+            continue
+
+        if stats["ops_per_sec"] < baseline_stats["ops_per_sec"] * (1 - threshold):
+            regressions.append(
+                f"{name} ops/sec : {baseline_stats['ops_per_sec']} "
+                f"-> {stats['ops_per_sec']}"
+            )
+        if stats["peak_bytes"] > baseline_stats["peak_bytes"] * (1 + threshold):
+            regressions.append(
+                f"{name} peak bytes : {baseline_stats['peak_bytes']} "
+                f"-> {stats['peak_bytes']}"
+            )
+    return regressions
+
+
+def main() -> int:  # pragma: no cover
+    """Main method of the script"""
+    args = parse_parameters()
+
+    report: dict[str, dict] = {"cases": {}}
+    for case in list_cases():
+        if args.filter not in case.name:
+            continue
+        report["cases"][case.name] = stats = measure(case, args.min_time, args.rounds)
+        logger.info(
+            "{} : {} ops/sec, {} ms, {} bytes peak",
+            case.name,
+            stats["ops_per_sec"],
+            stats["mean_ms"],
+            stats["peak_bytes"],
+        )
+
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+        logger.info("Results saved into {}", args.output)
+
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        if regressions := find_regressions(report, baseline, args.threshold):
+            logger.error("Regressions found :\n{}", "\n".join(regressions))
+            return 1
+        logger.info("No regression compared to {}", args.baseline)
+
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    logger = logger.patch(lambda record: record.update(name="parsers_benchmark"))
+    raise SystemExit(main())
@@ -0,0 +1,90 @@
+"""Tests for the load benchmark helpers"""
+
+import random
+
+import pytest
+
+from tests.benchmarks.load_benchmark import (
+    ENDPOINT_WEIGHTS,
+    RequestResult,
+    build_synthetic_mix,
+    find_regressions,
+    summarize,
+    zipf_cum_weights,
+)
+
+
+class TestSyntheticMix:
+    def test_zipf_weights_favor_first_ranks(self):
+        cum_weights = zipf_cum_weights(3, 1.0)
+
+        assert cum_weights == pytest.approx([1.0, 1.5, 1.5 + 1 / 3])
+
+    def test_paths_cover_endpoints_of_the_mix(self):
+        next_path = build_synthetic_mix(
+            ["TeKrop-2217", "KIRIKO-12460"], 1.1, random.Random(0)
+        )
+
+        paths = [next_path() for _ in range(2000)]
+
+        assert all(
+            path.startswith(("/heroes", "/players", "/roles", "/maps", "/gamemodes"))
+            for path in paths
+        )
+        assert "/players/TeKrop-2217/summary" in paths
+        assert any(path.startswith("/players?name=") for path in paths)
+
+    def test_same_seed_gives_same_paths(self):
+        players = ["TeKrop-2217", "KIRIKO-12460", "JohnV1-1190"]
+        first_mix = build_synthetic_mix(players, 1.1, random.Random(42))
+        second_mix = build_synthetic_mix(players, 1.1, random.Random(42))
+
+        assert [first_mix() for _ in range(50)] == [second_mix() for _ in range(50)]
+
+    def test_weights_cover_all_endpoints(self):
+        assert all(weight > 0 for weight in ENDPOINT_WEIGHTS.values())
+
+
+class TestSummarize:
+    def test_percentiles_per_endpoint_and_overall(self):
+        results = [
+            RequestResult("/heroes", 200, duration / 1000) for duration in range(1, 101)
+        ] + [RequestResult("/roles", 503, 0.5)]
+
+        summary = summarize(results, elapsed=10.0)
+
+        assert summary["/heroes"]["requests"] == 100  # noqa: PLR2004
+        assert summary["/heroes"]["rps"] == pytest.approx(10.0)
+        assert summary["/heroes"]["p50"] == pytest.approx(50.5)
+        assert summary["/heroes"]["p99"] == pytest.approx(99.01)
+        assert summary["/roles"]["error_rate"] == 1.0
+        assert summary["all"]["requests"] == 101  # noqa: PLR2004
+
+
+class TestFindRegressions:
+    @staticmethod
+    def _results(p95: float, rps: float) -> dict:
+        return {
+            "endpoints": {"/heroes": {"p50": 10.0, "p95": p95, "p99": 30.0, "rps": rps}}
+        }
+
+    def test_no_regression_within_threshold(self):
+        regressions = find_regressions(
+            self._results(21.0, 95.0), self._results(20.0, 100.0), 0.1
+        )
+
+        assert regressions == []
+
+    def test_latency_regression(self):
+        regressions = find_regressions(
+            self._results(25.0, 100.0), self._results(20.0, 100.0), 0.1
+        )
+
+        assert regressions == ["/heroes p95 : 20.0ms -> 25.0ms"]
+
+    def test_throughput_regression(self):
+        regressions = find_regressions(
+            self._results(20.0, 80.0), self._results(20.0, 100.0), 0.1
+        )
+
+        assert regressions == ["/heroes rps : 100.0 -> 80.0"]
@@ -0,0 +1,99 @@
+"""Tests for the parsers benchmark helpers"""
+
+from app.domain.parsers.heroes import parse_heroes_html
+from app.domain.parsers.player_helpers import get_hero_keyname
+from app.domain.parsers.player_profile import parse_player_profile_html
+from tests.benchmarks.parsers_benchmark import (
+    LARGE_PROFILE_BASE_FIXTURE,
+    LARGE_PROFILE_NAME,
+    BenchmarkCase,
+    build_large_profile_html,
+    find_regressions,
+    list_cases,
+    measure,
+)
+from tests.helpers import read_html_file
+
+
+class TestLargeProfile:
+    def test_career_stats_for_every_hero_on_both_platforms(self):
+        hero_names = [
+            hero["name"] for hero in parse_heroes_html(read_html_file("heroes.html"))
+        ]
+        html = build_large_profile_html(
+            read_html_file(LARGE_PROFILE_BASE_FIXTURE), hero_names
+        )
+
+        stats = parse_player_profile_html(html)["stats"]
+
+        expected_heroes = {get_hero_keyname(hero_name) for hero_name in hero_names}
+        for platform in ("pc", "console"):
+            gamemodes_stats = [
+                gamemode_stats
+                for gamemode_stats in stats[platform].values()
+                if gamemode_stats
+            ]
+            assert gamemodes_stats
+            for gamemode_stats in gamemodes_stats:
+                assert expected_heroes <= set(gamemode_stats["career_stats"])
+
+
+class TestListCases:
+    def test_cases_cover_every_parser_and_the_large_profile(self):
+        cases = list_cases()
+
+        assert {case.parser for case in cases} == {
+            "parse_heroes_html",
+            "parse_hero_html",
+            "parse_player_profile_html",
+            "parse_player_stats_summary_from_html",
+            "parse_player_career_stats_from_html",
+        }
+        assert any(case.fixture == LARGE_PROFILE_NAME for case in cases)
+        assert not any("Unknown" in case.fixture for case in cases)
+
+
+class TestMeasure:
+    def test_reports_throughput_and_allocations(self):
+        case = BenchmarkCase("split", "inline", lambda html: html.split(), "a b c")
+
+        stats = measure(case, min_time=0.01, rounds=2)
+
+        assert stats["ops_per_sec"] > 0
+        assert stats["peak_bytes"] > 0
+
+
+class TestFindRegressions:
+    @staticmethod
+    def _results(ops_per_sec: float, peak_bytes: int) -> dict:
+        return {
+            "cases": {
+                "parse_heroes_html[heroes.html]": {
+                    "ops_per_sec": ops_per_sec,
+                    "peak_bytes": peak_bytes,
+                }
+            }
+        }
+
+    def test_no_regression_within_threshold(self):
+        regressions = find_regressions(
+            self._results(95.0, 1050), self._results(100.0, 1000), 0.1
+        )
+
+        assert regressions == []
+
+    def test_throughput_regression(self):
+        regressions = find_regressions(
+            self._results(80.0, 1000), self._results(100.0, 1000), 0.1
+        )
+
+        assert regressions == ["parse_heroes_html[heroes.html] ops/sec : 100.0 -> 80.0"]
+
+    def test_allocations_regression(self):
+        regressions = find_regressions(
+            self._results(100.0, 1500), self._results(100.0, 1000), 0.1
+        )
+
+        assert regressions == [
+            "parse_heroes_html[heroes.html] peak bytes : 1000 -> 1500"
+        ]
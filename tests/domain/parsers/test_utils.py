@@ -1,9 +1,15 @@
 """Tests for Blizzard parser utility functions"""
 
+from unittest.mock import Mock
+
+import pytest
+
+from app.domain.exceptions import BlizzardNotModifiedError, ParserBlizzardError
 from app.domain.parsers.utils import (
     extract_blizzard_id_from_url,
     is_blizzard_id,
     match_player_by_blizzard_id,
+    validate_response_status,
 )
 
 
@@ -238,3 +244,21 @@ class TestMatchPlayerByBlizzardId:
         assert result is not None
         assert result["name"] == "Player1"  # First match
         assert result["avatar"] == "url1"
+
+
+class TestValidateResponseStatus:
+    """Test validate_response_status function"""
+
+    def test_valid_status(self):
+        """Test a 200 response is accepted"""
+        validate_response_status(Mock(status_code=200, text=""))
+
+    def test_not_modified(self):
+        """Test a 304 response raises BlizzardNotModifiedError"""
+        with pytest.raises(BlizzardNotModifiedError):
+            validate_response_status(Mock(status_code=304, text=""))
+
+    def test_invalid_status(self):
+        """Test an unexpected status raises ParserBlizzardError"""
+        with pytest.raises(ParserBlizzardError):
+            validate_response_status(Mock(status_code=500, text="error"))
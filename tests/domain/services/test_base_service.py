@@ -1,7 +1,7 @@
 """Tests for BaseService — _update_api_cache and _enqueue_refresh paths"""
 
 from typing import Any, cast
-from unittest.mock import AsyncMock
+from unittest.mock import AsyncMock, patch
 
 import pytest
 
@@ -12,7 +12,7 @@ def _make_service(
     *,
     cache_fail: bool = False,
     queue_fail: bool = False,
-    is_pending: bool = False,
+    admission_rate: float = 1.0,
 ) -> BaseService:
     cache = AsyncMock()
     if cache_fail:
@@ -22,10 +22,9 @@ def _make_service(
     blizzard_client = AsyncMock()
 
     task_queue = AsyncMock()
+    task_queue.get_admission_rate.return_value = admission_rate
     if queue_fail:
-        task_queue.is_job_pending_or_running.side_effect = Exception("Queue error")
-    else:
-        task_queue.is_job_pending_or_running.return_value = is_pending
+        task_queue.enqueue.side_effect = Exception("Queue error")
 
     return BaseService(cache, storage, blizzard_client, task_queue)
 
@@ -42,6 +41,7 @@ class TestUpdateApiCache:
             stored_at=None,
             staleness_threshold=None,
             stale_while_revalidate=0,
+            player_id=None,
         )
 
     @pytest.mark.asyncio
@@ -60,6 +60,7 @@ class TestUpdateApiCache:
             1800,
             staleness_threshold=900,
             stale_while_revalidate=60,
+            player_id=None,
         )
         cast("Any", svc.cache).update_api_cache.assert_awaited_once_with(
             "key",
@@ -68,6 +69,7 @@ class TestUpdateApiCache:
             stored_at=None,
             staleness_threshold=900,
             stale_while_revalidate=60,
+            player_id=None,
         )
 
     @pytest.mark.asyncio
@@ -82,28 +84,66 @@ class TestUpdateApiCache:
             stored_at=1_000_000,
             staleness_threshold=None,
             stale_while_revalidate=0,
+            player_id=None,
         )
 
 
 class TestEnqueueRefresh:
     @pytest.mark.asyncio
-    async def test_enqueues_when_job_not_pending(self):
-        svc = _make_service(is_pending=False)
+    async def test_enqueues_refresh(self):
+        svc = _make_service()
         await svc._enqueue_refresh("heroes", "heroes:en-us")
         cast("Any", svc.task_queue).enqueue.assert_awaited_once_with(
             "refresh_heroes",
             job_id="heroes:en-us",
+            run_at=None,
         )
 
-    @pytest.mark.asyncio
-    async def test_skips_when_job_already_pending(self):
-        svc = _make_service(is_pending=True)
-        await svc._enqueue_refresh("heroes", "heroes:en-us")
-        cast("Any", svc.task_queue).enqueue.assert_not_awaited()
-
     @pytest.mark.asyncio
     async def test_exception_is_swallowed(self):
         """Queue errors must not propagate."""
         svc = _make_service(queue_fail=True)
         # Should not raise
         await svc._enqueue_refresh("maps", "maps:all")
+
+    @pytest.mark.asyncio
+    async def test_admitted_refresh_returns_true(self):
+        svc = _make_service()
+
+        assert await svc._enqueue_refresh("heroes", "heroes:en-us") is True
+
+
+class TestRefreshAdmission:
+    @pytest.mark.asyncio
+    async def test_skipped_without_valkey_round_trip(self):
+        """A refresh shed by admission control never reaches the queue."""
+        svc = _make_service(admission_rate=0.0)
+
+        admitted = await svc._enqueue_refresh("player_profile", "TeKrop-2217")
+
+        assert admitted is False
+        cast("Any", svc.task_queue).enqueue.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_refreshes_are_sampled(self):
+        svc = _make_service(admission_rate=0.5)
+
+        with patch(
+            "app.domain.services.base_service.random.random",
+            side_effect=[0.2, 0.8],
+        ):
+            first = await svc._enqueue_refresh("player_profile", "TeKrop-2217")
+            second = await svc._enqueue_refresh("player_profile", "KIRIKO-12460")
+
+        assert (first, second) == (True, False)
+        cast("Any", svc.task_queue).enqueue.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_admission_errors_admit_the_refresh(self):
+        svc = _make_service()
+        cast("Any", svc.task_queue).get_admission_rate.side_effect = Exception(
+            "Valkey gone"
+        )
+
+        assert await svc._enqueue_refresh("maps", "maps:all") is True
+        cast("Any", svc.task_queue).enqueue.assert_awaited_once()
@@ -1,4 +1,4 @@
-"""Tests for StaticDataService — get_or_fetch, _parse_stored, _store_in_storage"""
+"""Tests for StaticDataService — get_or_fetch, _fetch_and_store, _parse_stored, _store_in_storage"""
 
 import time
 from typing import Any, cast
@@ -6,6 +6,9 @@ from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 
+from app.config import settings
+from app.domain.exceptions import BlizzardNotModifiedError
+from app.domain.models import PageValidators
 from app.domain.services.static_data_service import StaticDataService, StaticFetchConfig
 
 
@@ -14,7 +17,7 @@ def _make_service() -> StaticDataService:
     storage = AsyncMock()
     blizzard_client = AsyncMock()
     task_queue = AsyncMock()
-    task_queue.is_job_pending_or_running.return_value = False
+    task_queue.get_admission_rate.return_value = 1.0
     return StaticDataService(cache, storage, blizzard_client, task_queue)
 
 
@@ -48,15 +51,18 @@ class TestGetOrFetch:
         """When storage returns None, performs a cold fetch."""
         svc = _make_service()
         cast("Any", svc.storage).get_static_data.return_value = None
+        cast("Any", svc.cache).update_api_cache.return_value = "etag"
 
         parsed = [{"key": "ana"}]
         config = _make_config(fetcher=lambda: parsed)
 
-        data, is_stale, age = await svc.get_or_fetch(config)
+        data, is_stale, age, etag = await svc.get_or_fetch(config)
 
         assert data == parsed
         assert is_stale is False
         assert age == 0
+        # Entity tag of the body written to the API cache, for the response
+        assert etag == "etag"
 
     @pytest.mark.asyncio
     async def test_serves_fresh_from_storage(self):
@@ -75,7 +81,7 @@ class TestGetOrFetch:
             staleness_threshold=3600,
         )
 
-        _data, is_stale, age = await svc.get_or_fetch(config)
+        _data, is_stale, age, _etag = await svc.get_or_fetch(config)
 
         assert is_stale is False
         assert 99 <= age <= 102  # noqa: PLR2004
@@ -103,7 +109,7 @@ class TestGetOrFetch:
             staleness_threshold=3600,
         )
 
-        _data, is_stale, age = await svc.get_or_fetch(config)
+        _data, is_stale, age, _etag = await svc.get_or_fetch(config)
 
         assert is_stale is True
         assert age >= 3600  # noqa: PLR2004
@@ -118,6 +124,27 @@ class TestGetOrFetch:
             == config.cache_ttl
         )
 
+    @pytest.mark.asyncio
+    async def test_stale_window_extended_when_refresh_is_shed(self):
+        """A stale hit whose refresh is shed is cached with the backlog SWR."""
+        svc = _make_service()
+        cast("Any", svc.task_queue).get_admission_rate.return_value = 0.0
+        cast("Any", svc.storage).get_static_data.return_value = {
+            "data": "old-html",
+            "updated_at": int(time.time()) - 7200,
+        }
+        parsed = [{"key": "ana"}]
+        config = _make_config(fetcher=lambda: parsed, parser=lambda _html: parsed)
+
+        _data, is_stale, _age, _etag = await svc.get_or_fetch(config)
+
+        assert is_stale is True
+        cast("Any", svc.task_queue).enqueue.assert_not_awaited()
+        call_kwargs = cast("Any", svc.cache).update_api_cache.call_args.kwargs
+        assert call_kwargs["stale_while_revalidate"] == (
+            settings.stale_cache_backlog_timeout
+        )
+
     @pytest.mark.asyncio
     async def test_result_filter_applied(self):
         """result_filter is called on the data before returning."""
@@ -132,7 +159,7 @@ class TestGetOrFetch:
             result_filter=lambda heroes: [h for h in heroes if h["key"] == "ana"],
         )
 
-        data, _, _ = await svc.get_or_fetch(config)
+        data, _, _, _ = await svc.get_or_fetch(config)
 
         assert data == filtered
 
@@ -176,6 +203,107 @@ class TestParseStored:
         assert result == [{"key": "gamemode-a"}]
 
 
+class TestFetchAndStoreRevalidate:
+    @pytest.mark.asyncio
+    async def test_not_modified_touches_storage(self):
+        """A 304 on revalidation only bumps the stored source, and the API cache
+        is written again from it with the new stored_at."""
+        svc = _make_service()
+        cast("Any", svc.storage).touch_static_data.return_value = True
+        cast("Any", svc.storage).get_static_data.return_value = {
+            "data": "<html>",
+            "updated_at": 1_700_000_000,
+        }
+        parser = MagicMock(return_value=[{"key": "ana"}])
+        fetcher = MagicMock()
+        config = _make_config(fetcher=fetcher, parser=parser)
+        config.conditional_fetcher = AsyncMock(side_effect=BlizzardNotModifiedError)
+
+        result, _etag = await svc._fetch_and_store(config, revalidate=True)
+
+        assert result == [{"key": "ana"}]
+        cast("Any", svc.storage).touch_static_data.assert_awaited_once_with(
+            "heroes:en-us"
+        )
+        cast("Any", svc.storage).set_static_data.assert_not_awaited()
+        fetcher.assert_not_called()
+        parser.assert_called_once_with("<html>")
+        call_kwargs = cast("Any", svc.cache).update_api_cache.call_args.kwargs
+        assert call_kwargs["stored_at"] == 1_700_000_000  # noqa: PLR2004
+
+    @pytest.mark.asyncio
+    async def test_not_modified_without_stored_source_fetches_again(self):
+        """When there is no stored source to touch, falls back to a full fetch."""
+        svc = _make_service()
+        cast("Any", svc.storage).touch_static_data.return_value = False
+        config = _make_config(fetcher=lambda: "<html>", parser=lambda _: [{"k": 1}])
+        config.conditional_fetcher = AsyncMock(side_effect=BlizzardNotModifiedError)
+
+        result, _etag = await svc._fetch_and_store(config, revalidate=True)
+
+        assert result == [{"k": 1}]
+        cast("Any", svc.storage).set_static_data.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_modified_source_is_stored(self):
+        """A changed source fetched by the conditional fetcher is stored as usual."""
+        svc = _make_service()
+        fetcher = MagicMock()
+        config = _make_config(fetcher=fetcher, parser=lambda _: [{"k": 2}])
+        validators = PageValidators(url="https://blizzard/heroes", etag='"v2"')
+        config.conditional_fetcher = AsyncMock(return_value=("<html>", validators))
+
+        result, _etag = await svc._fetch_and_store(config, revalidate=True)
+
+        assert result == [{"k": 2}]
+        fetcher.assert_not_called()
+        cast("Any", svc.storage).touch_static_data.assert_not_awaited()
+        cast("Any", svc.storage).set_static_data.assert_awaited_once()
+        cast("Any", svc.blizzard_client).save_validators.assert_awaited_once_with(
+            validators
+        )
+
+    @pytest.mark.asyncio
+    async def test_validators_not_saved_when_source_not_stored(self):
+        """Validators of a source which couldn't be stored are never saved, so
+        that the next refresh fetches it again instead of getting a 304."""
+        svc = _make_service()
+        cast("Any", svc.storage).set_static_data.side_effect = RuntimeError("db")
+        config = _make_config(parser=lambda _: [{"k": 2}])
+        config.conditional_fetcher = AsyncMock(
+            return_value=("<html>", PageValidators(url="https://blizzard/heroes"))
+        )
+
+        await svc._fetch_and_store(config, revalidate=True)
+
+        cast("Any", svc.blizzard_client).save_validators.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_validators_not_saved_when_parsing_fails(self):
+        svc = _make_service()
+        config = _make_config(parser=MagicMock(side_effect=ValueError("parse")))
+        config.conditional_fetcher = AsyncMock(
+            return_value=("<html>", PageValidators(url="https://blizzard/heroes"))
+        )
+
+        with pytest.raises(ValueError, match="parse"):
+            await svc._fetch_and_store(config, revalidate=True)
+
+        cast("Any", svc.storage).set_static_data.assert_not_awaited()
+        cast("Any", svc.blizzard_client).save_validators.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_conditional_fetcher_unused_without_revalidate(self):
+        """Cold fetches never use the conditional fetcher."""
+        svc = _make_service()
+        config = _make_config(fetcher=lambda: [{"key": "ana"}])
+        config.conditional_fetcher = AsyncMock()
+
+        await svc._fetch_and_store(config)
+
+        config.conditional_fetcher.assert_not_awaited()
+
+
 class TestStoreInStorage:
     @pytest.mark.asyncio
     async def test_stores_successfully(self):
@@ -0,0 +1,134 @@
+"""Tests for the in-process parsed player profile cache"""
+
+from unittest.mock import patch
+
+import pytest
+
+from app.domain.utils.parsed_profile_cache import (
+    PARSED_PROFILE_MEMORY_FACTOR,
+    ParsedProfileCache,
+)
+
+_PROFILE = {"summary": {"username": "TeKrop"}, "stats": None}
+_SERIALIZED_SIZE = len('{"summary":{"username":"TeKrop"},"stats":null}')
+_PROFILE_SIZE = _SERIALIZED_SIZE * PARSED_PROFILE_MEMORY_FACTOR
+
+
+def _make_cache(*, ttl: int = 60, max_bytes: int = 1024) -> ParsedProfileCache:
+    with patch("app.domain.utils.parsed_profile_cache.settings") as s:
+        s.parsed_profile_cache_ttl = ttl
+        s.parsed_profile_cache_max_bytes = max_bytes
+        return ParsedProfileCache()
+
+
+@pytest.fixture(autouse=True)
+def _disable_prometheus():
+    with patch(
+        "app.domain.utils.parsed_profile_cache.settings.prometheus_enabled", False
+    ):
+        yield
+
+
+class TestGetAndSet:
+    def test_miss_returns_none(self):
+        profile_cache = _make_cache()
+
+        assert profile_cache.get("abc123") is None
+
+    def test_hit_returns_profile_and_updated_at(self):
+        profile_cache = _make_cache()
+        profile_cache.set("abc123", 1700000000, _PROFILE, _SERIALIZED_SIZE)
+
+        assert profile_cache.get("abc123") == (_PROFILE, 1700000000)
+
+    def test_newer_version_replaces_entry(self):
+        profile_cache = _make_cache()
+        new_profile = {"summary": {"username": "NewTeKrop"}, "stats": None}
+        profile_cache.set("abc123", 1700000000, _PROFILE, _SERIALIZED_SIZE)
+        profile_cache.set("abc123", 1700000060, new_profile, _SERIALIZED_SIZE)
+
+        assert profile_cache.get("abc123") == (new_profile, 1700000060)
+
+    def test_older_version_is_ignored(self):
+        profile_cache = _make_cache()
+        profile_cache.set("abc123", 1700000060, _PROFILE, _SERIALIZED_SIZE)
+        profile_cache.set(
+            "abc123", 1700000000, {"summary": {}, "stats": None}, _SERIALIZED_SIZE
+        )
+
+        assert profile_cache.get("abc123") == (_PROFILE, 1700000060)
+
+    def test_expired_entry_is_a_miss(self):
+        profile_cache = _make_cache(ttl=60)
+        with patch(
+            "app.domain.utils.parsed_profile_cache.time.monotonic",
+            side_effect=[1000.0, 1061.0],
+        ):
+            profile_cache.set("abc123", 1700000000, _PROFILE, _SERIALIZED_SIZE)
+            result = profile_cache.get("abc123")
+
+        assert result is None
+        assert profile_cache._size == 0
+
+    def test_disabled_cache_stores_nothing(self):
+        profile_cache = _make_cache(ttl=0)
+        profile_cache.set("abc123", 1700000000, _PROFILE, _SERIALIZED_SIZE)
+
+        assert profile_cache.get("abc123") is None
+
+    def test_delete_removes_entry(self):
+        profile_cache = _make_cache()
+        profile_cache.set("abc123", 1700000000, _PROFILE, _SERIALIZED_SIZE)
+        profile_cache.delete("abc123")
+
+        assert profile_cache.get("abc123") is None
+        assert profile_cache._size == 0
+
+
+class TestSizeEviction:
+    def test_least_recently_used_entry_is_evicted(self):
+        profile_cache = _make_cache(max_bytes=_PROFILE_SIZE * 2)
+        profile_cache.set("first", 1700000000, _PROFILE, _SERIALIZED_SIZE)
+        profile_cache.set("second", 1700000000, _PROFILE, _SERIALIZED_SIZE)
+
+        # Touch the first entry, so that the second one is the LRU
+        profile_cache.get("first")
+        profile_cache.set("third", 1700000000, _PROFILE, _SERIALIZED_SIZE)
+
+        assert profile_cache.get("first") is not None
+        assert profile_cache.get("second") is None
+        assert profile_cache.get("third") is not None
+        assert profile_cache._size == _PROFILE_SIZE * 2
+
+    def test_profile_larger_than_budget_is_not_stored(self):
+        profile_cache = _make_cache(max_bytes=_PROFILE_SIZE - 1)
+        profile_cache.set("abc123", 1700000000, _PROFILE, _SERIALIZED_SIZE)
+
+        assert profile_cache.get("abc123") is None
+        assert profile_cache._size == 0
+
+
+class TestMetrics:
+    def test_hits_misses_and_evictions_are_counted(self):
+        profile_cache = _make_cache(max_bytes=_PROFILE_SIZE)
+
+        with (
+            patch(
+                "app.domain.utils.parsed_profile_cache.settings.prometheus_enabled",
+                True,
+            ),
+            patch(
+                "app.domain.utils.parsed_profile_cache.parsed_profile_cache_requests_total"
+            ) as requests_mock,
+            patch(
+                "app.domain.utils.parsed_profile_cache.parsed_profile_cache_evictions_total"
+            ) as evictions_mock,
+        ):
+            profile_cache.get("first")
+            profile_cache.set("first", 1700000000, _PROFILE, _SERIALIZED_SIZE)
+            profile_cache.get("first")
+            profile_cache.set("second", 1700000000, _PROFILE, _SERIALIZED_SIZE)
+
+        requests_mock.labels.assert_any_call(result="miss")
+        requests_mock.labels.assert_any_call(result="hit")
+        evictions_mock.labels.assert_called_once_with(reason="size")
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import json
 import time
 from typing import TYPE_CHECKING
 
@@ -53,6 +54,13 @@ class FakeStorage:
             "created_at": existing["created_at"] if existing else now,
         }
 
+    async def touch_static_data(self, key: str) -> bool:
+        entry = self._static.get(key)
+        if entry is None:
+            return False
+        entry["updated_at"] = int(time.time())
+        return True
+
     # ------------------------------------------------------------------ #
     # Player profiles
     # ------------------------------------------------------------------ #
@@ -67,11 +75,30 @@ class FakeStorage:
                 "url": player_id,
                 "lastUpdated": profile.get("last_updated_blizzard"),
             }
-        return {**profile, "summary": summary}
+        parsed_profile = profile["parsed_profile"]
+        return {
+            **profile,
+            "summary": summary,
+            "parsed_profile_size": (
+                len(json.dumps(parsed_profile, separators=(",", ":")))
+                if parsed_profile is not None
+                else None
+            ),
+        }
 
     async def get_player_id_by_battletag(self, battletag: str) -> str | None:
         return self._battletag_index.get(battletag)
 
+    async def get_player_profiles_updated_at(
+        self, player_ids: list[str]
+    ) -> dict[str, int]:
+        updated_at = {}
+        for player_id in player_ids:
+            blizzard_id = self._battletag_index.get(player_id, player_id)
+            if (profile := self._profiles.get(blizzard_id)) is not None:
+                updated_at[player_id] = profile["updated_at"]
+        return updated_at
+
     async def set_player_profile(
         self,
         player_id: str,
@@ -81,6 +108,8 @@ class FakeStorage:
         name: str | None = None,
         last_updated_blizzard: int | None = None,
         data_version: int = 1,
+        parsed_profile: dict | None = None,
+        parser_version: int | None = None,
     ) -> None:
         now = int(time.time())
         existing = self._profiles.get(player_id)
@@ -93,10 +122,34 @@ class FakeStorage:
             "updated_at": now,
             "created_at": existing["created_at"] if existing else now,
             "data_version": data_version,
+            "parsed_profile": parsed_profile,
+            "parser_version": parser_version if parsed_profile is not None else None,
         }
         if battletag:
             self._battletag_index[battletag] = player_id
 
+    async def set_player_profiles(self, profiles: list[dict]) -> None:
+        for profile in profiles:
+            await self.set_player_profile(**profile)
+
+    async def set_player_profile_parsed(
+        self,
+        player_id: str,
+        parsed_profile: dict,
+        parser_version: int,
+    ) -> None:
+        profile = self._profiles.get(player_id)
+        if profile is not None:
+            profile["parsed_profile"] = parsed_profile
+            profile["parser_version"] = parser_version
+
+    async def touch_player_profile(self, player_id: str) -> bool:
+        profile = self._profiles.get(player_id)
+        if profile is None:
+            return False
+        profile["updated_at"] = int(time.time())
+        return True
+
     # ------------------------------------------------------------------ #
     # Maintenance
     # ------------------------------------------------------------------ #
@@ -17,7 +17,7 @@ def _make_hero_service() -> HeroService:
     storage = AsyncMock()
     blizzard_client = AsyncMock()
     task_queue = AsyncMock()
-    task_queue.is_job_pending_or_running.return_value = False
+    task_queue.get_admission_rate.return_value = 1.0
     return HeroService(cache, storage, blizzard_client, task_queue)
 
 
@@ -90,7 +90,7 @@ class TestHeroServiceGetHeroStatsGamemodeFilter:
                 expected,
             ],
         ) as mock_parse:
-            data, _, _ = await svc.get_hero_stats(**self._base_kwargs)
+            data, _, _, _ = await svc.get_hero_stats(**self._base_kwargs)
 
         assert data == expected
         assert mock_parse.call_count == 2  # noqa: PLR2004
@@ -116,7 +116,7 @@ class TestHeroServiceGetHeroStatsGamemodeFilter:
             "app.domain.services.hero_service.parse_hero_stats_summary",
             return_value=[],
         ) as mock_parse:
-            data, _, _ = await svc.get_hero_stats(**self._base_kwargs)
+            data, _, _, _ = await svc.get_hero_stats(**self._base_kwargs)
 
         assert data == []
         assert mock_parse.call_count == 1
@@ -144,7 +144,7 @@ class TestHeroServiceGamemodeFilterCaching:
             "app.domain.services.hero_service.parse_hero_stats_summary",
             return_value=expected,
         ) as mock_parse:
-            data, _, _ = await svc.get_hero_stats(**self._base_kwargs)
+            data, _, _, _ = await svc.get_hero_stats(**self._base_kwargs)
 
         assert mock_parse.call_count == 1
         assert mock_parse.call_args.kwargs["gamemode_filter"] == "2"
@@ -178,7 +178,7 @@ class TestHeroServiceGamemodeFilterCaching:
                 expected,
             ],
         ) as mock_parse:
-            data, _, _ = await svc.get_hero_stats(**self._base_kwargs)
+            data, _, _, _ = await svc.get_hero_stats(**self._base_kwargs)
 
         assert mock_parse.call_count == 2  # noqa: PLR2004
         assert data == expected
@@ -75,7 +75,7 @@ def test_get_hero_blizzard_error(client: TestClient):
 def test_get_hero_internal_error(client: TestClient):
     with patch(
         "app.domain.services.hero_service.HeroService.get_hero",
-        return_value=({"invalid_key": "invalid_value"}, False, 0),
+        return_value=({"invalid_key": "invalid_value"}, False, 0, None),
     ):
         response = client.get(f"/heroes/{HeroKey.ANA}")
 
@@ -202,7 +202,7 @@ def test_get_hero_stats_blizzard_error(client: TestClient):
 def test_get_hero_stats_internal_error(client: TestClient):
     with patch(
         "app.domain.services.hero_service.HeroService.get_hero_stats",
-        return_value=([{"invalid_key": "invalid_value"}], False, 0),
+        return_value=([{"invalid_key": "invalid_value"}], False, 0, None),
     ):
         response = client.get("/heroes/stats", params=_BASE_PARAMS)
 
@@ -75,7 +75,7 @@ def test_get_heroes_blizzard_error(client: TestClient):
 def test_get_heroes_internal_error(client: TestClient):
     with patch(
         "app.domain.services.hero_service.HeroService.list_heroes",
-        return_value=([{"invalid_key": "invalid_value"}], False, 0),
+        return_value=([{"invalid_key": "invalid_value"}], False, 0, None),
     ):
         response = client.get("/heroes")
 
@@ -14,6 +14,7 @@ from app.infrastructure.helpers import (
     _MAX_TITLE_LEN,
     _build_embed,
     _truncate_embed_content,
+    compute_etag,
     overfast_internal_error,
     send_discord_webhook_message,
 )
@@ -298,3 +299,16 @@ class TestApplySWRHeaders:
         )
 
         assert "max-age=1800" in resp.headers["Cache-Control"]
+
+    def test_etag_set_as_weak_validator(self):
+        resp = self._make_response()
+        etag = compute_etag(b'[{"a":1}]')
+        apply_swr_headers(resp, cache_ttl=3600, is_stale=False, etag=etag)
+
+        assert resp.headers["ETag"] == f'W/"{etag}"'
+
+    def test_etag_not_set_without_etag(self):
+        resp = self._make_response()
+        apply_swr_headers(resp, cache_ttl=3600, is_stale=False)
+
+        assert "ETag" not in resp.headers
@@ -1,5 +1,7 @@
 """Unit tests for PlayerService domain service"""
 
+import asyncio
+import contextlib
 import time
 from typing import Any, cast
 from unittest.mock import AsyncMock, MagicMock, Mock, patch
@@ -8,12 +10,16 @@ import pytest
 from fastapi import HTTPException, status
 
 from app.domain.exceptions import (
+    BlizzardNotModifiedError,
     ParserBlizzardError,
     ParserInternalError,
     ParserParsingError,
 )
+from app.domain.models import PageValidators
 from app.domain.models.player import PlayerIdentity
+from app.domain.parsers.player_profile import PLAYER_PROFILE_PARSER_VERSION
 from app.domain.services.player_service import PlayerService
+from app.domain.utils.parsed_profile_cache import ParsedProfileCache
 from tests.fake_storage import FakeStorage
 from tests.helpers import read_html_file
 
@@ -38,9 +44,10 @@ def _make_service(
         cache = AsyncMock()
         cache.get_player_status = AsyncMock(return_value=None)
         cache.set_player_status = AsyncMock()
+        cache.evict_players_api_cache = AsyncMock(return_value={})
     if task_queue is None:
         task_queue = AsyncMock()
-        task_queue.is_job_pending_or_running = AsyncMock(return_value=False)
+        task_queue.get_admission_rate = AsyncMock(return_value=1.0)
     blizzard_client = AsyncMock()
     return PlayerService(cache, storage, blizzard_client, task_queue)
 
@@ -259,6 +266,85 @@ class TestGetFreshStoredProfile:
         assert profile["profile"] == _TEKROP_HTML
         assert age >= 0
 
+    @pytest.mark.asyncio
+    async def test_memory_cache_hit_skips_storage(self):
+        parsed_profile = {"summary": {"username": "TeKrop"}, "stats": None}
+        updated_at = int(time.time()) - 10
+        ParsedProfileCache().set("TeKrop-2217", updated_at, parsed_profile, 1)
+        storage = AsyncMock()
+        svc = _make_service(storage=cast("Any", storage))
+        with patch("app.domain.services.player_service.settings") as s:
+            s.player_staleness_threshold = 3600
+            profile, age = await svc._get_fresh_stored_profile("TeKrop-2217")
+
+        storage.get_player_profiles_updated_at.assert_not_called()
+        storage.get_player_id_by_battletag.assert_not_called()
+        storage.get_player_profile.assert_not_called()
+        assert profile is not None
+        assert profile["parsed_profile"] == parsed_profile
+        assert profile["updated_at"] == updated_at
+        assert age >= 10  # noqa: PLR2004
+
+    @pytest.mark.asyncio
+    async def test_stale_memory_cache_entry_falls_back_to_storage(self):
+        ParsedProfileCache().set(
+            "abc123", int(time.time()) - 99999, {"summary": {}, "stats": None}, 1
+        )
+        storage = FakeStorage()
+        await storage.set_player_profile(
+            "abc123", html=_TEKROP_HTML, summary=_PLAYER_SUMMARY
+        )
+        svc = _make_service(storage=storage)
+        with (
+            patch(
+                "app.domain.services.player_service.is_blizzard_id", return_value=True
+            ),
+            patch("app.domain.services.player_service.settings") as s,
+        ):
+            s.player_staleness_threshold = 3600
+            s.prometheus_enabled = False
+            profile, _age = await svc._get_fresh_stored_profile("abc123")
+
+        assert profile is not None
+        assert profile["profile"] == _TEKROP_HTML
+
+    @pytest.mark.asyncio
+    async def test_loaded_profile_invalidates_memory_cache(self):
+        """Entries of a player are dropped once this process stored its
+        profile, under both the requested and the resolved IDs."""
+        for player_id in ("TeKrop-2217", "abc123"):
+            ParsedProfileCache().set(
+                player_id, int(time.time()) - 60, {"summary": {}, "stats": None}, 1
+            )
+        parsed_profile = {"summary": {"username": "TeKrop"}, "stats": None}
+        svc = _make_service()
+        with (
+            patch.object(
+                svc,
+                "_resolve_player_identity",
+                AsyncMock(return_value=PlayerIdentity(blizzard_id="abc123")),
+            ),
+            patch.object(
+                svc, "_get_player_profile", AsyncMock(return_value=parsed_profile)
+            ),
+        ):
+            result, _identity = await svc._load_player_profile("TeKrop-2217")
+
+        assert result == parsed_profile
+        assert ParsedProfileCache().get("TeKrop-2217") is None
+        assert ParsedProfileCache().get("abc123") is None
+
+    @pytest.mark.asyncio
+    async def test_evicted_player_is_removed_from_memory_cache(self):
+        ParsedProfileCache().set(
+            "abc123", int(time.time()), {"summary": {}, "stats": None}, 1
+        )
+        svc = _make_service()
+
+        await svc._evict_player_cache_keys("abc123")
+
+        assert ParsedProfileCache().get("abc123") is None
+
 
 # ---------------------------------------------------------------------------
 # _mark_player_unknown
@@ -442,13 +528,81 @@ class TestExecutePlayerRequest:
             s.player_staleness_threshold = 99999
             s.prometheus_enabled = False
             s.career_path_cache_timeout = 300
-            result, _is_stale, _age = await svc._execute_player_request(
+            result, _is_stale, _age, _etag = await svc._execute_player_request(
                 "abc123|def456", "test-key", data_factory
             )
 
         assert result == {"result": "ok"}
         data_factory.assert_called_once()
 
+    @pytest.mark.asyncio
+    async def test_fast_path_uses_stored_parsed_profile(self):
+        """A parsed profile of the current parser version skips HTML parsing."""
+        storage = FakeStorage()
+        parsed_profile = {"summary": {"username": "TeKrop"}, "stats": None}
+        await storage.set_player_profile(
+            "abc123|def456",
+            html=_TEKROP_HTML,
+            summary=_PLAYER_SUMMARY,
+            parsed_profile=parsed_profile,
+            parser_version=PLAYER_PROFILE_PARSER_VERSION,
+        )
+        svc = _make_service(storage=storage)
+        data_factory = Mock(return_value={"result": "ok"})
+
+        with (
+            patch(
+                "app.domain.services.player_service.is_blizzard_id", return_value=True
+            ),
+            patch(
+                "app.domain.services.player_service.parse_player_profile_html"
+            ) as parse_mock,
+            patch("app.domain.services.player_service.settings") as s,
+        ):
+            s.player_staleness_threshold = 99999
+            s.prometheus_enabled = False
+            s.career_path_cache_timeout = 300
+            await svc._execute_player_request("abc123|def456", "test-key", data_factory)
+
+        parse_mock.assert_not_called()
+        data_factory.assert_called_once_with(parsed_profile)
+        # Kept in memory, sized from the stored document
+        cached = ParsedProfileCache().get("abc123|def456")
+        assert cached is not None
+        assert cached[0] == parsed_profile
+
+    @pytest.mark.asyncio
+    async def test_fast_path_reparses_outdated_parser_version(self):
+        """An outdated parsed profile is re-parsed from HTML and backfilled."""
+        storage = FakeStorage()
+        await storage.set_player_profile(
+            "abc123|def456",
+            html=_TEKROP_HTML,
+            summary=_PLAYER_SUMMARY,
+            parsed_profile={"summary": {}, "stats": None},
+            parser_version=PLAYER_PROFILE_PARSER_VERSION - 1,
+        )
+        svc = _make_service(storage=storage)
+
+        with (
+            patch(
+                "app.domain.services.player_service.is_blizzard_id", return_value=True
+            ),
+            patch("app.domain.services.player_service.settings") as s,
+        ):
+            s.player_staleness_threshold = 99999
+            s.prometheus_enabled = False
+            s.career_path_cache_timeout = 300
+            result, _is_stale, _age, _etag = await svc._execute_player_request(
+                "abc123|def456", "test-key", lambda profile: profile["summary"]
+            )
+
+        stored = storage._profiles["abc123|def456"]
+
+        assert result["username"] == "TeKrop"
+        assert stored["parser_version"] == PLAYER_PROFILE_PARSER_VERSION
+        assert stored["parsed_profile"]["summary"] == result
+
     @pytest.mark.asyncio
     async def test_slow_path_calls_blizzard(self):
         """When no fresh profile in storage, Blizzard is called."""
@@ -488,8 +642,8 @@ class TestExecutePlayerRequest:
             s.blizzard_host = "https://overwatch.blizzard.com"
             s.career_path = "/career"
             s.unknown_players_cache_enabled = False
-            result, _is_stale, _age = await svc._execute_player_request(
-                "TeKrop-2217", "test-key", lambda _html, _summary: {"from": "blizzard"}
+            result, _is_stale, _age, _etag = await svc._execute_player_request(
+                "TeKrop-2217", "test-key", lambda _profile: {"from": "blizzard"}
             )
 
         assert result == {"from": "blizzard"}
@@ -507,7 +661,7 @@ class TestExecutePlayerRequest:
         # Then it goes to slow path; we mock the identity resolution and html fetch
         storage._profiles["abc123|def456"]["updated_at"] = int(time.time()) - 9999
         task_queue = AsyncMock()
-        task_queue.is_job_pending_or_running = AsyncMock(return_value=False)
+        task_queue.get_admission_rate = AsyncMock(return_value=1.0)
         svc = _make_service(storage=storage, task_queue=task_queue)
 
         with (
@@ -533,8 +687,8 @@ class TestExecutePlayerRequest:
             s.player_staleness_threshold = 3600
             s.prometheus_enabled = False
             s.career_path_cache_timeout = 300
-            result, _is_stale, _age = await svc._execute_player_request(
-                "abc123|def456", "test-key", lambda _html, _summary: {}
+            result, _is_stale, _age, _etag = await svc._execute_player_request(
+                "abc123|def456", "test-key", lambda _profile: {}
             )
         # Profile is stale (age > threshold), slow path → fresh fetch → age=0 → not stale
         assert result == {}
@@ -564,7 +718,7 @@ class TestExecutePlayerRequest:
             s.career_path_cache_timeout = 300
             s.stale_cache_timeout = 60
             await svc._execute_player_request(
-                "abc123|def456", "test-key", lambda _html, _summary: {}
+                "abc123|def456", "test-key", lambda _profile: {}
             )
 
         call_kwargs = cache.update_api_cache.call_args.kwargs
@@ -584,7 +738,7 @@ class TestExecutePlayerRequest:
         storage._profiles["abc123|def456"]["updated_at"] = int(time.time()) - 2000
         cache = AsyncMock()
         task_queue = AsyncMock()
-        task_queue.is_job_pending_or_running = AsyncMock(return_value=False)
+        task_queue.get_admission_rate = AsyncMock(return_value=1.0)
         svc = _make_service(storage=storage, cache=cache, task_queue=task_queue)
 
         with (
@@ -597,8 +751,8 @@ class TestExecutePlayerRequest:
             s.prometheus_enabled = False
             s.career_path_cache_timeout = 300
             s.stale_cache_timeout = 60
-            _data, is_stale, _age = await svc._execute_player_request(
-                "abc123|def456", "test-key", lambda _html, _summary: {}
+            _data, is_stale, _age, _etag = await svc._execute_player_request(
+                "abc123|def456", "test-key", lambda _profile: {}
             )
 
         assert is_stale is True
@@ -641,13 +795,184 @@ class TestExecutePlayerRequest:
             s.career_path = "/career"
             s.unknown_players_cache_enabled = False
             await svc._execute_player_request(
-                "TeKrop-2217", "test-key", lambda _html, _summary: {}
+                "TeKrop-2217", "test-key", lambda _profile: {}
             )
 
         call_kwargs = cache.update_api_cache.call_args.kwargs
         assert call_kwargs["stored_at"] is None
 
 
+# ---------------------------------------------------------------------------
+# _load_player_profile_once — single-flight profile loading
+# ---------------------------------------------------------------------------
+
+
+class TestLoadPlayerProfileOnce:
+    @pytest.mark.asyncio
+    async def test_concurrent_requests_share_one_load(self):
+        """Concurrent requests for the same player only load the profile once."""
+        parsed_profile = {"summary": {"username": "TeKrop"}, "stats": None}
+        svc = _make_service()
+
+        async def slow_load(_player_id: str):
+            await asyncio.sleep(0.05)
+            return parsed_profile, PlayerIdentity(blizzard_id="abc123")
+
+        with patch.object(
+            svc, "_load_player_profile", side_effect=slow_load
+        ) as load_mock:
+            results = await asyncio.gather(
+                *(svc._load_player_profile_once("TeKrop-2217") for _ in range(5))
+            )
+
+        load_mock.assert_awaited_once_with("TeKrop-2217")
+        assert all(result[0] is parsed_profile for result in results)
+        assert not PlayerService._inflight_profile_loads
+
+    @pytest.mark.asyncio
+    async def test_concurrent_requests_share_the_error(self):
+        """The error of the loading request is raised in every waiting request."""
+        svc = _make_service()
+        not_found = ParserBlizzardError(
+            status_code=status.HTTP_404_NOT_FOUND, message="Player not found"
+        )
+
+        async def failing_load(_player_id: str):
+            await asyncio.sleep(0.05)
+            raise not_found
+
+        with patch.object(
+            svc, "_load_player_profile", side_effect=failing_load
+        ) as load_mock:
+            results = await asyncio.gather(
+                *(svc._load_player_profile_once("TeKrop-2217") for _ in range(3)),
+                return_exceptions=True,
+            )
+
+        load_mock.assert_awaited_once()
+        assert all(result is not_found for result in results)
+        assert not PlayerService._inflight_profile_loads
+
+    @pytest.mark.asyncio
+    async def test_lock_held_elsewhere_uses_stored_profile(self):
+        """When another process holds the lock, the profile it stored is used."""
+        storage = FakeStorage()
+        await storage.set_player_profile(
+            "abc123", html=_TEKROP_HTML, summary=_PLAYER_SUMMARY
+        )
+        cache = AsyncMock()
+        cache.acquire_lock = AsyncMock(return_value=False)
+        cache.exists = AsyncMock(return_value=False)
+        svc = _make_service(storage=storage, cache=cache)
+        svc._lock_poll_interval = 0
+
+        with (
+            patch.object(svc, "_load_player_profile") as load_mock,
+            patch(
+                "app.domain.services.player_service.is_blizzard_id", return_value=True
+            ),
+            patch("app.domain.services.player_service.settings") as s,
+        ):
+            s.player_staleness_threshold = 3600
+            s.player_fetch_lock_timeout = 30
+            s.prometheus_enabled = False
+            parsed_profile, identity = await svc._load_player_profile_once("abc123")
+
+        load_mock.assert_not_called()
+        cache.release_lock.assert_not_called()
+        assert parsed_profile["summary"]["username"] == "TeKrop"
+        assert identity.blizzard_id == "abc123"
+
+    @pytest.mark.asyncio
+    async def test_unchanged_stale_profile_is_touched_for_waiters(self):
+        """When Blizzard's lastUpdated didn't change, the lock holder bumps the
+        stored profile, so that waiters use it instead of loading it again."""
+        storage = FakeStorage()
+        await storage.set_player_profile(
+            "abc123|def456", html=_TEKROP_HTML, summary=_PLAYER_SUMMARY
+        )
+        storage._profiles["abc123|def456"]["updated_at"] = 0
+        svc = _make_service(storage=storage)
+        identity = PlayerIdentity(
+            blizzard_id="abc123|def456", player_summary=_PLAYER_SUMMARY
+        )
+
+        with (
+            patch(
+                "app.domain.services.player_service.fetch_player_html",
+                new_callable=AsyncMock,
+            ) as mock_fetch,
+            patch(
+                "app.domain.services.player_service.is_blizzard_id", return_value=True
+            ),
+            patch("app.domain.services.player_service.settings") as s,
+        ):
+            s.player_staleness_threshold = 3600
+            s.prometheus_enabled = False
+            await svc._get_player_profile("abc123|def456", identity)
+            profile, _age = await svc._get_fresh_stored_profile("abc123|def456")
+
+        mock_fetch.assert_not_called()
+        assert profile is not None
+        assert profile["updated_at"] > 0
+
+    @pytest.mark.asyncio
+    async def test_lock_acquired_is_released_after_load(self):
+        parsed_profile = {"summary": {}, "stats": None}
+        svc = _make_service()
+
+        with patch.object(
+            svc,
+            "_load_player_profile",
+            new_callable=AsyncMock,
+            return_value=(parsed_profile, PlayerIdentity()),
+        ):
+            await svc._load_player_profile_once("TeKrop-2217")
+
+        cache = cast("Any", svc.cache)
+        lock_key, lock_token, _ttl = cache.acquire_lock.call_args[0]
+        cache.release_lock.assert_awaited_once_with(lock_key, lock_token)
+
+
+# ---------------------------------------------------------------------------
+# _evict_player_cache_keys
+# ---------------------------------------------------------------------------
+
+
+class TestEvictPlayerCacheKeys:
+    @pytest.mark.asyncio
+    async def test_evicts_through_player_cache_index(self):
+        cache = AsyncMock()
+        cache.evict_players_api_cache = AsyncMock(
+            return_value={"TeKrop-2217": 3, "Other-1234": 0}
+        )
+        svc = _make_service(cache=cache)
+
+        await svc._evict_player_cache_keys("TeKrop-2217", "Other-1234")
+
+        cache.evict_players_api_cache.assert_awaited_once_with(
+            ["TeKrop-2217", "Other-1234"]
+        )
+        cache.scan_keys.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_observes_evicted_keys_metric(self):
+        cache = AsyncMock()
+        cache.evict_players_api_cache = AsyncMock(return_value={"TeKrop-2217": 3})
+        svc = _make_service(cache=cache)
+
+        with (
+            patch("app.domain.services.player_service.settings") as s,
+            patch(
+                "app.domain.services.player_service.player_cache_keys_evicted"
+            ) as metric_mock,
+        ):
+            s.prometheus_enabled = True
+            await svc._evict_player_cache_keys("TeKrop-2217")
+
+        metric_mock.observe.assert_called_once_with(3)
+
+
 # ---------------------------------------------------------------------------
 # refresh_player_profile — bypasses storage fast-path
 # ---------------------------------------------------------------------------
@@ -714,6 +1039,217 @@ class TestRefreshPlayerProfile:
         profile = await storage.get_player_profile("abc123|def456")
         assert profile is not None
 
+    @pytest.mark.asyncio
+    async def test_not_modified_touches_stored_profile(self):
+        """When Blizzard answers 304 to the conditional request, the stored
+        profile is only touched, its HTML isn't rewritten."""
+        storage = FakeStorage()
+        await storage.set_player_profile(
+            "abc123|def456",
+            html=_TEKROP_HTML,
+            summary=_PLAYER_SUMMARY,
+        )
+        storage._profiles["abc123|def456"]["updated_at"] = 0
+        svc = _make_service(storage=storage)
+
+        # Identity resolution fetches the page unconditionally for Blizzard IDs,
+        # only the conditional request of the refresh is tested here
+        with (
+            patch.object(
+                svc,
+                "_resolve_player_identity",
+                return_value=PlayerIdentity(blizzard_id="abc123|def456"),
+            ),
+            patch(
+                "app.domain.services.player_service.fetch_player_html_if_modified",
+                new_callable=AsyncMock,
+                side_effect=BlizzardNotModifiedError,
+            ) as mock_fetch,
+            patch.object(
+                storage, "set_player_profile", wraps=storage.set_player_profile
+            ) as mock_set,
+            patch("app.domain.services.player_service.settings") as s,
+        ):
+            s.player_staleness_threshold = 3600
+            s.prometheus_enabled = False
+            s.career_path_cache_timeout = 300
+            s.unknown_players_cache_enabled = False
+            await svc.refresh_player_profile("abc123|def456")
+
+        mock_fetch.assert_awaited_once()
+        mock_set.assert_not_called()
+        profile = await storage.get_player_profile("abc123|def456")
+        assert profile is not None
+        assert profile["updated_at"] > 0
+
+    @pytest.mark.asyncio
+    async def test_unchanged_profile_reuses_stored_parsed_profile(self):
+        """When lastUpdated didn't change, the stored parsed profile is stored
+        again with the existing HTML, without parsing it."""
+        storage = FakeStorage()
+        parsed_profile = {"summary": {"username": "TeKrop"}, "stats": None}
+        await storage.set_player_profile(
+            "abc123|def456",
+            html=_TEKROP_HTML,
+            summary=_PLAYER_SUMMARY,
+            parsed_profile=parsed_profile,
+            parser_version=PLAYER_PROFILE_PARSER_VERSION,
+        )
+        svc = _make_service(storage=storage)
+
+        with patch(
+            "app.domain.services.player_service.parse_player_profile_html"
+        ) as parse_mock:
+            result = await svc._get_player_profile(
+                "abc123|def456",
+                PlayerIdentity(player_summary=_PLAYER_SUMMARY),
+                force_update=True,
+            )
+
+        parse_mock.assert_not_called()
+        assert result == parsed_profile
+
+    @pytest.mark.asyncio
+    async def test_unparsable_html_is_not_stored(self):
+        """Fetched HTML failing to parse is not stored, the previous profile
+        being kept."""
+        storage = FakeStorage()
+        await storage.set_player_profile(
+            "abc123|def456", html=_TEKROP_HTML, summary=_PLAYER_SUMMARY
+        )
+        svc = _make_service(storage=storage)
+
+        with (
+            patch(
+                "app.domain.services.player_service.fetch_player_html_if_modified",
+                new_callable=AsyncMock,
+                return_value=("<html/>", PageValidators(url="https://blizzard")),
+            ),
+            patch(
+                "app.domain.services.player_service.parse_player_profile_html",
+                side_effect=ParserParsingError("Could not find main content in HTML"),
+            ),
+            pytest.raises(ParserParsingError),
+        ):
+            await svc._get_player_profile(
+                "abc123|def456", PlayerIdentity(), force_update=True
+            )
+
+        profile = await storage.get_player_profile("abc123|def456")
+        assert profile is not None
+        assert profile["html"] == _TEKROP_HTML
+        cast("Any", svc.blizzard_client).save_validators.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("write_fails", [False, True])
+    async def test_validators_saved_once_profile_stored(self, write_fails: bool):
+        """Validators of a modified page are only saved after the profile is
+        stored, and never if the write failed."""
+        validators = PageValidators(url="https://blizzard/career", etag='"v2"')
+        storage = FakeStorage()
+        await storage.set_player_profile(
+            "abc123|def456", html=_TEKROP_HTML, summary=_PLAYER_SUMMARY
+        )
+        svc = _make_service(storage=storage)
+        with (
+            patch(
+                "app.domain.services.player_service.fetch_player_html_if_modified",
+                new_callable=AsyncMock,
+                return_value=(_TEKROP_HTML, validators),
+            ),
+            patch.object(
+                storage,
+                "set_player_profile",
+                side_effect=RuntimeError("db") if write_fails else None,
+            ),
+            contextlib.suppress(RuntimeError),
+        ):
+            await svc._get_player_profile(
+                "abc123|def456", PlayerIdentity(), force_update=True
+            )
+
+        save_validators = cast("Any", svc.blizzard_client).save_validators
+        if write_fails:
+            save_validators.assert_not_awaited()
+        else:
+            save_validators.assert_awaited_once_with(validators)
+
+    @pytest.mark.asyncio
+    async def test_buffered_writes_are_stored_at_once(self):
+        """Within buffered_profile_writes, refreshed profiles are stored in a
+        single write on exit, and cache keys are only evicted afterwards."""
+        storage = FakeStorage()
+        svc = _make_service(storage=storage)
+        player_ids = ["abc123|def456", "ghi789|jkl012"]
+
+        with (
+            patch(
+                "app.domain.services.player_service.is_blizzard_id", return_value=True
+            ),
+            patch(
+                "app.domain.services.player_service.fetch_player_html",
+                new_callable=AsyncMock,
+                return_value=(_TEKROP_HTML, "abc123|def456"),
+            ),
+            patch.object(
+                storage, "set_player_profiles", wraps=storage.set_player_profiles
+            ) as mock_set_many,
+            patch("app.domain.services.player_service.settings") as s,
+        ):
+            s.player_staleness_threshold = 3600
+            s.prometheus_enabled = False
+            s.career_path_cache_timeout = 300
+            s.unknown_players_cache_enabled = False
+            async with svc.buffered_profile_writes():
+                for player_id in player_ids:
+                    await svc.refresh_player_profile(player_id)
+
+                assert await storage.get_player_profile(player_ids[0]) is None
+                cast("Any", svc.cache).evict_players_api_cache.assert_not_awaited()
+
+        mock_set_many.assert_awaited_once()
+        assert [
+            profile["player_id"] for profile in mock_set_many.call_args.args[0]
+        ] == player_ids
+        for player_id in player_ids:
+            assert await storage.get_player_profile(player_id) is not None
+        cast("Any", svc.cache).evict_players_api_cache.assert_awaited_once_with(
+            player_ids
+        )
+
+    @pytest.mark.asyncio
+    async def test_buffered_write_failure_is_raised(self):
+        """A failed storage write of buffered profiles is raised on exit, and
+        cache keys of players aren't evicted."""
+        storage = FakeStorage()
+        svc = _make_service(storage=storage)
+
+        with (
+            patch(
+                "app.domain.services.player_service.is_blizzard_id", return_value=True
+            ),
+            patch(
+                "app.domain.services.player_service.fetch_player_html",
+                new_callable=AsyncMock,
+                return_value=(_TEKROP_HTML, "abc123|def456"),
+            ),
+            patch.object(
+                storage, "set_player_profiles", side_effect=RuntimeError("db")
+            ),
+            patch("app.domain.services.player_service.settings") as s,
+        ):
+            s.player_staleness_threshold = 3600
+            s.prometheus_enabled = False
+            s.career_path_cache_timeout = 300
+            s.unknown_players_cache_enabled = False
+            buffered_writes = svc.buffered_profile_writes()
+            await buffered_writes.__aenter__()
+            await svc.refresh_player_profile("abc123|def456")
+            with pytest.raises(RuntimeError, match="db"):
+                await buffered_writes.__aexit__(None, None, None)
+
+        cast("Any", svc.cache).evict_players_api_cache.assert_not_awaited()
+
     @pytest.mark.asyncio
     async def test_blizzard_error_propagates(self):
         """A ParserBlizzardError from identity resolution is re-raised as-is by
@@ -742,3 +1278,83 @@ class TestRefreshPlayerProfile:
                 await svc.refresh_player_profile("TeKrop-2217")
 
         assert exc_info.value.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+
+
+# ---------------------------------------------------------------------------
+# prerefresh_popular_players
+# ---------------------------------------------------------------------------
+
+
+class TestPrerefreshPopularPlayers:
+    @staticmethod
+    async def _make_storage(ages: dict[str, int]) -> FakeStorage:
+        storage = FakeStorage()
+        now = int(time.time())
+        for player_id, age in ages.items():
+            await storage.set_player_profile(player_id, html="<html/>")
+            storage._profiles[player_id]["updated_at"] = now - age
+        return storage
+
+    @staticmethod
+    def _settings(s: Any) -> None:
+        s.player_popularity_half_life = 60
+        s.player_popularity_max_players = 1000
+        s.player_prerefresh_top_k = 10
+        s.player_staleness_threshold = 3600
+        s.player_prerefresh_min_age_ratio = 0.5
+        s.prometheus_enabled = False
+
+    @pytest.mark.asyncio
+    async def test_enqueues_expiring_popular_players_oldest_first(self):
+        storage = await self._make_storage(
+            {"Fresh-1": 60, "Old-1": 2000, "Older-1": 3000}
+        )
+        svc = _make_service(storage=storage)
+        cache = cast("Any", svc.cache)
+        cache.get_popular_players = AsyncMock(
+            return_value=["Fresh-1", "Old-1", "Unknown-1", "Older-1"]
+        )
+
+        with patch("app.domain.services.player_service.settings") as s:
+            self._settings(s)
+            enqueued = await svc.prerefresh_popular_players(60, budget=10)
+
+        assert enqueued == 2  # noqa: PLR2004
+        calls = cast("Any", svc.task_queue).enqueue.call_args_list
+        assert [call.kwargs["job_id"] for call in calls] == ["Older-1", "Old-1"]
+        # Refreshes are spread over the interval
+        assert calls[1].kwargs["run_at"] - calls[0].kwargs["run_at"] == pytest.approx(
+            30
+        )
+        # Scores are halved after a half-life
+        cache.decay_player_popularity.assert_awaited_once_with(0.5, 1000)
+
+    @pytest.mark.asyncio
+    async def test_enqueues_within_budget(self):
+        storage = await self._make_storage({"Old-1": 2000, "Older-1": 3000})
+        svc = _make_service(storage=storage)
+        cast("Any", svc.cache).get_popular_players = AsyncMock(
+            return_value=["Old-1", "Older-1"]
+        )
+
+        with patch("app.domain.services.player_service.settings") as s:
+            self._settings(s)
+            enqueued = await svc.prerefresh_popular_players(60, budget=1)
+
+        assert enqueued == 1
+        enqueue = cast("Any", svc.task_queue).enqueue
+        enqueue.assert_awaited_once()
+        assert enqueue.call_args.args == ("refresh_player_profile",)
+        assert enqueue.call_args.kwargs["job_id"] == "Older-1"
+
+    @pytest.mark.asyncio
+    async def test_no_budget_only_decays_scores(self):
+        svc = _make_service()
+
+        with patch("app.domain.services.player_service.settings") as s:
+            self._settings(s)
+            enqueued = await svc.prerefresh_popular_players(60, budget=0)
+
+        assert enqueued == 0
+        cast("Any", svc.cache).decay_player_popularity.assert_awaited_once()
+        cast("Any", svc.cache).get_popular_players.assert_not_awaited()
@@ -225,6 +225,7 @@ def test_get_player_stats_internal_error(
             },
             False,
             0,
+            None,
         ),
     ):
         response = client.get(
@@ -143,6 +143,7 @@ def test_get_player_stats_summary_internal_error(client: TestClient):
             },
             False,
             0,
+            None,
         ),
     ):
         response = client.get(
@@ -164,7 +164,7 @@ def test_search_players_ordering(
 def test_search_players_internal_error(client: TestClient):
     with patch(
         "app.domain.services.player_service.PlayerService.search_players",
-        return_value={"invalid_key": "invalid_value"},
+        return_value=({"invalid_key": "invalid_value"}, None),
     ):
         response = client.get("/players", params={"name": "Test"})
 
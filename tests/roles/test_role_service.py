@@ -14,7 +14,7 @@ def _make_role_service() -> RoleService:
     storage = AsyncMock()
     blizzard_client = AsyncMock()
     task_queue = AsyncMock()
-    task_queue.is_job_pending_or_running.return_value = False
+    task_queue.get_admission_rate.return_value = 1.0
     return RoleService(cache, storage, blizzard_client, task_queue)
 
 
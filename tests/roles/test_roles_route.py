@@ -38,7 +38,7 @@ def test_get_roles_blizzard_error(client: TestClient):
 def test_get_roles_internal_error(client: TestClient):
     with patch(
         "app.domain.services.role_service.RoleService.list_roles",
-        return_value=([{"invalid_key": "invalid_value"}], False, 0),
+        return_value=([{"invalid_key": "invalid_value"}], False, 0, None),
     ):
         response = client.get("/roles")
 